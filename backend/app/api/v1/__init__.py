@@ -7,7 +7,10 @@ from app.api.v1.conversations import router as conversations_router
 from app.api.v1.dbs import router as dbs_router
 from app.api.v1.editor_memory import router as editor_memory_router
 from app.api.v1.history import router as history_router
+from app.api.v1.jobs import router as jobs_router
+from app.api.v1.metrics import router as metrics_router
 from app.api.v1.query import router as query_router
+from app.api.v1.results import router as results_router
 
 router = APIRouter()
 
@@ -17,6 +20,12 @@ router.include_router(dbs_router)
 # Include query execution routes
 router.include_router(query_router)
 
+# Include stored result routes
+router.include_router(results_router)
+
+# Include query job routes
+router.include_router(jobs_router)
+
 # Include query history routes
 router.include_router(history_router)
 
@@ -27,3 +36,6 @@ router.include_router(agent_router)
 router.include_router(editor_memory_router)
 
 router.include_router(conversations_router)
+
+# Include runtime metrics routes
+router.include_router(metrics_router)
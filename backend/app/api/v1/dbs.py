@@ -1,24 +1,46 @@
 """Database connection API endpoints."""
 
+import asyncio
 import json
+from collections.abc import AsyncIterator
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
+from app.models.base import CamelModel
 from app.models.database import (
+    CostGuardConfig,
     DatabaseCreateRequest,
     DatabaseListResponse,
     DatabaseResponse,
     mask_password_in_url,
 )
 from app.models.error import ErrorResponse
-from app.models.metadata import DatabaseMetadata, TableListResponse, TableMetadata
+from app.models.metadata import (
+    DatabaseMetadata,
+    MetadataStreamEnd,
+    MetadataStreamError,
+    MetadataStreamHeader,
+    MetadataStreamSchema,
+    TableListResponse,
+    TableMetadata,
+)
 from app.models.ssh import SSHConfigResponse
 from app.services.db_manager import database_manager
 from app.services.metadata_service import metadata_service
+from app.services.query_scheduler import QueryQueueFullError
 
 router = APIRouter(prefix="/dbs", tags=["Databases"])
 
+# Items of a streamed metadata refresh: progress frames, the end frame or the error
+_RefreshItem = MetadataStreamHeader | MetadataStreamSchema | MetadataStreamEnd | Exception
+
+
+def _frame(frame: CamelModel) -> str:
+    """Encode a stream frame as one NDJSON line."""
+    return frame.model_dump_json(by_alias=True) + "\n"
+
 
 def _parse_ssh_config_response(ssh_config_json: str | None) -> SSHConfigResponse | None:
     """Parse SSH config JSON to response model (sanitized)."""
@@ -35,6 +57,13 @@ def _parse_ssh_config_response(ssh_config_json: str | None) -> SSHConfigResponse
     )
 
 
+def _parse_cost_guard(cost_guard_json: str | None) -> CostGuardConfig | None:
+    """Parse cost guard JSON to response model."""
+    if not cost_guard_json:
+        return None
+    return CostGuardConfig.model_validate_json(cost_guard_json)
+
+
 @router.get(
     "",
     response_model=DatabaseListResponse,
@@ -52,6 +81,8 @@ async def list_databases() -> DatabaseListResponse:
             db_type=db.get("db_type", "postgresql"),
             ssl_disabled=bool(db.get("ssl_disabled", 0)),
             ssh_config=_parse_ssh_config_response(db.get("ssh_config")),
+            cache_ttl_seconds=db.get("cache_ttl_seconds"),
+            cost_guard=_parse_cost_guard(db.get("cost_guard")),
             created_at=datetime.fromisoformat(db["created_at"]),
             updated_at=datetime.fromisoformat(db["updated_at"]),
         )
@@ -85,6 +116,8 @@ async def get_database(name: str) -> DatabaseResponse:
         db_type=db.get("db_type", "postgresql"),
         ssl_disabled=bool(db.get("ssl_disabled", 0)),
         ssh_config=_parse_ssh_config_response(db.get("ssh_config")),
+        cache_ttl_seconds=db.get("cache_ttl_seconds"),
+        cost_guard=_parse_cost_guard(db.get("cost_guard")),
         created_at=datetime.fromisoformat(db["created_at"]),
         updated_at=datetime.fromisoformat(db["updated_at"]),
     )
@@ -95,6 +128,7 @@ async def get_database(name: str) -> DatabaseResponse:
     response_model=DatabaseMetadata,
     responses={
         404: {"model": ErrorResponse, "description": "Database not found"},
+        429: {"model": ErrorResponse, "description": "Too many queries queued for database"},
         503: {"model": ErrorResponse, "description": "Failed to fetch metadata"},
     },
     summary="Get database metadata (tables, columns)",
@@ -125,6 +159,11 @@ async def get_database_metadata(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         ) from e
+    except QueryQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -137,6 +176,7 @@ async def get_database_metadata(
     response_model=DatabaseMetadata,
     responses={
         404: {"model": ErrorResponse, "description": "Database not found"},
+        429: {"model": ErrorResponse, "description": "Too many queries queued for database"},
         503: {"model": ErrorResponse, "description": "Failed to refresh metadata"},
     },
     summary="Refresh database metadata",
@@ -159,6 +199,11 @@ async def refresh_database_metadata(name: str) -> DatabaseMetadata:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         ) from e
+    except QueryQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -166,11 +211,94 @@ async def refresh_database_metadata(name: str) -> DatabaseMetadata:
         ) from e
 
 
+@router.post(
+    "/{name}/metadata/refresh/stream",
+    responses={
+        200: {"description": "NDJSON stream: header, one frame per schema, then end or error"},
+        404: {"model": ErrorResponse, "description": "Database not found"},
+        429: {"model": ErrorResponse, "description": "Too many queries queued for database"},
+        503: {"model": ErrorResponse, "description": "Failed to refresh metadata"},
+    },
+    summary="Refresh database metadata with streamed progress",
+)
+async def stream_refresh_database_metadata(name: str) -> StreamingResponse:
+    """
+    Force refresh database metadata, streaming each schema as it arrives.
+
+    - Schemas are fetched concurrently over several connections (see
+      METADATA_FETCH_CONCURRENCY), so the sidebar can fill in as they arrive
+    - Frames: {"type": "header", ...}, {"type": "schema", ...} per schema,
+      then {"type": "end", ...} once the metadata is cached, or {"type": "error", ...}
+    - Errors before the header use the same status codes as /metadata/refresh
+    """
+    db = await database_manager.get_database(name)
+    if not db:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Database '{name}' not found",
+        )
+
+    frames: asyncio.Queue[_RefreshItem] = asyncio.Queue()
+
+    async def refresh() -> None:
+        try:
+            metadata = await metadata_service.refresh_metadata(name, on_progress=frames.put)
+            # refresh_metadata always sets the summary
+            assert metadata.refresh is not None
+            await frames.put(MetadataStreamEnd(refresh=metadata.refresh))
+        except Exception as e:
+            await frames.put(e)
+
+    task = asyncio.create_task(refresh())
+    # Wait for the header so connection errors still get a proper status code
+    header = await frames.get()
+    try:
+        if isinstance(header, Exception):
+            raise header
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
+    except QueryQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        ) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to refresh metadata: {e}",
+        ) from e
+
+    async def ndjson() -> AsyncIterator[str]:
+        """Serialize stream frames, one JSON document per line."""
+        try:
+            frame: _RefreshItem = header
+            while not isinstance(frame, MetadataStreamEnd):
+                if isinstance(frame, Exception):
+                    yield _frame(MetadataStreamError(detail=f"Failed to refresh metadata: {frame}"))
+                    return
+                yield _frame(frame)
+                frame = await frames.get()
+            yield _frame(frame)
+        finally:
+            # The client went away: stop fetching the remaining schemas
+            task.cancel()
+
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/{name}/metadata/tables",
     response_model=TableListResponse,
     responses={
         404: {"model": ErrorResponse, "description": "Database not found"},
+        429: {"model": ErrorResponse, "description": "Too many queries queued for database"},
         503: {"model": ErrorResponse, "description": "Failed to fetch metadata"},
     },
     summary="Get table list (without column details)",
@@ -201,6 +329,11 @@ async def get_table_list(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         ) from e
+    except QueryQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -213,6 +346,7 @@ async def get_table_list(
     response_model=TableMetadata,
     responses={
         404: {"model": ErrorResponse, "description": "Database or table not found"},
+        429: {"model": ErrorResponse, "description": "Too many queries queued for database"},
         503: {"model": ErrorResponse, "description": "Failed to fetch table details"},
     },
     summary="Get table details with columns",
@@ -249,6 +383,11 @@ async def get_table_details(
         return table_details
     except HTTPException:
         raise
+    except QueryQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -278,7 +417,12 @@ async def create_or_update_database(
     """
     try:
         db = await database_manager.create_or_update_database(
-            name, request.url, request.ssl_disabled, request.ssh_config
+            name,
+            request.url,
+            request.ssl_disabled,
+            request.ssh_config,
+            cache_ttl_seconds=request.cache_ttl_seconds,
+            cost_guard_config=request.cost_guard,
         )
 
         return DatabaseResponse(
@@ -287,6 +431,8 @@ async def create_or_update_database(
             db_type=db.get("db_type", "postgresql"),
             ssl_disabled=bool(db.get("ssl_disabled", 0)),
             ssh_config=_parse_ssh_config_response(db.get("ssh_config")),
+            cache_ttl_seconds=db.get("cache_ttl_seconds"),
+            cost_guard=_parse_cost_guard(db.get("cost_guard")),
             created_at=datetime.fromisoformat(db["created_at"]),
             updated_at=datetime.fromisoformat(db["updated_at"]),
         )
@@ -8,8 +8,11 @@ from app.models.history import (
     QueryHistoryItem,
     QueryHistoryListResponse,
     QueryHistorySearchResponse,
+    QueryStatsItem,
+    TopQueriesResponse,
 )
 from app.services.history_service import history_service
+from app.services.query_stats import QueryStatsSort, query_stats_service
 
 router = APIRouter(prefix="/dbs", tags=["History"])
 
@@ -94,3 +97,33 @@ async def search_history(
         total=total,
     )
 
+
+@router.get(
+    "/{name}/top-queries",
+    response_model=TopQueriesResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Database not found"},
+    },
+    summary="List most expensive query shapes",
+)
+async def top_queries(
+    name: str,
+    sort: QueryStatsSort = Query(
+        default="total_time",
+        description="Ranking: total_time, mean_time, max_time, count or rows",
+    ),
+    limit: int = Query(default=20, ge=1, le=100, description="Number of shapes to return"),
+) -> TopQueriesResponse:
+    """
+    List query shapes by cost, to find what to optimize.
+
+    - Executions recorded in history are grouped by fingerprint: the SQL with
+      literals replaced by `?`, ignoring formatting and comments
+    - Each shape reports executions, total/mean/max/p50/p95 time and rows
+    - Sort by total_time to find the biggest overall load, by mean_time or
+      max_time to find the slowest shapes
+    """
+    await _verify_database_exists(name)
+
+    items = await query_stats_service.top_queries(db_name=name, sort=sort, limit=limit)
+    return TopQueriesResponse(items=[QueryStatsItem(**item) for item in items])
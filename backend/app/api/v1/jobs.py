@@ -0,0 +1,119 @@
+"""Asynchronous query job API endpoints."""
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.models.error import ErrorResponse, SQLErrorResponse
+from app.models.job import JobCreateRequest, JobResponse, JobResultResponse
+from app.models.query import RowFormat
+from app.services.job_service import JobStateError, job_service
+
+router = APIRouter(tags=["Jobs"])
+
+
+@router.post(
+    "/dbs/{name}/jobs",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        400: {
+            "model": SQLErrorResponse,
+            "description": "SQL syntax error or non-SELECT statement",
+        },
+    },
+    summary="Submit query job",
+)
+async def submit_job(name: str, request: JobCreateRequest) -> JobResponse:
+    """
+    Submit a SQL SELECT query to run in the background.
+
+    - Returns immediately with the job ID; poll GET /jobs/{id} for progress
+    - Rows are written to disk as they arrive and can be read before the job finishes
+    - LIMIT is added only above the job row cap, not the interactive 1000
+    - Finished jobs and their results are kept for a limited time
+    """
+    try:
+        return await job_service.submit(
+            name, request.sql, request.timeout_seconds, request.natural_query
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Job not found or expired"},
+    },
+    summary="Get query job",
+)
+async def get_job(job_id: str) -> JobResponse:
+    """Get a job's status and the number of rows fetched so far."""
+    job = job_service.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found",
+        )
+    return job
+
+
+@router.get(
+    "/jobs/{job_id}/result",
+    response_model=JobResultResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Job not found or expired"},
+        409: {"model": ErrorResponse, "description": "Job is queued, failed or cancelled"},
+    },
+    summary="Get query job result",
+)
+async def get_job_result(
+    job_id: str,
+    offset: int = Query(default=0, ge=0, description="Index of the first row to return"),
+    limit: int = Query(default=1000, ge=1, le=10000, description="Number of rows to return"),
+    row_format: RowFormat = Query(
+        default="objects", alias="rowFormat", description="Encoding of rows"
+    ),
+) -> JobResultResponse:
+    """
+    Get a window of a job's result rows.
+
+    Available while the job is running (rows fetched so far) and once it has
+    succeeded.
+    """
+    try:
+        result = await job_service.get_result(job_id, offset, limit, row_format)
+    except JobStateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        ) from e
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found",
+        )
+    return result
+
+
+@router.delete(
+    "/jobs/{job_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        404: {"model": ErrorResponse, "description": "Job not found or expired"},
+    },
+    summary="Cancel and delete query job",
+)
+async def delete_job(job_id: str) -> None:
+    """Cancel a queued or running job (and its statement) and delete its result."""
+    deleted = await job_service.delete(job_id)
+
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found",
+        )
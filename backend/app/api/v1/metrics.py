@@ -0,0 +1,95 @@
+"""Runtime metrics API endpoints."""
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.connectors.executors import executor_manager
+from app.connectors.pool import pool_manager
+from app.models.error import ErrorResponse
+from app.models.metrics import (
+    ExecutorStats,
+    ExecutorStatsResponse,
+    ParseCacheStats,
+    PoolStats,
+    PoolStatsResponse,
+    QueryCacheStats,
+    SchedulerStats,
+    SchedulerStatsResponse,
+)
+from app.services.parse_cache import parse_cache
+from app.services.query_scheduler import query_scheduler
+from app.services.result_cache import query_cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get(
+    "/pools",
+    response_model=PoolStatsResponse,
+    summary="Get connection pool stats for all databases",
+)
+async def list_pool_stats() -> PoolStatsResponse:
+    """Get connection pool occupancy and counters for every pooled database."""
+    return PoolStatsResponse(pools=[PoolStats(**stats) for stats in pool_manager.stats()])
+
+
+@router.get(
+    "/pools/{name}",
+    response_model=PoolStats,
+    responses={
+        404: {"model": ErrorResponse, "description": "No pool for this database"},
+    },
+    summary="Get connection pool stats for a database",
+)
+async def get_pool_stats(name: str) -> PoolStats:
+    """Get connection pool stats for one database (created on first use)."""
+    stats = pool_manager.get_stats(name)
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No connection pool for database '{name}'",
+        )
+    return PoolStats(**stats)
+
+
+@router.get(
+    "/query-cache",
+    response_model=QueryCacheStats,
+    summary="Get query result cache stats",
+)
+async def get_query_cache_stats() -> QueryCacheStats:
+    """Get query result cache occupancy and hit/miss counters."""
+    return QueryCacheStats(**query_cache.stats())
+
+
+@router.get(
+    "/parse-cache",
+    response_model=ParseCacheStats,
+    summary="Get SQL parse cache stats",
+)
+async def get_parse_cache_stats() -> ParseCacheStats:
+    """Get SQL parse cache occupancy and hit rate."""
+    return ParseCacheStats(**parse_cache.stats())
+
+
+@router.get(
+    "/scheduler",
+    response_model=SchedulerStatsResponse,
+    summary="Get query admission stats for all databases",
+)
+async def get_scheduler_stats() -> SchedulerStatsResponse:
+    """Get running queries, queue depth per lane and wait times for every database."""
+    return SchedulerStatsResponse(
+        databases=[SchedulerStats(**stats) for stats in query_scheduler.stats()]
+    )
+
+
+@router.get(
+    "/executors",
+    response_model=ExecutorStatsResponse,
+    summary="Get connector thread pool stats",
+)
+async def get_executor_stats() -> ExecutorStatsResponse:
+    """Get occupancy of the thread pools running blocking driver calls."""
+    return ExecutorStatsResponse(
+        executors=[ExecutorStats(**stats) for stats in executor_manager.stats()]
+    )
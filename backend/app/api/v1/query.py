@@ -2,27 +2,133 @@
 
 import asyncio
 import logging
+import re
+import time
+from collections.abc import AsyncGenerator, Awaitable
+from contextlib import suppress
+from datetime import datetime
+from urllib.parse import quote
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 
+from app.config import settings
+from app.models.base import CamelModel
 from app.models.error import ErrorResponse, SQLErrorResponse
 from app.models.query import (
+    ExplainRequest,
+    ExplainResponse,
     FormatRequest,
     FormatResponse,
     NaturalQueryRequest,
     NaturalQueryResponse,
+    QueryExportRequest,
     QueryRequest,
     QueryResponse,
     QueryResult,
+    QueryStreamEnd,
+    QueryStreamError,
+    QueryStreamHeader,
+    QueryStreamRows,
 )
+from app.services import arrow_encoder, export_encoder
+from app.services.arrow_encoder import ARROW_STREAM_MEDIA_TYPE, ArrowStreamEncoder
+from app.services.explain_service import explain_service
 from app.services.history_service import history_service
 from app.services.llm_service import llm_service
+from app.services.query_scheduler import QueryQueueFullError
 from app.services.query_service import query_service
+from app.services.result_store import result_store
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/dbs", tags=["Query"])
 
+# How often a running query checks whether the client is still connected
+DISCONNECT_POLL_INTERVAL = 0.5
+
+# Non-standard status (nginx) for requests abandoned by the client
+HTTP_499_CLIENT_CLOSED_REQUEST = 499
+
+
+async def run_until_disconnected[T](http_request: Request, awaitable: Awaitable[T]) -> T:
+    """Await a query, cancelling it if the client disconnects first.
+
+    Cancelling the query task also cancels the statement on the database
+    server, so abandoned requests stop consuming database resources.
+
+    Raises:
+        HTTPException: 499 if the client went away before the query finished
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                logger.info("Client disconnected, cancelling query")
+                task.cancel()
+                with suppress(asyncio.CancelledError, Exception):
+                    await task
+                raise HTTPException(
+                    status_code=HTTP_499_CLIENT_CLOSED_REQUEST,
+                    detail="Client closed request",
+                )
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def _store_query(
+    name: str, request: QueryRequest, http_request: Request
+) -> QueryResponse:
+    """Execute a query with store=true: write the result to disk, return its first page."""
+    if not arrow_encoder.is_available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=(
+                "Stored results require the pyarrow package "
+                "(install with: pip install 'tablechat-backend[arrow]')"
+            ),
+        )
+
+    stored, execution_time_ms, cost_warning = await run_until_disconnected(
+        http_request,
+        query_service.store_validated_query(name, request.sql, request.timeout_seconds),
+    )
+    page = result_store.read(
+        stored.result_id, 0, settings.result_store_first_page_rows, request.row_format
+    )
+    if page is None:
+        raise RuntimeError("Stored result was deleted before it could be read")
+
+    try:
+        await history_service.create_history(
+            db_name=name,
+            sql_content=stored.sql,
+            row_count=stored.total_rows,
+            execution_time_ms=execution_time_ms,
+            natural_query=request.natural_query,
+        )
+    except Exception as history_error:
+        logger.warning(f"Failed to record query history: {history_error}")
+
+    return QueryResponse(
+        sql=stored.sql,
+        result=QueryResult(
+            columns=page.columns,
+            rows=page.rows,
+            row_count=page.row_count,
+            truncated=stored.truncated,
+            row_format=request.row_format,
+            total_rows=stored.total_rows,
+        ),
+        execution_time_ms=execution_time_ms,
+        result_id=stored.result_id,
+        cost_warning=cost_warning,
+    )
+
 
 @router.post(
     "/{name}/query",
@@ -34,11 +140,14 @@ router = APIRouter(prefix="/dbs", tags=["Query"])
         },
         404: {"model": ErrorResponse, "description": "Database not found"},
         408: {"model": ErrorResponse, "description": "Query execution timeout"},
+        429: {"model": ErrorResponse, "description": "Too many queries queued for database"},
         503: {"model": ErrorResponse, "description": "Query execution failed"},
     },
     summary="Execute SQL query",
 )
-async def execute_query(name: str, request: QueryRequest) -> QueryResponse:
+async def execute_query(
+    name: str, request: QueryRequest, http_request: Request
+) -> QueryResponse:
     """
     Execute SQL SELECT query against a database with configurable timeout.
 
@@ -47,12 +156,38 @@ async def execute_query(name: str, request: QueryRequest) -> QueryResponse:
     - Returns query results as JSON
     - Records execution in query history
     - Query timeout configurable (10-300 seconds, default: 30)
+    - Timeouts and client disconnects cancel the statement on the server
+    - rowFormat "arrays" returns each row as a list in column order
+    - Results are cached per connection TTL; cache=false bypasses the cache
+      and cached=true marks a cached response
+    - store=true writes the full result to disk (LIMIT 1000000 if none) and
+      returns its first rows, totalRows and a resultId for GET /results/{id}/rows;
+      stored results are never served from the cache
+    - With a cost guard configured, the plan's estimates are checked first:
+      queries above the connection's limits fail with 400 (reject) or run
+      and carry costWarning (warn)
     """
     try:
-        final_sql, columns, rows, execution_time_ms, truncated = (
-            await query_service.execute_validated_query(
-                name, request.sql, request.timeout_seconds
-            )
+        if request.store:
+            return await _store_query(name, request, http_request)
+
+        (
+            final_sql,
+            columns,
+            rows,
+            execution_time_ms,
+            truncated,
+            cached,
+            cost_warning,
+        ) = await run_until_disconnected(
+            http_request,
+            query_service.execute_validated_query(
+                name,
+                request.sql,
+                request.timeout_seconds,
+                request.row_format,
+                use_cache=request.cache,
+            ),
         )
 
         # Record query history (fire and forget, don't block response)
@@ -75,10 +210,16 @@ async def execute_query(name: str, request: QueryRequest) -> QueryResponse:
                 rows=rows,
                 row_count=len(rows),
                 truncated=truncated,
+                row_format=request.row_format,
             ),
             execution_time_ms=execution_time_ms,
+            cached=cached,
+            cost_warning=cost_warning,
         )
 
+    except HTTPException:
+        raise
+
     except ValueError as e:
         # SQL validation or parsing errors
         error_msg = str(e)
@@ -95,6 +236,13 @@ async def execute_query(name: str, request: QueryRequest) -> QueryResponse:
             detail=error_msg,
         ) from e
 
+    except QueryQueueFullError as e:
+        # Too many queries already waiting for this database
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        ) from e
+
     except Exception as e:
         # Database connection or execution errors
         raise HTTPException(
@@ -103,6 +251,431 @@ async def execute_query(name: str, request: QueryRequest) -> QueryResponse:
         ) from e
 
 
+@router.post(
+    "/{name}/query/stream",
+    responses={
+        200: {"description": "NDJSON stream: header, row batches, then end or error"},
+        400: {
+            "model": SQLErrorResponse,
+            "description": "SQL syntax error or non-SELECT statement",
+        },
+        408: {"model": ErrorResponse, "description": "Query execution timeout"},
+        429: {"model": ErrorResponse, "description": "Too many queries queued for database"},
+        503: {"model": ErrorResponse, "description": "Query execution failed"},
+    },
+    summary="Execute SQL query with streamed results",
+)
+async def stream_query(name: str, request: QueryRequest) -> StreamingResponse:
+    """
+    Execute SQL SELECT query and stream the results as NDJSON.
+
+    - Rows are read from a server-side cursor in batches, so memory stays
+      bounded and the first rows arrive before the query finishes
+    - Frames: {"type": "header", ...}, {"type": "rows", ...}*, then
+      {"type": "end", ...} or {"type": "error", ...}
+    - LIMIT is automatically added if no LIMIT clause exists (default 100000)
+    - Errors before the first batch use the same status codes as /query
+    """
+    start_time = time.time()
+    try:
+        final_sql, truncated, batches, cost_warning = await query_service.stream_validated_query(
+            name, request.sql, request.timeout_seconds, request.row_format
+        )
+        # Fetch the first batch up front so connection and SQL errors still
+        # get a proper status code
+        columns, first_rows = await anext(batches)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_408_REQUEST_TIMEOUT,
+            detail=str(e),
+        ) from e
+
+    except QueryQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        ) from e
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Query execution failed: {e}",
+        ) from e
+
+    async def ndjson() -> AsyncGenerator[str]:
+        """Serialize stream frames, one JSON document per line."""
+        row_count = len(first_rows)
+        try:
+            yield _frame(
+                QueryStreamHeader(
+                    sql=final_sql,
+                    columns=columns,
+                    truncated=truncated,
+                    row_format=request.row_format,
+                    cost_warning=cost_warning,
+                )
+            )
+            if first_rows:
+                yield _frame(QueryStreamRows(rows=first_rows))
+
+            async for _, rows in batches:
+                row_count += len(rows)
+                yield _frame(QueryStreamRows(rows=rows))
+
+        except Exception as e:
+            logger.warning(f"Streamed query failed after {row_count} rows: {e}")
+            yield _frame(QueryStreamError(detail=f"Query execution failed: {e}"))
+            return
+
+        finally:
+            await batches.aclose()
+
+        execution_time_ms = int((time.time() - start_time) * 1000)
+        yield _frame(QueryStreamEnd(row_count=row_count, execution_time_ms=execution_time_ms))
+
+        try:
+            await history_service.create_history(
+                db_name=name,
+                sql_content=final_sql,
+                row_count=row_count,
+                execution_time_ms=execution_time_ms,
+                natural_query=request.natural_query,
+            )
+        except Exception as history_error:
+            logger.warning(f"Failed to record query history: {history_error}")
+
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/{name}/query/arrow",
+    responses={
+        200: {
+            "content": {ARROW_STREAM_MEDIA_TYPE: {}},
+            "description": "Arrow IPC stream of typed record batches",
+        },
+        400: {
+            "model": SQLErrorResponse,
+            "description": "SQL syntax error or non-SELECT statement",
+        },
+        408: {"model": ErrorResponse, "description": "Query execution timeout"},
+        429: {"model": ErrorResponse, "description": "Too many queries queued for database"},
+        503: {"model": ErrorResponse, "description": "Query execution failed"},
+    },
+    summary="Execute SQL query with Arrow IPC results",
+)
+async def arrow_query(name: str, request: QueryRequest) -> StreamingResponse:
+    """
+    Execute SQL SELECT query and stream the results in Arrow IPC stream format.
+
+    - Each server-side cursor batch becomes one Arrow record batch
+    - Column types come from the driver's result description; decimals and
+      types without an Arrow equivalent (json, uuid, ...) are strings
+    - Schema metadata carries the executed "sql" and "truncated" flag, plus
+      "cost_warning" when the cost guard found the query likely expensive
+    - LIMIT is automatically added if no LIMIT clause exists (default 100000)
+    - Errors before the first batch use the same status codes as /query; a
+      later failure ends the response without the end-of-stream marker
+    """
+    if not arrow_encoder.is_available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=(
+                "Arrow output requires the pyarrow package "
+                "(install with: pip install 'tablechat-backend[arrow]')"
+            ),
+        )
+
+    start_time = time.time()
+    try:
+        final_sql, truncated, batches, cost_warning = await query_service.stream_validated_batches(
+            name, request.sql, request.timeout_seconds
+        )
+        first = await anext(batches)
+        metadata = {"sql": final_sql, "truncated": str(truncated).lower()}
+        if cost_warning:
+            metadata["cost_warning"] = cost_warning
+        encoder = ArrowStreamEncoder(first.columns, first.column_types, metadata=metadata)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_408_REQUEST_TIMEOUT,
+            detail=str(e),
+        ) from e
+
+    except QueryQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        ) from e
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Query execution failed: {e}",
+        ) from e
+
+    async def ipc() -> AsyncGenerator[bytes]:
+        """Write the schema, one record batch per fetched batch, then end-of-stream."""
+        row_count = len(first.rows)
+        try:
+            yield encoder.begin()
+            yield encoder.write(first.rows)
+
+            async for batch in batches:
+                row_count += len(batch.rows)
+                yield encoder.write(batch.rows)
+
+        except Exception as e:
+            # The IPC stream has no error frame; a missing end-of-stream
+            # marker tells the reader the result is incomplete
+            logger.warning(f"Arrow query failed after {row_count} rows: {e}")
+            return
+
+        finally:
+            await batches.aclose()
+
+        yield encoder.finish()
+
+        execution_time_ms = int((time.time() - start_time) * 1000)
+        try:
+            await history_service.create_history(
+                db_name=name,
+                sql_content=final_sql,
+                row_count=row_count,
+                execution_time_ms=execution_time_ms,
+                natural_query=request.natural_query,
+            )
+        except Exception as history_error:
+            logger.warning(f"Failed to record query history: {history_error}")
+
+    return StreamingResponse(
+        ipc(),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _export_filename(db_name: str, extension: str) -> str:
+    """{dbName}_{yyyyMMdd_HHmmss}.{ext}, like the browser export."""
+    sanitized = re.sub(r'[/\\:*?"<>|\s]', "_", db_name)
+    return f"{sanitized}_{datetime.now():%Y%m%d_%H%M%S}.{extension}"
+
+
+@router.post(
+    "/{name}/query/export",
+    responses={
+        200: {
+            "content": {
+                encoder.media_type: {} for encoder in export_encoder.ENCODERS.values()
+            },
+            "description": "Export file, streamed as it is written",
+        },
+        400: {
+            "model": SQLErrorResponse,
+            "description": "SQL syntax error or non-SELECT statement",
+        },
+        408: {"model": ErrorResponse, "description": "Query execution timeout"},
+        429: {"model": ErrorResponse, "description": "Too many queries queued for database"},
+        503: {"model": ErrorResponse, "description": "Query execution failed"},
+    },
+    summary="Export SQL query result as a file",
+)
+async def export_query(name: str, request: QueryExportRequest) -> StreamingResponse:
+    """
+    Execute SQL SELECT query and stream the result as a file download.
+
+    - Formats: csv, json, ndjson, xlsx and parquet (parquet requires pyarrow)
+    - Rows are fetched with a server-side cursor and written to the response
+      batch by batch, so memory use does not depend on the result size
+    - LIMIT is automatically added if no LIMIT clause exists (default
+      10000000; xlsx stops at the 1048575 data rows a sheet can hold)
+    - Exports wait for an execution slot behind interactive and agent queries
+    - A cost guard warning is returned in the X-Cost-Warning header
+    - Errors before the first batch use the same status codes as /query; a
+      later failure aborts the download
+    """
+    encoder_class = export_encoder.ENCODERS[request.format]
+    if request.format == "parquet" and not arrow_encoder.is_available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=(
+                "Parquet export requires the pyarrow package "
+                "(install with: pip install 'tablechat-backend[arrow]')"
+            ),
+        )
+
+    max_rows = settings.query_export_max_rows
+    if request.format == "xlsx":
+        max_rows = min(max_rows, export_encoder.XLSX_MAX_ROWS)
+
+    start_time = time.time()
+    try:
+        final_sql, _, batches, cost_warning = await query_service.stream_validated_batches(
+            name, request.sql, request.timeout_seconds, max_rows=max_rows, lane="job"
+        )
+        first = await anext(batches)
+        encoder = encoder_class(first.columns, first.column_types)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_408_REQUEST_TIMEOUT,
+            detail=str(e),
+        ) from e
+
+    except QueryQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        ) from e
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Query execution failed: {e}",
+        ) from e
+
+    async def file() -> AsyncGenerator[bytes]:
+        """Write the file's header, one chunk per fetched batch, then its trailer."""
+        row_count = len(first.rows)
+        try:
+            yield encoder.begin()
+            yield encoder.write(first.rows)
+
+            async for batch in batches:
+                row_count += len(batch.rows)
+                yield encoder.write(batch.rows)
+
+            yield encoder.finish()
+
+        except Exception as e:
+            # Headers are already sent; failing the response makes the
+            # client discard the download instead of keeping a partial file
+            logger.warning(f"Export failed after {row_count} rows: {e}")
+            raise
+
+        finally:
+            await batches.aclose()
+
+        execution_time_ms = int((time.time() - start_time) * 1000)
+        try:
+            await history_service.create_history(
+                db_name=name,
+                sql_content=final_sql,
+                row_count=row_count,
+                execution_time_ms=execution_time_ms,
+                natural_query=request.natural_query,
+            )
+        except Exception as history_error:
+            logger.warning(f"Failed to record query history: {history_error}")
+
+    filename = _export_filename(name, encoder.extension)
+    headers = {
+        "Content-Disposition": (
+            f"attachment; filename=\"{filename.encode('ascii', 'replace').decode()}\"; "
+            f"filename*=UTF-8''{quote(filename)}"
+        ),
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    }
+    if cost_warning:
+        headers["X-Cost-Warning"] = cost_warning
+    return StreamingResponse(file(), media_type=encoder.media_type, headers=headers)
+
+
+@router.post(
+    "/{name}/explain",
+    response_model=ExplainResponse,
+    responses={
+        400: {
+            "model": SQLErrorResponse,
+            "description": "SQL syntax error, non-SELECT statement or ANALYZE on MySQL",
+        },
+        404: {"model": ErrorResponse, "description": "Database not found"},
+        408: {"model": ErrorResponse, "description": "EXPLAIN timeout"},
+        429: {"model": ErrorResponse, "description": "Too many queries queued for database"},
+        503: {"model": ErrorResponse, "description": "EXPLAIN failed"},
+    },
+    summary="Analyze query plan",
+)
+async def explain_query(
+    name: str, request: ExplainRequest, http_request: Request
+) -> ExplainResponse:
+    """
+    Explain a SELECT query and point out likely performance problems.
+
+    - Returns the plan as a tree normalized across PostgreSQL and MySQL,
+      plus the raw JSON plan
+    - analyze=true runs EXPLAIN ANALYZE (PostgreSQL only) for actual rows
+      and timings; the statement runs in a transaction that is rolled back
+    - Findings: hot nodes, row misestimates (ANALYZE), full scans of large
+      tables and missing-index candidates, sized with cached metadata
+    - No LIMIT is added, and nothing is recorded in query history
+    """
+    try:
+        return await run_until_disconnected(
+            http_request,
+            explain_service.explain(
+                name, request.sql, request.analyze, request.timeout_seconds
+            ),
+        )
+
+    except HTTPException:
+        raise
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_408_REQUEST_TIMEOUT,
+            detail=str(e),
+        ) from e
+
+    except QueryQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        ) from e
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"EXPLAIN failed: {e}",
+        ) from e
+
+
+def _frame(frame: CamelModel) -> str:
+    """Encode a stream frame as one NDJSON line."""
+    return frame.model_dump_json(by_alias=True) + "\n"
+
+
 @router.post(
     "/{name}/query/natural",
     response_model=NaturalQueryResponse,
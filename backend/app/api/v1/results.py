@@ -0,0 +1,108 @@
+"""Stored query result API endpoints."""
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.models.error import ErrorResponse
+from app.models.query import RowFormat
+from app.models.result import ResultViewRequest, StoredResultResponse, StoredRowsResponse
+from app.services.result_store import result_store
+
+router = APIRouter(prefix="/results", tags=["Results"])
+
+
+def _not_found(result_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Result '{result_id}' not found",
+    )
+
+
+@router.get(
+    "/{result_id}",
+    response_model=StoredResultResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Result not found or expired"},
+    },
+    summary="Get stored result",
+)
+async def get_result(result_id: str) -> StoredResultResponse:
+    """Get the columns, row count and SQL of a result stored with store=true."""
+    stored = result_store.get(result_id)
+    if stored is None:
+        raise _not_found(result_id)
+    return stored
+
+
+@router.get(
+    "/{result_id}/rows",
+    response_model=StoredRowsResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Result not found or expired"},
+    },
+    summary="Get stored result rows",
+)
+async def get_result_rows(
+    result_id: str,
+    offset: int = Query(default=0, ge=0, description="Index of the first row to return"),
+    limit: int = Query(default=1000, ge=1, le=10000, description="Number of rows to return"),
+    row_format: RowFormat = Query(
+        default="objects", alias="rowFormat", description="Encoding of rows"
+    ),
+) -> StoredRowsResponse:
+    """
+    Get rows [offset, offset + limit) of a stored result.
+
+    Only the requested window is read from the memory-mapped result file,
+    so grids can virtual-scroll results of any size. Reading a result keeps
+    it from expiring.
+    """
+    rows = result_store.read(result_id, offset, limit, row_format)
+    if rows is None:
+        raise _not_found(result_id)
+    return rows
+
+
+@router.post(
+    "/{result_id}/view",
+    response_model=StoredRowsResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Unknown column or unsupported operation"},
+        404: {"model": ErrorResponse, "description": "Result not found or expired"},
+    },
+    summary="Filter, group and sort stored result",
+)
+async def view_result(result_id: str, request: ResultViewRequest) -> StoredRowsResponse:
+    """
+    Get a window of a filtered, grouped and sorted view of a stored result.
+
+    - Runs locally on the stored file; the source database is not queried
+    - Filters (all must match) apply first, then groupBy/aggregates, then sort
+    - Without groupBy, aggregates reduce the whole result to one row
+    - sort + limit gives top-N; totalRows counts the rows of the whole view
+    - Decimal columns are compared, sorted and aggregated as floating point
+    """
+    try:
+        rows = await result_store.view(result_id, request)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+    if rows is None:
+        raise _not_found(result_id)
+    return rows
+
+
+@router.delete(
+    "/{result_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        404: {"model": ErrorResponse, "description": "Result not found or expired"},
+    },
+    summary="Delete stored result",
+)
+async def delete_result(result_id: str) -> None:
+    """Delete a stored result and its file."""
+    if not result_store.delete(result_id):
+        raise _not_found(result_id)
@@ -78,6 +78,131 @@ class Settings(BaseSettings):
     # MySQL Connection Timeout (seconds)
     mysql_connect_timeout: int = 10
 
+    # ==========================================================================
+    # Connection Pool Configuration (per registered database)
+    # ==========================================================================
+
+    pool_min_size: int = 1
+    pool_max_size: int = 5
+    pool_idle_timeout: int = 300  # seconds before surplus idle connections are closed
+    pool_acquire_timeout: int = 30  # seconds to wait for a free connection
+    # Connections idle at least this long are pinged before reuse (0 = always)
+    pool_health_check_interval: int = 5
+
+    # ==========================================================================
+    # Connector Thread Pools (blocking drivers: psycopg2, mysql-connector)
+    # ==========================================================================
+
+    # Worker threads per registered database; keep above pool_max_size
+    executor_workers_per_database: int = 8
+    # Worker threads per connector type for unregistered URLs (connection tests)
+    executor_shared_workers: int = 4
+    # Worker threads for statement cancellation (KILL QUERY)
+    executor_control_workers: int = 2
+
+    # ==========================================================================
+    # Streaming Query Configuration
+    # ==========================================================================
+
+    # Rows fetched from the server-side cursor per chunk
+    query_stream_batch_size: int = 500
+    # LIMIT auto-added to streamed queries without one
+    query_stream_max_rows: int = 100_000
+    # LIMIT auto-added to exported queries without one (XLSX stops at a sheet's rows)
+    query_export_max_rows: int = 10_000_000
+
+    # ==========================================================================
+    # Query Result Cache Configuration
+    # ==========================================================================
+
+    # Default TTL of cached results; connections can override it (0 = disabled)
+    query_cache_ttl_seconds: int = 60
+    # Memory budget shared by all cached results; least recently used are evicted
+    query_cache_max_bytes: int = 64 * 1024 * 1024
+    # Parsed SQL statements kept for reuse; least recently used are evicted (0 = disabled)
+    parse_cache_max_entries: int = 2048
+
+    # ==========================================================================
+    # Query Scheduler Configuration (per registered database)
+    # ==========================================================================
+
+    # Statements running at once; keep at or below pool_max_size
+    query_max_concurrency: int = 5
+    # Queries waiting for a slot before new ones are rejected with 429
+    query_max_queue: int = 100
+    # Waiters queued this long are admitted next regardless of their lane
+    query_queue_starvation_seconds: int = 10
+
+    # ==========================================================================
+    # Query Cost Guard Configuration (EXPLAIN before running; connections can override)
+    # ==========================================================================
+
+    # "off", "warn" (run and return a warning) or "reject" (400 before running)
+    cost_guard_mode: Literal["off", "warn", "reject"] = "off"
+    # Highest planner cost allowed (PostgreSQL Total Cost, MySQL query_cost; 0 = not checked)
+    cost_guard_max_cost: float = 0
+    # Largest estimated table scan allowed, in rows (0 = not checked)
+    cost_guard_max_rows: int = 0
+    # Agent queries get these limits scaled by this factor unless set per connection
+    cost_guard_agent_factor: float = 0.1
+    # Estimates are reused for queries with the same fingerprint for this long
+    cost_guard_estimate_ttl_seconds: int = 300
+    # EXPLAIN taking longer than this is abandoned and the query runs unchecked
+    cost_guard_timeout_seconds: int = 5
+
+    # ==========================================================================
+    # Query Plan Analysis Configuration (POST /dbs/{name}/explain)
+    # ==========================================================================
+
+    # Full scans of tables with at least this many rows are reported
+    explain_large_table_rows: int = 100_000
+    # Actual rows this many times above or below the estimate count as a misestimate
+    explain_misestimate_factor: float = 10
+    # Nodes taking at least this share of the plan's time (or cost) are hot
+    explain_hot_node_share: float = 0.2
+
+    # ==========================================================================
+    # Metadata Refresh Configuration
+    # ==========================================================================
+
+    # Only fetch tables whose definition fingerprint changed since the last refresh
+    metadata_incremental_refresh: bool = True
+    # Schemas fetched at once, each on its own connection (1 = one query for all);
+    # keep at or below pool_max_size
+    metadata_fetch_concurrency: int = 4
+    # First load lists only schemas and tables; columns are fetched per table on first access
+    metadata_lazy_loading: bool = False
+
+    # ==========================================================================
+    # Query Job Configuration
+    # ==========================================================================
+
+    # Jobs running at once across all databases; further jobs stay queued
+    job_max_running: int = 2
+    # LIMIT auto-added to job queries without one
+    job_max_rows: int = 10_000_000
+    # Directory for job result files (emptied at startup)
+    job_results_dir: Path = Path("./job_results")
+    # Finished jobs and their results are deleted after this long
+    job_retention_seconds: int = 3600
+    # How often expired jobs are looked for and deleted
+    job_sweep_interval_seconds: int = 60
+
+    # ==========================================================================
+    # Stored Result Configuration (query results materialized to disk)
+    # ==========================================================================
+
+    # Directory for stored result files (emptied at startup)
+    result_store_dir: Path = Path("./result_store")
+    # LIMIT auto-added to stored queries without one
+    result_store_max_rows: int = 1_000_000
+    # Disk budget shared by all stored results; least recently read are deleted
+    result_store_max_bytes: int = 2 * 1024 * 1024 * 1024
+    # Stored results not read for this long are deleted
+    result_store_idle_seconds: int = 1800
+    # Rows returned inline by /query when it stores the result
+    result_store_first_page_rows: int = 1000
+
     # ==========================================================================
     # Server Configuration
     # ==========================================================================
@@ -6,9 +6,13 @@ Provides a unified interface for different database types.
 from app.connectors.base import DatabaseConnector
 from app.connectors.factory import ConnectorFactory
 from app.connectors.mysql import MySQLConnector
+from app.connectors.mysql_async import AIOMySQLConnector
 from app.connectors.postgres import PostgreSQLConnector
+from app.connectors.postgres_async import AsyncPGConnector
 
 __all__ = [
+    "AIOMySQLConnector",
+    "AsyncPGConnector",
     "DatabaseConnector",
     "ConnectorFactory",
     "MySQLConnector",
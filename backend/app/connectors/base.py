@@ -1,9 +1,38 @@
 """Abstract base class for database connectors."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import AsyncGenerator, Collection, Sequence
+from typing import Any, NamedTuple, cast
 
+from app.connectors.converters import ColumnType, RowEncoder, build_row_encoder
 from app.models.metadata import TableMetadata
+from app.models.query import RowFormat
+
+# Result rows: dicts keyed by column name ("objects") or positional lists ("arrays")
+Rows = list[dict[str, Any]] | list[list[Any]]
+
+
+class ResultBatch(NamedTuple):
+    """A batch of raw driver rows plus the result's column description."""
+
+    columns: list[str]
+    # None when the connector cannot describe its result columns
+    column_types: list[ColumnType] | None
+    # Positional driver values, not yet serialized
+    rows: Sequence[Sequence[Any]]
+
+
+# (schema_name, table_name)
+TableKey = tuple[str, str]
+
+
+class TableVersion(NamedTuple):
+    """Definition fingerprint and size statistics of a table."""
+
+    # Changes whenever the table's cached metadata (columns, keys, comments) would
+    fingerprint: str
+    row_count: int | None
+    size_bytes: int | None
 
 
 class DatabaseConnector(ABC):
@@ -16,7 +45,12 @@ class DatabaseConnector(ABC):
 
     @abstractmethod
     async def test_connection(
-        self, url: str, timeout: int, tunnel_endpoint: tuple[str, int] | None = None
+        self,
+        url: str,
+        timeout: int,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
     ) -> None:
         """Test database connection.
 
@@ -24,6 +58,8 @@ class DatabaseConnector(ABC):
             url: Database connection URL
             timeout: Connection timeout in seconds
             tunnel_endpoint: Optional (host, port) tuple if using SSH tunnel
+            db_name: Registered database name; when given, the check borrows
+                from (and warms) that database's connection pool
 
         Raises:
             ConnectionError: If connection fails
@@ -33,13 +69,20 @@ class DatabaseConnector(ABC):
 
     @abstractmethod
     async def fetch_metadata(
-        self, url: str, tunnel_endpoint: tuple[str, int] | None = None
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        tables: Collection[TableKey] | None = None,
     ) -> tuple[list[str], list[TableMetadata]]:
         """Fetch database metadata (schemas, tables, columns).
 
         Args:
             url: Database connection URL
             tunnel_endpoint: Optional (host, port) tuple if using SSH tunnel
+            db_name: Registered database name, used to select a pooled connection
+            tables: Only fetch these (schema, table) pairs; all tables if None
 
         Returns:
             Tuple of (schemas, tables)
@@ -49,22 +92,223 @@ class DatabaseConnector(ABC):
         """
         pass
 
+    async def fetch_schemas(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> list[str]:
+        """Fetch the schema names ``fetch_metadata`` would return, without tables."""
+        schemas, _ = await self.fetch_metadata(url, tunnel_endpoint, db_name=db_name, tables=())
+        return schemas
+
+    async def fetch_table_list(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> tuple[list[str], list[TableMetadata]]:
+        """Fetch schema and table names without columns, for lazy metadata loading.
+
+        Tables come back with ``columns_loaded=False``. Connectors without a
+        cheaper query return the full metadata of ``fetch_metadata`` instead.
+
+        Returns:
+            Tuple of (schemas list, tables list)
+        """
+        return await self.fetch_metadata(url, tunnel_endpoint, db_name=db_name)
+
+    async def fetch_schema_metadata(
+        self,
+        url: str,
+        schema: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        tables: Collection[TableKey] | None = None,
+    ) -> list[TableMetadata]:
+        """Fetch the tables of one schema.
+
+        Each call uses its own connection, so several schemas can be fetched
+        concurrently.
+
+        Args:
+            url: Database connection URL
+            schema: Schema (MySQL: database) to read
+            tunnel_endpoint: Optional (host, port) tuple if using SSH tunnel
+            db_name: Registered database name, used to select a pooled connection
+            tables: Only fetch these (schema, table) pairs of the schema; all if None
+
+        Returns:
+            Tables of the schema
+        """
+        if tables is None:
+            _, fetched = await self.fetch_metadata(url, tunnel_endpoint, db_name=db_name)
+        else:
+            _, fetched = await self.fetch_metadata(
+                url, tunnel_endpoint, db_name=db_name, tables=tables
+            )
+        return [table for table in fetched if table.schema_name == schema]
+
+    async def fetch_table_versions(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> dict[TableKey, TableVersion]:
+        """Fetch a fingerprint of every table's definition, without its columns.
+
+        Used for incremental metadata refreshes: only tables whose
+        fingerprint changed are fetched again with ``fetch_metadata``.
+
+        Returns:
+            Version of each table ``fetch_metadata`` would return
+
+        Raises:
+            NotImplementedError: If the connector can't detect changes
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def execute_query(
-        self, url: str, sql: str, tunnel_endpoint: tuple[str, int] | None = None
-    ) -> tuple[list[str], list[dict[str, Any]], int]:
+        self,
+        url: str,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        timeout_seconds: int | None = None,
+        row_format: RowFormat = "objects",
+        read_only: bool = False,
+    ) -> tuple[list[str], Rows, int]:
         """Execute SQL query and return results.
 
+        Cancelling the awaiting task must cancel the statement on the server.
+
         Args:
             url: Database connection URL
             sql: SQL query to execute
             tunnel_endpoint: Optional (host, port) tuple if using SSH tunnel
+            db_name: Registered database name, used to select a pooled connection
+            timeout_seconds: Server-side statement timeout, if any
+            row_format: "objects" for dict rows, "arrays" for positional lists
+            read_only: Run in a read-only transaction, so writes hidden in a
+                SELECT (data-modifying CTEs, functions) fail
 
         Returns:
             Tuple of (column_names, rows, execution_time_ms)
+
+        Raises:
+            TimeoutError: If the server aborted the statement at its timeout
         """
         pass
 
+    async def stream_query(
+        self,
+        url: str,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        timeout_seconds: int | None = None,
+        batch_size: int = 500,
+        row_format: RowFormat = "objects",
+    ) -> AsyncGenerator[tuple[list[str], Rows]]:
+        """Execute SQL query and yield the results in batches.
+
+        The first batch is always yielded, even when empty, so callers learn
+        the column names before any rows.
+
+        Args:
+            url: Database connection URL
+            sql: SQL query to execute
+            tunnel_endpoint: Optional (host, port) tuple if using SSH tunnel
+            db_name: Registered database name, used to select a pooled connection
+            timeout_seconds: Server-side statement timeout, if any
+            batch_size: Maximum rows per batch
+            row_format: "objects" for dict rows, "arrays" for positional lists
+
+        Yields:
+            Tuples of (column_names, rows)
+        """
+        batches = self.stream_batches(
+            url,
+            sql,
+            tunnel_endpoint,
+            db_name=db_name,
+            timeout_seconds=timeout_seconds,
+            batch_size=batch_size,
+        )
+        encode: RowEncoder | None = None
+        try:
+            async for batch in batches:
+                if encode is None:
+                    encode = self._row_encoder(batch.columns, batch.column_types, row_format)
+                yield batch.columns, encode(batch.rows)
+        finally:
+            await batches.aclose()
+
+    async def stream_batches(
+        self,
+        url: str,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        timeout_seconds: int | None = None,
+        batch_size: int = 500,
+    ) -> AsyncGenerator[ResultBatch]:
+        """Execute SQL query and yield raw driver rows in batches.
+
+        Same contract as stream_query, but rows are left unserialized and each
+        batch carries the column types, for typed encodings such as Arrow.
+        Connectors override this with server-side cursors; the default fetches
+        everything via execute_query and reports no column types.
+
+        Yields:
+            ResultBatch per fetched batch, the first one always yielded
+        """
+        columns, rows, _ = await self.execute_query(
+            url,
+            sql,
+            tunnel_endpoint,
+            db_name=db_name,
+            timeout_seconds=timeout_seconds,
+            row_format="arrays",
+        )
+        arrays = cast(list[list[Any]], rows)
+        yield ResultBatch(columns, None, arrays[:batch_size])
+        for start in range(batch_size, len(arrays), batch_size):
+            yield ResultBatch(columns, None, arrays[start : start + batch_size])
+
+    def _encode_rows(
+        self,
+        columns: list[str],
+        rows: Sequence[Sequence[Any]],
+        row_format: RowFormat,
+        column_types: list[ColumnType] | None = None,
+    ) -> Rows:
+        """Serialize cursor tuples in the requested row format.
+
+        Without column types every value goes through _serialize_value.
+        """
+        return self._row_encoder(columns, column_types, row_format)(rows)
+
+    def _row_encoder(
+        self, columns: list[str], column_types: list[ColumnType] | None, row_format: RowFormat
+    ) -> RowEncoder:
+        """Row encoder with per-column converters, built once per query."""
+        return build_row_encoder(
+            columns, column_types, self._serialize_value, arrays=row_format == "arrays"
+        )
+
+    def _serialize_value(self, value: Any) -> Any:
+        """Convert a driver value to a JSON-serializable value."""
+        return value
+
     @abstractmethod
     def get_dialect(self) -> str:
         """Get sqlglot dialect name.
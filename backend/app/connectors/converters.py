@@ -0,0 +1,97 @@
+"""Per-column value converters for JSON result encoding.
+
+Converters are chosen once per query from the column types in
+``cursor.description``, so the row loop only converts the columns that need
+it instead of inspecting the type of every value.
+"""
+
+from collections.abc import Callable, Sequence
+from itertools import repeat
+from typing import Any, Literal
+
+# Driver-independent column type, derived from cursor.description. "text" is
+# a column the driver always returns as str; "string" is any other type
+# without a dedicated mapping (json, uuid, arrays, ...).
+ColumnType = Literal[
+    "bool",
+    "int",
+    "float",
+    "decimal",
+    "date",
+    "time",
+    "timestamp",
+    "timestamptz",
+    "binary",
+    "text",
+    "string",
+]
+
+# Encodes a batch of positional driver rows
+RowEncoder = Callable[[Sequence[Sequence[Any]]], list[Any]]
+
+_IDENTITY_TYPES = frozenset({"bool", "int", "float", "decimal", "text"})
+_TEMPORAL_TYPES = frozenset({"date", "time", "timestamp", "timestamptz"})
+
+
+def _isoformat(value: Any) -> Any:
+    return value.isoformat()
+
+
+def build_row_encoder(
+    columns: list[str],
+    column_types: Sequence[ColumnType] | None,
+    fallback: Callable[[Any], Any],
+    arrays: bool,
+) -> RowEncoder:
+    """Build a function that encodes a batch of rows for the given columns.
+
+    Each column gets a specialized converter: none for numbers and text,
+    ``isoformat`` for temporals, and ``fallback`` (the connector's generic
+    per-value serializer) for types whose Python type the driver type does
+    not pin down. NULLs are never converted. A batch is converted column by
+    column, so columns without a converter are not looped over in Python.
+
+    Args:
+        columns: Result column names
+        column_types: Column types from the connector, or None if unknown
+        fallback: Generic per-value serializer
+        arrays: Encode rows as positional lists instead of dicts
+
+    Returns:
+        Function mapping positional driver rows to encoded rows
+    """
+    types: Sequence[ColumnType | None] = (
+        column_types if column_types is not None else [None] * len(columns)
+    )
+
+    def _binary(value: Any) -> Any:
+        # psycopg2 returns bytea as memoryview
+        return fallback(value.tobytes() if isinstance(value, memoryview) else value)
+
+    def _converter(column_type: ColumnType | None) -> Callable[[Any], Any] | None:
+        if column_type in _IDENTITY_TYPES:
+            return None
+        if column_type in _TEMPORAL_TYPES:
+            return _isoformat
+        if column_type == "binary":
+            return _binary
+        return fallback
+
+    converters = tuple(_converter(column_type) for column_type in types)
+
+    def _encode(rows: Sequence[Sequence[Any]]) -> list[Any]:
+        if not converters:
+            # No columns to transpose (e.g. PostgreSQL "SELECT FROM t")
+            return [[] if arrays else {} for _ in rows]
+        if not rows:
+            return []
+        values = [
+            column if convert is None else [None if v is None else convert(v) for v in column]
+            for convert, column in zip(converters, zip(*rows, strict=True), strict=True)
+        ]
+        if arrays:
+            return list(map(list, zip(*values, strict=True)))
+        # Duplicate column names: the last one wins
+        return list(map(dict, map(zip, repeat(columns), zip(*values, strict=True))))
+
+    return _encode
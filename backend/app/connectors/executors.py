@@ -0,0 +1,183 @@
+"""Dedicated thread pools for the blocking database drivers.
+
+psycopg2 and mysql-connector calls run in worker threads. Instead of the
+event loop's shared default executor, each registered database gets its
+own bounded executor, so a stuck or slow database can only tie up its own
+threads. Connections without a registered name (e.g. testing an unsaved
+URL) share one executor per connector type, and statement cancellation
+(``KILL QUERY``) has a small executor of its own so it never queues behind
+the statements it is meant to stop.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Literal, TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ExecutorKind = Literal["database", "shared", "control"]
+
+
+class BoundedExecutor:
+    """A named thread pool that tracks running and queued calls."""
+
+    def __init__(self, name: str, kind: ExecutorKind, max_workers: int) -> None:
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"tablechat-{kind}-{name}"
+        )
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._completed = 0
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call in this pool, like ``asyncio.to_thread``.
+
+        Context variables are propagated to the worker thread. Cancelling the
+        awaiting task drops the call if it hasn't started; a running call
+        finishes in its thread.
+        """
+        context = contextvars.copy_context()
+
+        def _call() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+            try:
+                return context.run(func, *args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        with self._lock:
+            self._queued += 1
+        try:
+            future = self._executor.submit(_call)
+        except RuntimeError:
+            # Shut down between lookup and submit (database deleted)
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """Stop accepting calls; calls already submitted finish in the background."""
+        self._closed = True
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict[str, Any]:
+        """Occupancy and counters."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "queued": self._queued,
+                "completed": self._completed,
+                "closed": self._closed,
+            }
+
+    def _on_done(self, future: "Future[Any]") -> None:
+        if future.cancelled():
+            # Never started, so _call didn't take it off the queue
+            with self._lock:
+                self._queued -= 1
+
+
+class ExecutorManager:
+    """Registry of executors: one per database, per connector type, and for control calls."""
+
+    def __init__(self) -> None:
+        self._databases: dict[str, BoundedExecutor] = {}
+        self._shared: dict[str, BoundedExecutor] = {}
+        self._control: BoundedExecutor | None = None
+        self._lock = threading.Lock()
+
+    def for_database(self, db_name: str | None, connector: str) -> BoundedExecutor:
+        """Executor for a registered database, or the connector type's shared one."""
+        with self._lock:
+            if db_name is None:
+                executor = self._shared.get(connector)
+                if executor is None or executor.closed:
+                    executor = BoundedExecutor(
+                        connector, "shared", settings.executor_shared_workers
+                    )
+                    self._shared[connector] = executor
+                return executor
+
+            executor = self._databases.get(db_name)
+            if executor is None or executor.closed:
+                executor = BoundedExecutor(
+                    db_name, "database", settings.executor_workers_per_database
+                )
+                self._databases[db_name] = executor
+            return executor
+
+    def control(self) -> BoundedExecutor:
+        """Executor for statement cancellation."""
+        with self._lock:
+            if self._control is None or self._control.closed:
+                self._control = BoundedExecutor(
+                    "control", "control", settings.executor_control_workers
+                )
+            return self._control
+
+    async def run(
+        self, db_name: str | None, connector: str, func: Callable[..., T], *args: Any
+    ) -> T:
+        """Run a blocking driver call in the database's executor."""
+        return await self.for_database(db_name, connector).run(func, *args)
+
+    def invalidate(self, db_name: str) -> None:
+        """Shut down a deleted database's executor."""
+        with self._lock:
+            executor = self._databases.pop(db_name, None)
+        if executor:
+            logger.info(f"Shut down executor for {db_name}")
+            executor.shutdown()
+
+    def close_all(self) -> None:
+        """Shut down every executor (application shutdown)."""
+        with self._lock:
+            executors = [*self._databases.values(), *self._shared.values()]
+            if self._control is not None:
+                executors.append(self._control)
+            self._databases.clear()
+            self._shared.clear()
+            self._control = None
+        for executor in executors:
+            executor.shutdown()
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Stats for every executor: databases by name, then shared, then control."""
+        with self._lock:
+            executors = [
+                *(executor for _, executor in sorted(self._databases.items())),
+                *(executor for _, executor in sorted(self._shared.items())),
+            ]
+            if self._control is not None:
+                executors.append(self._control)
+        return [executor.stats() for executor in executors]
+
+
+# Global instance
+executor_manager = ExecutorManager()
@@ -2,7 +2,9 @@
 
 from app.connectors.base import DatabaseConnector
 from app.connectors.mysql import MySQLConnector
+from app.connectors.mysql_async import AIOMySQLConnector
 from app.connectors.postgres import PostgreSQLConnector
+from app.connectors.postgres_async import AsyncPGConnector
 
 
 class ConnectorFactory:
@@ -18,8 +20,12 @@ class ConnectorFactory:
     def get_connector(cls, url: str) -> DatabaseConnector:
         """Get the appropriate connector for the given URL.
 
+        A driver-qualified scheme (e.g. ``postgresql+asyncpg://``) selects the
+        connector registered for it; otherwise the database type decides.
+
         Args:
-            url: Database connection URL (postgresql://, postgres://, or mysql://)
+            url: Database connection URL (postgresql://, postgres://, mysql://,
+                optionally with a ``+driver`` suffix)
 
         Returns:
             DatabaseConnector instance
@@ -28,7 +34,8 @@ class ConnectorFactory:
             ValueError: If URL scheme is not supported
         """
         db_type = cls.detect_db_type(url)
-        connector_class = cls._connectors.get(db_type)
+        scheme = url.split("://", 1)[0].lower()
+        connector_class = cls._connectors.get(scheme) or cls._connectors.get(db_type)
         if not connector_class:
             raise ValueError(f"No connector available for database type: {db_type}")
         return connector_class()
@@ -46,14 +53,18 @@ class ConnectorFactory:
         Raises:
             ValueError: If URL scheme is not recognized
         """
-        if url.startswith("postgresql://") or url.startswith("postgres://"):
+        # Strip an optional driver suffix: postgresql+asyncpg:// -> postgresql
+        scheme, sep, _ = url.partition("://")
+        base_scheme = scheme.split("+", 1)[0].lower() if sep else ""
+        if base_scheme in ("postgresql", "postgres"):
             return "postgresql"
-        elif url.startswith("mysql://"):
+        elif base_scheme == "mysql":
             return "mysql"
         else:
             raise ValueError(
                 f"Unsupported database URL scheme: {url}. "
-                "Supported schemes: postgresql://, postgres://, mysql://"
+                "Supported schemes: postgresql://, postgres://, mysql:// "
+                "(append +asyncpg or +aiomysql for the asyncio drivers)"
             )
 
     @classmethod
@@ -61,7 +72,13 @@ class ConnectorFactory:
         """Register a new connector for a URL scheme.
 
         Args:
-            scheme: URL scheme (e.g., 'postgresql', 'mysql')
+            scheme: URL scheme (e.g., 'postgresql', 'mysql', 'postgresql+asyncpg')
             connector_class: Connector class to use
         """
         cls._connectors[scheme] = connector_class
+
+
+# Native asyncio drivers, selected per connection via the URL scheme
+ConnectorFactory.register_connector("postgresql+asyncpg", AsyncPGConnector)
+ConnectorFactory.register_connector("postgres+asyncpg", AsyncPGConnector)
+ConnectorFactory.register_connector("mysql+aiomysql", AIOMySQLConnector)
@@ -1,15 +1,310 @@
 """MySQL database connector."""
 
 import asyncio
+import logging
+import threading
 import time
+from collections.abc import AsyncGenerator, Callable, Collection, Iterator, Sequence
+from contextlib import ExitStack, contextmanager, suppress
 from typing import Any
 
 import mysql.connector
 from mysql.connector import MySQLConnection
 
 from app.config import settings
-from app.connectors.base import DatabaseConnector
+from app.connectors.base import (
+    DatabaseConnector,
+    ResultBatch,
+    Rows,
+    TableKey,
+    TableVersion,
+)
+from app.connectors.converters import ColumnType
+from app.connectors.executors import executor_manager
+from app.connectors.pool import borrow_connection
 from app.models.metadata import ColumnInfo, TableMetadata
+from app.models.query import RowFormat
+
+logger = logging.getLogger(__name__)
+
+
+# Metadata queries, shared by the mysql-connector and aiomysql connectors
+
+_SYSTEM_SCHEMAS = "'information_schema', 'mysql', 'performance_schema', 'sys'"
+
+SCHEMAS_SQL = f"""
+    SELECT SCHEMA_NAME
+    FROM INFORMATION_SCHEMA.SCHEMATA
+    WHERE SCHEMA_NAME NOT IN ({_SYSTEM_SCHEMAS})
+    ORDER BY SCHEMA_NAME
+"""
+
+# TABLE_ROWS is an estimate for InnoDB, and MySQL 8 caches both statistics
+# for information_schema_stats_expiry (one day by default)
+_TABLES_SQL = f"""
+    SELECT
+        TABLE_SCHEMA,
+        TABLE_NAME,
+        TABLE_TYPE,
+        TABLE_COMMENT,
+        TABLE_ROWS,
+        DATA_LENGTH + INDEX_LENGTH
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_SCHEMA NOT IN ({_SYSTEM_SCHEMAS}){{table_filter}}
+    ORDER BY TABLE_SCHEMA, TABLE_NAME
+"""
+
+_PRIMARY_KEYS_SQL = f"""
+    SELECT
+        TABLE_SCHEMA,
+        TABLE_NAME,
+        COLUMN_NAME
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA NOT IN ({_SYSTEM_SCHEMAS}) AND COLUMN_KEY = 'PRI'{{table_filter}}
+"""
+
+_COLUMNS_SQL = f"""
+    SELECT
+        TABLE_SCHEMA,
+        TABLE_NAME,
+        COLUMN_NAME,
+        DATA_TYPE,
+        IS_NULLABLE,
+        COLUMN_DEFAULT,
+        COLUMN_KEY,
+        COLUMN_COMMENT,
+        EXTRA
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA NOT IN ({_SYSTEM_SCHEMAS}){{table_filter}}
+    ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+"""
+
+TABLES_SQL = _TABLES_SQL.format(table_filter="")
+PRIMARY_KEYS_SQL = _PRIMARY_KEYS_SQL.format(table_filter="")
+COLUMNS_SQL = _COLUMNS_SQL.format(table_filter="")
+
+# One row per table listed by TABLES_SQL. The fingerprint covers everything
+# the metadata queries read: CREATE_TIME (changes on CREATE, ALTER and
+# TRUNCATE), the comment and an order-independent hash of the column
+# definitions (BIT_XOR avoids GROUP_CONCAT's group_concat_max_len
+# truncation). UPDATE_TIME is left out, as it changes on every data write.
+TABLE_VERSIONS_SQL = f"""
+    SELECT
+        t.TABLE_SCHEMA,
+        t.TABLE_NAME,
+        MD5(CONCAT_WS('|',
+            t.TABLE_TYPE,
+            QUOTE(t.CREATE_TIME),
+            QUOTE(t.TABLE_COMMENT),
+            COUNT(c.COLUMN_NAME),
+            BIT_XOR(CAST(CONV(LEFT(MD5(CONCAT_WS(':',
+                c.ORDINAL_POSITION,
+                c.COLUMN_NAME,
+                c.COLUMN_TYPE,
+                c.IS_NULLABLE,
+                QUOTE(c.COLUMN_DEFAULT),
+                c.COLUMN_KEY,
+                QUOTE(c.COLUMN_COMMENT),
+                c.EXTRA
+            )), 16), 16, 10) AS UNSIGNED))
+        )),
+        t.TABLE_ROWS,
+        t.DATA_LENGTH + t.INDEX_LENGTH
+    FROM INFORMATION_SCHEMA.TABLES t
+    LEFT JOIN INFORMATION_SCHEMA.COLUMNS c
+        ON c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME
+    WHERE t.TABLE_SCHEMA NOT IN ({_SYSTEM_SCHEMAS})
+    GROUP BY
+        t.TABLE_SCHEMA, t.TABLE_NAME, t.TABLE_TYPE, t.CREATE_TIME, t.TABLE_COMMENT,
+        t.TABLE_ROWS, t.DATA_LENGTH, t.INDEX_LENGTH
+"""
+
+
+def metadata_queries(
+    tables: Collection[TableKey] | None = None,
+    *,
+    schema: str | None = None,
+) -> list[tuple[str, list[Any] | None]]:
+    """
+    Tables, primary key and column queries with their parameters.
+
+    Args:
+        tables: Only read these (schema, table) pairs; all tables if None
+        schema: Only read this schema (ignored if ``tables`` is given)
+    """
+    if tables is not None:
+        rows = ", ".join(["(%s, %s)"] * len(tables))
+        table_filter = f"\n        AND (TABLE_SCHEMA, TABLE_NAME) IN ({rows})"
+        params: list[Any] = [value for table in tables for value in table]
+    elif schema is not None:
+        table_filter = "\n        AND TABLE_SCHEMA = %s"
+        params = [schema]
+    else:
+        return [(TABLES_SQL, None), (PRIMARY_KEYS_SQL, None), (COLUMNS_SQL, None)]
+
+    return [
+        (template.format(table_filter=table_filter), params)
+        for template in (_TABLES_SQL, _PRIMARY_KEYS_SQL, _COLUMNS_SQL)
+    ]
+
+
+def _fetch_schemas(cursor: Any) -> list[str]:
+    """Run SCHEMAS_SQL on a mysql-connector cursor."""
+    cursor.execute(SCHEMAS_SQL)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _fetch_tables(cursor: Any, queries: list[tuple[str, list[Any] | None]]) -> list[TableMetadata]:
+    """Run the metadata queries on a mysql-connector cursor."""
+    results = []
+    for sql, params in queries:
+        if params is None:
+            cursor.execute(sql)
+        else:
+            cursor.execute(sql, params)
+        results.append(cursor.fetchall())
+    return build_table_metadata(*results)
+
+
+def build_table_versions(rows: Sequence[Sequence[Any]]) -> dict[TableKey, TableVersion]:
+    """Map the rows of TABLE_VERSIONS_SQL by (schema, table)."""
+    return {
+        (row[0], row[1]): TableVersion(
+            fingerprint=row[2],
+            row_count=int(row[3]) if row[3] is not None else None,
+            size_bytes=int(row[4]) if row[4] is not None else None,
+        )
+        for row in rows
+    }
+
+
+def build_table_metadata(
+    tables_raw: Sequence[Sequence[Any]],
+    pk_raw: Sequence[Sequence[Any]],
+    columns_raw: Sequence[Sequence[Any]],
+) -> list[TableMetadata]:
+    """Assemble TableMetadata from the rows of the metadata queries."""
+    # Get primary key info
+    pk_columns: dict[str, set[str]] = {}
+    for row in pk_raw:
+        key = f"{row[0]}.{row[1]}"
+        if key not in pk_columns:
+            pk_columns[key] = set()
+        pk_columns[key].add(row[2])
+
+    # Group columns by table
+    columns_by_table: dict[str, list[ColumnInfo]] = {}
+    for row in columns_raw:
+        key = f"{row[0]}.{row[1]}"
+        if key not in columns_by_table:
+            columns_by_table[key] = []
+
+        is_pk = key in pk_columns and row[2] in pk_columns[key]
+
+        columns_by_table[key].append(
+            ColumnInfo(
+                name=row[2],
+                data_type=row[3],
+                is_nullable=row[4] == "YES",
+                is_primary_key=is_pk,
+                default_value=row[5],
+                comment=row[7],
+                extra=row[8] if row[8] else None,
+            )
+        )
+
+    # Build table metadata
+    tables: list[TableMetadata] = []
+    for row in tables_raw:
+        key = f"{row[0]}.{row[1]}"
+        table_type = "view" if row[2] == "VIEW" else "table"
+
+        tables.append(
+            TableMetadata(
+                schema_name=row[0],
+                table_name=row[1],
+                table_type=table_type,
+                columns=columns_by_table.get(key, []),
+                row_count=int(row[4]) if row[4] is not None else None,
+                size_bytes=int(row[5]) if row[5] is not None else None,
+                comment=row[3] if row[3] else None,
+            )
+        )
+
+    return tables
+
+
+# ER_QUERY_TIMEOUT: statement exceeded MAX_EXECUTION_TIME
+ER_QUERY_TIMEOUT = 3024
+
+
+# Result column types by protocol field type code (shared by mysql-connector
+# and PyMySQL/aiomysql); anything not listed is a generic "string". TIME is
+# not "time" because drivers return a timedelta that may exceed 24 hours; BIT
+# is not "binary" because mysql-connector returns it as an int. Character
+# columns may come back as bytes (binary collations), so none are "text".
+MYSQL_COLUMN_TYPES: dict[int, ColumnType] = {
+    1: "int",  # TINY
+    2: "int",  # SHORT
+    3: "int",  # LONG
+    4: "float",  # FLOAT
+    5: "float",  # DOUBLE
+    7: "timestamp",  # TIMESTAMP
+    8: "int",  # LONGLONG
+    9: "int",  # INT24
+    10: "date",  # DATE
+    12: "timestamp",  # DATETIME
+    13: "int",  # YEAR
+    14: "date",  # NEWDATE
+    246: "decimal",  # NEWDECIMAL
+    255: "binary",  # GEOMETRY
+}
+
+
+def build_table_list(tables_raw: Sequence[Sequence[Any]]) -> list[TableMetadata]:
+    """Assemble TableMetadata without columns from the rows of TABLES_SQL."""
+    return [
+        table.model_copy(update={"columns_loaded": False})
+        for table in build_table_metadata(tables_raw, [], [])
+    ]
+
+
+def column_types(type_codes: Sequence[int]) -> list[ColumnType]:
+    """Map result field type codes to driver-independent column types."""
+    return [MYSQL_COLUMN_TYPES.get(code, "string") for code in type_codes]
+
+
+def _set_max_execution_time(conn: MySQLConnection, milliseconds: int) -> None:
+    """Set the session statement timeout (MySQL 5.7.8+; ignored elsewhere, e.g. MariaDB)."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {int(milliseconds)}")
+        cursor.close()
+    except mysql.connector.Error as e:
+        logger.debug(f"MAX_EXECUTION_TIME not supported: {e}")
+
+
+def _kill_query(conn_params: dict[str, Any], connection_id: int) -> None:
+    """Abort the statement running on another connection."""
+    try:
+        conn = mysql.connector.connect(**conn_params)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"KILL QUERY {int(connection_id)}")
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning(f"Failed to cancel MySQL query {connection_id}: {e}")
+
+
+def _ping(conn: MySQLConnection) -> None:
+    """Health check for a pooled MySQL connection."""
+    conn.ping(reconnect=False)
+
+
+def _reset(conn: MySQLConnection) -> None:
+    """End any open transaction so the next borrower gets a fresh snapshot."""
+    conn.rollback()
 
 
 class MySQLConnector(DatabaseConnector):
@@ -21,7 +316,8 @@ class MySQLConnector(DatabaseConnector):
 
     def detect_db_type(self, url: str) -> str:
         """Detect database type from URL."""
-        if url.startswith("mysql://"):
+        scheme = url.split("://", 1)[0].split("+", 1)[0] if "://" in url else ""
+        if scheme == "mysql":
             return "mysql"
         raise ValueError(f"Unsupported database URL: {url}")
 
@@ -39,7 +335,8 @@ class MySQLConnector(DatabaseConnector):
 
         parsed = urlparse(url)
 
-        if parsed.scheme != "mysql":
+        # Accept driver-qualified schemes such as mysql+aiomysql://
+        if parsed.scheme.split("+", 1)[0] != "mysql":
             raise ValueError(f"Expected mysql:// URL, got {parsed.scheme}://")
 
         # unquote password to handle URL-encoded characters like %40 (@), %23 (#)
@@ -102,198 +399,306 @@ class MySQLConnector(DatabaseConnector):
 
         return conn_params
 
+    @contextmanager
+    def _connection(
+        self, conn_params: dict[str, Any], db_name: str | None
+    ) -> Iterator[MySQLConnection]:
+        """Borrow a pooled connection for a registered database.
+
+        Without ``db_name`` a one-off connection is opened and closed instead.
+        """
+        signature = repr(sorted(conn_params.items()))
+        with borrow_connection(
+            db_name,
+            signature,
+            lambda: mysql.connector.connect(**conn_params),
+            ping=_ping,
+            reset=_reset,
+        ) as conn:
+            yield conn
+
     async def test_connection(
-        self, url: str, timeout: int, tunnel_endpoint: tuple[str, int] | None = None
+        self,
+        url: str,
+        timeout: int,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
     ) -> None:
         """Test MySQL connection."""
 
-        def _connect() -> MySQLConnection:
+        def _connect() -> None:
             try:
                 # Get SSL disabled flag from connection manager (if available)
                 # For now, default to False - will be handled by db_manager
                 conn_params = self._build_connection_params(
                     url, timeout, ssl_disabled=False, tunnel_endpoint=tunnel_endpoint
                 )
-                conn = mysql.connector.connect(**conn_params)
-                conn.close()
-                return conn
+                with self._connection(conn_params, db_name) as conn:
+                    if db_name is not None:
+                        _ping(conn)
             except mysql.connector.Error as e:
                 raise ConnectionError(f"Failed to connect to MySQL: {e}") from e
+            except ConnectionError:
+                raise
             except Exception as e:
                 raise ValueError(f"Invalid MySQL connection URL: {e}") from e
 
-        await asyncio.to_thread(_connect)
+        await executor_manager.run(db_name, "mysql", _connect)
 
     async def fetch_metadata(
-        self, url: str, tunnel_endpoint: tuple[str, int] | None = None
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        tables: Collection[TableKey] | None = None,
     ) -> tuple[list[str], list[TableMetadata]]:
         """Fetch MySQL metadata using INFORMATION_SCHEMA."""
 
         def _fetch() -> tuple[list[str], list[TableMetadata]]:
-            conn: MySQLConnection | None = None
-
-            try:
-                # Note: ssl_disabled should be passed from db_manager context
-                # For now, default to False
-                conn_params = self._build_connection_params(
-                    url, ssl_disabled=False, tunnel_endpoint=tunnel_endpoint
-                )
-                conn = mysql.connector.connect(**conn_params)
+            # Note: ssl_disabled should be passed from db_manager context
+            # For now, default to False
+            conn_params = self._build_connection_params(
+                url, ssl_disabled=False, tunnel_endpoint=tunnel_endpoint
+            )
+            with self._connection(conn_params, db_name) as conn:
                 cursor = conn.cursor()
 
-                # Get all databases (schemas)
-                cursor.execute(
-                    """
-                    SELECT SCHEMA_NAME
-                    FROM INFORMATION_SCHEMA.SCHEMATA
-                    WHERE SCHEMA_NAME NOT IN (
-                        'information_schema', 'mysql', 'performance_schema', 'sys'
-                    )
-                    ORDER BY SCHEMA_NAME
-                """
-                )
-                schemas = [row[0] for row in cursor.fetchall()]
-
-                # Get all tables and views
-                cursor.execute(
-                    """
-                    SELECT
-                        TABLE_SCHEMA,
-                        TABLE_NAME,
-                        TABLE_TYPE,
-                        TABLE_COMMENT
-                    FROM INFORMATION_SCHEMA.TABLES
-                    WHERE TABLE_SCHEMA NOT IN (
-                        'information_schema', 'mysql', 'performance_schema', 'sys'
-                    )
-                    ORDER BY TABLE_SCHEMA, TABLE_NAME
-                """
-                )
-                tables_raw = cursor.fetchall()
-
-                # Get primary key info
-                cursor.execute(
-                    """
-                    SELECT
-                        TABLE_SCHEMA,
-                        TABLE_NAME,
-                        COLUMN_NAME
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_SCHEMA NOT IN (
-                        'information_schema', 'mysql', 'performance_schema', 'sys'
-                    ) AND COLUMN_KEY = 'PRI'
-                """
-                )
-                pk_columns: dict[str, set[str]] = {}
-                for row in cursor.fetchall():
-                    key = f"{row[0]}.{row[1]}"
-                    if key not in pk_columns:
-                        pk_columns[key] = set()
-                    pk_columns[key].add(row[2])
-
-                # Get all columns
-                cursor.execute(
-                    """
-                    SELECT
-                        TABLE_SCHEMA,
-                        TABLE_NAME,
-                        COLUMN_NAME,
-                        DATA_TYPE,
-                        IS_NULLABLE,
-                        COLUMN_DEFAULT,
-                        COLUMN_KEY,
-                        COLUMN_COMMENT,
-                        EXTRA
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE TABLE_SCHEMA NOT IN (
-                        'information_schema', 'mysql', 'performance_schema', 'sys'
-                    )
-                    ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
-                """
-                )
-                columns_raw = cursor.fetchall()
-
-                # Group columns by table
-                columns_by_table: dict[str, list[ColumnInfo]] = {}
-                for row in columns_raw:
-                    key = f"{row[0]}.{row[1]}"
-                    if key not in columns_by_table:
-                        columns_by_table[key] = []
-
-                    is_pk = key in pk_columns and row[2] in pk_columns[key]
-
-                    columns_by_table[key].append(
-                        ColumnInfo(
-                            name=row[2],
-                            data_type=row[3],
-                            is_nullable=row[4] == "YES",
-                            is_primary_key=is_pk,
-                            default_value=row[5],
-                            comment=row[7],
-                            extra=row[8] if row[8] else None,
-                        )
-                    )
-
-                # Build table metadata
-                tables: list[TableMetadata] = []
-                for row in tables_raw:
-                    key = f"{row[0]}.{row[1]}"
-                    table_type = "view" if row[2] == "VIEW" else "table"
-
-                    tables.append(
-                        TableMetadata(
-                            schema_name=row[0],
-                            table_name=row[1],
-                            table_type=table_type,
-                            columns=columns_by_table.get(key, []),
-                            comment=row[3] if row[3] else None,
-                        )
-                    )
-
-                return schemas, tables
-
-            finally:
-                if conn:
-                    conn.close()
-
-        return await asyncio.to_thread(_fetch)
+                schemas = _fetch_schemas(cursor)
+                if tables is not None and not tables:
+                    return schemas, []
 
-    async def execute_query(
-        self, url: str, sql: str, tunnel_endpoint: tuple[str, int] | None = None
-    ) -> tuple[list[str], list[dict[str, Any]], int]:
-        """Execute MySQL query."""
+                return schemas, _fetch_tables(cursor, metadata_queries(tables))
 
-        def _execute() -> tuple[list[str], list[dict[str, Any]], int]:
-            start_time = time.time()
-            conn: MySQLConnection | None = None
+        return await executor_manager.run(db_name, "mysql", _fetch)
 
-            try:
-                # Note: ssl_disabled should be passed from db_manager context
-                # For now, default to False
-                conn_params = self._build_connection_params(
-                    url, ssl_disabled=False, tunnel_endpoint=tunnel_endpoint
-                )
-                conn = mysql.connector.connect(**conn_params)
-                cursor = conn.cursor(dictionary=True)
+    async def fetch_schemas(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> list[str]:
+        """Fetch MySQL database (schema) names."""
+
+        def _fetch() -> list[str]:
+            conn_params = self._build_connection_params(
+                url, ssl_disabled=False, tunnel_endpoint=tunnel_endpoint
+            )
+            with self._connection(conn_params, db_name) as conn:
+                return _fetch_schemas(conn.cursor())
+
+        return await executor_manager.run(db_name, "mysql", _fetch)
+
+    async def fetch_table_list(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> tuple[list[str], list[TableMetadata]]:
+        """Fetch MySQL database (schema) and table names without columns."""
+
+        def _fetch() -> tuple[list[str], list[TableMetadata]]:
+            conn_params = self._build_connection_params(
+                url, ssl_disabled=False, tunnel_endpoint=tunnel_endpoint
+            )
+            with self._connection(conn_params, db_name) as conn:
+                cursor = conn.cursor()
+                schemas = _fetch_schemas(cursor)
+                cursor.execute(TABLES_SQL)
+                return schemas, build_table_list(cursor.fetchall())
+
+        return await executor_manager.run(db_name, "mysql", _fetch)
+
+    async def fetch_schema_metadata(
+        self,
+        url: str,
+        schema: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        tables: Collection[TableKey] | None = None,
+    ) -> list[TableMetadata]:
+        """Fetch the tables of one MySQL database (schema)."""
+
+        def _fetch() -> list[TableMetadata]:
+            conn_params = self._build_connection_params(
+                url, ssl_disabled=False, tunnel_endpoint=tunnel_endpoint
+            )
+            with self._connection(conn_params, db_name) as conn:
+                return _fetch_tables(conn.cursor(), metadata_queries(tables, schema=schema))
+
+        return await executor_manager.run(db_name, "mysql", _fetch)
+
+    async def fetch_table_versions(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> dict[TableKey, TableVersion]:
+        """Fetch MySQL table fingerprints from INFORMATION_SCHEMA."""
+
+        def _fetch() -> dict[TableKey, TableVersion]:
+            conn_params = self._build_connection_params(
+                url, ssl_disabled=False, tunnel_endpoint=tunnel_endpoint
+            )
+            with self._connection(conn_params, db_name) as conn:
+                cursor = conn.cursor()
+                cursor.execute(TABLE_VERSIONS_SQL)
+                return build_table_versions(cursor.fetchall())
 
-                cursor.execute(sql)
+        return await executor_manager.run(db_name, "mysql", _fetch)
 
-                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+    async def execute_query(
+        self,
+        url: str,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        timeout_seconds: int | None = None,
+        row_format: RowFormat = "objects",
+        read_only: bool = False,
+    ) -> tuple[list[str], Rows, int]:
+        """Execute MySQL query.
+
+        The timeout is enforced by the server through ``MAX_EXECUTION_TIME``;
+        cancelling the awaiting task issues ``KILL QUERY`` for the running
+        statement instead of leaving it to run in the worker thread.
+        """
+        # Note: ssl_disabled should be passed from db_manager context
+        # For now, default to False
+        conn_params = self._build_connection_params(
+            url, ssl_disabled=False, tunnel_endpoint=tunnel_endpoint
+        )
+        active: list[int] = []
+        cancelled = threading.Event()
+
+        def _execute() -> tuple[list[str], Rows, int]:
+            start_time = time.time()
 
-                rows = cursor.fetchall()
+            with self._connection(conn_params, db_name) as conn:
+                if timeout_seconds:
+                    _set_max_execution_time(conn, timeout_seconds * 1000)
+
+                cursor = conn.cursor()
+                if read_only:
+                    # Applies to the next transaction only
+                    cursor.execute("SET TRANSACTION READ ONLY")
+
+                if conn.connection_id is not None:
+                    active.append(conn.connection_id)
+                try:
+                    if cancelled.is_set():
+                        raise asyncio.CancelledError
+                    cursor.execute(sql)
+
+                    description = cursor.description or []
+                    columns = [desc[0] for desc in description]
+                    types = column_types([desc[1] for desc in description])
+
+                    rows = cursor.fetchall()
+                except mysql.connector.Error as e:
+                    if e.errno == ER_QUERY_TIMEOUT:
+                        raise TimeoutError(
+                            f"Query execution exceeded timeout of {timeout_seconds} seconds"
+                        ) from e
+                    raise
+                finally:
+                    active.clear()
+                    if timeout_seconds:
+                        # Don't leak the limit to the next borrower of a pooled connection
+                        _set_max_execution_time(conn, 0)
 
                 # Serialize rows
-                serialized_rows = [self._serialize_row(row) for row in rows]
+                serialized_rows = self._encode_rows(columns, rows, row_format, types)
 
                 execution_time_ms = int((time.time() - start_time) * 1000)
 
                 return columns, serialized_rows, execution_time_ms
 
-            finally:
-                if conn:
-                    conn.close()
-
-        return await asyncio.to_thread(_execute)
+        try:
+            return await executor_manager.run(db_name, "mysql", _execute)
+        except asyncio.CancelledError:
+            # The thread keeps waiting on the server; kill the statement from
+            # a second connection
+            cancelled.set()
+            for connection_id in list(active):
+                await executor_manager.control().run(_kill_query, conn_params, connection_id)
+            raise
+
+    async def stream_batches(
+        self,
+        url: str,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        timeout_seconds: int | None = None,
+        batch_size: int = 500,
+    ) -> AsyncGenerator[ResultBatch]:
+        """Stream MySQL query results through an unbuffered cursor.
+
+        Only one batch is held in memory at a time. If the generator is closed
+        before the result is exhausted, the rest of the query is killed.
+        """
+        conn_params = self._build_connection_params(
+            url, ssl_disabled=False, tunnel_endpoint=tunnel_endpoint
+        )
+        executor = executor_manager.for_database(db_name, "mysql")
+        stack = ExitStack()
+        conn = await executor.run(stack.enter_context, self._connection(conn_params, db_name))
+        exhausted = False
+        # The in-flight cursor call; it must finish before the connection is released
+        pending: asyncio.Future[Any] | None = None
+
+        async def _call(func: Callable[..., Any], *args: Any) -> Any:
+            nonlocal pending
+            pending = asyncio.ensure_future(executor.run(func, *args))
+            result = await asyncio.shield(pending)
+            pending = None
+            return result
+
+        try:
+            if timeout_seconds:
+                await _call(_set_max_execution_time, conn, timeout_seconds * 1000)
+
+            cursor = conn.cursor(buffered=False)
+            try:
+                await _call(cursor.execute, sql)
+                description = cursor.description or []
+                columns = [desc[0] for desc in description]
+                types = column_types([desc[1] for desc in description])
+
+                first = True
+                while True:
+                    rows = await _call(cursor.fetchmany, batch_size)
+                    exhausted = len(rows) < batch_size
+                    if rows or first:
+                        yield ResultBatch(columns, types, rows)
+                    first = False
+                    if exhausted:
+                        break
+            except mysql.connector.Error as e:
+                exhausted = True
+                if e.errno == ER_QUERY_TIMEOUT:
+                    raise TimeoutError(
+                        f"Query execution exceeded timeout of {timeout_seconds} seconds"
+                    ) from e
+                raise
+        finally:
+            if not exhausted:
+                # Unread rows would otherwise keep streaming to this connection
+                await executor_manager.control().run(_kill_query, conn_params, conn.connection_id)
+            if pending is not None:
+                with suppress(Exception):
+                    await pending
+            elif exhausted and timeout_seconds:
+                await executor.run(_set_max_execution_time, conn, 0)
+            await executor.run(stack.close)
 
     def _serialize_row(self, row: dict[str, Any]) -> dict[str, Any]:
         """Serialize a row from MySQL."""
@@ -0,0 +1,380 @@
+"""MySQL connector on the native asyncio driver (aiomysql).
+
+Selected with a ``mysql+aiomysql://`` URL. Queries run on the event loop
+instead of a worker thread, so concurrency is bounded by the connection pool
+rather than the default executor.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Collection
+from contextlib import asynccontextmanager, suppress
+from typing import Any
+
+try:
+    import aiomysql
+except ImportError:  # pragma: no cover - optional dependency
+    aiomysql = None
+
+from app.config import settings
+from app.connectors.base import ResultBatch, Rows, TableKey, TableVersion
+from app.connectors.mysql import (
+    ER_QUERY_TIMEOUT,
+    SCHEMAS_SQL,
+    TABLE_VERSIONS_SQL,
+    TABLES_SQL,
+    MySQLConnector,
+    build_table_list,
+    build_table_metadata,
+    build_table_versions,
+    column_types,
+    metadata_queries,
+)
+from app.connectors.pool import AsyncPoolHandle, pool_manager
+from app.models.metadata import TableMetadata
+from app.models.query import RowFormat
+
+logger = logging.getLogger(__name__)
+
+
+def _require_aiomysql() -> None:
+    if aiomysql is None:
+        raise ValueError(
+            "mysql+aiomysql:// URLs require the aiomysql package "
+            "(install with: pip install 'tablechat-backend[async]')"
+        )
+
+
+def _cancelling() -> bool:
+    """Whether the current task is being cancelled."""
+    task = asyncio.current_task()
+    return task is not None and task.cancelling() > 0
+
+
+def _describe_pool(pool: Any) -> tuple[int, int, int, int]:
+    return pool.size, pool.freesize, pool.minsize, pool.maxsize
+
+
+class AIOMySQLConnector(MySQLConnector):
+    """MySQL connector implemented with aiomysql."""
+
+    def _build_aiomysql_params(
+        self,
+        url: str,
+        timeout: int | None = None,
+        tunnel_endpoint: tuple[str, int] | None = None,
+    ) -> dict[str, Any]:
+        """Build keyword arguments for aiomysql.connect()/create_pool()."""
+        params = self._parse_url(url, tunnel_endpoint)
+        return {
+            "host": params["host"],
+            "port": params["port"],
+            "user": params["user"],
+            "password": params["password"],
+            "db": params["database"] or None,
+            "connect_timeout": timeout or settings.mysql_connect_timeout,
+        }
+
+    @asynccontextmanager
+    async def _connection(  # type: ignore[override]
+        self, conn_params: dict[str, Any], db_name: str | None
+    ) -> AsyncIterator[Any]:
+        """Borrow a pooled aiomysql connection for a registered database.
+
+        Without ``db_name`` a one-off connection is opened and closed instead.
+        The transaction is rolled back before the connection is returned.
+        """
+        _require_aiomysql()
+
+        if db_name is None:
+            conn = await aiomysql.connect(**conn_params)
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+
+        async def _create() -> Any:
+            return await aiomysql.create_pool(
+                minsize=settings.pool_min_size,
+                maxsize=settings.pool_max_size,
+                pool_recycle=settings.pool_idle_timeout,
+                **conn_params,
+            )
+
+        signature = repr(sorted(conn_params.items()))
+        handle = pool_manager.get_pool(
+            db_name,
+            signature,
+            AsyncPoolHandle,
+            lambda: AsyncPoolHandle(
+                db_name, _create, terminate=lambda p: p.terminate(), describe=_describe_pool
+            ),
+        )
+        pool = await handle.get()
+        conn = await asyncio.wait_for(pool.acquire(), settings.pool_acquire_timeout)
+        try:
+            yield conn
+        finally:
+            # aiomysql closes connections released mid-transaction
+            with suppress(Exception):
+                await conn.rollback()
+            pool.release(conn)
+
+    async def test_connection(
+        self,
+        url: str,
+        timeout: int,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> None:
+        """Test MySQL connection."""
+        _require_aiomysql()
+
+        try:
+            conn_params = self._build_aiomysql_params(url, timeout, tunnel_endpoint)
+            async with self._connection(conn_params, db_name) as conn:
+                await conn.ping(reconnect=False)
+        except (aiomysql.Error, OSError, TimeoutError) as e:
+            raise ConnectionError(f"Failed to connect to MySQL: {e}") from e
+        except ConnectionError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Invalid MySQL connection URL: {e}") from e
+
+    async def fetch_metadata(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        tables: Collection[TableKey] | None = None,
+    ) -> tuple[list[str], list[TableMetadata]]:
+        """Fetch MySQL metadata using INFORMATION_SCHEMA."""
+        conn_params = self._build_aiomysql_params(url, tunnel_endpoint=tunnel_endpoint)
+
+        async with (
+            self._connection(conn_params, db_name) as conn,
+            conn.cursor() as cursor,
+        ):
+            await cursor.execute(SCHEMAS_SQL)
+            schemas = [row[0] for row in await cursor.fetchall()]
+            if tables is not None and not tables:
+                return schemas, []
+
+            results = []
+            for sql, params in metadata_queries(tables):
+                await cursor.execute(sql, params)
+                results.append(await cursor.fetchall())
+
+        return schemas, build_table_metadata(*results)
+
+    async def fetch_schemas(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> list[str]:
+        """Fetch MySQL database (schema) names."""
+        conn_params = self._build_aiomysql_params(url, tunnel_endpoint=tunnel_endpoint)
+
+        async with (
+            self._connection(conn_params, db_name) as conn,
+            conn.cursor() as cursor,
+        ):
+            await cursor.execute(SCHEMAS_SQL)
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def fetch_table_list(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> tuple[list[str], list[TableMetadata]]:
+        """Fetch MySQL database (schema) and table names without columns."""
+        conn_params = self._build_aiomysql_params(url, tunnel_endpoint=tunnel_endpoint)
+
+        async with (
+            self._connection(conn_params, db_name) as conn,
+            conn.cursor() as cursor,
+        ):
+            await cursor.execute(SCHEMAS_SQL)
+            schemas = [row[0] for row in await cursor.fetchall()]
+            await cursor.execute(TABLES_SQL)
+            tables = build_table_list(await cursor.fetchall())
+
+        return schemas, tables
+
+    async def fetch_schema_metadata(
+        self,
+        url: str,
+        schema: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        tables: Collection[TableKey] | None = None,
+    ) -> list[TableMetadata]:
+        """Fetch the tables of one MySQL database (schema)."""
+        conn_params = self._build_aiomysql_params(url, tunnel_endpoint=tunnel_endpoint)
+
+        async with (
+            self._connection(conn_params, db_name) as conn,
+            conn.cursor() as cursor,
+        ):
+            results = []
+            for sql, params in metadata_queries(tables, schema=schema):
+                await cursor.execute(sql, params)
+                results.append(await cursor.fetchall())
+
+        return build_table_metadata(*results)
+
+    async def fetch_table_versions(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> dict[TableKey, TableVersion]:
+        """Fetch MySQL table fingerprints from INFORMATION_SCHEMA."""
+        conn_params = self._build_aiomysql_params(url, tunnel_endpoint=tunnel_endpoint)
+
+        async with (
+            self._connection(conn_params, db_name) as conn,
+            conn.cursor() as cursor,
+        ):
+            await cursor.execute(TABLE_VERSIONS_SQL)
+            return build_table_versions(await cursor.fetchall())
+
+    async def execute_query(
+        self,
+        url: str,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        timeout_seconds: int | None = None,
+        row_format: RowFormat = "objects",
+        read_only: bool = False,
+    ) -> tuple[list[str], Rows, int]:
+        """Execute MySQL query.
+
+        The timeout is pushed down as ``MAX_EXECUTION_TIME``; cancelling the
+        awaiting task issues ``KILL QUERY`` and drops the connection.
+        """
+        start_time = time.time()
+        conn_params = self._build_aiomysql_params(url, tunnel_endpoint=tunnel_endpoint)
+
+        async with self._connection(conn_params, db_name) as conn:
+            try:
+                async with conn.cursor() as cursor:
+                    if timeout_seconds:
+                        await self._set_max_execution_time(cursor, timeout_seconds * 1000)
+                    if read_only:
+                        # Applies to the next transaction only
+                        await cursor.execute("SET TRANSACTION READ ONLY")
+                    try:
+                        await cursor.execute(sql)
+                        description = cursor.description or []
+                        columns = [desc[0] for desc in description]
+                        types = column_types([desc[1] for desc in description])
+                        rows = await cursor.fetchall() if cursor.description else []
+                    finally:
+                        if timeout_seconds and not _cancelling():
+                            # Don't leak the limit to the next borrower of a pooled
+                            # connection (a cancelled connection is closed instead)
+                            await self._set_max_execution_time(cursor, 0)
+            except aiomysql.OperationalError as e:
+                if e.args and e.args[0] == ER_QUERY_TIMEOUT:
+                    raise TimeoutError(
+                        f"Query execution exceeded timeout of {timeout_seconds} seconds"
+                    ) from e
+                raise
+            except asyncio.CancelledError:
+                await self._kill_query(conn_params, conn.thread_id())
+                # The protocol state is unknown mid-result; never reuse it
+                conn.close()
+                raise
+
+        serialized_rows = self._encode_rows(columns, rows, row_format, types)
+        execution_time_ms = int((time.time() - start_time) * 1000)
+
+        return columns, serialized_rows, execution_time_ms
+
+    async def stream_batches(
+        self,
+        url: str,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        timeout_seconds: int | None = None,
+        batch_size: int = 500,
+    ) -> AsyncGenerator[ResultBatch]:
+        """Stream MySQL query results through an unbuffered (SSCursor) cursor.
+
+        If the generator is closed before the result is exhausted, the rest of
+        the query is killed and the connection dropped.
+        """
+        conn_params = self._build_aiomysql_params(url, tunnel_endpoint=tunnel_endpoint)
+
+        async with self._connection(conn_params, db_name) as conn:
+            exhausted = False
+            cursor = None
+            try:
+                cursor = await conn.cursor(aiomysql.SSCursor)
+                if timeout_seconds:
+                    await self._set_max_execution_time(cursor, timeout_seconds * 1000)
+                await cursor.execute(sql)
+                description = cursor.description or []
+                columns = [desc[0] for desc in description]
+                types = column_types([desc[1] for desc in description])
+
+                first = True
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    exhausted = len(rows) < batch_size
+                    if rows or first:
+                        yield ResultBatch(columns, types, rows)
+                    first = False
+                    if exhausted:
+                        break
+            except aiomysql.OperationalError as e:
+                exhausted = True
+                if e.args and e.args[0] == ER_QUERY_TIMEOUT:
+                    raise TimeoutError(
+                        f"Query execution exceeded timeout of {timeout_seconds} seconds"
+                    ) from e
+                raise
+            finally:
+                if not exhausted:
+                    await self._kill_query(conn_params, conn.thread_id())
+                    # The protocol state is unknown mid-result; never reuse it
+                    conn.close()
+                elif timeout_seconds and cursor is not None:
+                    # Don't leak the limit to the next borrower of a pooled connection
+                    await self._set_max_execution_time(cursor, 0)
+
+    @staticmethod
+    async def _set_max_execution_time(cursor: Any, milliseconds: int) -> None:
+        """Set the session statement timeout (MySQL 5.7.8+; ignored elsewhere, e.g. MariaDB)."""
+        try:
+            await cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {int(milliseconds)}")
+        except aiomysql.Error as e:
+            logger.debug(f"MAX_EXECUTION_TIME not supported: {e}")
+
+    @staticmethod
+    async def _kill_query(conn_params: dict[str, Any], thread_id: int) -> None:
+        """Abort the statement running on another connection."""
+        try:
+            conn = await aiomysql.connect(**conn_params)
+            try:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(f"KILL QUERY {int(thread_id)}")
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"Failed to cancel MySQL query {thread_id}: {e}")
@@ -0,0 +1,446 @@
+"""Connection pooling for the database connectors.
+
+Pools are keyed by registered database name. Each pool remembers the
+connection signature (effective URL or connection parameters) it was built
+from, so a changed URL or a re-created SSH tunnel transparently yields a
+fresh pool.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager, suppress
+from typing import Any, TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(ConnectionError):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class _PooledConnection:
+    """A raw DB-API connection plus bookkeeping timestamps."""
+
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn: Any) -> None:
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """Thread-safe pool of DB-API connections for a single database.
+
+    Connections are opened lazily up to ``max_size``. Idle connections beyond
+    ``min_size`` are closed after ``idle_timeout`` seconds. Connections that
+    have been idle longer than ``health_check_interval`` seconds are checked
+    with ``ping`` before being handed out, and every connection is ``reset``
+    (rolled back) when returned; a failing reset discards the connection.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], Any],
+        *,
+        ping: Callable[[Any], None],
+        reset: Callable[[Any], None],
+        min_size: int | None = None,
+        max_size: int | None = None,
+        idle_timeout: float | None = None,
+        acquire_timeout: float | None = None,
+        health_check_interval: float | None = None,
+    ) -> None:
+        self.name = name
+        self._connect = connect
+        self._ping = ping
+        self._reset = reset
+        self.min_size = settings.pool_min_size if min_size is None else min_size
+        self.max_size = settings.pool_max_size if max_size is None else max_size
+        self.idle_timeout = settings.pool_idle_timeout if idle_timeout is None else idle_timeout
+        self.acquire_timeout = (
+            settings.pool_acquire_timeout if acquire_timeout is None else acquire_timeout
+        )
+        self.health_check_interval = (
+            settings.pool_health_check_interval
+            if health_check_interval is None
+            else health_check_interval
+        )
+
+        self._idle: deque[_PooledConnection] = deque()
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        # Counters exposed through stats()
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._health_check_failures = 0
+
+    @property
+    def closed(self) -> bool:
+        """Whether the pool has been closed."""
+        return self._closed
+
+    def acquire(self) -> _PooledConnection:
+        """Borrow a connection, opening a new one if the pool has room.
+
+        Raises:
+            PoolTimeoutError: If the pool is exhausted for ``acquire_timeout`` seconds
+            ConnectionError: If the pool has been closed
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        expired: list[_PooledConnection] = []
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise ConnectionError(f"Connection pool for '{self.name}' is closed")
+
+                expired.extend(self._evict_expired_locked())
+
+                if self._idle:
+                    # LIFO: the most recently returned connection is the warmest
+                    entry: _PooledConnection | None = self._idle.pop()
+                    self._in_use += 1
+                    break
+
+                if len(self._idle) + self._in_use < self.max_size:
+                    entry = None
+                    self._in_use += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Timed out waiting for a connection to '{self.name}' "
+                        f"(pool size {self.max_size})"
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+        for stale in expired:
+            self._close_quietly(stale.conn)
+
+        if entry is not None and self._needs_health_check(entry):
+            try:
+                self._ping(entry.conn)
+            except Exception as e:
+                logger.info(f"Discarding dead pooled connection for {self.name}: {e}")
+                with self._cond:
+                    self._health_check_failures += 1
+                    self._discarded += 1
+                self._close_quietly(entry.conn)
+                entry = None
+
+        if entry is None:
+            try:
+                entry = _PooledConnection(self._connect())
+            except BaseException:
+                with self._cond:
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._created += 1
+        else:
+            with self._cond:
+                self._reused += 1
+
+        return entry
+
+    def release(self, entry: _PooledConnection, discard: bool = False) -> None:
+        """Return a borrowed connection to the pool.
+
+        Args:
+            entry: Connection previously returned by ``acquire``
+            discard: Close the connection instead of keeping it
+        """
+        if not discard and not self._closed:
+            try:
+                self._reset(entry.conn)
+            except Exception as e:
+                logger.info(f"Discarding pooled connection for {self.name} after reset failure: {e}")
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._discarded += 1
+                keep = False
+            else:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+                keep = True
+            self._cond.notify()
+
+        if not keep:
+            self._close_quietly(entry.conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for the duration of a ``with`` block."""
+        entry = self.acquire()
+        try:
+            yield entry.conn
+        finally:
+            self.release(entry)
+
+    def close(self) -> None:
+        """Close idle connections and refuse further borrowing.
+
+        Connections currently borrowed are closed when they are released.
+        """
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+
+        for entry in idle:
+            self._close_quietly(entry.conn)
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of pool occupancy and lifetime counters."""
+        with self._cond:
+            return {
+                "name": self.name,
+                "size": len(self._idle) + self._in_use,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "created": self._created,
+                "reused": self._reused,
+                "discarded": self._discarded,
+                "timeouts": self._timeouts,
+                "health_check_failures": self._health_check_failures,
+                "closed": self._closed,
+            }
+
+    def _needs_health_check(self, entry: _PooledConnection) -> bool:
+        return time.monotonic() - entry.last_used >= self.health_check_interval
+
+    def _evict_expired_locked(self) -> list[_PooledConnection]:
+        """Remove idle connections past ``idle_timeout`` while keeping ``min_size``."""
+        if self.idle_timeout <= 0:
+            return []
+
+        now = time.monotonic()
+        expired: list[_PooledConnection] = []
+        # Oldest idle connections sit at the left end of the deque
+        while (
+            self._idle
+            and len(self._idle) + self._in_use > self.min_size
+            and now - self._idle[0].last_used > self.idle_timeout
+        ):
+            expired.append(self._idle.popleft())
+        self._discarded += len(expired)
+        return expired
+
+    @staticmethod
+    def _close_quietly(conn: Any) -> None:
+        with suppress(Exception):
+            conn.close()
+
+
+class AsyncPoolHandle:
+    """Registers a driver-native asyncio pool (asyncpg, aiomysql) with the manager.
+
+    The driver pool is created lazily on first use, inside the event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        create: Callable[[], Awaitable[Any]],
+        *,
+        terminate: Callable[[Any], None],
+        describe: Callable[[Any], tuple[int, int, int, int]],
+    ) -> None:
+        """
+        Args:
+            name: Registered database name
+            create: Coroutine factory creating the driver pool
+            terminate: Closes the driver pool without awaiting
+            describe: Returns (size, idle, min_size, max_size) for the driver pool
+        """
+        self.name = name
+        self._create = create
+        self._terminate = terminate
+        self._describe = describe
+        self._pool: Any = None
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """Whether the pool has been closed."""
+        return self._closed
+
+    async def get(self) -> Any:
+        """Get the driver pool, creating it on first use."""
+        async with self._lock:
+            if self._closed:
+                raise ConnectionError(f"Connection pool for '{self.name}' is closed")
+            if self._pool is None:
+                self._pool = await self._create()
+            return self._pool
+
+    def close(self) -> None:
+        """Terminate the driver pool."""
+        self._closed = True
+        if self._pool is not None:
+            try:
+                self._terminate(self._pool)
+            except Exception as e:
+                logger.warning(f"Failed to close async pool for {self.name}: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of pool occupancy in the same shape as ConnectionPool.stats()."""
+        size = idle = min_size = max_size = 0
+        if self._pool is not None and not self._closed:
+            size, idle, min_size, max_size = self._describe(self._pool)
+        return {
+            "name": self.name,
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "waiting": 0,
+            "min_size": min_size,
+            "max_size": max_size,
+            "created": 0,
+            "reused": 0,
+            "discarded": 0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "closed": self._closed,
+        }
+
+
+_PoolT = TypeVar("_PoolT", ConnectionPool, AsyncPoolHandle)
+
+
+class ConnectionPoolManager:
+    """Registry of connection pools keyed by registered database name."""
+
+    def __init__(self) -> None:
+        self._pools: dict[str, tuple[str, ConnectionPool | AsyncPoolHandle]] = {}
+        self._lock = threading.Lock()
+
+    def get_pool(
+        self,
+        db_name: str,
+        signature: str,
+        pool_type: type[_PoolT],
+        factory: Callable[[], _PoolT],
+    ) -> _PoolT:
+        """Get the pool for a database, rebuilding it if the signature changed.
+
+        Args:
+            db_name: Registered database name
+            signature: Effective connection target (URL or parameters)
+            pool_type: Class of the pools built by factory; a registered pool
+                of another class is replaced
+            factory: Creates a new pool when none matches
+
+        Returns:
+            Pool for the database
+        """
+        stale: ConnectionPool | AsyncPoolHandle | None = None
+        with self._lock:
+            existing = self._pools.get(db_name)
+            if existing:
+                current = existing[1]
+                if (
+                    existing[0] == signature
+                    and isinstance(current, pool_type)
+                    and not current.closed
+                ):
+                    return current
+                stale = current
+            pool = factory()
+            self._pools[db_name] = (signature, pool)
+
+        if stale:
+            stale.close()
+        return pool
+
+    def invalidate(self, db_name: str) -> None:
+        """Close and forget the pool for a database (e.g. URL changed or deleted)."""
+        with self._lock:
+            existing = self._pools.pop(db_name, None)
+        if existing:
+            logger.info(f"Invalidated connection pool for {db_name}")
+            existing[1].close()
+
+    def close_all(self) -> None:
+        """Close every pool (application shutdown)."""
+        with self._lock:
+            pools = [pool for _, pool in self._pools.values()]
+            self._pools.clear()
+        for pool in pools:
+            pool.close()
+
+    def get_stats(self, db_name: str) -> dict[str, Any] | None:
+        """Stats for a single database pool, or None if no pool exists."""
+        with self._lock:
+            existing = self._pools.get(db_name)
+        return existing[1].stats() if existing else None
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Stats for every pool, ordered by database name."""
+        with self._lock:
+            pools = sorted(self._pools.items())
+        return [pool.stats() for _, (_, pool) in pools]
+
+
+@contextmanager
+def borrow_connection(
+    db_name: str | None,
+    signature: str,
+    connect: Callable[[], Any],
+    *,
+    ping: Callable[[Any], None],
+    reset: Callable[[Any], None],
+) -> Iterator[Any]:
+    """Yield a connection, pooled when a registered database name is known.
+
+    Without a database name (e.g. testing an unsaved URL) a one-off
+    connection is opened and closed around the block.
+    """
+    if db_name is None:
+        conn = connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+        return
+
+    pool = pool_manager.get_pool(
+        db_name,
+        signature,
+        ConnectionPool,
+        lambda: ConnectionPool(db_name, connect, ping=ping, reset=reset),
+    )
+    with pool.connection() as conn:
+        yield conn
+
+
+# Global instance
+pool_manager = ConnectionPoolManager()
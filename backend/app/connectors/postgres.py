@@ -1,15 +1,439 @@
 """PostgreSQL database connector."""
 
 import asyncio
+import logging
+import threading
 import time
+import uuid
+from collections.abc import AsyncGenerator, Callable, Collection, Iterator, Sequence
+from contextlib import ExitStack, contextmanager
 from typing import Any
 from urllib.parse import ParseResult, parse_qs, urlparse, urlunparse
 
 import psycopg2
+from psycopg2.extensions import QueryCanceledError
 from psycopg2.extensions import connection as PgConnection
 
-from app.connectors.base import DatabaseConnector
+from app.config import settings
+from app.connectors.base import (
+    DatabaseConnector,
+    ResultBatch,
+    Rows,
+    TableKey,
+    TableVersion,
+)
+from app.connectors.converters import ColumnType
+from app.connectors.executors import BoundedExecutor, executor_manager
+from app.connectors.pool import borrow_connection
 from app.models.metadata import ColumnInfo, TableMetadata
+from app.models.query import RowFormat
+
+logger = logging.getLogger(__name__)
+
+
+# Metadata queries, shared by the psycopg2 and asyncpg connectors
+
+SCHEMAS_SQL = """
+    SELECT schema_name
+    FROM information_schema.schemata
+    WHERE schema_name NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
+    ORDER BY schema_name
+"""
+
+# The table, primary key and column queries read pg_catalog directly with
+# set-based joins instead of information_schema, whose views evaluate
+# privilege functions per row, and instead of per-row regclass casts and
+# obj_description()/col_description() lookups. They return the same rows the
+# information_schema views would (same visibility rules and type names).
+
+_SYSTEM_SCHEMAS = "'pg_catalog', 'information_schema', 'pg_toast'"
+
+# Oldest server (server_version_num) the metadata queries run on: they read
+# pg_attribute.attidentity and partitioned tables, both PostgreSQL 10+.
+# pg_attribute.attgenerated only exists on PostgreSQL 12+.
+MIN_SERVER_VERSION = 100000
+_GENERATED_COLUMNS_VERSION = 120000
+
+# Relations listed by information_schema.tables: tables, views, foreign and
+# partitioned tables the user owns or has any privilege on
+_VISIBLE_TABLES = f"""c.relkind IN ('r', 'v', 'f', 'p')
+        AND n.nspname NOT IN ({_SYSTEM_SCHEMAS})
+        AND NOT pg_is_other_temp_schema(n.oid)
+        AND (
+            pg_has_role(c.relowner, 'USAGE')
+            OR has_table_privilege(
+                c.oid, 'SELECT, INSERT, UPDATE, DELETE, TRUNCATE, REFERENCES, TRIGGER'
+            )
+            OR has_any_column_privilege(c.oid, 'SELECT, INSERT, UPDATE, REFERENCES')
+        )"""
+
+# Row counts are the planner's estimate (pg_class.reltuples, -1 before the
+# first ANALYZE on PostgreSQL 14+); sizes include indexes and TOAST
+_TABLES_SQL = f"""
+    SELECT
+        n.nspname as table_schema,
+        c.relname as table_name,
+        CASE
+            WHEN n.oid = pg_my_temp_schema() THEN 'LOCAL TEMPORARY'
+            WHEN c.relkind IN ('r', 'p') THEN 'BASE TABLE'
+            WHEN c.relkind = 'v' THEN 'VIEW'
+            WHEN c.relkind = 'f' THEN 'FOREIGN'
+        END as table_type,
+        d.description as table_comment,
+        CASE WHEN c.relkind IN ('r', 'p') AND c.reltuples >= 0
+            THEN c.reltuples::bigint END as row_estimate,
+        CASE WHEN c.relkind = 'r'
+            THEN pg_total_relation_size(c.oid) END as total_bytes
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_description d
+        ON d.objoid = c.oid AND d.classoid = 'pg_class'::regclass AND d.objsubid = 0
+    WHERE {_VISIBLE_TABLES}{{table_filter}}
+    ORDER BY n.nspname, c.relname
+"""
+
+# information_schema.table_constraints only shows constraints of tables the
+# user has privileges other than SELECT on, and key_column_usage only
+# columns the user has privileges on
+_PRIMARY_KEYS_SQL = f"""
+    SELECT
+        n.nspname as table_schema,
+        c.relname as table_name,
+        a.attname as column_name
+    FROM pg_constraint con
+    JOIN pg_class c ON c.oid = con.conrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = ANY (con.conkey)
+    WHERE con.contype = 'p'
+        AND c.relkind IN ('r', 'p')
+        AND n.nspname NOT IN ({_SYSTEM_SCHEMAS})
+        AND NOT pg_is_other_temp_schema(n.oid)
+        AND (
+            pg_has_role(c.relowner, 'USAGE')
+            OR has_table_privilege(
+                c.oid, 'INSERT, UPDATE, DELETE, TRUNCATE, REFERENCES, TRIGGER'
+            )
+            OR has_any_column_privilege(c.oid, 'INSERT, UPDATE, REFERENCES')
+        )
+        AND (
+            pg_has_role(c.relowner, 'USAGE')
+            OR has_column_privilege(c.oid, a.attnum, 'SELECT, INSERT, UPDATE, REFERENCES')
+        ){{table_filter}}
+"""
+
+# data_type follows information_schema.columns: the base type of domains,
+# "ARRAY" and "USER-DEFINED" for arrays and types outside pg_catalog;
+# generated columns have no default (not_generated is TRUE before PostgreSQL 12)
+_COLUMNS_SQL = f"""
+    SELECT
+        n.nspname as table_schema,
+        c.relname as table_name,
+        a.attname as column_name,
+        CASE
+            WHEN t.typtype = 'd' THEN
+                CASE
+                    WHEN bt.typelem <> 0 AND bt.typlen = -1 THEN 'ARRAY'
+                    WHEN nbt.nspname = 'pg_catalog' THEN format_type(t.typbasetype, NULL)
+                    ELSE 'USER-DEFINED'
+                END
+            WHEN t.typelem <> 0 AND t.typlen = -1 THEN 'ARRAY'
+            WHEN nt.nspname = 'pg_catalog' THEN format_type(a.atttypid, NULL)
+            ELSE 'USER-DEFINED'
+        END as data_type,
+        CASE WHEN a.attnotnull OR (t.typtype = 'd' AND t.typnotnull)
+            THEN 'NO' ELSE 'YES' END as is_nullable,
+        CASE WHEN {{not_generated}}
+            THEN pg_get_expr(ad.adbin, ad.adrelid) END as column_default,
+        d.description as column_comment,
+        CASE a.attidentity
+            WHEN 'a' THEN 'ALWAYS'
+            WHEN 'd' THEN 'BY DEFAULT'
+        END as identity_generation,
+        CASE WHEN a.attidentity IN ('a', 'd') THEN 'YES' ELSE 'NO' END as is_identity
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_type t ON t.oid = a.atttypid
+    JOIN pg_namespace nt ON nt.oid = t.typnamespace
+    LEFT JOIN pg_type bt ON t.typtype = 'd' AND bt.oid = t.typbasetype
+    LEFT JOIN pg_namespace nbt ON nbt.oid = bt.typnamespace
+    LEFT JOIN pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+    LEFT JOIN pg_description d
+        ON d.objoid = c.oid AND d.classoid = 'pg_class'::regclass AND d.objsubid = a.attnum
+    WHERE a.attnum > 0
+        AND NOT a.attisdropped
+        AND c.relkind IN ('r', 'v', 'f', 'p')
+        AND n.nspname NOT IN ({_SYSTEM_SCHEMAS})
+        AND NOT pg_is_other_temp_schema(n.oid)
+        AND (
+            pg_has_role(c.relowner, 'USAGE')
+            OR has_column_privilege(c.oid, a.attnum, 'SELECT, INSERT, UPDATE, REFERENCES')
+        ){{table_filter}}
+    ORDER BY n.nspname, c.relname, a.attnum
+"""
+
+_NOT_GENERATED = "a.attgenerated = ''"
+
+TABLES_SQL = _TABLES_SQL.format(table_filter="")
+PRIMARY_KEYS_SQL = _PRIMARY_KEYS_SQL.format(table_filter="")
+COLUMNS_SQL = _COLUMNS_SQL.format(table_filter="", not_generated=_NOT_GENERATED)
+
+# Limits a metadata query to the (schema, table) pairs of two text arrays
+_TABLE_FILTER = """
+        AND (n.nspname, c.relname) IN (
+            SELECT * FROM unnest({schemas}::text[], {names}::text[])
+        )"""
+
+# One row per table listed by TABLES_SQL. The fingerprint covers everything
+# the metadata queries read: OID (changes when a table is dropped and
+# recreated), comments, columns with types, defaults and identity, and the
+# primary key.
+TABLE_VERSIONS_SQL = f"""
+    SELECT
+        n.nspname,
+        c.relname,
+        md5(concat_ws('|',
+            c.oid,
+            c.relkind,
+            quote_nullable(obj_description(c.oid, 'pg_class')),
+            (
+                SELECT string_agg(concat_ws(':',
+                    a.attnum,
+                    quote_ident(a.attname),
+                    format_type(a.atttypid, a.atttypmod),
+                    a.attnotnull,
+                    a.attidentity,
+                    quote_nullable(pg_get_expr(d.adbin, d.adrelid)),
+                    quote_nullable(col_description(c.oid, a.attnum))
+                ), ',' ORDER BY a.attnum)
+                FROM pg_attribute a
+                LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+                WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+            ),
+            (
+                SELECT i.indkey::text
+                FROM pg_index i
+                WHERE i.indrelid = c.oid AND i.indisprimary
+            )
+        )) as fingerprint,
+        CASE WHEN c.relkind IN ('r', 'p') AND c.reltuples >= 0
+            THEN c.reltuples::bigint END as row_estimate,
+        CASE WHEN c.relkind = 'r'
+            THEN pg_total_relation_size(c.oid) END as total_bytes
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE {_VISIBLE_TABLES}
+"""
+
+
+def check_server_version(server_version: int) -> None:
+    """
+    Check that the metadata queries can run on a server.
+
+    Args:
+        server_version: server_version_num of the server, e.g. 160002
+
+    Raises:
+        ValueError: If the server is older than PostgreSQL 10
+    """
+    if server_version < MIN_SERVER_VERSION:
+        major, minor = divmod(server_version // 100, 100)
+        raise ValueError(
+            f"Reading metadata requires PostgreSQL 10 or later (server is {major}.{minor})"
+        )
+
+
+def metadata_queries(
+    tables: Collection[TableKey] | None = None,
+    placeholders: tuple[str, str] = ("%s", "%s"),
+    *,
+    schema: str | None = None,
+    server_version: int | None = None,
+) -> list[tuple[str, list[Any] | None]]:
+    """
+    Tables, primary key and column queries with their parameters.
+
+    Args:
+        tables: Only read these (schema, table) pairs; all tables if None
+        placeholders: Parameter markers of the driver (``$1``, ``$2`` for asyncpg)
+        schema: Only read this schema (ignored if ``tables`` is given)
+        server_version: server_version_num of the server; the queries for the
+            current PostgreSQL versions if None
+
+    Raises:
+        ValueError: If the server is older than PostgreSQL 10
+    """
+    not_generated = _NOT_GENERATED
+    if server_version is not None:
+        check_server_version(server_version)
+        if server_version < _GENERATED_COLUMNS_VERSION:
+            not_generated = "TRUE"
+
+    params: list[Any] | None
+    if tables is not None:
+        params = [
+            [schema_name for schema_name, _ in tables],
+            [table_name for _, table_name in tables],
+        ]
+        table_filter = _TABLE_FILTER.format(schemas=placeholders[0], names=placeholders[1])
+    elif schema is not None:
+        params = [schema]
+        table_filter = f"\n        AND n.nspname = {placeholders[0]}"
+    else:
+        params = None
+        table_filter = ""
+
+    return [
+        (template.format(table_filter=table_filter, not_generated=not_generated), params)
+        for template in (_TABLES_SQL, _PRIMARY_KEYS_SQL, _COLUMNS_SQL)
+    ]
+
+
+def _fetch_tables(cursor: Any, queries: list[tuple[str, list[Any] | None]]) -> list[TableMetadata]:
+    """Run the metadata queries on a psycopg2 cursor."""
+    results = []
+    for sql, params in queries:
+        if params is None:
+            cursor.execute(sql)
+        else:
+            cursor.execute(sql, params)
+        results.append(cursor.fetchall())
+    return build_table_metadata(*results)
+
+
+def build_table_versions(rows: Sequence[Sequence[Any]]) -> dict[TableKey, TableVersion]:
+    """Map the rows of TABLE_VERSIONS_SQL by (schema, table)."""
+    return {
+        (row[0], row[1]): TableVersion(fingerprint=row[2], row_count=row[3], size_bytes=row[4])
+        for row in rows
+    }
+
+
+def build_table_metadata(
+    tables_raw: Sequence[Sequence[Any]],
+    pk_raw: Sequence[Sequence[Any]],
+    columns_raw: Sequence[Sequence[Any]],
+) -> list[TableMetadata]:
+    """Assemble TableMetadata from the rows of the metadata queries."""
+    # Get primary key info
+    pk_columns: dict[str, set[str]] = {}
+    for row in pk_raw:
+        key = f"{row[0]}.{row[1]}"
+        if key not in pk_columns:
+            pk_columns[key] = set()
+        pk_columns[key].add(row[2])
+
+    # Group columns by table
+    columns_by_table: dict[str, list[ColumnInfo]] = {}
+    for row in columns_raw:
+        key = f"{row[0]}.{row[1]}"
+        if key not in columns_by_table:
+            columns_by_table[key] = []
+
+        is_pk = key in pk_columns and row[2] in pk_columns[key]
+
+        # Logic for extra: identity generation
+        extra = None
+        if row[8] == "YES":  # is_identity
+            if row[7] == "ALWAYS":
+                extra = "generated always as identity"
+            else:
+                extra = "generated by default as identity"
+
+        columns_by_table[key].append(
+            ColumnInfo(
+                name=row[2],
+                data_type=row[3],
+                is_nullable=row[4] == "YES",
+                is_primary_key=is_pk,
+                default_value=row[5],
+                comment=row[6],
+                extra=extra,
+            )
+        )
+
+    # Build table metadata
+    tables: list[TableMetadata] = []
+    for row in tables_raw:
+        key = f"{row[0]}.{row[1]}"
+        table_type = "view" if row[2] == "VIEW" else "table"
+
+        tables.append(
+            TableMetadata(
+                schema_name=row[0],
+                table_name=row[1],
+                table_type=table_type,
+                columns=columns_by_table.get(key, []),
+                row_count=row[4],
+                size_bytes=row[5],
+                comment=row[3],
+            )
+        )
+
+    return tables
+
+
+# Result column types by type OID; anything not listed is a generic "string"
+PG_COLUMN_TYPES: dict[int, ColumnType] = {
+    16: "bool",  # bool
+    17: "binary",  # bytea
+    19: "text",  # name
+    20: "int",  # int8
+    21: "int",  # int2
+    23: "int",  # int4
+    25: "text",  # text
+    26: "int",  # oid
+    700: "float",  # float4
+    701: "float",  # float8
+    1042: "text",  # bpchar
+    1043: "text",  # varchar
+    1082: "date",  # date
+    1083: "time",  # time
+    1114: "timestamp",  # timestamp
+    1184: "timestamptz",  # timestamptz
+    1700: "decimal",  # numeric
+}
+
+
+def build_table_list(tables_raw: Sequence[Sequence[Any]]) -> list[TableMetadata]:
+    """Assemble TableMetadata without columns from the rows of TABLES_SQL."""
+    return [
+        table.model_copy(update={"columns_loaded": False})
+        for table in build_table_metadata(tables_raw, [], [])
+    ]
+
+
+def column_types(type_oids: Sequence[int]) -> list[ColumnType]:
+    """Map result column type OIDs to driver-independent column types."""
+    return [PG_COLUMN_TYPES.get(oid, "string") for oid in type_oids]
+
+
+async def _run_cancellable[T](
+    executor: BoundedExecutor, conn: PgConnection, func: Callable[..., T], *args: Any
+) -> T:
+    """Run a blocking cursor call in a thread, cancelling the statement if abandoned."""
+    try:
+        return await executor.run(func, *args)
+    except asyncio.CancelledError:
+        try:
+            conn.cancel()
+        except Exception as e:
+            logger.warning(f"Failed to cancel PostgreSQL query: {e}")
+        raise
+
+
+def _ping(conn: PgConnection) -> None:
+    """Health check for a pooled PostgreSQL connection."""
+    if conn.closed:
+        raise psycopg2.InterfaceError("connection already closed")
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    conn.rollback()
+
+
+def _reset(conn: PgConnection) -> None:
+    """End any open transaction before a connection goes back to the pool."""
+    conn.rollback()
 
 
 class PostgreSQLConnector(DatabaseConnector):
@@ -21,7 +445,8 @@ class PostgreSQLConnector(DatabaseConnector):
 
     def detect_db_type(self, url: str) -> str:
         """Detect database type from URL."""
-        if url.startswith("postgresql://") or url.startswith("postgres://"):
+        scheme = url.split("://", 1)[0].split("+", 1)[0] if "://" in url else ""
+        if scheme in ("postgresql", "postgres"):
             return "postgresql"
         raise ValueError(f"Unsupported database URL: {url}")
 
@@ -56,8 +481,34 @@ class PostgreSQLConnector(DatabaseConnector):
         )
         return urlunparse(new_parsed)
 
+    @contextmanager
+    def _connection(
+        self, connection_url: str, db_name: str | None, connect_timeout: int | None = None
+    ) -> Iterator[PgConnection]:
+        """Borrow a pooled connection for a registered database.
+
+        Without ``db_name`` a one-off connection is opened and closed instead.
+        """
+
+        def _connect() -> PgConnection:
+            if db_name is None and connect_timeout is None:
+                return psycopg2.connect(connection_url)
+            return psycopg2.connect(
+                connection_url, connect_timeout=connect_timeout or settings.pg_connect_timeout
+            )
+
+        with borrow_connection(
+            db_name, connection_url, _connect, ping=_ping, reset=_reset
+        ) as conn:
+            yield conn
+
     async def test_connection(
-        self, url: str, timeout: int, tunnel_endpoint: tuple[str, int] | None = None
+        self,
+        url: str,
+        timeout: int,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
     ) -> None:
         """Test PostgreSQL connection."""
         # Use tunnel endpoint if provided
@@ -65,20 +516,27 @@ class PostgreSQLConnector(DatabaseConnector):
             self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
         )
 
-        def _connect() -> PgConnection:
+        def _connect() -> None:
             try:
-                conn = psycopg2.connect(connection_url, connect_timeout=timeout)
-                conn.close()
-                return conn
+                with self._connection(connection_url, db_name, connect_timeout=timeout) as conn:
+                    if db_name is not None:
+                        _ping(conn)
             except psycopg2.OperationalError as e:
                 raise ConnectionError(f"Failed to connect to PostgreSQL: {e}") from e
+            except ConnectionError:
+                raise
             except Exception as e:
                 raise ValueError(f"Invalid PostgreSQL connection URL: {e}") from e
 
-        await asyncio.to_thread(_connect)
+        await executor_manager.run(db_name, "postgresql", _connect)
 
     async def fetch_metadata(
-        self, url: str, tunnel_endpoint: tuple[str, int] | None = None
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        tables: Collection[TableKey] | None = None,
     ) -> tuple[list[str], list[TableMetadata]]:
         """Fetch PostgreSQL metadata."""
         # Use tunnel endpoint if provided
@@ -87,178 +545,240 @@ class PostgreSQLConnector(DatabaseConnector):
         )
 
         def _fetch() -> tuple[list[str], list[TableMetadata]]:
-            conn: PgConnection | None = None
-
-            try:
-                conn = psycopg2.connect(connection_url)
+            with self._connection(connection_url, db_name) as conn:
                 cursor = conn.cursor()
 
-                # Get all schemas
-                cursor.execute(
-                    """
-                    SELECT schema_name
-                    FROM information_schema.schemata
-                    WHERE schema_name NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
-                    ORDER BY schema_name
-                """
-                )
+                cursor.execute(SCHEMAS_SQL)
                 schemas = [row[0] for row in cursor.fetchall()]
+                if tables is not None and not tables:
+                    return schemas, []
 
-                # Get all tables and views
-                cursor.execute(
-                    """
-                    SELECT
-                        t.table_schema,
-                        t.table_name,
-                        t.table_type,
-                        obj_description(
-                            (t.table_schema || '.' || t.table_name)::regclass, 'pg_class'
-                        ) as table_comment
-                    FROM information_schema.tables t
-                    WHERE t.table_schema NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
-                    ORDER BY t.table_schema, t.table_name
-                """
-                )
-                tables_raw = cursor.fetchall()
-
-                # Get primary key info
-                cursor.execute(
-                    """
-                    SELECT
-                        tc.table_schema,
-                        tc.table_name,
-                        kcu.column_name
-                    FROM information_schema.table_constraints tc
-                    JOIN information_schema.key_column_usage kcu
-                        ON tc.constraint_name = kcu.constraint_name
-                        AND tc.table_schema = kcu.table_schema
-                    WHERE tc.constraint_type = 'PRIMARY KEY'
-                """
-                )
-                pk_columns: dict[str, set[str]] = {}
-                for row in cursor.fetchall():
-                    key = f"{row[0]}.{row[1]}"
-                    if key not in pk_columns:
-                        pk_columns[key] = set()
-                    pk_columns[key].add(row[2])
-
-                # Get all columns
-                cursor.execute(
-                    """
-                    SELECT
-                        c.table_schema,
-                        c.table_name,
-                        c.column_name,
-                        c.data_type,
-                        c.is_nullable,
-                        c.column_default,
-                        col_description(
-                            (c.table_schema || '.' || c.table_name)::regclass,
-                            c.ordinal_position
-                        ) as column_comment,
-                        c.identity_generation,
-                        c.is_identity
-                    FROM information_schema.columns c
-                    WHERE c.table_schema NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
-                    ORDER BY c.table_schema, c.table_name, c.ordinal_position
-                """
+                return schemas, _fetch_tables(
+                    cursor, metadata_queries(tables, server_version=conn.server_version)
                 )
-                columns_raw = cursor.fetchall()
-
-                # Group columns by table
-                columns_by_table: dict[str, list[ColumnInfo]] = {}
-                for row in columns_raw:
-                    key = f"{row[0]}.{row[1]}"
-                    if key not in columns_by_table:
-                        columns_by_table[key] = []
-
-                    is_pk = key in pk_columns and row[2] in pk_columns[key]
-
-                    # Logic for extra: identity generation
-                    extra = None
-                    if row[8] == "YES":  # is_identity
-                        if row[7] == "ALWAYS":
-                            extra = "generated always as identity"
-                        else:
-                            extra = "generated by default as identity"
-
-                    columns_by_table[key].append(
-                        ColumnInfo(
-                            name=row[2],
-                            data_type=row[3],
-                            is_nullable=row[4] == "YES",
-                            is_primary_key=is_pk,
-                            default_value=row[5],
-                            comment=row[6],
-                            extra=extra,
-                        )
-                    )
 
-                # Build table metadata
-                tables: list[TableMetadata] = []
-                for row in tables_raw:
-                    key = f"{row[0]}.{row[1]}"
-                    table_type = "view" if row[2] == "VIEW" else "table"
-
-                    tables.append(
-                        TableMetadata(
-                            schema_name=row[0],
-                            table_name=row[1],
-                            table_type=table_type,
-                            columns=columns_by_table.get(key, []),
-                            comment=row[3],
-                        )
-                    )
+        return await executor_manager.run(db_name, "postgresql", _fetch)
+
+    async def fetch_schemas(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> list[str]:
+        """Fetch PostgreSQL schema names."""
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
+
+        def _fetch() -> list[str]:
+            with self._connection(connection_url, db_name) as conn:
+                cursor = conn.cursor()
+                cursor.execute(SCHEMAS_SQL)
+                return [row[0] for row in cursor.fetchall()]
+
+        return await executor_manager.run(db_name, "postgresql", _fetch)
+
+    async def fetch_table_list(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> tuple[list[str], list[TableMetadata]]:
+        """Fetch PostgreSQL schema and table names without columns."""
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
+
+        def _fetch() -> tuple[list[str], list[TableMetadata]]:
+            with self._connection(connection_url, db_name) as conn:
+                cursor = conn.cursor()
+                cursor.execute(SCHEMAS_SQL)
+                schemas = [row[0] for row in cursor.fetchall()]
+                cursor.execute(TABLES_SQL)
+                return schemas, build_table_list(cursor.fetchall())
+
+        return await executor_manager.run(db_name, "postgresql", _fetch)
+
+    async def fetch_schema_metadata(
+        self,
+        url: str,
+        schema: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        tables: Collection[TableKey] | None = None,
+    ) -> list[TableMetadata]:
+        """Fetch the tables of one PostgreSQL schema."""
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
 
-                return schemas, tables
+        def _fetch() -> list[TableMetadata]:
+            with self._connection(connection_url, db_name) as conn:
+                queries = metadata_queries(
+                    tables, schema=schema, server_version=conn.server_version
+                )
+                return _fetch_tables(conn.cursor(), queries)
+
+        return await executor_manager.run(db_name, "postgresql", _fetch)
+
+    async def fetch_table_versions(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> dict[TableKey, TableVersion]:
+        """Fetch PostgreSQL table fingerprints from pg_class and pg_attribute."""
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
 
-            finally:
-                if conn:
-                    conn.close()
+        def _fetch() -> dict[TableKey, TableVersion]:
+            with self._connection(connection_url, db_name) as conn:
+                check_server_version(conn.server_version)
+                cursor = conn.cursor()
+                cursor.execute(TABLE_VERSIONS_SQL)
+                return build_table_versions(cursor.fetchall())
 
-        return await asyncio.to_thread(_fetch)
+        return await executor_manager.run(db_name, "postgresql", _fetch)
 
     async def execute_query(
-        self, url: str, sql: str, tunnel_endpoint: tuple[str, int] | None = None
-    ) -> tuple[list[str], list[dict[str, Any]], int]:
-        """Execute PostgreSQL query."""
+        self,
+        url: str,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        timeout_seconds: int | None = None,
+        row_format: RowFormat = "objects",
+        read_only: bool = False,
+    ) -> tuple[list[str], Rows, int]:
+        """Execute PostgreSQL query.
+
+        The timeout is enforced by the server through ``statement_timeout``;
+        cancelling the awaiting task sends a cancel request for the running
+        statement instead of leaving it to run in the worker thread.
+        """
         # Use tunnel endpoint if provided
         connection_url = (
             self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
         )
+        active: list[PgConnection] = []
+        cancelled = threading.Event()
 
-        def _execute() -> tuple[list[str], list[dict[str, Any]], int]:
+        def _execute() -> tuple[list[str], Rows, int]:
             start_time = time.time()
-            conn: PgConnection | None = None
 
-            try:
-                conn = psycopg2.connect(connection_url)
+            with self._connection(connection_url, db_name) as conn:
                 cursor = conn.cursor()
 
-                cursor.execute(sql)
+                if read_only:
+                    cursor.execute("SET TRANSACTION READ ONLY")
+                if timeout_seconds:
+                    # Scoped to the transaction, which is rolled back afterwards
+                    cursor.execute(
+                        "SELECT set_config('statement_timeout', %s, true)",
+                        (str(timeout_seconds * 1000),),
+                    )
 
-                columns = (
-                    [desc[0] for desc in cursor.description] if cursor.description else []
+                active.append(conn)
+                try:
+                    if cancelled.is_set():
+                        raise asyncio.CancelledError
+                    cursor.execute(sql)
+                except QueryCanceledError as e:
+                    raise TimeoutError(
+                        f"Query execution exceeded timeout of {timeout_seconds} seconds"
+                    ) from e
+                finally:
+                    active.clear()
+
+                description = cursor.description or []
+                columns = [desc[0] for desc in description]
+                types = column_types([desc[1] for desc in description])
+
+                rows = (
+                    self._encode_rows(columns, cursor.fetchall(), row_format, types)
+                    if cursor.description
+                    else []
                 )
 
-                rows = []
-                if cursor.description:
-                    for row in cursor.fetchall():
-                        row_dict = {
-                            columns[i]: self._serialize_value(val)
-                            for i, val in enumerate(row)
-                        }
-                        rows.append(row_dict)
-
                 execution_time_ms = int((time.time() - start_time) * 1000)
 
                 return columns, rows, execution_time_ms
 
-            finally:
-                if conn:
-                    conn.close()
+        try:
+            return await executor_manager.run(db_name, "postgresql", _execute)
+        except asyncio.CancelledError:
+            # The thread keeps waiting on the server; ask it to stop the statement
+            cancelled.set()
+            for conn in list(active):
+                try:
+                    conn.cancel()
+                except Exception as e:
+                    logger.warning(f"Failed to cancel PostgreSQL query: {e}")
+            raise
+
+    async def stream_batches(
+        self,
+        url: str,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        timeout_seconds: int | None = None,
+        batch_size: int = 500,
+    ) -> AsyncGenerator[ResultBatch]:
+        """Stream PostgreSQL query results through a named (server-side) cursor.
+
+        Only one batch is held in memory at a time. The connection stays
+        borrowed until the generator is exhausted or closed.
+        """
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
+        executor = executor_manager.for_database(db_name, "postgresql")
+        stack = ExitStack()
+        conn = await executor.run(stack.enter_context, self._connection(connection_url, db_name))
+        try:
+            if timeout_seconds:
+                # Applies to each FETCH; the caller enforces the overall deadline
+                await executor.run(
+                    conn.cursor().execute,
+                    "SELECT set_config('statement_timeout', %s, true)",
+                    (str(timeout_seconds * 1000),),
+                )
 
-        return await asyncio.to_thread(_execute)
+            cursor = conn.cursor(name=f"tablechat_stream_{uuid.uuid4().hex[:12]}")
+            columns: list[str] | None = None
+            types: list[ColumnType] = []
+            while True:
+                try:
+                    if columns is None:
+                        await _run_cancellable(executor, conn, cursor.execute, sql)
+                    rows = await _run_cancellable(executor, conn, cursor.fetchmany, batch_size)
+                except QueryCanceledError as e:
+                    raise TimeoutError(
+                        f"Query execution exceeded timeout of {timeout_seconds} seconds"
+                    ) from e
+
+                if columns is None:
+                    # Named cursors only describe the result after the first fetch
+                    description = cursor.description or []
+                    columns = [desc[0] for desc in description]
+                    types = column_types([desc[1] for desc in description])
+                elif not rows:
+                    break
+
+                yield ResultBatch(columns, types, rows)
+                if len(rows) < batch_size:
+                    break
+        finally:
+            # Rolling back on release also closes the server-side cursor
+            await executor.run(stack.close)
 
     def _serialize_value(self, value: Any) -> Any:
         """Convert PostgreSQL types to JSON-serializable types."""
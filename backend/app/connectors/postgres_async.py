@@ -0,0 +1,344 @@
+"""PostgreSQL connector on the native asyncio driver (asyncpg).
+
+Selected with a ``postgresql+asyncpg://`` (or ``postgres+asyncpg://``) URL.
+Queries run on the event loop instead of a worker thread, so concurrency is
+bounded by the connection pool rather than the default executor.
+"""
+
+import json
+import time
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator, Collection
+from contextlib import asynccontextmanager
+from typing import Any
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - optional dependency
+    asyncpg = None
+
+from app.config import settings
+from app.connectors.base import ResultBatch, Rows, TableKey, TableVersion
+from app.connectors.pool import AsyncPoolHandle, pool_manager
+from app.connectors.postgres import (
+    SCHEMAS_SQL,
+    TABLE_VERSIONS_SQL,
+    TABLES_SQL,
+    PostgreSQLConnector,
+    build_table_list,
+    build_table_metadata,
+    build_table_versions,
+    check_server_version,
+    column_types,
+    metadata_queries,
+)
+from app.models.metadata import TableMetadata
+from app.models.query import RowFormat
+
+
+def _require_asyncpg() -> None:
+    if asyncpg is None:
+        raise ValueError(
+            "postgresql+asyncpg:// URLs require the asyncpg package "
+            "(install with: pip install 'tablechat-backend[async]')"
+        )
+
+
+def _to_dsn(url: str) -> str:
+    """Strip the driver suffix so asyncpg accepts the URL."""
+    scheme, _, rest = url.partition("://")
+    return f"{scheme.split('+', 1)[0]}://{rest}"
+
+
+async def _init_connection(conn: Any) -> None:
+    """Decode json/jsonb like psycopg2 does (asyncpg returns them as str)."""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+def _server_version_num(conn: Any) -> int:
+    """server_version_num of an asyncpg connection, as psycopg2 reports it."""
+    version = conn.get_server_version()
+    if version.major >= 10:
+        return int(version.major * 10000 + version.minor)
+    return int(version.major * 10000 + version.minor * 100 + version.micro)
+
+
+def _describe_pool(pool: Any) -> tuple[int, int, int, int]:
+    return pool.get_size(), pool.get_idle_size(), pool.get_min_size(), pool.get_max_size()
+
+
+class AsyncPGConnector(PostgreSQLConnector):
+    """PostgreSQL connector implemented with asyncpg."""
+
+    @asynccontextmanager
+    async def _connection(  # type: ignore[override]
+        self, dsn: str, db_name: str | None, connect_timeout: int | None = None
+    ) -> AsyncIterator[Any]:
+        """Borrow a pooled asyncpg connection for a registered database.
+
+        Without ``db_name`` a one-off connection is opened and closed instead.
+        """
+        _require_asyncpg()
+        timeout = connect_timeout or settings.pg_connect_timeout
+
+        if db_name is None:
+            conn = await asyncpg.connect(dsn, timeout=timeout)
+            try:
+                await _init_connection(conn)
+                yield conn
+            finally:
+                await conn.close()
+            return
+
+        async def _create() -> Any:
+            return await asyncpg.create_pool(
+                dsn,
+                min_size=settings.pool_min_size,
+                max_size=settings.pool_max_size,
+                max_inactive_connection_lifetime=settings.pool_idle_timeout,
+                timeout=timeout,
+                init=_init_connection,
+            )
+
+        handle = pool_manager.get_pool(
+            db_name,
+            dsn,
+            AsyncPoolHandle,
+            lambda: AsyncPoolHandle(
+                db_name, _create, terminate=lambda p: p.terminate(), describe=_describe_pool
+            ),
+        )
+        pool = await handle.get()
+        # asyncpg resets released connections (open transactions are rolled back)
+        async with pool.acquire(timeout=settings.pool_acquire_timeout) as conn:
+            yield conn
+
+    async def test_connection(
+        self,
+        url: str,
+        timeout: int,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> None:
+        """Test PostgreSQL connection."""
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
+        _require_asyncpg()
+
+        try:
+            async with self._connection(
+                _to_dsn(connection_url), db_name, connect_timeout=timeout
+            ) as conn:
+                await conn.fetchval("SELECT 1")
+        except (asyncpg.PostgresError, OSError, TimeoutError) as e:
+            raise ConnectionError(f"Failed to connect to PostgreSQL: {e}") from e
+        except ConnectionError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Invalid PostgreSQL connection URL: {e}") from e
+
+    async def fetch_metadata(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        tables: Collection[TableKey] | None = None,
+    ) -> tuple[list[str], list[TableMetadata]]:
+        """Fetch PostgreSQL metadata."""
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
+
+        async with self._connection(_to_dsn(connection_url), db_name) as conn:
+            schemas = [row[0] for row in await conn.fetch(SCHEMAS_SQL)]
+            if tables is not None and not tables:
+                return schemas, []
+            queries = metadata_queries(
+                tables, placeholders=("$1", "$2"), server_version=_server_version_num(conn)
+            )
+            results = [await conn.fetch(sql, *(params or ())) for sql, params in queries]
+
+        return schemas, build_table_metadata(*results)
+
+    async def fetch_schemas(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> list[str]:
+        """Fetch PostgreSQL schema names."""
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
+
+        async with self._connection(_to_dsn(connection_url), db_name) as conn:
+            return [row[0] for row in await conn.fetch(SCHEMAS_SQL)]
+
+    async def fetch_table_list(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> tuple[list[str], list[TableMetadata]]:
+        """Fetch PostgreSQL schema and table names without columns."""
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
+
+        async with self._connection(_to_dsn(connection_url), db_name) as conn:
+            schemas = [row[0] for row in await conn.fetch(SCHEMAS_SQL)]
+            tables = build_table_list(await conn.fetch(TABLES_SQL))
+
+        return schemas, tables
+
+    async def fetch_schema_metadata(
+        self,
+        url: str,
+        schema: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        tables: Collection[TableKey] | None = None,
+    ) -> list[TableMetadata]:
+        """Fetch the tables of one PostgreSQL schema."""
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
+        async with self._connection(_to_dsn(connection_url), db_name) as conn:
+            queries = metadata_queries(
+                tables,
+                placeholders=("$1", "$2"),
+                schema=schema,
+                server_version=_server_version_num(conn),
+            )
+            results = [await conn.fetch(sql, *(params or ())) for sql, params in queries]
+
+        return build_table_metadata(*results)
+
+    async def fetch_table_versions(
+        self,
+        url: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+    ) -> dict[TableKey, TableVersion]:
+        """Fetch PostgreSQL table fingerprints from pg_class and pg_attribute."""
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
+
+        async with self._connection(_to_dsn(connection_url), db_name) as conn:
+            check_server_version(_server_version_num(conn))
+            return build_table_versions(await conn.fetch(TABLE_VERSIONS_SQL))
+
+    async def execute_query(
+        self,
+        url: str,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        timeout_seconds: int | None = None,
+        row_format: RowFormat = "objects",
+        read_only: bool = False,
+    ) -> tuple[list[str], Rows, int]:
+        """Execute PostgreSQL query.
+
+        asyncpg sends a cancel request itself when the awaiting task is
+        cancelled; the timeout is also pushed down as ``statement_timeout``.
+        """
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
+        start_time = time.time()
+
+        async with self._connection(_to_dsn(connection_url), db_name) as conn:
+            # Same semantics as psycopg2: run inside a transaction that is
+            # never committed
+            transaction = conn.transaction()
+            await transaction.start()
+            try:
+                if read_only:
+                    await conn.execute("SET TRANSACTION READ ONLY")
+                if timeout_seconds:
+                    await conn.execute(
+                        "SELECT set_config('statement_timeout', $1, true)",
+                        str(timeout_seconds * 1000),
+                    )
+                statement = await conn.prepare(sql)
+                attributes = statement.get_attributes()
+                columns = [attr.name for attr in attributes]
+                types = column_types([attr.type.oid for attr in attributes])
+                records = await statement.fetch()
+            except asyncpg.QueryCanceledError as e:
+                raise TimeoutError(
+                    f"Query execution exceeded timeout of {timeout_seconds} seconds"
+                ) from e
+            finally:
+                await transaction.rollback()
+
+        rows = self._encode_rows(columns, records, row_format, types)
+        execution_time_ms = int((time.time() - start_time) * 1000)
+
+        return columns, rows, execution_time_ms
+
+    async def stream_batches(
+        self,
+        url: str,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        db_name: str | None = None,
+        timeout_seconds: int | None = None,
+        batch_size: int = 500,
+    ) -> AsyncGenerator[ResultBatch]:
+        """Stream PostgreSQL query results through an asyncpg server-side cursor."""
+        connection_url = (
+            self._rewrite_url_for_tunnel(url, tunnel_endpoint) if tunnel_endpoint else url
+        )
+
+        async with self._connection(_to_dsn(connection_url), db_name) as conn:
+            # Cursors require a transaction; it is never committed
+            transaction = conn.transaction()
+            await transaction.start()
+            try:
+                if timeout_seconds:
+                    await conn.execute(
+                        "SELECT set_config('statement_timeout', $1, true)",
+                        str(timeout_seconds * 1000),
+                    )
+                statement = await conn.prepare(sql)
+                attributes = statement.get_attributes()
+                columns = [attr.name for attr in attributes]
+                types = column_types([attr.type.oid for attr in attributes])
+                cursor = await statement.cursor()
+
+                first = True
+                while True:
+                    records = await cursor.fetch(batch_size)
+                    if records or first:
+                        yield ResultBatch(columns, types, records)
+                    first = False
+                    if len(records) < batch_size:
+                        break
+            except asyncpg.QueryCanceledError as e:
+                raise TimeoutError(
+                    f"Query execution exceeded timeout of {timeout_seconds} seconds"
+                ) from e
+            finally:
+                await transaction.rollback()
+
+    def _serialize_value(self, value: Any) -> Any:
+        """Convert asyncpg types to JSON-serializable types."""
+        # psycopg2 returns uuid columns as strings; keep the API output identical
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return super()._serialize_value(value)
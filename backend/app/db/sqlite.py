@@ -1,7 +1,7 @@
 """SQLite database manager for storing connection configs and metadata."""
 
 import json
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Iterable
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
@@ -28,7 +28,11 @@ CREATE TABLE IF NOT EXISTS table_metadata (
     table_name TEXT NOT NULL,
     table_type TEXT NOT NULL CHECK (table_type IN ('table', 'view')),
     table_comment TEXT,
+    row_count INTEGER,
+    size_bytes INTEGER,
+    fingerprint TEXT,
     columns_json TEXT NOT NULL,
+    columns_loaded INTEGER NOT NULL DEFAULT 1,
     created_at TEXT NOT NULL DEFAULT (datetime('now')),
     UNIQUE (db_name, schema_name, table_name),
     FOREIGN KEY (db_name) REFERENCES databases(name) ON DELETE CASCADE
@@ -37,6 +41,27 @@ CREATE TABLE IF NOT EXISTS table_metadata (
 CREATE INDEX IF NOT EXISTS idx_metadata_db ON table_metadata(db_name);
 """
 
+UPSERT_METADATA_SQL = """
+INSERT INTO table_metadata (db_name, schema_name, table_name, table_type, table_comment,
+                            row_count, size_bytes, fingerprint, columns_json, columns_loaded,
+                            created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (db_name, schema_name, table_name) DO UPDATE SET
+    table_type = excluded.table_type,
+    table_comment = excluded.table_comment,
+    row_count = excluded.row_count,
+    size_bytes = excluded.size_bytes,
+    fingerprint = excluded.fingerprint,
+    columns_json = excluded.columns_json,
+    columns_loaded = excluded.columns_loaded,
+    created_at = excluded.created_at
+"""
+
+UPDATE_TABLE_STATS_SQL = """
+UPDATE table_metadata SET row_count = ?, size_bytes = ?
+WHERE db_name = ? AND schema_name = ? AND table_name = ?
+"""
+
 # Migration SQL for existing databases
 MIGRATION_ADD_DB_TYPE = """
 ALTER TABLE databases ADD COLUMN db_type TEXT DEFAULT 'postgresql';
@@ -54,6 +79,30 @@ MIGRATION_ADD_SSH_CONFIG = """
 ALTER TABLE databases ADD COLUMN ssh_config TEXT;
 """
 
+MIGRATION_ADD_CACHE_TTL = """
+ALTER TABLE databases ADD COLUMN cache_ttl_seconds INTEGER;
+"""
+
+# Planner row estimate and on-disk size of each table (one statement per column)
+MIGRATION_ADD_TABLE_SIZE = (
+    "ALTER TABLE table_metadata ADD COLUMN row_count INTEGER",
+    "ALTER TABLE table_metadata ADD COLUMN size_bytes INTEGER",
+)
+
+# Definition fingerprint of each table, for incremental metadata refreshes
+MIGRATION_ADD_TABLE_FINGERPRINT = """
+ALTER TABLE table_metadata ADD COLUMN fingerprint TEXT;
+"""
+
+# 0 for tables listed without columns (lazy metadata loading)
+MIGRATION_ADD_COLUMNS_LOADED = """
+ALTER TABLE table_metadata ADD COLUMN columns_loaded INTEGER NOT NULL DEFAULT 1;
+"""
+
+MIGRATION_ADD_COST_GUARD = """
+ALTER TABLE databases ADD COLUMN cost_guard TEXT;
+"""
+
 # Query history table schema
 QUERY_HISTORY_SCHEMA = """
 CREATE TABLE IF NOT EXISTS query_history (
@@ -80,6 +129,43 @@ CREATE VIRTUAL TABLE IF NOT EXISTS query_history_fts USING fts5(
 );
 """
 
+# Aggregated statistics per query fingerprint, with execution time sketch buckets
+QUERY_STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_stats (
+    db_name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    normalized_sql TEXT NOT NULL,
+    sample_sql TEXT NOT NULL,
+    exec_count INTEGER NOT NULL DEFAULT 0,
+    total_time_ms INTEGER NOT NULL DEFAULT 0,
+    max_time_ms INTEGER NOT NULL DEFAULT 0,
+    total_rows INTEGER NOT NULL DEFAULT 0,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (db_name, fingerprint),
+    FOREIGN KEY (db_name) REFERENCES databases(name) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS query_stats_buckets (
+    db_name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (db_name, fingerprint, bucket),
+    FOREIGN KEY (db_name, fingerprint)
+        REFERENCES query_stats(db_name, fingerprint) ON DELETE CASCADE
+);
+"""
+
+# ORDER BY expressions for top queries
+QUERY_STATS_ORDER = {
+    "total_time": "total_time_ms",
+    "mean_time": "CAST(total_time_ms AS REAL) / exec_count",
+    "max_time": "max_time_ms",
+    "count": "exec_count",
+    "rows": "total_rows",
+}
+
 # Editor memory table schema
 EDITOR_MEMORY_SCHEMA = """
 CREATE TABLE IF NOT EXISTS editor_memory (
@@ -144,9 +230,15 @@ class SQLiteManager:
             # Run migrations for existing databases
             await self._migrate_add_db_type(conn)
             await self._migrate_add_table_comment(conn)
+            await self._migrate_add_table_size(conn)
+            await self._migrate_add_table_fingerprint(conn)
+            await self._migrate_add_columns_loaded(conn)
             await self._migrate_add_ssl_disabled(conn)
             await self._migrate_add_ssh_config(conn)
+            await self._migrate_add_cache_ttl(conn)
+            await self._migrate_add_cost_guard(conn)
             await self._migrate_add_query_history(conn)
+            await self._migrate_add_query_stats(conn)
             await self._migrate_add_editor_memory(conn)
             await self._migrate_add_agent_conversations(conn)
 
@@ -176,6 +268,46 @@ class SQLiteManager:
                 # Column already exists or other error, ignore
                 pass
 
+    async def _migrate_add_table_size(self, conn: aiosqlite.Connection) -> None:
+        """Add row_count and size_bytes columns if they don't exist (migration for existing DBs)."""
+        cursor = await conn.execute("PRAGMA table_info(table_metadata)")
+        columns = await cursor.fetchall()
+        column_names = [col[1] for col in columns]
+        if "row_count" not in column_names:
+            try:
+                for statement in MIGRATION_ADD_TABLE_SIZE:
+                    await conn.execute(statement)
+                await conn.commit()
+            except Exception:
+                # Column already exists or other error, ignore
+                pass
+
+    async def _migrate_add_table_fingerprint(self, conn: aiosqlite.Connection) -> None:
+        """Add fingerprint column if it doesn't exist (migration for existing DBs)."""
+        cursor = await conn.execute("PRAGMA table_info(table_metadata)")
+        columns = await cursor.fetchall()
+        column_names = [col[1] for col in columns]
+        if "fingerprint" not in column_names:
+            try:
+                await conn.execute(MIGRATION_ADD_TABLE_FINGERPRINT)
+                await conn.commit()
+            except Exception:
+                # Column already exists or other error, ignore
+                pass
+
+    async def _migrate_add_columns_loaded(self, conn: aiosqlite.Connection) -> None:
+        """Add columns_loaded column if it doesn't exist (migration for existing DBs)."""
+        cursor = await conn.execute("PRAGMA table_info(table_metadata)")
+        columns = await cursor.fetchall()
+        column_names = [col[1] for col in columns]
+        if "columns_loaded" not in column_names:
+            try:
+                await conn.execute(MIGRATION_ADD_COLUMNS_LOADED)
+                await conn.commit()
+            except Exception:
+                # Column already exists or other error, ignore
+                pass
+
     async def _migrate_add_ssl_disabled(self, conn: aiosqlite.Connection) -> None:
         """Add ssl_disabled column if it doesn't exist (migration for existing DBs)."""
         cursor = await conn.execute("PRAGMA table_info(databases)")
@@ -202,6 +334,32 @@ class SQLiteManager:
                 # Column already exists or other error, ignore
                 pass
 
+    async def _migrate_add_cache_ttl(self, conn: aiosqlite.Connection) -> None:
+        """Add cache_ttl_seconds column if it doesn't exist (migration for existing DBs)."""
+        cursor = await conn.execute("PRAGMA table_info(databases)")
+        columns = await cursor.fetchall()
+        column_names = [col[1] for col in columns]
+        if "cache_ttl_seconds" not in column_names:
+            try:
+                await conn.execute(MIGRATION_ADD_CACHE_TTL)
+                await conn.commit()
+            except Exception:
+                # Column already exists or other error, ignore
+                pass
+
+    async def _migrate_add_cost_guard(self, conn: aiosqlite.Connection) -> None:
+        """Add cost_guard column if it doesn't exist (migration for existing DBs)."""
+        cursor = await conn.execute("PRAGMA table_info(databases)")
+        columns = await cursor.fetchall()
+        column_names = [col[1] for col in columns]
+        if "cost_guard" not in column_names:
+            try:
+                await conn.execute(MIGRATION_ADD_COST_GUARD)
+                await conn.commit()
+            except Exception:
+                # Column already exists or other error, ignore
+                pass
+
     async def _migrate_add_query_history(self, conn: aiosqlite.Connection) -> None:
         """Create query_history table and FTS5 index if they don't exist."""
         # Check if query_history table exists
@@ -228,6 +386,19 @@ class SQLiteManager:
                 # Table already exists or other error, ignore
                 pass
 
+    async def _migrate_add_query_stats(self, conn: aiosqlite.Connection) -> None:
+        """Create query_stats tables if they don't exist."""
+        cursor = await conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='query_stats_buckets'"
+        )
+        if not await cursor.fetchone():
+            try:
+                await conn.executescript(QUERY_STATS_SCHEMA)
+                await conn.commit()
+            except Exception:
+                # Table already exists or other error, ignore
+                pass
+
     async def _migrate_add_editor_memory(self, conn: aiosqlite.Connection) -> None:
         """Create editor_memory table and indexes if they don't exist."""
         # Check if editor_memory table exists
@@ -259,7 +430,7 @@ class SQLiteManager:
         """List all saved database connections."""
         async with self.get_connection() as conn:
             cursor = await conn.execute(
-                "SELECT name, url, db_type, ssl_disabled, ssh_config, created_at, updated_at FROM databases ORDER BY name"
+                "SELECT name, url, db_type, ssl_disabled, ssh_config, cache_ttl_seconds, cost_guard, created_at, updated_at FROM databases ORDER BY name"
             )
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
@@ -268,7 +439,7 @@ class SQLiteManager:
         """Get a database connection by name."""
         async with self.get_connection() as conn:
             cursor = await conn.execute(
-                "SELECT name, url, db_type, ssl_disabled, ssh_config, created_at, updated_at FROM databases WHERE name = ?",
+                "SELECT name, url, db_type, ssl_disabled, ssh_config, cache_ttl_seconds, cost_guard, created_at, updated_at FROM databases WHERE name = ?",
                 (name,),
             )
             row = await cursor.fetchone()
@@ -281,6 +452,8 @@ class SQLiteManager:
         db_type: str = "postgresql",
         ssl_disabled: bool = False,
         ssh_config: str | None = None,
+        cache_ttl_seconds: int | None = None,
+        cost_guard: str | None = None,
     ) -> dict[str, Any]:
         """Create or update a database connection."""
         now = datetime.now().isoformat()
@@ -290,13 +463,13 @@ class SQLiteManager:
             existing = await self.get_database(name)
             if existing:
                 await conn.execute(
-                    "UPDATE databases SET url = ?, db_type = ?, ssl_disabled = ?, ssh_config = ?, updated_at = ? WHERE name = ?",
-                    (url, db_type, ssl_disabled_int, ssh_config, now, name),
+                    "UPDATE databases SET url = ?, db_type = ?, ssl_disabled = ?, ssh_config = ?, cache_ttl_seconds = ?, cost_guard = ?, updated_at = ? WHERE name = ?",
+                    (url, db_type, ssl_disabled_int, ssh_config, cache_ttl_seconds, cost_guard, now, name),
                 )
             else:
                 await conn.execute(
-                    "INSERT INTO databases (name, url, db_type, ssl_disabled, ssh_config, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                    (name, url, db_type, ssl_disabled_int, ssh_config, now, now),
+                    "INSERT INTO databases (name, url, db_type, ssl_disabled, ssh_config, cache_ttl_seconds, cost_guard, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (name, url, db_type, ssl_disabled_int, ssh_config, cache_ttl_seconds, cost_guard, now, now),
                 )
             await conn.commit()
 
@@ -316,7 +489,8 @@ class SQLiteManager:
         async with self.get_connection() as conn:
             cursor = await conn.execute(
                 """
-                SELECT schema_name, table_name, table_type, table_comment, columns_json, created_at
+                SELECT schema_name, table_name, table_type, table_comment, row_count, size_bytes,
+                       columns_json, columns_loaded, created_at
                 FROM table_metadata
                 WHERE db_name = ?
                 ORDER BY schema_name, table_name
@@ -328,6 +502,7 @@ class SQLiteManager:
             for row in rows:
                 data = dict(row)
                 data["columns"] = json.loads(data.pop("columns_json"))
+                data["columns_loaded"] = bool(data["columns_loaded"])
                 result.append(data)
             return result
 
@@ -339,25 +514,96 @@ class SQLiteManager:
         table_type: str,
         columns: list[dict[str, Any]],
         table_comment: str | None = None,
+        row_count: int | None = None,
+        size_bytes: int | None = None,
+        fingerprint: str | None = None,
+        columns_loaded: bool = True,
     ) -> None:
         """Save or update table metadata."""
         columns_json = json.dumps(columns)
         now = datetime.now().isoformat()
         async with self.get_connection() as conn:
             await conn.execute(
-                """
-                INSERT INTO table_metadata (db_name, schema_name, table_name, table_type, table_comment, columns_json, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT (db_name, schema_name, table_name) DO UPDATE SET
-                    table_type = excluded.table_type,
-                    table_comment = excluded.table_comment,
-                    columns_json = excluded.columns_json,
-                    created_at = excluded.created_at
-                """,
-                (db_name, schema_name, table_name, table_type, table_comment, columns_json, now),
+                UPSERT_METADATA_SQL,
+                (
+                    db_name, schema_name, table_name, table_type, table_comment,
+                    row_count, size_bytes, fingerprint, columns_json, int(columns_loaded), now,
+                ),
             )
             await conn.commit()
 
+    async def save_metadata_bulk(
+        self,
+        db_name: str,
+        tables: Iterable[dict[str, Any]],
+        *,
+        replace: bool = False,
+        deleted: Iterable[tuple[str, str]] = (),
+        stats: Iterable[tuple[str, str, int | None, int | None]] = (),
+    ) -> int:
+        """
+        Save or update the metadata of many tables in one transaction.
+
+        Readers see either the old or the new metadata, never a mix.
+
+        Args:
+            db_name: Database connection name
+            tables: Keyword arguments of ``save_metadata`` (without db_name), one per table
+            replace: Delete all other metadata of the database
+            deleted: (schema, table) pairs whose metadata is deleted
+            stats: (schema, table, row_count, size_bytes) of tables whose
+                statistics are updated, leaving their columns untouched
+
+        Returns:
+            Number of tables saved
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                db_name, table["schema_name"], table["table_name"], table["table_type"],
+                table.get("table_comment"), table.get("row_count"), table.get("size_bytes"),
+                table.get("fingerprint"), json.dumps(table["columns"]),
+                int(table.get("columns_loaded", True)), now,
+            )
+            for table in tables
+        ]
+        async with self.get_connection() as conn:
+            # Take the write lock up front so the delete and inserts commit together
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                if replace:
+                    await conn.execute("DELETE FROM table_metadata WHERE db_name = ?", (db_name,))
+                await conn.executemany(
+                    """
+                    DELETE FROM table_metadata
+                    WHERE db_name = ? AND schema_name = ? AND table_name = ?
+                    """,
+                    [(db_name, schema_name, table_name) for schema_name, table_name in deleted],
+                )
+                await conn.executemany(UPSERT_METADATA_SQL, rows)
+                await conn.executemany(
+                    UPDATE_TABLE_STATS_SQL,
+                    [
+                        (row_count, size_bytes, db_name, schema_name, table_name)
+                        for schema_name, table_name, row_count, size_bytes in stats
+                    ],
+                )
+            except BaseException:
+                await conn.rollback()
+                raise
+            await conn.commit()
+        return len(rows)
+
+    async def get_table_fingerprints(self, db_name: str) -> dict[tuple[str, str], str | None]:
+        """Get the stored definition fingerprint of each table, by (schema, table)."""
+        async with self.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT schema_name, table_name, fingerprint FROM table_metadata WHERE db_name = ?",
+                (db_name,),
+            )
+            rows = await cursor.fetchall()
+            return {(row[0], row[1]): row[2] for row in rows}
+
     async def clear_metadata_for_database(self, db_name: str) -> None:
         """Clear all metadata for a database."""
         async with self.get_connection() as conn:
@@ -478,6 +724,85 @@ class SQLiteManager:
 
             return items, total
 
+    async def record_query_stats(
+        self,
+        db_name: str,
+        fingerprint: str,
+        normalized_sql: str,
+        sample_sql: str,
+        row_count: int,
+        execution_time_ms: int,
+        time_bucket: int,
+    ) -> None:
+        """Add one execution to the statistics of a query fingerprint."""
+        now = datetime.now().isoformat()
+        async with self.get_connection() as conn:
+            await conn.execute(
+                """
+                INSERT INTO query_stats
+                (db_name, fingerprint, normalized_sql, sample_sql, exec_count,
+                 total_time_ms, max_time_ms, total_rows, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?)
+                ON CONFLICT (db_name, fingerprint) DO UPDATE SET
+                    sample_sql = excluded.sample_sql,
+                    exec_count = exec_count + 1,
+                    total_time_ms = total_time_ms + excluded.total_time_ms,
+                    max_time_ms = MAX(max_time_ms, excluded.max_time_ms),
+                    total_rows = total_rows + excluded.total_rows,
+                    last_seen = excluded.last_seen
+                """,
+                (
+                    db_name, fingerprint, normalized_sql, sample_sql,
+                    execution_time_ms, execution_time_ms, row_count, now, now,
+                ),
+            )
+            await conn.execute(
+                """
+                INSERT INTO query_stats_buckets (db_name, fingerprint, bucket, count)
+                VALUES (?, ?, ?, 1)
+                ON CONFLICT (db_name, fingerprint, bucket) DO UPDATE SET count = count + 1
+                """,
+                (db_name, fingerprint, time_bucket),
+            )
+            await conn.commit()
+
+    async def list_query_stats(
+        self, db_name: str, sort: str = "total_time", limit: int = 20
+    ) -> list[dict[str, Any]]:
+        """List query fingerprint statistics, highest first, with their time buckets."""
+        order = QUERY_STATS_ORDER[sort]
+        async with self.get_connection() as conn:
+            cursor = await conn.execute(
+                f"""
+                SELECT fingerprint, normalized_sql, sample_sql, exec_count, total_time_ms,
+                       max_time_ms, total_rows, first_seen, last_seen
+                FROM query_stats
+                WHERE db_name = ?
+                ORDER BY {order} DESC, fingerprint
+                LIMIT ?
+                """,
+                (db_name, limit),
+            )
+            items = [dict(row) for row in await cursor.fetchall()]
+            if not items:
+                return items
+
+            by_fingerprint = {item["fingerprint"]: item for item in items}
+            for item in items:
+                item["buckets"] = {}
+            placeholders = ", ".join("?" * len(items))
+            cursor = await conn.execute(
+                f"""
+                SELECT fingerprint, bucket, count
+                FROM query_stats_buckets
+                WHERE db_name = ? AND fingerprint IN ({placeholders})
+                """,
+                (db_name, *by_fingerprint),
+            )
+            for row in await cursor.fetchall():
+                by_fingerprint[row["fingerprint"]]["buckets"][row["bucket"]] = row["count"]
+            return items
+
 
 # Global instance
 db_manager = SQLiteManager()
@@ -9,7 +9,11 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1 import router as v1_router
 from app.config import ConfigurationError, print_config_summary, settings, validate_config
+from app.connectors.executors import executor_manager
+from app.connectors.pool import pool_manager
 from app.db.sqlite import db_manager
+from app.services.job_service import job_service
+from app.services.result_store import result_store
 from app.services.ssh_tunnel import ssh_tunnel_manager
 from app.services.tokenizer import initialize_jieba
 
@@ -31,8 +35,18 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
     initialize_jieba()
     # Startup: Initialize database schema
     await db_manager.init_schema()
+    # Startup: Remove job and stored results left by a previous run (not persisted)
+    job_service.remove_orphaned_results()
+    result_store.remove_orphaned_files()
+    # Startup: Delete expired job results in the background
+    job_service.start_sweeper()
     yield
-    # Shutdown: Close all SSH tunnels
+    # Shutdown: Cancel query jobs and delete stored results, then close pooled
+    # database connections, driver threads and SSH tunnels
+    await job_service.close_all()
+    result_store.clear()
+    pool_manager.close_all()
+    executor_manager.close_all()
     await ssh_tunnel_manager.close_all()
 
 
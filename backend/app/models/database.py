@@ -1,6 +1,7 @@
 """Database connection models."""
 
 from datetime import datetime
+from typing import Literal
 
 from pydantic import Field
 
@@ -8,6 +9,30 @@ from app.models.base import CamelModel
 from app.models.ssh import SSHConfig, SSHConfigResponse
 
 
+class CostGuardConfig(CamelModel):
+    """Per-connection limits on planner estimates checked before queries run.
+
+    Unset fields use the server defaults (COST_GUARD_*). Agent limits
+    default to the regular ones scaled by COST_GUARD_AGENT_FACTOR.
+    """
+
+    mode: Literal["off", "warn", "reject"] | None = Field(
+        default=None, description="off, warn (run with a warning) or reject"
+    )
+    max_cost: float | None = Field(
+        default=None, ge=0, description="Highest planner cost allowed (0: not checked)"
+    )
+    max_rows: int | None = Field(
+        default=None, ge=0, description="Largest estimated table scan allowed (0: not checked)"
+    )
+    agent_max_cost: float | None = Field(
+        default=None, ge=0, description="Highest planner cost allowed for agent queries"
+    )
+    agent_max_rows: int | None = Field(
+        default=None, ge=0, description="Largest estimated table scan allowed for agent queries"
+    )
+
+
 class DatabaseCreateRequest(CamelModel):
     """Request model for creating/updating a database connection."""
 
@@ -18,6 +43,14 @@ class DatabaseCreateRequest(CamelModel):
     ssh_config: SSHConfig | None = Field(
         default=None, description="SSH tunnel configuration"
     )
+    cache_ttl_seconds: int | None = Field(
+        default=None,
+        ge=0,
+        description="Result cache TTL for this connection (None: server default, 0: disabled)",
+    )
+    cost_guard: CostGuardConfig | None = Field(
+        default=None, description="Limits on planner estimates (None: server defaults)"
+    )
 
 
 class DatabaseResponse(CamelModel):
@@ -28,6 +61,8 @@ class DatabaseResponse(CamelModel):
     db_type: str  # 'postgresql' or 'mysql'
     ssl_disabled: bool  # SSL disabled flag (only applies to MySQL)
     ssh_config: SSHConfigResponse | None  # Sanitized SSH config (no sensitive data)
+    cache_ttl_seconds: int | None = None  # Result cache TTL override (None = server default)
+    cost_guard: CostGuardConfig | None = None  # Planner estimate limits (None = server defaults)
     created_at: datetime
     updated_at: datetime
 
@@ -50,3 +50,26 @@ class QueryHistorySearchResponse(CamelModel):
     items: list[QueryHistoryItem]
     total: int
 
+
+class QueryStatsItem(CamelModel):
+    """Aggregated executions of one query shape (literals replaced by ?)."""
+
+    fingerprint: str = Field(..., description="Hash of the normalized SQL")
+    normalized_sql: str = Field(..., description="SQL with literals replaced by ?")
+    sample_sql: str = Field(..., description="Most recently executed SQL of this shape")
+    exec_count: int = Field(..., description="Recorded executions")
+    total_time_ms: int = Field(..., description="Sum of execution times")
+    mean_time_ms: float = Field(..., description="Mean execution time")
+    max_time_ms: int = Field(..., description="Slowest execution")
+    p50_time_ms: float = Field(..., description="Median execution time (within 2%)")
+    p95_time_ms: float = Field(..., description="95th percentile execution time (within 2%)")
+    total_rows: int = Field(..., description="Sum of rows returned")
+    mean_rows: float = Field(..., description="Mean rows returned")
+    first_seen: datetime
+    last_seen: datetime
+
+
+class TopQueriesResponse(CamelModel):
+    """Response model for the most expensive query shapes."""
+
+    items: list[QueryStatsItem]
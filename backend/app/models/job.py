@@ -0,0 +1,65 @@
+"""Asynchronous query job models."""
+
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import Field
+
+from app.models.base import CamelModel
+from app.models.query import RowFormat
+
+# queued -> running -> succeeded | failed | cancelled
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class JobCreateRequest(CamelModel):
+    """Request model for submitting a query job."""
+
+    sql: str = Field(..., description="SQL SELECT statement")
+    natural_query: str | None = Field(
+        None, description="Natural language description (if SQL was generated from NL)"
+    )
+    timeout_seconds: int = Field(
+        3600,
+        ge=10,
+        le=86400,
+        description="Time the database may spend producing rows (10-86400, default: 3600)",
+    )
+
+
+class JobResponse(CamelModel):
+    """State and progress of a query job."""
+
+    id: str = Field(..., description="Job ID")
+    db_name: str = Field(..., description="Database connection name")
+    sql: str = Field(..., description="Executed SQL (may include auto-added LIMIT)")
+    status: JobStatus
+    columns: list[str] | None = Field(None, description="Column names, once known")
+    rows_fetched: int = Field(0, description="Rows fetched so far")
+    truncated: bool = Field(False, description="True if LIMIT was auto-added")
+    cost_warning: str | None = Field(
+        None, description="Set when the cost guard found the query likely expensive"
+    )
+    error: str | None = Field(None, description="Failure reason (status 'failed')")
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    execution_time_ms: int | None = Field(None, description="Run time of a finished job")
+    expires_at: datetime | None = Field(
+        None, description="When a finished job and its result are deleted"
+    )
+
+
+class JobResultResponse(CamelModel):
+    """A window of a job's result rows."""
+
+    id: str = Field(..., description="Job ID")
+    status: JobStatus
+    columns: list[str] = Field(..., description="Column names")
+    rows: list[dict[str, Any]] | list[list[Any]] = Field(
+        ..., description="Rows [offset, offset + limit)"
+    )
+    offset: int = Field(..., description="Index of the first returned row")
+    row_count: int = Field(..., description="Number of rows returned")
+    total_rows: int = Field(..., description="Rows fetched so far (final once succeeded)")
+    row_format: RowFormat = Field("objects", description="Encoding of rows")
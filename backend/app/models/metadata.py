@@ -1,5 +1,7 @@
 """Database metadata models."""
 
+from typing import Literal
+
 from pydantic import Field
 
 from app.models.base import CamelModel
@@ -24,6 +26,8 @@ class TableSummary(CamelModel):
     table_name: str = Field(..., description="Table or view name")
     table_type: str = Field(..., description="Type: 'table' or 'view'")
     comment: str | None = Field(None, description="Table comment/description")
+    row_count: int | None = Field(None, description="Estimated row count (for tables)")
+    size_bytes: int | None = Field(None, description="Size on disk including indexes (for tables)")
 
 
 class TableMetadata(CamelModel):
@@ -34,7 +38,11 @@ class TableMetadata(CamelModel):
     table_type: str = Field(..., description="Type: 'table' or 'view'")
     columns: list[ColumnInfo] = Field(default_factory=list, description="List of columns")
     row_count: int | None = Field(None, description="Estimated row count (for tables)")
+    size_bytes: int | None = Field(None, description="Size on disk including indexes (for tables)")
     comment: str | None = Field(None, description="Table comment/description")
+    columns_loaded: bool = Field(
+        True, description="False until the columns of a lazily listed table are fetched"
+    )
 
 
 class TableListResponse(CamelModel):
@@ -46,6 +54,21 @@ class TableListResponse(CamelModel):
     last_refreshed: str | None = Field(None, description="Last metadata refresh timestamp")
 
 
+class MetadataRefreshSummary(CamelModel):
+    """What a metadata refresh changed in the cache."""
+
+    mode: Literal["full", "incremental"] = Field(
+        ..., description="'incremental' if only changed tables were fetched"
+    )
+    added: list[str] = Field(default_factory=list, description="New tables (schema.table)")
+    changed: list[str] = Field(
+        default_factory=list, description="Tables whose definition changed (schema.table)"
+    )
+    dropped: list[str] = Field(default_factory=list, description="Removed tables (schema.table)")
+    unchanged: int = Field(0, description="Tables kept from the cache without fetching")
+    duration_ms: int = Field(..., description="Time the refresh took in milliseconds")
+
+
 class DatabaseMetadata(CamelModel):
     """Complete database metadata with all tables and views."""
 
@@ -53,4 +76,44 @@ class DatabaseMetadata(CamelModel):
     schemas: list[str] = Field(default_factory=list, description="List of schema names")
     tables: list[TableMetadata] = Field(default_factory=list, description="List of tables and views")
     last_refreshed: str | None = Field(None, description="Last metadata refresh timestamp")
+    refresh: MetadataRefreshSummary | None = Field(
+        None, description="Changes made by the refresh (only set on refreshed metadata)"
+    )
+
+
+# === Streamed Metadata Refresh (NDJSON frames) ===
+
+
+class MetadataStreamHeader(CamelModel):
+    """First frame of a streamed metadata refresh."""
+
+    type: Literal["header"] = "header"
+    mode: Literal["full", "incremental"] = Field(
+        ..., description="'incremental' if only changed tables are fetched"
+    )
+    schemas: list[str] = Field(default_factory=list, description="All schema names")
+    pending: list[str] = Field(
+        default_factory=list, description="Schemas whose tables are being fetched"
+    )
+
+
+class MetadataStreamSchema(CamelModel):
+    """Complete table list of one schema, sent as soon as it is known."""
+
+    type: Literal["schema"] = "schema"
+    schema_name: str = Field(..., description="Schema name")
+    tables: list[TableSummary] = Field(default_factory=list, description="Tables of the schema")
+
+
+class MetadataStreamEnd(CamelModel):
+    """Final frame of a successful streamed metadata refresh (after it was cached)."""
+
+    type: Literal["end"] = "end"
+    refresh: MetadataRefreshSummary = Field(..., description="Changes made by the refresh")
+
+
+class MetadataStreamError(CamelModel):
+    """Final frame when a streamed metadata refresh fails after the header was sent."""
 
+    type: Literal["error"] = "error"
+    detail: str = Field(..., description="Error message")
@@ -0,0 +1,100 @@
+"""Runtime metrics models."""
+
+from pydantic import Field
+
+from app.models.base import CamelModel
+
+
+class PoolStats(CamelModel):
+    """Connection pool occupancy and counters for one database."""
+
+    name: str = Field(..., description="Database connection name")
+    size: int = Field(..., description="Open connections (idle + in use)")
+    idle: int = Field(..., description="Idle connections ready for reuse")
+    in_use: int = Field(..., description="Connections currently borrowed")
+    waiting: int = Field(..., description="Callers waiting for a free connection")
+    min_size: int = Field(..., description="Connections kept open despite idle timeout")
+    max_size: int = Field(..., description="Maximum open connections")
+    created: int = Field(..., description="Connections opened since pool creation")
+    reused: int = Field(..., description="Borrows served by an existing connection")
+    discarded: int = Field(..., description="Connections closed (idle timeout, errors)")
+    timeouts: int = Field(..., description="Borrows that timed out waiting")
+    health_check_failures: int = Field(..., description="Dead connections found on borrow")
+    closed: bool = Field(..., description="Whether the pool has been closed")
+
+
+class PoolStatsResponse(CamelModel):
+    """Response for connection pool stats."""
+
+    pools: list[PoolStats] = Field(default_factory=list, description="Pool stats per database")
+
+
+class QueryCacheStats(CamelModel):
+    """Query result cache occupancy and counters."""
+
+    entries: int = Field(..., description="Cached results")
+    bytes: int = Field(..., description="Estimated memory held by cached results")
+    max_bytes: int = Field(..., description="Memory budget; least recently used are evicted")
+    hits: int = Field(..., description="Queries served from the cache")
+    misses: int = Field(..., description="Cacheable queries that had to be executed")
+    evictions: int = Field(..., description="Results evicted to stay within the budget")
+    invalidations: int = Field(..., description="Results dropped by metadata refreshes or edits")
+
+
+class ParseCacheStats(CamelModel):
+    """SQL parse cache occupancy and counters."""
+
+    entries: int = Field(..., description="Cached parsed statements")
+    max_entries: int = Field(..., description="Capacity; least recently used are evicted")
+    hits: int = Field(..., description="Parses served from the cache")
+    misses: int = Field(..., description="Statements that had to be parsed")
+    evictions: int = Field(..., description="Statements evicted to stay within capacity")
+    hit_rate: float = Field(..., description="hits / (hits + misses), 0 before any lookup")
+
+
+class SchedulerStats(CamelModel):
+    """Query admission occupancy, queue depth and wait times for one database."""
+
+    name: str = Field(..., description="Database connection name")
+    running: int = Field(..., description="Statements currently executing")
+    max_concurrency: int = Field(..., description="Statements allowed to run at once")
+    queued: int = Field(..., description="Queries waiting for a slot")
+    queued_by_lane: dict[str, int] = Field(
+        ..., description="Waiting queries per lane (interactive, agent, job, metadata)"
+    )
+    max_queue: int = Field(..., description="Waiting queries allowed before rejecting")
+    admitted: int = Field(..., description="Queries admitted since startup")
+    waited: int = Field(..., description="Admitted queries that had to wait")
+    rejected: int = Field(..., description="Queries rejected with 429 (queue full)")
+    avg_wait_ms: int = Field(..., description="Average wait of queries that waited")
+    max_wait_ms: int = Field(..., description="Longest wait for a slot")
+
+
+class SchedulerStatsResponse(CamelModel):
+    """Response for query scheduler stats."""
+
+    databases: list[SchedulerStats] = Field(
+        default_factory=list, description="Scheduler stats per database"
+    )
+
+
+class ExecutorStats(CamelModel):
+    """Thread pool occupancy and counters for blocking driver calls."""
+
+    name: str = Field(..., description="Database name, connector type, or 'control'")
+    kind: str = Field(
+        ..., description="'database' (per registered database), 'shared' or 'control'"
+    )
+    max_workers: int = Field(..., description="Worker threads")
+    active: int = Field(..., description="Calls currently running")
+    queued: int = Field(..., description="Calls waiting for a free thread")
+    completed: int = Field(..., description="Calls finished since creation")
+    closed: bool = Field(..., description="Whether the executor has been shut down")
+
+
+class ExecutorStatsResponse(CamelModel):
+    """Response for connector thread pool stats."""
+
+    executors: list[ExecutorStats] = Field(
+        default_factory=list, description="Stats per executor"
+    )
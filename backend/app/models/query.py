@@ -1,11 +1,15 @@
 """Query-related models."""
 
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import Field
 
 from app.models.base import CamelModel
 
+# "objects": each row is a dict keyed by column name (default)
+# "arrays": each row is a list of values in column order (compact)
+RowFormat = Literal["objects", "arrays"]
+
 
 class QueryRequest(CamelModel):
     """Request model for executing SQL query."""
@@ -20,15 +24,53 @@ class QueryRequest(CamelModel):
         le=300,
         description="Query execution timeout in seconds (10-300, default: 30)",
     )
+    row_format: RowFormat = Field(
+        "objects",
+        description="Row encoding: 'objects' (dict per row) or 'arrays' (list per row)",
+    )
+    cache: bool = Field(
+        True, description="Serve from the result cache if possible; false always executes"
+    )
+    store: bool = Field(
+        False,
+        description=(
+            "Write the full result to disk and return its first rows plus a result ID; "
+            "fetch further rows from GET /results/{id}/rows"
+        ),
+    )
+
+
+# Export file formats of POST /dbs/{name}/query/export
+ExportFormat = Literal["csv", "json", "ndjson", "xlsx", "parquet"]
+
+
+class QueryExportRequest(CamelModel):
+    """Request model for exporting a query result as a file."""
+
+    sql: str = Field(..., description="SQL SELECT statement")
+    natural_query: str | None = Field(
+        None, description="Natural language description (if SQL was generated from NL)"
+    )
+    format: ExportFormat = Field("csv", description="File format")
+    timeout_seconds: int = Field(
+        600,
+        ge=10,
+        le=3600,
+        description="Time the database may spend producing rows (10-3600, default: 600)",
+    )
 
 
 class QueryResult(CamelModel):
     """Query result data."""
 
     columns: list[str] = Field(..., description="Column names")
-    rows: list[dict] = Field(..., description="Data rows")
+    rows: list[dict[str, Any]] | list[list[Any]] = Field(..., description="Data rows")
     row_count: int = Field(..., description="Number of rows returned")
     truncated: bool = Field(False, description="True if LIMIT was auto-added")
+    row_format: RowFormat = Field("objects", description="Encoding of rows")
+    total_rows: int | None = Field(
+        None, description="Rows in the stored result (store=true); rows holds the first page"
+    )
 
 
 class QueryResponse(CamelModel):
@@ -37,6 +79,136 @@ class QueryResponse(CamelModel):
     sql: str = Field(..., description="Executed SQL (may include auto-added LIMIT)")
     result: QueryResult
     execution_time_ms: int = Field(..., description="Execution time in milliseconds")
+    cached: bool = Field(
+        False, description="True if served from the result cache (time is of the original run)"
+    )
+    result_id: str | None = Field(None, description="ID of the stored result (store=true)")
+    cost_warning: str | None = Field(
+        None, description="Set when the cost guard found the query likely expensive"
+    )
+
+
+# === Streaming Query Models ===
+# POST /dbs/{name}/query/stream emits one JSON frame per line (NDJSON):
+# a header, zero or more row batches, then an end or error frame.
+
+
+class QueryStreamHeader(CamelModel):
+    """First frame of a streamed query result."""
+
+    type: Literal["header"] = "header"
+    sql: str = Field(..., description="Executed SQL (may include auto-added LIMIT)")
+    columns: list[str] = Field(..., description="Column names")
+    truncated: bool = Field(False, description="True if LIMIT was auto-added")
+    row_format: RowFormat = Field("objects", description="Encoding of rows")
+    cost_warning: str | None = Field(
+        None, description="Set when the cost guard found the query likely expensive"
+    )
+
+
+class QueryStreamRows(CamelModel):
+    """A batch of rows from a streamed query result."""
+
+    type: Literal["rows"] = "rows"
+    rows: list[dict[str, Any]] | list[list[Any]] = Field(..., description="Data rows")
+
+
+class QueryStreamEnd(CamelModel):
+    """Final frame of a successfully streamed query result."""
+
+    type: Literal["end"] = "end"
+    row_count: int = Field(..., description="Total number of rows streamed")
+    execution_time_ms: int = Field(..., description="Execution time in milliseconds")
+
+
+class QueryStreamError(CamelModel):
+    """Final frame when a streamed query fails after the header was sent."""
+
+    type: Literal["error"] = "error"
+    detail: str = Field(..., description="Error message")
+
+
+# === Query Plan Models ===
+
+
+class ExplainRequest(CamelModel):
+    """Request model for analyzing a query plan."""
+
+    sql: str = Field(..., description="SQL SELECT statement")
+    analyze: bool = Field(
+        False,
+        description=(
+            "Run the statement with EXPLAIN ANALYZE for actual rows and timings "
+            "(PostgreSQL only; runs in a transaction that is rolled back)"
+        ),
+    )
+    timeout_seconds: int = Field(
+        30,
+        ge=10,
+        le=300,
+        description="Timeout in seconds (10-300, default: 30)",
+    )
+
+
+# hot_node: large share of the plan's time (or cost)
+# misestimate: actual rows far from the planner's estimate (ANALYZE only)
+# seq_scan: full scan of a large table
+# missing_index: full scan filtered on columns an index could serve
+PlanFindingKind = Literal["hot_node", "misestimate", "seq_scan", "missing_index"]
+
+
+class PlanNode(CamelModel):
+    """A node of a query plan, normalized across PostgreSQL and MySQL."""
+
+    id: int = Field(..., description="Position of the node in the plan (pre-order)")
+    node_type: str = Field(..., description="Operation (e.g. Seq Scan, Hash Join, Table Scan)")
+    relation_name: str | None = Field(None, description="Table read by the node")
+    schema_name: str | None = Field(None, description="Schema of the table, if reported")
+    alias: str | None = Field(None, description="Alias of the table in the query")
+    index_name: str | None = Field(None, description="Index used by the node")
+    full_scan: bool = Field(False, description="True if the node reads every row of its table")
+    condition: str | None = Field(None, description="Filter applied to the node's rows")
+    index_condition: str | None = Field(None, description="Condition served by the index")
+    total_cost: float | None = Field(None, description="Estimated cost including children")
+    self_cost: float | None = Field(None, description="Estimated cost excluding children")
+    plan_rows: float | None = Field(None, description="Estimated rows per execution")
+    actual_rows: float | None = Field(None, description="Actual rows per execution (ANALYZE)")
+    actual_loops: int | None = Field(None, description="Executions of the node (ANALYZE)")
+    actual_time_ms: float | None = Field(
+        None, description="Time including children over all executions (ANALYZE)"
+    )
+    self_time_ms: float | None = Field(
+        None, description="Time excluding children over all executions (ANALYZE)"
+    )
+    children: list["PlanNode"] = Field(default_factory=list, description="Input nodes")
+
+
+class PlanFinding(CamelModel):
+    """A potential problem found in a query plan."""
+
+    kind: PlanFindingKind = Field(..., description="Type of finding")
+    node_id: int = Field(..., description="ID of the plan node concerned")
+    table: str | None = Field(None, description="Table concerned")
+    columns: list[str] = Field(
+        default_factory=list, description="Candidate index columns (missing_index)"
+    )
+    message: str = Field(..., description="Explanation and suggestion")
+
+
+class ExplainResponse(CamelModel):
+    """Response model for query plan analysis."""
+
+    sql: str = Field(..., description="Explained SQL statement")
+    dialect: str = Field(..., description="SQL dialect of the plan (postgres or mysql)")
+    analyzed: bool = Field(False, description="True if the plan has actual rows and timings")
+    plan: PlanNode = Field(..., description="Root of the normalized plan tree")
+    total_cost: float | None = Field(None, description="Estimated cost of the whole plan")
+    planning_time_ms: float | None = Field(None, description="Planning time (ANALYZE)")
+    execution_time_ms: float | None = Field(None, description="Execution time (ANALYZE)")
+    findings: list[PlanFinding] = Field(
+        default_factory=list, description="Potential problems, hottest nodes first"
+    )
+    raw_plan: Any = Field(None, description="Plan as returned by the database")
 
 
 # === Natural Language Query Models ===
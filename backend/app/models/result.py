@@ -0,0 +1,87 @@
+"""Stored query result models."""
+
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import Field
+
+from app.models.base import CamelModel
+from app.models.query import RowFormat
+
+
+class StoredResultResponse(CamelModel):
+    """A query result materialized to disk."""
+
+    result_id: str = Field(..., description="Stored result ID")
+    db_name: str = Field(..., description="Database connection name")
+    sql: str = Field(..., description="Executed SQL (may include auto-added LIMIT)")
+    columns: list[str] = Field(..., description="Column names")
+    total_rows: int = Field(..., description="Number of rows stored")
+    truncated: bool = Field(False, description="True if LIMIT was auto-added")
+    size_bytes: int = Field(..., description="Size of the result file")
+    created_at: datetime
+
+
+class StoredRowsResponse(CamelModel):
+    """A window of a stored result's rows, or of a view of them."""
+
+    result_id: str = Field(..., description="Stored result ID")
+    columns: list[str] = Field(..., description="Column names")
+    rows: list[dict[str, Any]] | list[list[Any]] = Field(
+        ..., description="Rows [offset, offset + limit)"
+    )
+    offset: int = Field(..., description="Index of the first returned row")
+    row_count: int = Field(..., description="Number of rows returned")
+    total_rows: int = Field(
+        ..., description="Rows in the result (in the view, for filtered or grouped views)"
+    )
+    row_format: RowFormat = Field("objects", description="Encoding of rows")
+
+
+# === Result Views ===
+# POST /results/{id}/view filters, groups, sorts and pages a stored result
+# locally, in that order, without querying the source database.
+
+FilterOp = Literal["eq", "ne", "lt", "le", "gt", "ge", "contains", "in", "is_null", "not_null"]
+AggregateFunction = Literal["count", "count_distinct", "sum", "mean", "min", "max"]
+
+
+class ResultFilter(CamelModel):
+    """A condition on one column; a view keeps rows matching all of its filters."""
+
+    column: str = Field(..., description="Column name")
+    op: FilterOp = Field(..., description="Comparison operator")
+    value: Any = Field(
+        None,
+        description=(
+            "Operand: a scalar, a list for 'in', unused for 'is_null'/'not_null'; "
+            "cast to the column's type"
+        ),
+    )
+
+
+class ResultSort(CamelModel):
+    """A sort key."""
+
+    column: str = Field(..., description="Column name (or aggregate alias when grouping)")
+    direction: Literal["asc", "desc"] = "asc"
+
+
+class ResultAggregate(CamelModel):
+    """An aggregate computed per group (or over all rows without groupBy)."""
+
+    function: AggregateFunction
+    column: str | None = Field(None, description="Input column; omit with 'count' to count rows")
+    alias: str | None = Field(None, description="Output column name (default: function_column)")
+
+
+class ResultViewRequest(CamelModel):
+    """Request model for a view of a stored result."""
+
+    filters: list[ResultFilter] = Field(default_factory=list)
+    group_by: list[str] = Field(default_factory=list, description="Grouping columns")
+    aggregates: list[ResultAggregate] = Field(default_factory=list)
+    sort: list[ResultSort] = Field(default_factory=list, description="Sort keys, in priority order")
+    offset: int = Field(0, ge=0, description="Index of the first returned row")
+    limit: int = Field(1000, ge=1, le=10000, description="Number of rows to return (top N)")
+    row_format: RowFormat = Field("objects", description="Encoding of rows")
@@ -34,6 +34,7 @@ AGENT_SYSTEM_PROMPT_ZH = """你是一个 SQL 助手，帮助用户探索数据
 
 重要提示：
 - `query_database` 只能执行只读查询
+- `list_tables` 会给出每个表的估算行数和大小；对大表（百万行以上）的探索查询要加过滤条件或聚合，并保持较小的 LIMIT
 - 但你可以生成 DDL 语句（如 CREATE INDEX、ALTER TABLE）作为最终答案
 - 用户会在其他工具中执行这些 DDL 语句
 
@@ -60,6 +61,7 @@ Workflow:
 
 Important notes:
 - `query_database` can only execute read-only queries
+- `list_tables` shows each table's estimated row count and size; on large tables (millions of rows) filter or aggregate exploratory queries and keep LIMIT small
 - However, you can generate DDL statements (like CREATE INDEX, ALTER TABLE) as final answers
 - Users will execute these DDL statements in other tools
 
@@ -5,6 +5,7 @@ import logging
 from typing import Any
 
 from app.services.db_manager import database_manager
+from app.services.metadata_service import format_table_size, metadata_service
 from app.services.query_service import query_service
 
 logger = logging.getLogger(__name__)
@@ -109,7 +110,9 @@ async def execute_list_tables(db_name: str) -> str:
             table_type = table_info.get("table_type", "table")
             table_comment = table_info.get("table_comment", "")
 
-            entry = f"{schema_name}.{tbl_name} ({table_type})"
+            size = format_table_size(table_info.get("row_count"), table_info.get("size_bytes"))
+            size_str = f", {size}" if size else ""
+            entry = f"{schema_name}.{tbl_name} ({table_type}{size_str})"
             if table_comment:
                 entry += f" - {table_comment}"
             tables.append(entry)
@@ -156,6 +159,9 @@ async def execute_get_table_schema(db_name: str, table_name: str) -> str:
             if table_name in (tbl_name, full_name):
                 filtered.append(table_info)
 
+        # Lazily listed tables get their columns now
+        filtered = await metadata_service.load_missing_columns(db_name, filtered)
+
         if not filtered:
             return f"Table '{table_name}' not found."
 
@@ -171,6 +177,9 @@ async def execute_get_table_schema(db_name: str, table_name: str) -> str:
             lines.append(f"Table: {schema_name}.{tbl_name} ({table_type})")
             if table_comment:
                 lines.append(f"  Comment: {table_comment}")
+            size = format_table_size(table_info.get("row_count"), table_info.get("size_bytes"))
+            if size:
+                lines.append(f"  Size: {size} (estimated)")
             lines.append("-" * 50)
 
             for col in columns:
@@ -223,14 +232,17 @@ async def execute_query_database(db_name: str, sql: str) -> str:
         db_type = db.get("db_type", "postgresql")
         dialect = "mysql" if db_type == "mysql" else "postgres"
 
-        # Validate read-only
+        # Validate read-only, then check planner estimates (stricter for agents)
         try:
             query_service.validate_readonly(sql, dialect)
+            cost_warning = await query_service.check_query_cost(db_name, sql, lane="agent")
         except ValueError as e:
             return f"Error: {e}"
 
         # Execute query
-        columns, rows, execution_time_ms = await query_service.execute_query(db_name, sql)
+        columns, rows, execution_time_ms = await query_service.execute_query(
+            db_name, sql, lane="agent"
+        )
 
         # Limit rows
         truncated = False
@@ -239,7 +251,8 @@ async def execute_query_database(db_name: str, sql: str) -> str:
             truncated = True
 
         # Format output
-        result_text = f"Query executed in {execution_time_ms}ms\n"
+        result_text = f"Warning: {cost_warning}\n" if cost_warning else ""
+        result_text += f"Query executed in {execution_time_ms}ms\n"
         result_text += f"Columns: {', '.join(columns)}\n"
         result_text += f"Rows returned: {len(rows)}"
         if truncated:
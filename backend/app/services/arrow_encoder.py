@@ -0,0 +1,159 @@
+"""Apache Arrow IPC encoding for streamed query results.
+
+Connector batches are converted column by column into Arrow record batches
+using the column types derived from ``cursor.description``, and written as
+an Arrow IPC stream (schema message, record batches, end-of-stream marker).
+"""
+
+import io
+import json
+from collections.abc import Callable, Sequence
+from typing import Any
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+from app.connectors.converters import ColumnType
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def is_available() -> bool:
+    """Check if pyarrow is installed."""
+    return pa is not None
+
+
+def to_text(value: Any) -> Any:
+    """Render a value for a string column the way the JSON API does."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, dict | list):
+        return json.dumps(value, default=str)
+    if isinstance(value, bytes | bytearray | memoryview):
+        try:
+            return bytes(value).decode("utf-8")
+        except UnicodeDecodeError:
+            return str(bytes(value))
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _to_decimal_text(value: Any) -> Any:
+    return None if value is None else str(value)
+
+
+def _to_bytes(value: Any) -> Any:
+    return None if value is None else bytes(value)
+
+
+# Per-type value conversion; types missing here are passed to pyarrow as-is
+_CONVERTERS: dict[ColumnType, Callable[[Any], Any]] = {
+    "decimal": _to_decimal_text,
+    "binary": _to_bytes,
+    "string": to_text,
+}
+
+
+def _arrow_type(column_type: ColumnType) -> Any:
+    """Arrow type for a column type.
+
+    Decimals are sent as strings: drivers don't report precision and scale
+    for every column, and guessing them would lose digits.
+    """
+    return {
+        "bool": pa.bool_(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "decimal": pa.string(),
+        "date": pa.date32(),
+        "time": pa.time64("us"),
+        "timestamp": pa.timestamp("us"),
+        "timestamptz": pa.timestamp("us", tz="UTC"),
+        "binary": pa.binary(),
+        "text": pa.string(),
+        "string": pa.string(),
+    }[column_type]
+
+
+class ArrowBatchConverter:
+    """Converts positional driver rows to Arrow record batches of a fixed schema."""
+
+    def __init__(
+        self,
+        columns: list[str],
+        column_types: list[ColumnType] | None,
+        metadata: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Args:
+            columns: Result column names
+            column_types: Column types from the connector; None reads every
+                column as a string
+            metadata: Key/value pairs attached to the Arrow schema
+        """
+        if pa is None:
+            raise RuntimeError("Arrow output requires the pyarrow package")
+
+        self.column_types: list[ColumnType] = column_types or ["string"] * len(columns)
+        # Arrow field names need not be unique, so duplicate column names survive
+        self.schema = pa.schema(
+            [
+                pa.field(name, _arrow_type(column_type))
+                for name, column_type in zip(columns, self.column_types, strict=True)
+            ],
+            metadata=metadata,
+        )
+
+    def record_batch(self, rows: Sequence[Sequence[Any]]) -> Any:
+        """Convert positional rows to a record batch, one column at a time."""
+        arrays = []
+        for index, (values, field) in enumerate(
+            zip(zip(*rows, strict=True), self.schema, strict=True)
+        ):
+            convert = _CONVERTERS.get(self.column_types[index])
+            column = values if convert is None else [convert(value) for value in values]
+            arrays.append(pa.array(column, type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+class ArrowStreamEncoder(ArrowBatchConverter):
+    """Incrementally encodes result batches as an Arrow IPC stream.
+
+    Each method returns the bytes produced by that step, so the output can
+    be sent to the client batch by batch.
+    """
+
+    def __init__(
+        self,
+        columns: list[str],
+        column_types: list[ColumnType] | None,
+        metadata: dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(columns, column_types, metadata)
+        self._sink = io.BytesIO()
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def begin(self) -> bytes:
+        """Bytes of the schema message."""
+        return self._drain()
+
+    def write(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        """Encode positional rows as one record batch."""
+        if not rows:
+            return b""
+        self._writer.write_batch(self.record_batch(rows))
+        return self._drain()
+
+    def finish(self) -> bytes:
+        """Bytes of the end-of-stream marker."""
+        self._writer.close()
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
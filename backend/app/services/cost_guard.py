@@ -0,0 +1,284 @@
+"""EXPLAIN-based cost guard run before user and agent queries.
+
+Before a SELECT runs, the planner's estimates are fetched with
+``EXPLAIN (FORMAT JSON)`` (PostgreSQL) or ``EXPLAIN FORMAT=JSON`` (MySQL):
+
+- cost: total cost of the plan (PostgreSQL "Total Cost", MySQL
+  "query_cost"), in the planner's own units
+- rows: the largest row estimate of any table scan, i.e. how much of the
+  biggest table the plan reads (regardless of an early exit at LIMIT)
+
+Queries above the connection's thresholds are rejected or get a warning
+("mode"). Agent queries use stricter thresholds: the connection's agent
+thresholds, or the regular ones scaled by ``cost_guard_agent_factor``.
+Estimates are cached per query fingerprint for
+``cost_guard_estimate_ttl_seconds``, so repeated query shapes don't pay
+for another EXPLAIN.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Literal, NamedTuple, cast
+
+from pydantic import ValidationError
+
+from app.config import settings
+from app.connectors.base import DatabaseConnector
+from app.models.database import CostGuardConfig
+from app.services.query_scheduler import Lane, query_scheduler
+from app.services.query_stats import fingerprint_sql
+
+logger = logging.getLogger(__name__)
+
+CostGuardMode = Literal["off", "warn", "reject"]
+
+# Estimates kept for reuse; least recently used are evicted
+_MAX_ESTIMATES = 1024
+
+
+class CostEstimate(NamedTuple):
+    """Planner estimates of a statement."""
+
+    cost: float
+    rows: int
+
+
+class CostLimits(NamedTuple):
+    """Thresholds in effect for one query (0 = not checked)."""
+
+    mode: CostGuardMode
+    max_cost: float
+    max_rows: int
+
+
+class QueryCostExceededError(ValueError):
+    """Raised when a query's estimated cost is above the connection's limits."""
+
+
+def explain_sql(sql: str, dialect: str, analyze: bool = False) -> str:
+    """
+    EXPLAIN statement returning the plan as JSON.
+
+    ``analyze`` runs the statement and adds actual rows and timings
+    (PostgreSQL only; MySQL's EXPLAIN ANALYZE has no JSON output).
+    """
+    if dialect == "mysql":
+        if analyze:
+            raise ValueError("EXPLAIN ANALYZE is only supported for PostgreSQL")
+        return f"EXPLAIN FORMAT=JSON {sql}"
+    if analyze:
+        return f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"
+    return f"EXPLAIN (FORMAT JSON) {sql}"
+
+
+def _walk(node: Any) -> Any:
+    """Yield every dict nested in a JSON value."""
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def parse_plan_estimate(plan: Any, dialect: str) -> CostEstimate:
+    """
+    Extract cost and largest scan estimate from an EXPLAIN JSON plan.
+
+    Args:
+        plan: The single value EXPLAIN returned, as JSON text or parsed
+        dialect: SQL dialect (postgres or mysql)
+
+    Raises:
+        ValueError: If the plan has an unexpected shape
+    """
+    if isinstance(plan, str | bytes):
+        plan = json.loads(plan)
+
+    try:
+        if dialect == "mysql":
+            cost = float(plan["query_block"]["cost_info"]["query_cost"])
+            rows = [
+                int(node["rows_examined_per_scan"])
+                for node in _walk(plan)
+                if "rows_examined_per_scan" in node
+            ]
+        else:
+            root = plan[0]["Plan"]
+            cost = float(root["Total Cost"])
+            rows = [
+                int(node["Plan Rows"])
+                for node in _walk(root)
+                if "Relation Name" in node and "Plan Rows" in node
+            ]
+    except (KeyError, IndexError, TypeError) as e:
+        raise ValueError(f"Unexpected EXPLAIN output: {e!r}") from e
+    return CostEstimate(cost=cost, rows=max(rows, default=0))
+
+
+def cost_limits(cost_guard_json: str | None, agent: bool) -> CostLimits:
+    """Resolve a connection's thresholds, falling back to the server defaults."""
+    config = CostGuardConfig()
+    if cost_guard_json:
+        try:
+            config = CostGuardConfig.model_validate_json(cost_guard_json)
+        except ValidationError:
+            logger.warning("Ignoring invalid cost guard configuration: %s", cost_guard_json)
+
+    mode = config.mode or settings.cost_guard_mode
+    max_cost = settings.cost_guard_max_cost if config.max_cost is None else config.max_cost
+    max_rows = settings.cost_guard_max_rows if config.max_rows is None else config.max_rows
+    if agent:
+        factor = settings.cost_guard_agent_factor
+        max_cost = max_cost * factor if config.agent_max_cost is None else config.agent_max_cost
+        max_rows = int(max_rows * factor) if config.agent_max_rows is None else config.agent_max_rows
+    return CostLimits(mode=mode, max_cost=max_cost, max_rows=max_rows)
+
+
+def _describe(estimate: CostEstimate, limits: CostLimits) -> str | None:
+    """Explain which threshold an estimate exceeds, or None."""
+    problems = []
+    if limits.max_cost and estimate.cost > limits.max_cost:
+        problems.append(f"estimated cost {estimate.cost:,.0f} exceeds {limits.max_cost:,.0f}")
+    if limits.max_rows and estimate.rows > limits.max_rows:
+        problems.append(f"estimated scan of {estimate.rows:,} rows exceeds {limits.max_rows:,}")
+    if not problems:
+        return None
+    return (
+        "Query is likely expensive: " + "; ".join(problems) + ". "
+        "Add filters on indexed columns or aggregate less data."
+    )
+
+
+class _CachedEstimate:
+    __slots__ = ("estimate", "expires_at")
+
+    def __init__(self, estimate: CostEstimate | None, expires_at: float) -> None:
+        self.estimate = estimate
+        self.expires_at = expires_at
+
+
+class CostGuard:
+    """Checks planner estimates against per-connection limits, caching estimates."""
+
+    def __init__(self) -> None:
+        self._estimates: OrderedDict[tuple[str, str], _CachedEstimate] = OrderedDict()
+        self._lock = threading.Lock()
+        self.explains = 0
+
+    async def check(
+        self,
+        db: dict[str, Any],
+        connector: DatabaseConnector,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        lane: Lane = "interactive",
+    ) -> str | None:
+        """
+        Check a statement before it runs.
+
+        Args:
+            db: Registered database row (name, url, cost_guard)
+            connector: Connector for the database
+            sql: Statement that will be executed (after LIMIT injection)
+            tunnel_endpoint: Optional (host, port) tuple if using SSH tunnel
+            lane: Scheduler lane of the query; "agent" uses the agent limits
+
+        Returns:
+            A warning if the query is above the limits in "warn" mode, else None
+
+        Raises:
+            QueryCostExceededError: If the query is above the limits in "reject" mode
+        """
+        limits = cost_limits(db.get("cost_guard"), agent=lane == "agent")
+        if limits.mode == "off" or not (limits.max_cost or limits.max_rows):
+            return None
+
+        estimate = await self.estimate(db, connector, sql, tunnel_endpoint, lane=lane)
+        if estimate is None:
+            return None
+
+        problem = _describe(estimate, limits)
+        if problem is None:
+            return None
+        if limits.mode == "reject":
+            raise QueryCostExceededError(problem)
+        return problem
+
+    async def estimate(
+        self,
+        db: dict[str, Any],
+        connector: DatabaseConnector,
+        sql: str,
+        tunnel_endpoint: tuple[str, int] | None = None,
+        *,
+        lane: Lane = "interactive",
+    ) -> CostEstimate | None:
+        """
+        Planner estimates of a statement, cached per fingerprint.
+
+        Returns None if EXPLAIN failed (e.g. missing privileges); queries
+        are never blocked because their plan could not be read.
+        """
+        db_name = db["name"]
+        dialect = connector.get_dialect()
+        key = (db_name, fingerprint_sql(sql, dialect)[0])
+        with self._lock:
+            cached = self._estimates.get(key)
+            if cached is not None and cached.expires_at > time.monotonic():
+                self._estimates.move_to_end(key)
+                return cached.estimate
+
+        estimate: CostEstimate | None = None
+        try:
+            async with query_scheduler.slot(db_name, lane):
+                _, rows, _ = await asyncio.wait_for(
+                    connector.execute_query(
+                        db["url"],
+                        explain_sql(sql, dialect),
+                        tunnel_endpoint,
+                        db_name=db_name,
+                        timeout_seconds=settings.cost_guard_timeout_seconds,
+                        row_format="arrays",
+                    ),
+                    timeout=settings.cost_guard_timeout_seconds,
+                )
+            self.explains += 1
+            # row_format="arrays": the plan is the first column of the first row
+            plan_rows = cast(list[list[Any]], rows)
+            estimate = parse_plan_estimate(plan_rows[0][0], dialect)
+        except Exception as e:
+            logger.warning(f"Cost guard skipped, EXPLAIN failed for '{db_name}': {e}")
+
+        with self._lock:
+            self._estimates[key] = _CachedEstimate(
+                estimate, time.monotonic() + settings.cost_guard_estimate_ttl_seconds
+            )
+            self._estimates.move_to_end(key)
+            while len(self._estimates) > _MAX_ESTIMATES:
+                self._estimates.popitem(last=False)
+        return estimate
+
+    def invalidate(self, db_name: str) -> int:
+        """Drop cached estimates of a database (statistics or configuration changed)."""
+        with self._lock:
+            keys = [key for key in self._estimates if key[0] == db_name]
+            for key in keys:
+                del self._estimates[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all cached estimates."""
+        with self._lock:
+            self._estimates.clear()
+            self.explains = 0
+
+
+# Global instance
+cost_guard = CostGuard()
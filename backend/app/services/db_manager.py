@@ -5,9 +5,15 @@ from typing import Any
 from urllib.parse import urlparse
 
 from app.config import settings
+from app.connectors.executors import executor_manager
 from app.connectors.factory import ConnectorFactory
+from app.connectors.pool import pool_manager
 from app.db.sqlite import db_manager
+from app.models.database import CostGuardConfig
 from app.models.ssh import SSHConfig
+from app.services.cost_guard import cost_guard
+from app.services.result_cache import query_cache
+from app.services.result_store import result_store
 from app.services.ssh_tunnel import ssh_tunnel_manager
 
 
@@ -38,7 +44,7 @@ class DatabaseManager:
         else:
             # Use default ports
             host = host_port
-            port = 5432 if url.startswith("postgresql://") else 3306
+            port = 5432 if ConnectorFactory.detect_db_type(url) == "postgresql" else 3306
 
         return host, port
 
@@ -51,7 +57,14 @@ class DatabaseManager:
         return await db_manager.get_database(name)
 
     async def create_or_update_database(
-        self, name: str, url: str, ssl_disabled: bool = False, ssh_config: SSHConfig | None = None
+        self,
+        name: str,
+        url: str,
+        ssl_disabled: bool = False,
+        ssh_config: SSHConfig | None = None,
+        *,
+        cache_ttl_seconds: int | None = None,
+        cost_guard_config: CostGuardConfig | None = None,
     ) -> dict[str, Any]:
         """
         Create or update a database connection.
@@ -62,10 +75,17 @@ class DatabaseManager:
             url: Database connection URL
             ssl_disabled: Whether to disable SSL (MySQL only)
             ssh_config: Optional SSH tunnel configuration
+            cache_ttl_seconds: Result cache TTL (None: server default, 0: disabled)
+            cost_guard_config: Limits on planner estimates (None: server defaults)
 
         Raises:
             ConnectionError: If connection test fails
         """
+        # Pooled connections and cached results come from the previous configuration
+        pool_manager.invalidate(name)
+        query_cache.invalidate(name)
+        cost_guard.invalidate(name)
+
         # Detect database type
         db_type = ConnectorFactory.detect_db_type(url)
         connector = ConnectorFactory.get_connector(url)
@@ -89,8 +109,13 @@ class DatabaseManager:
             )
 
         try:
-            # Test connection (with tunnel if configured)
-            await connector.test_connection(url, timeout, tunnel_endpoint)
+            # Test connection (with tunnel if configured). Without a tunnel the
+            # test borrows from the new pool so the first query finds it warm;
+            # the test tunnel is closed below, so those connections can't be kept.
+            if tunnel_endpoint:
+                await connector.test_connection(url, timeout, tunnel_endpoint)
+            else:
+                await connector.test_connection(url, timeout, db_name=name)
         except Exception as e:
             # If tunnel was created, close it since connection failed
             if tunnel_endpoint:
@@ -104,14 +129,23 @@ class DatabaseManager:
         # Serialize SSH config to JSON if provided
         ssh_config_json = ssh_config.model_dump_json() if ssh_config else None
 
+        cost_guard_json = (
+            cost_guard_config.model_dump_json(exclude_none=True) if cost_guard_config else None
+        )
+
         # Save to SQLite
         return await db_manager.create_or_update_database(
-            name, url, db_type, ssl_disabled, ssh_config_json
+            name, url, db_type, ssl_disabled, ssh_config_json, cache_ttl_seconds, cost_guard_json
         )
 
     async def delete_database(self, name: str) -> bool:
         """Delete a database connection."""
-        # Close any active SSH tunnel
+        # Close pooled connections, driver threads and any active SSH tunnel
+        pool_manager.invalidate(name)
+        executor_manager.invalidate(name)
+        query_cache.invalidate(name)
+        cost_guard.invalidate(name)
+        result_store.invalidate(name)
         await ssh_tunnel_manager.close_tunnel(name)
         return await db_manager.delete_database(name)
 
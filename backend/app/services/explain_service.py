@@ -0,0 +1,514 @@
+"""Query plan analysis (POST /dbs/{name}/explain).
+
+The JSON plan of ``EXPLAIN`` (optionally ``EXPLAIN ANALYZE`` on
+PostgreSQL) is normalized into a tree of ``PlanNode`` for both PostgreSQL
+and MySQL, then checked for common problems:
+
+- hot nodes: nodes taking a large share of the execution time (ANALYZE)
+  or of the estimated cost
+- misestimates: actual rows far above or below the planner's estimate,
+  usually stale statistics or correlated predicates (ANALYZE)
+- full scans of large tables, sized with the cached table metadata
+- missing-index candidates: columns a large full scan filters on,
+  excluding primary key columns (the metadata cache has no other indexes)
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Iterator
+from itertools import count
+from typing import Any, cast
+
+import sqlglot
+from sqlglot import exp
+
+from app.config import settings
+from app.connectors.factory import ConnectorFactory
+from app.models.metadata import TableMetadata
+from app.models.query import ExplainResponse, PlanFinding, PlanNode
+from app.services.cost_guard import explain_sql
+from app.services.db_manager import database_manager
+from app.services.metadata_service import metadata_service
+from app.services.query_scheduler import query_scheduler
+from app.services.query_service import query_service
+
+logger = logging.getLogger(__name__)
+
+# Hot nodes reported at most
+MAX_HOT_NODES = 3
+
+# MySQL access types (EXPLAIN "type") and the operation they stand for
+_MYSQL_ACCESS_TYPES = {
+    "ALL": "Table Scan",
+    "index": "Full Index Scan",
+    "range": "Index Range Scan",
+    "ref": "Index Lookup",
+    "eq_ref": "Unique Index Lookup",
+    "ref_or_null": "Index Lookup",
+    "fulltext": "Fulltext Index Lookup",
+    "index_merge": "Index Merge",
+    "unique_subquery": "Unique Subquery Lookup",
+    "index_subquery": "Subquery Index Lookup",
+    "const": "Constant Lookup",
+    "system": "Constant Lookup",
+}
+
+# MySQL plan operations wrapping their input
+_MYSQL_OPERATIONS = {
+    "grouping_operation": "Aggregate",
+    "duplicates_removal": "Distinct",
+    "windowing": "Window",
+    "buffer_result": "Buffer",
+    "union_result": "Union",
+}
+
+# Predicates an index can serve, equality first (leading index columns)
+_EQUALITY_PREDICATES = (exp.EQ, exp.In, exp.Is)
+_RANGE_PREDICATES = (exp.GT, exp.GTE, exp.LT, exp.LTE, exp.Between)
+
+
+def _float(value: Any) -> float | None:
+    return None if value is None else float(value)
+
+
+def walk_plan(node: PlanNode) -> Iterator[PlanNode]:
+    """Yield the nodes of a plan in pre-order."""
+    yield node
+    for child in node.children:
+        yield from walk_plan(child)
+
+
+def _number(root: PlanNode) -> PlanNode:
+    ids = count()
+    for node in walk_plan(root):
+        node.id = next(ids)
+    return root
+
+
+def _postgres_node(plan: dict[str, Any]) -> PlanNode:
+    children = [_postgres_node(child) for child in plan.get("Plans", [])]
+
+    total_cost = _float(plan.get("Total Cost"))
+    self_cost = None
+    if total_cost is not None:
+        child_cost = sum(child.total_cost or 0 for child in children)
+        self_cost = max(total_cost - child_cost, 0.0)
+
+    # Actual Total Time is per loop; scale to all loops for comparable shares
+    loops = plan.get("Actual Loops")
+    actual_time = None
+    self_time = None
+    if plan.get("Actual Total Time") is not None and loops is not None:
+        actual_time = float(plan["Actual Total Time"]) * loops
+        child_time = sum(child.actual_time_ms or 0 for child in children)
+        self_time = max(actual_time - child_time, 0.0)
+
+    return PlanNode(
+        id=0,
+        node_type=plan.get("Node Type", "Unknown"),
+        relation_name=plan.get("Relation Name"),
+        schema_name=plan.get("Schema"),
+        alias=plan.get("Alias"),
+        index_name=plan.get("Index Name"),
+        full_scan=plan.get("Node Type") == "Seq Scan",
+        condition=plan.get("Filter") or plan.get("Hash Cond") or plan.get("Join Filter"),
+        index_condition=plan.get("Index Cond") or plan.get("Recheck Cond"),
+        total_cost=total_cost,
+        self_cost=self_cost,
+        plan_rows=_float(plan.get("Plan Rows")),
+        actual_rows=_float(plan.get("Actual Rows")),
+        actual_loops=loops,
+        actual_time_ms=actual_time,
+        self_time_ms=self_time,
+        children=children,
+    )
+
+
+def _mysql_cost(cost_info: dict[str, Any], *keys: str) -> float | None:
+    values = [float(cost_info[key]) for key in keys if key in cost_info]
+    return sum(values) if values else None
+
+
+def _mysql_node(
+    node_type: str,
+    children: list[PlanNode],
+    self_cost: float | None = None,
+    total_cost: float | None = None,
+    **fields: Any,
+) -> PlanNode:
+    if total_cost is None:
+        child_costs = [child.total_cost for child in children if child.total_cost is not None]
+        if self_cost is not None or child_costs:
+            total_cost = (self_cost or 0) + sum(child_costs)
+    return PlanNode(
+        id=0,
+        node_type=node_type,
+        self_cost=self_cost,
+        total_cost=total_cost,
+        children=children,
+        **fields,
+    )
+
+
+def _mysql_table(table: dict[str, Any]) -> PlanNode:
+    access_type = str(table.get("access_type") or "")
+    return _mysql_node(
+        _MYSQL_ACCESS_TYPES.get(access_type, access_type or "Table"),
+        _mysql_children(table),
+        self_cost=_mysql_cost(table.get("cost_info", {}), "read_cost", "eval_cost"),
+        relation_name=table.get("table_name"),
+        index_name=table.get("key"),
+        full_scan=access_type == "ALL",
+        condition=table.get("attached_condition"),
+        index_condition=table.get("index_condition"),
+        plan_rows=_float(table.get("rows_examined_per_scan")),
+    )
+
+
+def _mysql_children(value: dict[str, Any]) -> list[PlanNode]:
+    """Plan nodes nested in a MySQL plan object, in plan order."""
+    nodes: list[PlanNode] = []
+    for key, item in value.items():
+        if key == "query_block":
+            nodes.append(
+                _mysql_node(
+                    "Query Block",
+                    _mysql_children(item),
+                    total_cost=_mysql_cost(item.get("cost_info", {}), "query_cost"),
+                )
+            )
+        elif key == "table":
+            nodes.append(_mysql_table(item))
+        elif key == "nested_loop":
+            inputs = [node for entry in item for node in _mysql_children(entry)]
+            nodes.append(_mysql_node("Nested Loop", inputs))
+        elif key == "ordering_operation":
+            nodes.append(
+                _mysql_node(
+                    "Sort" if item.get("using_filesort") else "Ordered",
+                    _mysql_children(item),
+                    self_cost=_mysql_cost(item.get("cost_info", {}), "sort_cost"),
+                )
+            )
+        elif key in _MYSQL_OPERATIONS:
+            nodes.append(_mysql_node(_MYSQL_OPERATIONS[key], _mysql_children(item)))
+        elif key == "materialized_from_subquery":
+            nodes.append(_mysql_node("Materialize", _mysql_children(item)))
+        elif key == "query_specifications" or key.endswith("_subqueries"):
+            for entry in item:
+                nodes.extend(_mysql_children(entry))
+    return nodes
+
+
+def parse_plan(
+    plan: Any, dialect: str
+) -> tuple[PlanNode, float | None, float | None]:
+    """
+    Normalize an EXPLAIN JSON plan.
+
+    Args:
+        plan: The single value EXPLAIN returned, as JSON text or parsed
+        dialect: SQL dialect (postgres or mysql)
+
+    Returns:
+        Tuple of (root_node, planning_time_ms, execution_time_ms); times are
+        only reported by PostgreSQL's EXPLAIN ANALYZE
+
+    Raises:
+        ValueError: If the plan has an unexpected shape
+    """
+    if isinstance(plan, str | bytes):
+        plan = json.loads(plan)
+
+    try:
+        if dialect == "mysql":
+            nodes = _mysql_children(plan)
+            if len(nodes) != 1:
+                raise ValueError(f"Expected one query block, got {len(nodes)}")
+            return _number(nodes[0]), None, None
+
+        top = plan[0]
+        root = _postgres_node(top["Plan"])
+        return (
+            _number(root),
+            _float(top.get("Planning Time")),
+            _float(top.get("Execution Time")),
+        )
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        raise ValueError(f"Unexpected EXPLAIN output: {e!r}") from e
+
+
+def _single_column(side: exp.Expression | None) -> str | None:
+    columns = list(side.find_all(exp.Column)) if side is not None else []
+    return columns[0].name if len(columns) == 1 else None
+
+
+def _predicate_column(predicate: exp.Expression | exp.Predicate) -> str | None:
+    """Column a predicate compares to constants, or None."""
+    if isinstance(predicate, exp.In):
+        operands = [predicate.this, *predicate.expressions]
+    elif isinstance(predicate, exp.Between):
+        operands = [predicate.this, predicate.args.get("low"), predicate.args.get("high")]
+    else:
+        operands = [predicate.this, predicate.expression]
+
+    with_columns = [
+        operand for operand in operands if operand is not None and operand.find(exp.Column)
+    ]
+    if len(with_columns) != 1 or isinstance(predicate, exp.In | exp.Between) and (
+        with_columns[0] is not predicate.this
+    ):
+        return None
+    return _single_column(with_columns[0])
+
+
+def condition_columns(condition: str, dialect: str) -> list[str]:
+    """
+    Columns a plan filter compares to constants, equality columns first.
+
+    Columns compared to other columns (join conditions) are left out; so is
+    anything in a condition sqlglot can't parse.
+    """
+    try:
+        tree = sqlglot.parse_one(f"SELECT 1 WHERE {condition}", dialect=dialect)
+    except Exception:
+        return []
+
+    equality: list[str] = []
+    ranges: list[str] = []
+    for predicate in tree.find_all(*_EQUALITY_PREDICATES, *_RANGE_PREDICATES, bfs=False):
+        column = _predicate_column(predicate)
+        if column is None:
+            continue
+        target = equality if isinstance(predicate, _EQUALITY_PREDICATES) else ranges
+        if column not in equality and column not in ranges:
+            target.append(column)
+    return equality + ranges
+
+
+def _table_index(metadata: list[TableMetadata]) -> dict[str, TableMetadata]:
+    """Cached tables by "schema.table" and by bare table name."""
+    tables: dict[str, TableMetadata] = {}
+    for table in metadata:
+        tables[f"{table.schema_name}.{table.table_name}"] = table
+        tables.setdefault(table.table_name, table)
+    return tables
+
+
+def _describe(node: PlanNode) -> str:
+    if node.relation_name:
+        return f"{node.node_type} on {node.relation_name}"
+    return node.node_type
+
+
+def find_plan_issues(
+    root: PlanNode,
+    dialect: str,
+    tables: dict[str, TableMetadata] | None = None,
+) -> list[PlanFinding]:
+    """
+    Annotate a normalized plan with potential problems.
+
+    Args:
+        root: Root of the plan
+        dialect: SQL dialect, used to parse filter conditions
+        tables: Cached table metadata by "schema.table" and table name
+
+    Returns:
+        Hot nodes (hottest first), then misestimates, large full scans and
+        missing-index candidates in plan order
+    """
+    tables = tables or {}
+    nodes = list(walk_plan(root))
+    findings: list[PlanFinding] = []
+
+    # Hot nodes, by time when the plan was executed and by cost otherwise
+    timed = root.actual_time_ms is not None
+    measure = "time" if timed else "estimated cost"
+    shares = [
+        (node, node.self_time_ms if timed else node.self_cost) for node in nodes
+    ]
+    total = sum(value or 0 for _, value in shares)
+    if total > 0:
+        hot = sorted(
+            (
+                (node, value / total)
+                for node, value in shares
+                if value and value / total >= settings.explain_hot_node_share
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        for node, share in hot[:MAX_HOT_NODES]:
+            findings.append(
+                PlanFinding(
+                    kind="hot_node",
+                    node_id=node.id,
+                    table=node.relation_name,
+                    message=f"{_describe(node)} accounts for {share:.0%} of the query's {measure}",
+                )
+            )
+
+    factor = settings.explain_misestimate_factor
+    for node in nodes:
+        if node.plan_rows is None or node.actual_rows is None or not node.actual_loops:
+            continue
+        estimated = max(node.plan_rows, 1.0)
+        actual = max(node.actual_rows, 1.0)
+        if max(estimated / actual, actual / estimated) >= factor:
+            findings.append(
+                PlanFinding(
+                    kind="misestimate",
+                    node_id=node.id,
+                    table=node.relation_name,
+                    message=(
+                        f"{_describe(node)} was estimated at {node.plan_rows:,.0f} rows "
+                        f"but returned {node.actual_rows:,.0f} per execution; statistics "
+                        "may be stale (ANALYZE the table) or predicates correlated"
+                    ),
+                )
+            )
+
+    for node in nodes:
+        if not node.full_scan or not node.relation_name:
+            continue
+        table = tables.get(f"{node.schema_name}.{node.relation_name}") or tables.get(
+            node.relation_name
+        )
+        table_rows: float | None = (
+            table.row_count if table and table.row_count is not None else None
+        )
+        if table_rows is None and (dialect == "mysql" or not node.condition):
+            # Without a filter the scan's estimate is the table size; MySQL
+            # always estimates rows read before filtering
+            table_rows = node.plan_rows
+        if table_rows is None or table_rows < settings.explain_large_table_rows:
+            continue
+
+        findings.append(
+            PlanFinding(
+                kind="seq_scan",
+                node_id=node.id,
+                table=node.relation_name,
+                message=f"{_describe(node)} reads all of its ~{table_rows:,.0f} rows",
+            )
+        )
+
+        if not node.condition:
+            continue
+        columns = condition_columns(node.condition, dialect)
+        if table is not None and table.columns:
+            known = {column.name for column in table.columns if not column.is_primary_key}
+            columns = [column for column in columns if column in known]
+        if columns:
+            findings.append(
+                PlanFinding(
+                    kind="missing_index",
+                    node_id=node.id,
+                    table=node.relation_name,
+                    columns=columns,
+                    message=(
+                        f"{node.relation_name} is filtered on {', '.join(columns)} without "
+                        "an index; consider CREATE INDEX ON "
+                        f"{node.relation_name} ({', '.join(columns)})"
+                    ),
+                )
+            )
+
+    return findings
+
+
+class ExplainService:
+    """Runs EXPLAIN through the connector layer and analyzes the plan."""
+
+    async def explain(
+        self,
+        db_name: str,
+        sql: str,
+        analyze: bool = False,
+        timeout_seconds: int = 30,
+    ) -> ExplainResponse:
+        """
+        Explain a SELECT statement and annotate its plan.
+
+        ``analyze`` executes the statement. It is validated as a SELECT like
+        any other query, and runs in a read-only transaction that is rolled
+        back afterwards, so writes hidden in a SELECT (data-modifying CTEs,
+        nextval()) fail instead of taking effect.
+
+        Args:
+            db_name: Database name
+            sql: SELECT statement to explain (no LIMIT is added)
+            analyze: Run EXPLAIN ANALYZE (PostgreSQL only)
+            timeout_seconds: Timeout in seconds, including time queued
+
+        Returns:
+            The normalized plan, its findings and the raw plan
+
+        Raises:
+            ValueError: If database not found, SQL is invalid or not a SELECT,
+                or ANALYZE was requested for MySQL
+            TimeoutError: If EXPLAIN exceeds the timeout
+            QueryQueueFullError: If too many queries are waiting for the database
+        """
+        db = await database_manager.get_database(db_name)
+        if not db:
+            raise ValueError(f"Database '{db_name}' not found")
+
+        url = db["url"]
+        connector = ConnectorFactory.get_connector(url)
+        dialect = connector.get_dialect()
+
+        parsed = query_service.parse_sql(sql.strip(), dialect)
+        query_service.validate_select_only(parsed)
+        statement = explain_sql(sql.strip().rstrip(";"), dialect, analyze=analyze)
+
+        tunnel_endpoint = await database_manager.get_tunnel_endpoint(db_name)
+
+        async def _execute() -> Any:
+            async with query_scheduler.slot(db_name, "interactive"):
+                _, rows, _ = await connector.execute_query(
+                    url,
+                    statement,
+                    tunnel_endpoint,
+                    db_name=db_name,
+                    timeout_seconds=timeout_seconds,
+                    row_format="arrays",
+                    read_only=True,
+                )
+            # row_format="arrays": the plan is the first column of the first row
+            return cast(list[list[Any]], rows)[0][0]
+
+        try:
+            raw_plan = await asyncio.wait_for(_execute(), timeout=timeout_seconds)
+        except TimeoutError as e:
+            raise TimeoutError(f"EXPLAIN exceeded timeout of {timeout_seconds} seconds") from e
+        if isinstance(raw_plan, str | bytes):
+            raw_plan = json.loads(raw_plan)
+
+        root, planning_time, execution_time = parse_plan(raw_plan, dialect)
+
+        tables: dict[str, TableMetadata] = {}
+        try:
+            metadata = await metadata_service.get_cached_metadata(db_name)
+            if metadata is not None:
+                tables = _table_index(metadata.tables)
+        except Exception as e:
+            logger.warning(f"Plan analysis without table metadata for '{db_name}': {e}")
+
+        return ExplainResponse(
+            sql=sql.strip(),
+            dialect=dialect,
+            analyzed=analyze,
+            plan=root,
+            total_cost=root.total_cost,
+            planning_time_ms=planning_time,
+            execution_time_ms=execution_time,
+            findings=find_plan_issues(root, dialect, tables),
+            raw_plan=raw_plan,
+        )
+
+
+# Global instance
+explain_service = ExplainService()
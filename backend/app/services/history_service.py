@@ -1,11 +1,15 @@
 """Service for managing SQL query execution history."""
 
+import logging
 from datetime import datetime
 from typing import Any
 
 from app.db.sqlite import db_manager
+from app.services.query_stats import query_stats_service
 from app.services.tokenizer import tokenize_for_search
 
+logger = logging.getLogger(__name__)
+
 
 class HistoryService:
     """Service for managing query history records."""
@@ -20,6 +24,9 @@ class HistoryService:
     ) -> int:
         """
         Create a new query history record.
+
+        The execution is also added to the statistics of its query
+        fingerprint; failing to do so is logged and doesn't fail the call.
         
         Args:
             db_name: Database connection name
@@ -45,6 +52,16 @@ class HistoryService:
             execution_time_ms=execution_time_ms,
         )
 
+        try:
+            await query_stats_service.record(
+                db_name=db_name,
+                sql=sql_content,
+                row_count=row_count,
+                execution_time_ms=execution_time_ms,
+            )
+        except Exception:
+            logger.exception("Failed to record query stats for '%s'", db_name)
+
         return history_id
 
     async def list_history(
@@ -0,0 +1,359 @@
+"""Asynchronous query jobs.
+
+Jobs run in the background, at most ``job_max_running`` at a time, and
+stream their rows to a file under ``job_results_dir`` instead of holding
+them in memory. Rows can be fetched by offset while the job is still
+running. Finished jobs and their files are deleted after
+``job_retention_seconds``, by a sweeper running every
+``job_sweep_interval_seconds``. Jobs live in memory only: a restart forgets them
+and removes their files.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from collections.abc import AsyncGenerator
+from contextlib import suppress
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from app.config import settings
+from app.connectors.base import Rows
+from app.models.job import JobResponse, JobResultResponse, JobStatus
+from app.models.query import RowFormat
+from app.services.history_service import history_service
+from app.services.query_service import query_service
+
+logger = logging.getLogger(__name__)
+
+_RESULT_SUFFIX = ".jsonl"
+
+
+class JobStateError(Exception):
+    """Raised when a job's result is requested in a state that has none."""
+
+
+class _RowSpill:
+    """Append-only file of JSON-encoded rows, one per line.
+
+    The byte offset of every ``INDEX_STRIDE``-th row is kept in memory, so
+    reading a window seeks close to its first row instead of scanning the
+    whole file.
+
+    ``append`` and ``read`` block and are run in worker threads; rows are
+    only counted once they are flushed, so a concurrent read never sees a
+    partly written batch.
+    """
+
+    INDEX_STRIDE = 1000
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.row_count = 0
+        self._offsets: list[int] = []
+        self._position = 0
+        self._file: BinaryIO | None = open(path, "wb")  # noqa: SIM115 - closed in close()
+
+    def append(self, rows: Rows) -> None:
+        assert self._file is not None
+        offsets: list[int] = []
+        lines: list[bytes] = []
+        position = self._position
+        for i, row in enumerate(rows):
+            if (self.row_count + i) % self.INDEX_STRIDE == 0:
+                offsets.append(position)
+            line = json.dumps(row, ensure_ascii=False, default=str).encode() + b"\n"
+            lines.append(line)
+            position += len(line)
+        self._file.write(b"".join(lines))
+        self._file.flush()
+        # Publish the rows only once they are on disk
+        self._offsets.extend(offsets)
+        self._position = position
+        self.row_count += len(lines)
+
+    def read(self, offset: int, limit: int) -> list[Any]:
+        if offset >= self.row_count:
+            return []
+        count = min(limit, self.row_count - offset)
+        block = offset // self.INDEX_STRIDE
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[block])
+            for _ in range(offset - block * self.INDEX_STRIDE):
+                f.readline()
+            return [json.loads(f.readline()) for _ in range(count)]
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def delete(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+class _Job:
+    """A submitted query and its progress."""
+
+    def __init__(
+        self,
+        db_name: str,
+        sql: str,
+        truncated: bool,
+        batches: AsyncGenerator[tuple[list[str], Rows]],
+        natural_query: str | None,
+        cost_warning: str | None = None,
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.db_name = db_name
+        self.sql = sql
+        self.truncated = truncated
+        self.batches = batches
+        self.natural_query = natural_query
+        self.cost_warning = cost_warning
+        self.status: JobStatus = "queued"
+        self.columns: list[str] | None = None
+        self.error: str | None = None
+        self.created_at = datetime.now()
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.execution_time_ms: int | None = None
+        self.task: asyncio.Task[None] | None = None
+        self.spill: _RowSpill | None = None
+
+    @property
+    def rows_fetched(self) -> int:
+        return self.spill.row_count if self.spill else 0
+
+    @property
+    def expires_at(self) -> datetime | None:
+        if self.finished_at is None:
+            return None
+        return self.finished_at + timedelta(seconds=settings.job_retention_seconds)
+
+    def to_response(self) -> JobResponse:
+        return JobResponse(
+            id=self.id,
+            db_name=self.db_name,
+            sql=self.sql,
+            status=self.status,
+            columns=self.columns,
+            rows_fetched=self.rows_fetched,
+            truncated=self.truncated,
+            cost_warning=self.cost_warning,
+            error=self.error,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            execution_time_ms=self.execution_time_ms,
+            expires_at=self.expires_at,
+        )
+
+
+class JobService:
+    """Runs query jobs in the background and serves their results."""
+
+    def __init__(self) -> None:
+        self._jobs: dict[str, _Job] = {}
+        self._pending: deque[_Job] = deque()
+        self._running = 0
+        self._sweeper: asyncio.Task[None] | None = None
+
+    def start_sweeper(self) -> None:
+        """Delete expired jobs periodically, even if the job API is not called."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(settings.job_sweep_interval_seconds)
+            try:
+                self._purge_expired()
+            except Exception as e:
+                logger.warning(f"Failed to delete expired query jobs: {e}")
+
+    async def submit(
+        self,
+        db_name: str,
+        sql: str,
+        timeout_seconds: int = 3600,
+        natural_query: str | None = None,
+    ) -> JobResponse:
+        """
+        Validate SQL and queue it as a background job.
+
+        Jobs get a much higher automatic LIMIT (``job_max_rows``) than
+        interactive queries, and wait in the scheduler's "job" lane.
+
+        Args:
+            db_name: Database name
+            sql: SQL query
+            timeout_seconds: Total time the database may spend producing rows
+            natural_query: Natural language description, recorded in history
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If SQL is invalid or not a SELECT statement
+        """
+        self._purge_expired()
+        final_sql, truncated, batches, cost_warning = await query_service.stream_validated_query(
+            db_name,
+            sql,
+            timeout_seconds,
+            "arrays",
+            max_rows=settings.job_max_rows,
+            lane="job",
+        )
+        job = _Job(db_name, final_sql, truncated, batches, natural_query, cost_warning)
+        self._jobs[job.id] = job
+        self._pending.append(job)
+        self._start_pending()
+        return job.to_response()
+
+    def get(self, job_id: str) -> JobResponse | None:
+        """State and progress of a job, or None if unknown or expired."""
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        return job.to_response() if job else None
+
+    async def get_result(
+        self, job_id: str, offset: int, limit: int, row_format: RowFormat = "objects"
+    ) -> JobResultResponse | None:
+        """
+        Rows [offset, offset + limit) of a job's result, or None if unknown.
+
+        Rows fetched so far can be read while the job is still running.
+
+        Raises:
+            JobStateError: If the job is queued, failed or cancelled
+        """
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job.status not in ("running", "succeeded"):
+            raise JobStateError(f"Job {job_id} is {job.status}; it has no result to read")
+
+        columns = job.columns or []
+        rows: list[Any] = (
+            await asyncio.to_thread(job.spill.read, offset, limit) if job.spill else []
+        )
+        if row_format == "objects":
+            rows = [dict(zip(columns, row, strict=False)) for row in rows]
+        return JobResultResponse(
+            id=job.id,
+            status=job.status,
+            columns=columns,
+            rows=rows,
+            offset=offset,
+            row_count=len(rows),
+            total_rows=job.rows_fetched,
+            row_format=row_format,
+        )
+
+    async def delete(self, job_id: str) -> bool:
+        """Cancel a job if it is still queued or running, and delete it with its result."""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False
+        await self._stop(job)
+        return True
+
+    async def close_all(self) -> None:
+        """Cancel every job and delete all results (application shutdown)."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+        jobs = list(self._jobs.values())
+        self._jobs.clear()
+        for job in jobs:
+            await self._stop(job)
+
+    def remove_orphaned_results(self) -> None:
+        """Delete result files left behind by a previous process."""
+        if not settings.job_results_dir.is_dir():
+            return
+        for path in settings.job_results_dir.glob(f"*{_RESULT_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+    def _start_pending(self) -> None:
+        while self._pending and self._running < settings.job_max_running:
+            job = self._pending.popleft()
+            self._running += 1
+            job.task = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: _Job) -> None:
+        job.status = "running"
+        job.started_at = datetime.now()
+        start_time = time.time()
+        try:
+            settings.job_results_dir.mkdir(parents=True, exist_ok=True)
+            job.spill = _RowSpill(settings.job_results_dir / f"{job.id}{_RESULT_SUFFIX}")
+            async for columns, rows in job.batches:
+                job.columns = columns
+                await asyncio.to_thread(job.spill.append, rows)
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            logger.warning(f"Query job {job.id} failed after {job.rows_fetched} rows: {e}")
+            job.status = "failed"
+            job.error = f"Query execution failed: {e}"
+        finally:
+            await job.batches.aclose()
+            if job.spill:
+                job.spill.close()
+            job.finished_at = datetime.now()
+            job.execution_time_ms = int((time.time() - start_time) * 1000)
+            self._running -= 1
+            self._start_pending()
+
+        if job.status != "succeeded":
+            return
+        try:
+            await history_service.create_history(
+                db_name=job.db_name,
+                sql_content=job.sql,
+                row_count=job.rows_fetched,
+                execution_time_ms=job.execution_time_ms,
+                natural_query=job.natural_query,
+            )
+        except Exception as history_error:
+            logger.warning(f"Failed to record query history: {history_error}")
+
+    async def _stop(self, job: _Job) -> None:
+        if job in self._pending:
+            self._pending.remove(job)
+            job.status = "cancelled"
+            await job.batches.aclose()
+        if job.task is not None and not job.task.done():
+            # Cancelling the fetch cancels the statement on the server
+            job.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await job.task
+        if job.spill:
+            job.spill.delete()
+
+    def _purge_expired(self) -> None:
+        now = datetime.now()
+        expired = [
+            job for job in self._jobs.values() if job.expires_at and job.expires_at <= now
+        ]
+        for job in expired:
+            del self._jobs[job.id]
+            if job.spill:
+                job.spill.delete()
+
+
+# Global instance
+job_service = JobService()
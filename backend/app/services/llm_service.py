@@ -8,6 +8,7 @@ from anthropic import Anthropic
 
 from app.config import settings
 from app.services.db_manager import database_manager
+from app.services.metadata_service import format_table_size, metadata_service
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +67,7 @@ Rules:
 3. If unsure about a table, include it (prefer false positives over false negatives)
 4. Return empty array [] only if truly no table matches the query
 5. Consider table names AND comments when making decisions
+6. Row counts and sizes are estimates; prefer small lookup tables when several tables could answer the query
 
 Example output: ["orders", "customers", "order_items"]"""
 
@@ -84,6 +86,7 @@ RULES:
 7. Use proper JOIN syntax when relating tables.
 8. Use PostgreSQL-specific functions and operators when appropriate.
 9. Recognize export intent: If the user mentions "导出", "export", "下载", "download", "保存为", "save as" with a format (csv/json/excel/xlsx), set the export_format field.
+10. Tables list estimated row counts and sizes. For large tables (millions of rows), filter on primary key or selective columns, aggregate instead of listing rows, and avoid unfiltered joins and ORDER BY over the whole table.
 
 OUTPUT FORMAT:
 Return a JSON object with three fields:
@@ -111,6 +114,7 @@ RULES:
 8. Use MySQL-specific functions when appropriate (e.g., IFNULL, COALESCE, DATE_FORMAT).
 9. For LIMIT with offset, use LIMIT offset, count syntax.
 10. Recognize export intent: If the user mentions "导出", "export", "下载", "download", "保存为", "save as" with a format (csv/json/excel/xlsx), set the export_format field.
+11. Tables list estimated row counts and sizes. For large tables (millions of rows), filter on primary key or selective columns, aggregate instead of listing rows, and avoid unfiltered joins and ORDER BY over the whole table.
 
 OUTPUT FORMAT:
 Return a JSON object with three fields:
@@ -195,7 +199,7 @@ Example outputs:
         """
         Build table summary context for LLM table selection (Phase 1).
         
-        Only includes table name, type, and comment - no column details.
+        Only includes table name, type, estimated size and comment - no column details.
         
         Args:
             db_name: Database name to get metadata for
@@ -223,8 +227,10 @@ Example outputs:
                 full_table_name = f"{schema_name}.{table_name}"
                 all_table_names.append(full_table_name)
 
+                size = format_table_size(table_info.get("row_count"), table_info.get("size_bytes"))
+                size_str = f", {size}" if size else ""
                 comment_str = f" - {table_comment}" if table_comment else ""
-                lines.append(f"Table: {full_table_name} ({table_type}){comment_str}")
+                lines.append(f"Table: {full_table_name} ({table_type}{size_str}){comment_str}")
 
             return "\n".join(lines), len(metadata), all_table_names
 
@@ -371,21 +377,29 @@ Return a JSON array of relevant table names. Example: ["public.orders", "public.
                     if "." in t:
                         filter_tables.add(t.split(".")[-1])
 
+            # Filter tables if specified
+            if filter_tables is not None:
+                selected = []
+                for table_info in metadata:
+                    table_name = table_info.get("table_name", "unknown")
+                    full_table_name = f"{table_info.get('schema_name', 'public')}.{table_name}"
+                    if full_table_name in filter_tables or table_name in filter_tables:
+                        selected.append(table_info)
+                metadata = selected
+
+            # Lazily listed tables get their columns now
+            metadata = await metadata_service.load_missing_columns(db_name, metadata)
+
             for table_info in metadata:
                 schema_name = table_info.get("schema_name", "public")
                 table_name = table_info.get("table_name", "unknown")
-                full_table_name = f"{schema_name}.{table_name}"
-
-                # Filter tables if specified
-                if filter_tables is not None:
-                    if full_table_name not in filter_tables and table_name not in filter_tables:
-                        continue
-
                 table_type = table_info.get("table_type", "table")
                 # Note: get_metadata_for_database already parses columns_json to "columns"
                 columns = table_info.get("columns", [])
 
-                lines.append(f"Table: {schema_name}.{table_name} ({table_type})")
+                size = format_table_size(table_info.get("row_count"), table_info.get("size_bytes"))
+                size_str = f", {size}" if size else ""
+                lines.append(f"Table: {schema_name}.{table_name} ({table_type}{size_str})")
                 lines.append("-" * 40)
 
                 for col in columns:
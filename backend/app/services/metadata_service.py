@@ -1,28 +1,131 @@
 """Database metadata extraction and caching service."""
 
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection, Mapping
 from datetime import datetime
+from typing import Any, Literal
 
+from app.config import settings
+from app.connectors.base import DatabaseConnector, TableKey, TableVersion
 from app.connectors.factory import ConnectorFactory
 from app.db.sqlite import db_manager
 from app.models.metadata import (
     ColumnInfo,
     DatabaseMetadata,
+    MetadataRefreshSummary,
+    MetadataStreamHeader,
+    MetadataStreamSchema,
     TableListResponse,
     TableMetadata,
     TableSummary,
 )
+from app.services.cost_guard import cost_guard
 from app.services.db_manager import database_manager
+from app.services.query_scheduler import query_scheduler
+from app.services.result_cache import query_cache
+
+logger = logging.getLogger(__name__)
+
+# Receives the header and schema frames of a refresh as they become known
+ProgressCallback = Callable[[MetadataStreamHeader | MetadataStreamSchema], Awaitable[None]]
+
+
+def format_table_size(row_count: int | None, size_bytes: int | None) -> str:
+    """
+    Short description of a table's size for LLM context, e.g. "~1.2M rows, 340 MB".
+
+    Returns an empty string if neither statistic is known.
+    """
+    parts = []
+    if row_count is not None:
+        parts.append(f"~{_abbreviate(row_count, 1000, ['', 'K', 'M', 'B', 'T'])} rows")
+    if size_bytes is not None:
+        parts.append(_abbreviate(size_bytes, 1024, [" B", " KB", " MB", " GB", " TB"]))
+    return ", ".join(parts)
+
+
+def _abbreviate(value: int, base: int, units: list[str]) -> str:
+    number = float(value)
+    for unit in units:
+        if abs(number) < base or unit == units[-1]:
+            break
+        number /= base
+    return f"{number:.0f}{unit}" if abs(number) >= 100 else f"{number:.2g}{unit}"
+
+
+def _names(tables: Collection[TableKey]) -> list[str]:
+    """Sorted "schema.table" names of (schema, table) pairs."""
+    return sorted(f"{schema}.{table}" for schema, table in tables)
+
+
+def _summaries(tables: list[TableMetadata]) -> list[TableSummary]:
+    """Table summaries (without columns), sorted by name."""
+    return [
+        TableSummary(
+            schema_name=table.schema_name,
+            table_name=table.table_name,
+            table_type=table.table_type,
+            comment=table.comment,
+            row_count=table.row_count,
+            size_bytes=table.size_bytes,
+        )
+        for table in sorted(tables, key=lambda table: table.table_name)
+    ]
+
+
+def _metadata_rows(
+    tables: list[TableMetadata], fingerprints: Mapping[TableKey, str]
+) -> list[dict[str, Any]]:
+    """Rows for SQLiteManager.save_metadata_bulk."""
+    return [
+        {
+            "schema_name": table.schema_name,
+            "table_name": table.table_name,
+            "table_type": table.table_type,
+            # Columns are stored as camelCase dicts
+            "columns": [col.model_dump(by_alias=True) for col in table.columns],
+            "table_comment": table.comment,
+            "row_count": table.row_count,
+            "size_bytes": table.size_bytes,
+            "fingerprint": fingerprints.get((table.schema_name, table.table_name)),
+            "columns_loaded": table.columns_loaded,
+        }
+        for table in tables
+    ]
 
 
 class MetadataService:
     """Service for extracting and caching database metadata."""
 
-    async def fetch_metadata(self, db_name: str) -> DatabaseMetadata:
+    async def _connector(
+        self, db_name: str
+    ) -> tuple[str, DatabaseConnector, tuple[str, int] | None]:
+        """URL, connector and SSH tunnel endpoint of a registered database."""
+        # Get database info
+        db = await database_manager.get_database(db_name)
+        if not db:
+            raise ValueError(f"Database '{db_name}' not found")
+
+        url = db["url"]
+
+        # Get connector
+        connector = ConnectorFactory.get_connector(url)
+
+        # Get SSH tunnel endpoint if configured
+        tunnel_endpoint = await database_manager.get_tunnel_endpoint(db_name)
+        return url, connector, tunnel_endpoint
+
+    async def fetch_metadata(
+        self, db_name: str, tables: Collection[TableKey] | None = None
+    ) -> DatabaseMetadata:
         """
         Fetch metadata from database.
 
         Args:
             db_name: Database connection name
+            tables: Only fetch these (schema, table) pairs; all tables if None
 
         Returns:
             DatabaseMetadata with tables and columns
@@ -30,21 +133,33 @@ class MetadataService:
         Raises:
             ValueError: If database not found or connection fails
         """
-        # Get database info
-        db = await database_manager.get_database(db_name)
-        if not db:
-            raise ValueError(f"Database '{db_name}' not found")
+        url, connector, tunnel_endpoint = await self._connector(db_name)
 
-        url = db["url"]
+        # Fetch metadata (with tunnel if configured), queued behind user queries
+        async with query_scheduler.slot(db_name, "metadata"):
+            schemas, fetched = await connector.fetch_metadata(
+                url, tunnel_endpoint, db_name=db_name, tables=tables
+            )
 
-        # Get connector
-        connector = ConnectorFactory.get_connector(url)
+        return DatabaseMetadata(
+            name=db_name,
+            schemas=schemas,
+            tables=fetched,
+            last_refreshed=datetime.now().isoformat(),
+        )
 
-        # Get SSH tunnel endpoint if configured
-        tunnel_endpoint = await database_manager.get_tunnel_endpoint(db_name)
+    async def fetch_table_list(self, db_name: str) -> DatabaseMetadata:
+        """
+        Fetch schema and table names, without columns where the connector can.
 
-        # Fetch metadata (with tunnel if configured)
-        schemas, tables = await connector.fetch_metadata(url, tunnel_endpoint)
+        Raises:
+            ValueError: If database not found or connection fails
+        """
+        url, connector, tunnel_endpoint = await self._connector(db_name)
+        async with query_scheduler.slot(db_name, "metadata"):
+            schemas, tables = await connector.fetch_table_list(
+                url, tunnel_endpoint, db_name=db_name
+            )
 
         return DatabaseMetadata(
             name=db_name,
@@ -53,30 +168,100 @@ class MetadataService:
             last_refreshed=datetime.now().isoformat(),
         )
 
-    async def cache_metadata(self, db_name: str, metadata: DatabaseMetadata) -> None:
+    async def fetch_schemas(self, db_name: str) -> list[str]:
+        """
+        Fetch the schema names of a database, without tables.
+
+        Raises:
+            ValueError: If database not found or connection fails
+        """
+        url, connector, tunnel_endpoint = await self._connector(db_name)
+        async with query_scheduler.slot(db_name, "metadata"):
+            return await connector.fetch_schemas(url, tunnel_endpoint, db_name=db_name)
+
+    async def fetch_schemas_parallel(
+        self, db_name: str, schemas: Mapping[str, Collection[TableKey] | None]
+    ) -> AsyncIterator[tuple[str, list[TableMetadata]]]:
         """
-        Cache metadata to SQLite.
+        Fetch several schemas concurrently, yielding each as soon as it arrives.
+
+        At most ``metadata_fetch_concurrency`` schemas are fetched at once,
+        each on its own connection and in its own "metadata" scheduler slot.
 
         Args:
             db_name: Database connection name
-            metadata: Metadata to cache
+            schemas: Schemas to fetch, with the (schema, table) pairs to read
+                (all tables of the schema if None)
+
+        Yields:
+            (schema, tables) in order of completion
+
+        Raises:
+            ValueError: If database not found or connection fails
         """
-        # Clear existing metadata for this database
-        await db_manager.clear_metadata_for_database(db_name)
+        url, connector, tunnel_endpoint = await self._connector(db_name)
+        limit = asyncio.Semaphore(max(1, settings.metadata_fetch_concurrency))
+
+        async def fetch(
+            schema: str, tables: Collection[TableKey] | None
+        ) -> tuple[str, list[TableMetadata]]:
+            async with limit, query_scheduler.slot(db_name, "metadata"):
+                fetched = await connector.fetch_schema_metadata(
+                    url, schema, tunnel_endpoint, db_name=db_name, tables=tables
+                )
+            return schema, fetched
+
+        tasks = [asyncio.create_task(fetch(schema, tables)) for schema, tables in schemas.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch_table_versions(self, db_name: str) -> dict[TableKey, TableVersion] | None:
+        """
+        Fetch the definition fingerprint of every table.
 
-        # Save each table's metadata
-        for table in metadata.tables:
-            # Convert columns to list of dicts for storage
-            columns_data = [col.model_dump(by_alias=True) for col in table.columns]
+        Args:
+            db_name: Database connection name
 
-            await db_manager.save_metadata(
-                db_name=db_name,
-                schema_name=table.schema_name,
-                table_name=table.table_name,
-                table_type=table.table_type,
-                columns=columns_data,
-                table_comment=table.comment,
-            )
+        Returns:
+            Versions by (schema, table), or None if the connector can't detect changes
+
+        Raises:
+            ValueError: If database not found or connection fails
+        """
+        url, connector, tunnel_endpoint = await self._connector(db_name)
+
+        try:
+            async with query_scheduler.slot(db_name, "metadata"):
+                return await connector.fetch_table_versions(
+                    url, tunnel_endpoint, db_name=db_name
+                )
+        except NotImplementedError:
+            return None
+
+    async def cache_metadata(
+        self,
+        db_name: str,
+        metadata: DatabaseMetadata,
+        fingerprints: Mapping[TableKey, str] | None = None,
+    ) -> None:
+        """
+        Cache metadata to SQLite, replacing everything cached for the database.
+
+        The swap is atomic: readers see either the old or the new metadata.
+
+        Args:
+            db_name: Database connection name
+            metadata: Metadata to cache
+            fingerprints: Definition fingerprints to store, by (schema, table)
+        """
+        await db_manager.save_metadata_bulk(
+            db_name, _metadata_rows(metadata.tables, fingerprints or {}), replace=True
+        )
 
     async def get_cached_metadata(self, db_name: str) -> DatabaseMetadata | None:
         """
@@ -115,6 +300,7 @@ class MetadataService:
                             is_primary_key=col.get("isPrimaryKey", col.get("is_primary_key", False)),
                             default_value=col.get("defaultValue", col.get("default_value")),
                             comment=col.get("comment"),
+                            extra=col.get("extra"),
                         )
                     )
             except (TypeError, KeyError):
@@ -126,7 +312,10 @@ class MetadataService:
                     table_name=row.get("table_name", "unknown"),
                     table_type=row.get("table_type", "table"),
                     columns=columns,
+                    row_count=row.get("row_count"),
+                    size_bytes=row.get("size_bytes"),
                     comment=row.get("table_comment"),
+                    columns_loaded=row.get("columns_loaded", True),
                 )
             )
 
@@ -137,26 +326,296 @@ class MetadataService:
             last_refreshed=rows[0].get("created_at") if rows else None,
         )
 
-    async def refresh_metadata(self, db_name: str) -> DatabaseMetadata:
+    async def refresh_metadata(
+        self, db_name: str, on_progress: ProgressCallback | None = None
+    ) -> DatabaseMetadata:
         """
         Refresh metadata from database and update cache.
 
+        If the connector can fingerprint table definitions and fingerprints
+        were stored by an earlier refresh, only new and changed tables are
+        fetched again; dropped tables are deleted and the size statistics
+        of the others are updated. Otherwise all metadata is fetched.
+
+        With ``metadata_fetch_concurrency`` above 1, schemas are fetched
+        concurrently and reported to ``on_progress`` as they arrive; the
+        cache is only written once all of them are known.
+
+        Cached query results and cost estimates of the database are dropped
+        as well, since a schema change may have made them stale.
+
+        Args:
+            db_name: Database connection name
+            on_progress: Receives a header frame, then the complete table
+                list of each schema
+
+        Returns:
+            Fresh metadata, with a summary of the changes in ``refresh``
+        """
+        started = time.monotonic()
+        versions = None
+        if settings.metadata_incremental_refresh:
+            versions = await self.fetch_table_versions(db_name)
+        stored = await db_manager.get_table_fingerprints(db_name)
+        incremental = versions is not None and any(stored.values())
+
+        # Tables kept from the cache (incremental refresh), by schema
+        kept: dict[str, list[TableMetadata]] = {}
+        to_fetch: list[TableKey] | None = None
+        if versions is not None and incremental:
+            added = versions.keys() - stored.keys()
+            dropped = stored.keys() - versions.keys()
+            changed = {
+                key
+                for key, version in versions.items()
+                if key in stored and stored[key] != version.fingerprint
+            }
+            unchanged = versions.keys() - added - changed
+            to_fetch = sorted(added | changed)
+            stats = [
+                (*key, versions[key].row_count, versions[key].size_bytes)
+                for key in sorted(unchanged)
+            ]
+
+            cached = await self.get_cached_metadata(db_name)
+            for table in cached.tables if cached else []:
+                key = (table.schema_name, table.table_name)
+                if key in unchanged:
+                    version = versions[key]
+                    kept.setdefault(table.schema_name, []).append(
+                        table.model_copy(
+                            update={"row_count": version.row_count, "size_bytes": version.size_bytes}
+                        )
+                    )
+
+        schemas, fetched = await self._fetch_for_refresh(
+            db_name, to_fetch, kept, incremental, on_progress
+        )
+        tables = sorted(
+            fetched + [table for schema_tables in kept.values() for table in schema_tables],
+            key=lambda table: (table.schema_name, table.table_name),
+        )
+        metadata = DatabaseMetadata(
+            name=db_name,
+            schemas=schemas,
+            tables=tables,
+            last_refreshed=datetime.now().isoformat(),
+        )
+        fingerprints = {key: version.fingerprint for key, version in (versions or {}).items()}
+
+        if not incremental:
+            await self.cache_metadata(db_name, metadata, fingerprints)
+            current = {(table.schema_name, table.table_name) for table in tables}
+            summary = MetadataRefreshSummary(
+                mode="full",
+                added=_names(current - stored.keys()),
+                dropped=_names(stored.keys() - current),
+                duration_ms=0,
+            )
+        else:
+            # Unchanged tables only get fresh statistics, in the same transaction
+            await db_manager.save_metadata_bulk(
+                db_name,
+                _metadata_rows(fetched, fingerprints),
+                deleted=sorted(dropped),
+                stats=stats,
+            )
+            summary = MetadataRefreshSummary(
+                mode="incremental",
+                added=_names(added),
+                changed=_names(changed),
+                dropped=_names(dropped),
+                unchanged=len(unchanged),
+                duration_ms=0,
+            )
+
+        summary.duration_ms = int((time.monotonic() - started) * 1000)
+        metadata.refresh = summary
+        logger.info(
+            "Refreshed metadata of '%s' (%s): %d added, %d changed, %d dropped, "
+            "%d unchanged in %d ms",
+            db_name, summary.mode, len(summary.added), len(summary.changed),
+            len(summary.dropped), summary.unchanged, summary.duration_ms,
+        )
+        query_cache.invalidate(db_name)
+        cost_guard.invalidate(db_name)
+        return metadata
+
+    async def _fetch_for_refresh(
+        self,
+        db_name: str,
+        tables: list[TableKey] | None,
+        kept: Mapping[str, list[TableMetadata]],
+        incremental: bool,
+        on_progress: ProgressCallback | None,
+    ) -> tuple[list[str], list[TableMetadata]]:
+        """
+        Fetch the tables a refresh needs, reporting each schema when complete.
+
+        Args:
+            tables: (schema, table) pairs to fetch; all tables if None
+            kept: Tables kept from the cache, by schema (completing the schemas' lists)
+
+        Returns:
+            Schema names and fetched tables
+        """
+
+        async def report(frame: MetadataStreamHeader | MetadataStreamSchema) -> None:
+            if on_progress is not None:
+                await on_progress(frame)
+
+        async def report_schema(schema: str, fetched: list[TableMetadata]) -> None:
+            await report(
+                MetadataStreamSchema(
+                    schema_name=schema, tables=_summaries(fetched + list(kept.get(schema, [])))
+                )
+            )
+
+        mode: Literal["full", "incremental"] = "incremental" if incremental else "full"
+        if tables is not None and not tables:
+            pending: dict[str, list[TableKey] | None] = {}
+            schemas = await self.fetch_schemas(db_name)
+        elif settings.metadata_fetch_concurrency > 1:
+            schemas = await self.fetch_schemas(db_name)
+            if tables is None:
+                pending = dict.fromkeys(schemas)
+            else:
+                by_table_schema: dict[str, list[TableKey]] = {}
+                for key in tables:
+                    by_table_schema.setdefault(key[0], []).append(key)
+                pending = dict(by_table_schema)
+        else:
+            # One set of queries for all schemas: nothing to report until it's done
+            fetched = await self.fetch_metadata(db_name, tables=tables)
+            by_schema: dict[str, list[TableMetadata]] = {}
+            for table in fetched.tables:
+                by_schema.setdefault(table.schema_name, []).append(table)
+            all_schemas = sorted(set(fetched.schemas) | by_schema.keys() | kept.keys())
+            await report(
+                MetadataStreamHeader(mode=mode, schemas=all_schemas, pending=sorted(by_schema))
+            )
+            for schema in all_schemas:
+                await report_schema(schema, by_schema.get(schema, []))
+            return fetched.schemas, fetched.tables
+
+        all_schemas = sorted(set(schemas) | pending.keys() | kept.keys())
+        await report(MetadataStreamHeader(mode=mode, schemas=all_schemas, pending=sorted(pending)))
+        for schema in all_schemas:
+            if schema not in pending:
+                await report_schema(schema, [])
+
+        result: list[TableMetadata] = []
+        if pending:
+            async for schema, schema_tables in self.fetch_schemas_parallel(db_name, pending):
+                result.extend(schema_tables)
+                await report_schema(schema, schema_tables)
+        return schemas, result
+
+    async def load_table_list(self, db_name: str) -> DatabaseMetadata:
+        """
+        Cache the schema and table names of a database, without columns.
+
+        Replaces the cached metadata; columns are fetched per table by
+        ``load_table_columns`` when first needed.
+
         Args:
             db_name: Database connection name
 
         Returns:
-            Fresh metadata
+            Metadata whose tables have ``columns_loaded=False``
         """
-        metadata = await self.fetch_metadata(db_name)
+        metadata = await self.fetch_table_list(db_name)
         await self.cache_metadata(db_name, metadata)
+        logger.info("Listed %d tables of '%s' without columns", len(metadata.tables), db_name)
+        query_cache.invalidate(db_name)
+        cost_guard.invalidate(db_name)
         return metadata
 
+    async def load_table_columns(
+        self, db_name: str, schema_name: str, table_name: str
+    ) -> TableMetadata | None:
+        """
+        Fetch and cache the columns of one lazily listed table.
+
+        Args:
+            db_name: Database connection name
+            schema_name: Schema name
+            table_name: Table name
+
+        Returns:
+            TableMetadata with columns, or None if the table no longer exists
+        """
+        loaded = await self.load_columns(db_name, [(schema_name, table_name)])
+        return loaded[0] if loaded else None
+
+    async def load_columns(
+        self, db_name: str, tables: Collection[TableKey]
+    ) -> list[TableMetadata]:
+        """
+        Fetch and cache the columns of lazily listed tables in one set of queries.
+
+        Args:
+            db_name: Database connection name
+            tables: (schema, table) pairs
+
+        Returns:
+            The tables with columns; tables dropped since they were listed
+            are left out and removed from the cache
+        """
+        keys = sorted(tables)
+        fetched = await self.fetch_metadata(db_name, tables=keys)
+        found = {(table.schema_name, table.table_name) for table in fetched.tables}
+        await db_manager.save_metadata_bulk(
+            db_name,
+            _metadata_rows(fetched.tables, {}),
+            deleted=[key for key in keys if key not in found],
+        )
+        return fetched.tables
+
+    async def load_missing_columns(
+        self, db_name: str, rows: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        Fill in the columns of lazily listed tables among cached metadata rows.
+
+        Args:
+            db_name: Database connection name
+            rows: Rows of ``db_manager.get_metadata_for_database``
+
+        Returns:
+            The rows, in order, with columns; tables dropped since they were
+            listed are left out
+        """
+        missing = [
+            (row["schema_name"], row["table_name"])
+            for row in rows
+            if not row.get("columns_loaded", True)
+        ]
+        if not missing:
+            return rows
+
+        # Same keys as the cached rows, as they are now stored
+        loaded = {
+            (row["schema_name"], row["table_name"]): row
+            for row in _metadata_rows(await self.load_columns(db_name, missing), {})
+        }
+        result = []
+        for row in rows:
+            if row.get("columns_loaded", True):
+                result.append(row)
+            elif (key := (row["schema_name"], row["table_name"])) in loaded:
+                result.append({**row, **loaded[key]})
+        return result
+
     async def get_or_refresh_metadata(
         self, db_name: str, force_refresh: bool = False
     ) -> DatabaseMetadata:
         """
         Get metadata from cache or refresh if needed.
 
+        With ``metadata_lazy_loading``, a refresh only lists schemas and
+        tables; see ``load_table_list``.
+
         Args:
             db_name: Database connection name
             force_refresh: Force refresh from database
@@ -169,6 +628,9 @@ class MetadataService:
             if cached and cached.tables:
                 return cached
 
+        if settings.metadata_lazy_loading:
+            return await self.load_table_list(db_name)
+
         # Refresh from database
         return await self.refresh_metadata(db_name)
 
@@ -193,6 +655,8 @@ class MetadataService:
                 table_name=table.table_name,
                 table_type=table.table_type,
                 comment=table.comment,
+                row_count=table.row_count,
+                size_bytes=table.size_bytes,
             )
             for table in metadata.tables
         ]
@@ -209,6 +673,8 @@ class MetadataService:
     ) -> TableMetadata | None:
         """
         Get detailed metadata for a specific table.
+
+        Columns of a lazily listed table are fetched and cached on first access.
         
         Args:
             db_name: Database connection name
@@ -224,13 +690,15 @@ class MetadataService:
         if not metadata:
             # Try to refresh if not cached
             try:
-                metadata = await self.refresh_metadata(db_name)
+                metadata = await self.get_or_refresh_metadata(db_name)
             except Exception:
                 return None
 
         # Find the specific table
         for table in metadata.tables:
             if table.schema_name == schema_name and table.table_name == table_name:
+                if not table.columns_loaded:
+                    return await self.load_table_columns(db_name, schema_name, table_name)
                 return table
 
         return None
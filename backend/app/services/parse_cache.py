@@ -0,0 +1,121 @@
+"""LRU cache of parsed SQL statements.
+
+Validation, LIMIT injection, cache keys, coalescing keys and formatting all
+start from the same sqlglot AST, and agents run the same statements over
+and over. Parsing is the most expensive step of that pipeline, so ASTs are
+cached per SQL text and dialect.
+
+The cached AST is never handed out: ``parse`` returns a copy, so callers
+may transform their tree without affecting later callers. The normalized
+SQL used for cache and coalescing keys is a string and is cached as is.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TypedDict
+
+import sqlglot
+from sqlglot import exp
+
+from app.config import settings
+
+# (blake2b digest of the SQL text, dialect)
+ParseKey = tuple[bytes, str]
+
+
+class ParseCacheCounters(TypedDict):
+    """Snapshot returned by ``SqlParseCache.stats``."""
+
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+
+class _ParsedEntry:
+    __slots__ = ("expression", "normalized")
+
+    def __init__(self, expression: exp.Expr) -> None:
+        self.expression = expression
+        self.normalized: str | None = None
+
+
+class SqlParseCache:
+    """LRU cache of sqlglot ASTs keyed by SQL text and dialect."""
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        self.max_entries = (
+            settings.parse_cache_max_entries if max_entries is None else max_entries
+        )
+        self._entries: OrderedDict[ParseKey, _ParsedEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def parse(self, sql: str, dialect: str) -> exp.Expr:
+        """
+        Parse a statement like ``sqlglot.parse_one``, reusing cached ASTs.
+
+        Returns:
+            A private copy of the AST
+
+        Raises:
+            sqlglot.errors.ParseError: If the SQL is invalid (failures are not cached)
+        """
+        return self._entry(sql, dialect).expression.copy()
+
+    def normalize(self, sql: str, dialect: str) -> str:
+        """Canonical SQL without comments, computed once per cached statement."""
+        entry = self._entry(sql, dialect)
+        if entry.normalized is None:
+            entry.normalized = entry.expression.sql(dialect=dialect, comments=False)
+        return entry.normalized
+
+    def clear(self) -> None:
+        """Drop all cached statements and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> ParseCacheCounters:
+        """Occupancy and counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _entry(self, sql: str, dialect: str) -> _ParsedEntry:
+        key = (hashlib.blake2b(sql.encode(), digest_size=16).digest(), dialect)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Parse outside the lock; a concurrent miss on the same SQL parses twice
+        entry = _ParsedEntry(sqlglot.parse_one(sql, dialect=dialect))
+        if self.max_entries <= 0:
+            return entry
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+
+# Global instance
+parse_cache = SqlParseCache()
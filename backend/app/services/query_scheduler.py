@@ -0,0 +1,163 @@
+"""Admission control for queries sent to registered databases.
+
+Each database gets at most ``query_max_concurrency`` statements at a time.
+Further queries wait in a bounded queue with one lane per kind of work:
+interactive queries from the grid are admitted before agent tool calls,
+those before background query jobs, and those before metadata refreshes.
+Within a lane, waiters are served in arrival order, and a waiter queued
+longer than ``query_queue_starvation_seconds`` is served next whatever its
+lane, so lower lanes can't be starved by a steady stream of interactive
+queries.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Literal
+
+from app.config import settings
+
+# Lanes in admission order
+Lane = Literal["interactive", "agent", "job", "metadata"]
+LANES: tuple[Lane, ...] = ("interactive", "agent", "job", "metadata")
+
+
+class QueryQueueFullError(Exception):
+    """Raised when a database's wait queue is full."""
+
+
+class _Waiter:
+    __slots__ = ("future", "enqueued_at")
+
+    def __init__(self, future: "asyncio.Future[None]") -> None:
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class _DatabaseQueue:
+    """Running count, lanes and counters of one database."""
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.lanes: dict[Lane, deque[_Waiter]] = {lane: deque() for lane in LANES}
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    @property
+    def depth(self) -> int:
+        return sum(len(waiters) for waiters in self.lanes.values())
+
+
+class QueryScheduler:
+    """Per-database concurrency limit with a prioritized, bounded wait queue."""
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        max_queue: int | None = None,
+        starvation_seconds: float | None = None,
+    ) -> None:
+        self.max_concurrency = (
+            settings.query_max_concurrency if max_concurrency is None else max_concurrency
+        )
+        self.max_queue = settings.query_max_queue if max_queue is None else max_queue
+        self.starvation_seconds = (
+            settings.query_queue_starvation_seconds
+            if starvation_seconds is None
+            else starvation_seconds
+        )
+        self._queues: dict[str, _DatabaseQueue] = {}
+
+    @asynccontextmanager
+    async def slot(self, db_name: str, lane: Lane = "interactive") -> AsyncIterator[None]:
+        """
+        Hold one of the database's execution slots for the duration of the block.
+
+        Raises:
+            QueryQueueFullError: If the database's wait queue is full
+        """
+        await self._acquire(db_name, lane)
+        try:
+            yield
+        finally:
+            self._release(db_name)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Occupancy, queue depth per lane and wait-time counters per database."""
+        return [
+            {
+                "name": name,
+                "running": queue.running,
+                "max_concurrency": self.max_concurrency,
+                "queued": queue.depth,
+                "queued_by_lane": {lane: len(waiters) for lane, waiters in queue.lanes.items()},
+                "max_queue": self.max_queue,
+                "admitted": queue.admitted,
+                "waited": queue.queued,
+                "rejected": queue.rejected,
+                "avg_wait_ms": int(queue.wait_seconds_total * 1000 / queue.queued)
+                if queue.queued
+                else 0,
+                "max_wait_ms": int(queue.wait_seconds_max * 1000),
+            }
+            for name, queue in sorted(self._queues.items())
+        ]
+
+    async def _acquire(self, db_name: str, lane: Lane) -> None:
+        queue = self._queues.setdefault(db_name, _DatabaseQueue())
+        if queue.running < self.max_concurrency and queue.depth == 0:
+            queue.running += 1
+            queue.admitted += 1
+            return
+
+        if queue.depth >= self.max_queue:
+            queue.rejected += 1
+            raise QueryQueueFullError(
+                f"Too many queries waiting for database '{db_name}' "
+                f"({queue.depth} queued); try again later"
+            )
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future())
+        queue.lanes[lane].append(waiter)
+        try:
+            await waiter.future
+        except BaseException:
+            if waiter.future.cancelled():
+                queue.lanes[lane].remove(waiter)
+            else:
+                # Cancelled right after being admitted: hand the slot on
+                self._release(db_name)
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        queue.admitted += 1
+        queue.queued += 1
+        queue.wait_seconds_total += waited
+        queue.wait_seconds_max = max(queue.wait_seconds_max, waited)
+
+    def _release(self, db_name: str) -> None:
+        queue = self._queues[db_name]
+        queue.running -= 1
+        waiter = self._next_waiter(queue)
+        if waiter is not None:
+            # The slot passes straight to the waiter, so newcomers can't jump the queue
+            queue.running += 1
+            waiter.future.set_result(None)
+
+    def _next_waiter(self, queue: _DatabaseQueue) -> _Waiter | None:
+        heads = [(lane, waiters[0]) for lane, waiters in queue.lanes.items() if waiters]
+        if not heads:
+            return None
+        starved_before = time.monotonic() - self.starvation_seconds
+        starving = [head for head in heads if head[1].enqueued_at <= starved_before]
+        lane, _ = min(starving, key=lambda head: head[1].enqueued_at) if starving else heads[0]
+        return queue.lanes[lane].popleft()
+
+
+# Global instance
+query_scheduler = QueryScheduler()
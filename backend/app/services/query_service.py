@@ -1,22 +1,39 @@
 """SQL query execution service."""
 
 import asyncio
-from typing import Any
+import time
+from collections.abc import AsyncGenerator
 
-import sqlglot
 from sqlglot import exp
 
+from app.config import settings
+from app.connectors.base import DatabaseConnector, ResultBatch, Rows
 from app.connectors.factory import ConnectorFactory
+from app.models.query import RowFormat
+from app.models.result import StoredResultResponse
+from app.services.cost_guard import cost_guard
 from app.services.db_manager import database_manager
+from app.services.parse_cache import parse_cache
+from app.services.query_scheduler import Lane, query_scheduler
+from app.services.result_cache import CachedResult, CacheKey, query_cache
+from app.services.result_store import result_store
+from app.services.single_flight import SingleFlight
 
 
 class QueryService:
     """Service for SQL query parsing and execution."""
 
+    def __init__(self) -> None:
+        # Identical queries running concurrently share one execution
+        self._query_flights: SingleFlight[tuple[list[str], Rows, int]] = SingleFlight()
+        self._validated_flights: SingleFlight[CachedResult] = SingleFlight()
+
     def parse_sql(self, sql: str, dialect: str = "postgres") -> exp.Expression:
         """
         Parse SQL using sqlglot.
 
+        ASTs are cached per SQL text and dialect; each call gets its own copy.
+
         Args:
             sql: SQL statement to parse
             dialect: SQL dialect (postgres or mysql)
@@ -28,8 +45,7 @@ class QueryService:
             ValueError: If SQL is invalid
         """
         try:
-            parsed = sqlglot.parse_one(sql, dialect=dialect)
-            return parsed
+            return parse_cache.parse(sql, dialect)
         except Exception as e:
             raise ValueError(f"SQL syntax error: {e}") from e
 
@@ -115,19 +131,21 @@ class QueryService:
             ValueError: If SQL cannot be formatted
         """
         try:
-            formatted = sqlglot.transpile(sql, read=dialect, write=dialect, pretty=True)[0]
-            return formatted
+            return parse_cache.parse(sql, dialect).sql(dialect=dialect, pretty=True)
         except Exception as e:
             raise ValueError(f"Failed to format SQL: {e}") from e
 
-    def inject_limit(self, sql: str, parsed: exp.Expression, dialect: str = "postgres") -> tuple[str, bool]:
+    def inject_limit(
+        self, sql: str, parsed: exp.Expression, dialect: str = "postgres", limit: int = 1000
+    ) -> tuple[str, bool]:
         """
-        Add LIMIT 1000 if no LIMIT clause exists, preserving original format.
+        Add LIMIT (default 1000) if no LIMIT clause exists, preserving original format.
 
         Args:
             sql: Original SQL
             parsed: Parsed SQL expression
             dialect: SQL dialect
+            limit: Row limit to add
 
         Returns:
             Tuple of (modified SQL, was_truncated)
@@ -142,23 +160,28 @@ class QueryService:
 
         if is_multiline:
             # Multiline format: add LIMIT on new line
-            modified_sql = stripped_sql + '\nLIMIT 1000'
+            modified_sql = stripped_sql + f'\nLIMIT {limit}'
         else:
             # Single line format: append LIMIT with space
-            modified_sql = stripped_sql + ' LIMIT 1000'
+            modified_sql = stripped_sql + f' LIMIT {limit}'
 
         return modified_sql, True
 
     async def execute_query(
-        self, db_name: str, sql: str, timeout_seconds: int = 30
-    ) -> tuple[list[str], list[dict[str, Any]], int]:
+        self, db_name: str, sql: str, timeout_seconds: int = 30, lane: Lane = "interactive"
+    ) -> tuple[list[str], Rows, int]:
         """
         Execute SQL query against database with timeout.
 
+        Concurrent calls with the same database and normalized SQL share one
+        execution; each caller still waits at most ``timeout_seconds``,
+        including time spent queued for an execution slot.
+
         Args:
             db_name: Database name
             sql: SQL query to execute
             timeout_seconds: Query timeout in seconds (default: 30)
+            lane: Scheduler lane the query waits in for an execution slot
 
         Returns:
             Tuple of (column_names, rows, execution_time_ms)
@@ -166,6 +189,7 @@ class QueryService:
         Raises:
             ValueError: If database not found
             asyncio.TimeoutError: If query exceeds timeout
+            QueryQueueFullError: If too many queries are waiting for the database
             Exception: If query execution fails
         """
         # Get database info
@@ -181,34 +205,60 @@ class QueryService:
         # Get SSH tunnel endpoint if configured
         tunnel_endpoint = await database_manager.get_tunnel_endpoint(db_name)
 
-        # Execute query with timeout (with tunnel if configured)
+        async def _execute() -> tuple[list[str], Rows, int]:
+            async with query_scheduler.slot(db_name, lane):
+                return await connector.execute_query(
+                    url, sql, tunnel_endpoint, db_name=db_name, timeout_seconds=timeout_seconds
+                )
+
+        # Execute query with timeout (with tunnel if configured). Once every
+        # caller has timed out, the connector call is cancelled, which cancels
+        # the statement on the server as well
+        key = (db_name, self.normalize_sql(sql, connector.get_dialect()))
         try:
-            return await asyncio.wait_for(
-                connector.execute_query(url, sql, tunnel_endpoint),
-                timeout=timeout_seconds
-            )
+            result, _ = await self._query_flights.do(key, _execute, timeout_seconds)
+            return result
         except asyncio.TimeoutError:
             raise asyncio.TimeoutError(
                 f"Query execution exceeded timeout of {timeout_seconds} seconds"
             )
 
     async def execute_validated_query(
-        self, db_name: str, sql: str, timeout_seconds: int = 30
-    ) -> tuple[str, list[str], list[dict[str, Any]], int, bool]:
+        self,
+        db_name: str,
+        sql: str,
+        timeout_seconds: int = 30,
+        row_format: RowFormat = "objects",
+        use_cache: bool = True,
+    ) -> tuple[str, list[str], Rows, int, bool, bool, str | None]:
         """
         Parse, validate, and execute SQL query with timeout.
 
+        Results are cached per connection TTL (``cache_ttl_seconds``, falling
+        back to ``query_cache_ttl_seconds``), and concurrent identical queries
+        share one execution. ``use_cache=False`` always runs its own
+        statement, and its result is not cached either.
+
+        Queries that miss the cache are checked by the cost guard first, which
+        may reject them or attach a warning; cached results keep their warning.
+
         Args:
             db_name: Database name
             sql: SQL query
             timeout_seconds: Query timeout in seconds (default: 30)
+            row_format: "objects" for dict rows, "arrays" for positional lists
+            use_cache: Serve and store the result in the result cache
 
         Returns:
-            Tuple of (executed_sql, columns, rows, execution_time_ms, truncated)
+            Tuple of (executed_sql, columns, rows, execution_time_ms, truncated,
+            cached, cost_warning), where cached is True if the result came from
+            the cache and cost_warning is set when the cost guard warned
 
         Raises:
             ValueError: If SQL is invalid or not a SELECT statement
+            QueryCostExceededError: If the cost guard rejected the query
             asyncio.TimeoutError: If query exceeds timeout
+            QueryQueueFullError: If too many queries are waiting for the database
         """
         # Get database info
         db = await database_manager.get_database(db_name)
@@ -226,24 +276,302 @@ class QueryService:
         # Validate SELECT only
         self.validate_select_only(parsed)
 
+        ttl = db.get("cache_ttl_seconds")
+        if ttl is None:
+            ttl = settings.query_cache_ttl_seconds
+        cache_key: CacheKey | None = None
+        if use_cache:
+            cache_key = self.cache_key(db_name, sql.strip(), dialect, row_format)
+            cached = query_cache.get(cache_key) if ttl > 0 else None
+            if cached is not None:
+                return (*cached[:5], True, cached[5])
+
         # Inject LIMIT if needed
         final_sql, truncated = self.inject_limit(sql, parsed, dialect)
 
         # Get SSH tunnel endpoint if configured
         tunnel_endpoint = await database_manager.get_tunnel_endpoint(db_name)
 
-        # Execute query with timeout (with tunnel if configured)
+        cost_warning = await cost_guard.check(db, connector, final_sql, tunnel_endpoint)
+
+        async def _execute() -> CachedResult:
+            async with query_scheduler.slot(db_name, "interactive"):
+                columns, rows, execution_time_ms = await connector.execute_query(
+                    url,
+                    final_sql,
+                    tunnel_endpoint,
+                    db_name=db_name,
+                    timeout_seconds=timeout_seconds,
+                    row_format=row_format,
+                )
+            result = (final_sql, columns, rows, execution_time_ms, truncated, cost_warning)
+            if cache_key is not None:
+                query_cache.put(cache_key, result, ttl)  # no-op when ttl is 0
+            return result
+
+        # Execute query with timeout (with tunnel if configured). Once every
+        # caller has timed out, the connector call is cancelled, which cancels
+        # the statement on the server as well
         try:
-            columns, rows, execution_time_ms = await asyncio.wait_for(
-                connector.execute_query(url, final_sql, tunnel_endpoint),
-                timeout=timeout_seconds
-            )
+            if cache_key is None:
+                result = await asyncio.wait_for(_execute(), timeout=timeout_seconds)
+            else:
+                result, _ = await self._validated_flights.do(
+                    cache_key, _execute, timeout_seconds
+                )
         except asyncio.TimeoutError:
             raise asyncio.TimeoutError(
                 f"Query execution exceeded timeout of {timeout_seconds} seconds"
             )
 
-        return final_sql, columns, rows, execution_time_ms, truncated
+        return (*result[:5], False, result[5])
+
+    async def check_query_cost(
+        self, db_name: str, sql: str, lane: Lane = "interactive"
+    ) -> str | None:
+        """
+        Run the cost guard on a statement that is executed without validation.
+
+        Statements other than queries (SHOW, DESCRIBE, ...) are not checked.
+
+        Returns:
+            A warning if the cost guard warned, else None
+
+        Raises:
+            ValueError: If database not found
+            QueryCostExceededError: If the cost guard rejected the query
+        """
+        db = await database_manager.get_database(db_name)
+        if not db:
+            raise ValueError(f"Database '{db_name}' not found")
+
+        connector = ConnectorFactory.get_connector(db["url"])
+        try:
+            parsed = self.parse_sql(sql.strip(), connector.get_dialect())
+        except ValueError:
+            return None
+        if not isinstance(parsed, exp.Query):
+            return None
+
+        tunnel_endpoint = await database_manager.get_tunnel_endpoint(db_name)
+        return await cost_guard.check(db, connector, sql, tunnel_endpoint, lane=lane)
+
+    def normalize_sql(self, sql: str, dialect: str = "postgres") -> str:
+        """
+        Canonical form of a statement for cache and coalescing keys.
+
+        Whitespace, keyword case and comments are normalized away; SQL that
+        sqlglot can't parse is only stripped.
+        """
+        try:
+            return parse_cache.normalize(sql, dialect)
+        except Exception:
+            return sql.strip()
+
+    def cache_key(
+        self, db_name: str, sql: str, dialect: str, row_format: RowFormat
+    ) -> CacheKey:
+        """Result cache and coalescing key; whitespace, keyword case and comments don't matter."""
+        return (db_name, dialect, self.normalize_sql(sql, dialect), row_format)
+
+    async def stream_validated_query(
+        self,
+        db_name: str,
+        sql: str,
+        timeout_seconds: int = 30,
+        row_format: RowFormat = "objects",
+        *,
+        max_rows: int | None = None,
+        lane: Lane = "interactive",
+    ) -> tuple[str, bool, AsyncGenerator[tuple[list[str], Rows]], str | None]:
+        """
+        Parse and validate SQL, then stream its results in batches.
+
+        Validation and cost guard errors are raised immediately; execution
+        errors (including QueryQueueFullError) surface while iterating.
+        Streamed queries get a higher automatic LIMIT
+        (``query_stream_max_rows``) than buffered ones.
+
+        Args:
+            db_name: Database name
+            sql: SQL query
+            timeout_seconds: Total time the database may spend producing rows
+            row_format: "objects" for dict rows, "arrays" for positional lists
+            max_rows: LIMIT added to queries without one (default:
+                ``query_stream_max_rows``)
+            lane: Scheduler lane the query waits in for an execution slot
+
+        Returns:
+            Tuple of (executed_sql, truncated, batches, cost_warning) where
+            batches yields (columns, rows) tuples, the first one always
+            carrying the columns
+
+        Raises:
+            ValueError: If SQL is invalid or not a SELECT statement
+            QueryCostExceededError: If the cost guard rejected the query
+        """
+        (
+            connector,
+            url,
+            final_sql,
+            truncated,
+            tunnel_endpoint,
+            cost_warning,
+        ) = await self._prepare_stream(db_name, sql, max_rows, lane)
+        batches = connector.stream_query(
+            url,
+            final_sql,
+            tunnel_endpoint,
+            db_name=db_name,
+            timeout_seconds=timeout_seconds,
+            batch_size=settings.query_stream_batch_size,
+            row_format=row_format,
+        )
+        return (
+            final_sql,
+            truncated,
+            self._with_deadline(self._admitted(db_name, batches, lane), timeout_seconds),
+            cost_warning,
+        )
+
+    async def stream_validated_batches(
+        self,
+        db_name: str,
+        sql: str,
+        timeout_seconds: int = 30,
+        *,
+        max_rows: int | None = None,
+        lane: Lane = "interactive",
+    ) -> tuple[str, bool, AsyncGenerator[ResultBatch], str | None]:
+        """
+        Like stream_validated_query, but yields raw driver rows with column types.
+
+        Used for typed encodings (Arrow) that serialize values themselves.
+
+        Returns:
+            Tuple of (executed_sql, truncated, batches, cost_warning)
+
+        Raises:
+            ValueError: If SQL is invalid or not a SELECT statement
+            QueryCostExceededError: If the cost guard rejected the query
+        """
+        (
+            connector,
+            url,
+            final_sql,
+            truncated,
+            tunnel_endpoint,
+            cost_warning,
+        ) = await self._prepare_stream(db_name, sql, max_rows, lane)
+        batches = connector.stream_batches(
+            url,
+            final_sql,
+            tunnel_endpoint,
+            db_name=db_name,
+            timeout_seconds=timeout_seconds,
+            batch_size=settings.query_stream_batch_size,
+        )
+        return (
+            final_sql,
+            truncated,
+            self._with_deadline(self._admitted(db_name, batches, lane), timeout_seconds),
+            cost_warning,
+        )
+
+    async def store_validated_query(
+        self,
+        db_name: str,
+        sql: str,
+        timeout_seconds: int = 30,
+    ) -> tuple[StoredResultResponse, int, str | None]:
+        """
+        Parse and validate SQL, then write its full result to the result store.
+
+        Stored queries get the highest automatic LIMIT
+        (``result_store_max_rows``); rows never accumulate in memory.
+
+        Returns:
+            Tuple of (stored_result, execution_time_ms, cost_warning)
+
+        Raises:
+            ValueError: If SQL is invalid or not a SELECT statement
+            QueryCostExceededError: If the cost guard rejected the query
+            asyncio.TimeoutError: If query exceeds timeout
+            QueryQueueFullError: If too many queries are waiting for the database
+        """
+        start_time = time.time()
+        final_sql, truncated, batches, cost_warning = await self.stream_validated_batches(
+            db_name, sql, timeout_seconds, max_rows=settings.result_store_max_rows
+        )
+        stored = await result_store.write(db_name, final_sql, truncated, batches)
+        return stored, int((time.time() - start_time) * 1000), cost_warning
+
+    async def _prepare_stream(
+        self, db_name: str, sql: str, max_rows: int | None = None, lane: Lane = "interactive"
+    ) -> tuple[DatabaseConnector, str, str, bool, tuple[str, int] | None, str | None]:
+        """Validate and cost-check SQL for streaming, resolving the connection target.
+
+        Returns:
+            Tuple of (connector, url, executed_sql, truncated, tunnel_endpoint,
+            cost_warning)
+        """
+        db = await database_manager.get_database(db_name)
+        if not db:
+            raise ValueError(f"Database '{db_name}' not found")
+
+        url = db["url"]
+
+        connector = ConnectorFactory.get_connector(url)
+        dialect = connector.get_dialect()
+
+        parsed = self.parse_sql(sql.strip(), dialect)
+        self.validate_select_only(parsed)
+        final_sql, truncated = self.inject_limit(
+            sql, parsed, dialect, limit=max_rows or settings.query_stream_max_rows
+        )
+
+        tunnel_endpoint = await database_manager.get_tunnel_endpoint(db_name)
+        cost_warning = await cost_guard.check(db, connector, final_sql, tunnel_endpoint, lane=lane)
+        return connector, url, final_sql, truncated, tunnel_endpoint, cost_warning
+
+    async def _admitted[T](
+        self, db_name: str, batches: AsyncGenerator[T], lane: Lane = "interactive"
+    ) -> AsyncGenerator[T]:
+        """Hold an execution slot from the first fetch until the stream is closed."""
+        try:
+            async with query_scheduler.slot(db_name, lane):
+                async for batch in batches:
+                    yield batch
+        finally:
+            await batches.aclose()
+
+    async def _with_deadline[T](
+        self,
+        batches: AsyncGenerator[T],
+        timeout_seconds: int,
+    ) -> AsyncGenerator[T]:
+        """Enforce the query timeout on time spent waiting for the database.
+
+        Time the consumer spends sending rows to the client is not counted.
+        On timeout the pending fetch is cancelled, which cancels the
+        statement on the server.
+        """
+        remaining = float(timeout_seconds)
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    batch = await asyncio.wait_for(anext(batches), timeout=max(remaining, 0))
+                except StopAsyncIteration:
+                    return
+                except TimeoutError as e:
+                    raise TimeoutError(
+                        f"Query execution exceeded timeout of {timeout_seconds} seconds"
+                    ) from e
+                remaining -= time.monotonic() - started
+                yield batch
+        finally:
+            await batches.aclose()
 
 
 # Global instance
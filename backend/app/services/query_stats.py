@@ -0,0 +1,177 @@
+"""Aggregated execution statistics per query shape.
+
+Each recorded execution is fingerprinted: literals are replaced by ``?``
+in the sqlglot AST (IN lists collapse to a single ``?``, comments and
+formatting are dropped), so ``WHERE id = 1`` and ``where id=2 LIMIT 5``
+share one entry. Per (database, fingerprint) the ``query_stats`` table
+keeps counts, totals and maxima of execution time and rows.
+
+Execution time percentiles come from a log-bucketed histogram sketch
+(as in DDSketch): a time t falls in bucket ceil(log_gamma(t)), so every
+estimate is within SKETCH_RELATIVE_ACCURACY of a real execution time and
+the number of buckets stays small (about 400 cover 1 ms to 1 hour).
+Buckets are counted in ``query_stats_buckets`` with plain upserts, so
+recording never reads back state.
+"""
+
+import hashlib
+import math
+import re
+from typing import Any, Literal
+
+from sqlglot import exp
+
+from app.db.sqlite import db_manager
+from app.services.parse_cache import parse_cache
+
+QueryStatsSort = Literal["total_time", "mean_time", "max_time", "count", "rows"]
+
+# Relative error of the p50/p95 estimates
+SKETCH_RELATIVE_ACCURACY = 0.02
+_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+# Fallback fingerprinting of SQL that sqlglot can't parse
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _placeholder() -> exp.Expression:
+    return exp.var("?")
+
+
+def _is_literal(node: exp.Expression) -> bool:
+    if isinstance(node, exp.Neg):
+        node = node.this
+    return isinstance(node, exp.Literal)
+
+
+def _strip_literal(node: exp.Expression) -> exp.Expression:
+    if isinstance(node, exp.In) and node.expressions and all(
+        _is_literal(item) for item in node.expressions
+    ):
+        node.set("expressions", [_placeholder()])
+        return node
+    if isinstance(node, exp.Interval) or (
+        _is_literal(node) and not isinstance(node.parent, exp.DataTypeParam)
+    ):
+        return _placeholder()
+    return node
+
+
+def fingerprint_sql(sql: str, dialect: str) -> tuple[str, str]:
+    """
+    Literal-free form of a statement and its hash.
+
+    Returns:
+        Tuple of (fingerprint, normalized_sql)
+    """
+    try:
+        # parse_cache hands out a copy, so the tree can be transformed
+        tree = parse_cache.parse(sql.strip(), dialect).transform(_strip_literal)
+        normalized = tree.sql(dialect=dialect, comments=False)
+    except Exception:
+        normalized = _STRING_LITERAL.sub("?", sql)
+        normalized = _NUMBER_LITERAL.sub("?", normalized)
+        normalized = _WHITESPACE.sub(" ", normalized).strip()
+    fingerprint = hashlib.sha1(f"{dialect}:{normalized}".encode()).hexdigest()[:16]
+    return fingerprint, normalized
+
+
+def time_bucket(execution_time_ms: int) -> int:
+    """Sketch bucket of an execution time; 0 holds times of 0 ms."""
+    if execution_time_ms <= 0:
+        return 0
+    return math.ceil(math.log(execution_time_ms) / _LOG_GAMMA) + 1
+
+
+def bucket_value(bucket: int) -> float:
+    """Representative execution time of a sketch bucket."""
+    if bucket <= 0:
+        return 0.0
+    return 2 * _GAMMA ** (bucket - 1) / (_GAMMA + 1)
+
+
+def sketch_quantile(buckets: dict[int, int], q: float) -> float:
+    """Estimate the nearest-rank q-quantile (0..1) of the times counted in ``buckets``."""
+    total = sum(buckets.values())
+    if total == 0:
+        return 0.0
+    rank = max(math.ceil(q * total), 1)
+    seen = 0
+    for bucket in sorted(buckets):
+        seen += buckets[bucket]
+        if seen >= rank:
+            return bucket_value(bucket)
+    return bucket_value(max(buckets))
+
+
+class QueryStatsService:
+    """Records executions per query fingerprint and ranks the hottest shapes."""
+
+    async def record(
+        self,
+        db_name: str,
+        sql: str,
+        row_count: int,
+        execution_time_ms: int,
+        dialect: str | None = None,
+    ) -> str:
+        """
+        Add an execution to the statistics of its fingerprint.
+
+        Args:
+            db_name: Database connection name
+            sql: The SQL statement that was executed
+            row_count: Number of rows returned
+            execution_time_ms: Execution time in milliseconds
+            dialect: SQL dialect; looked up from the connection when omitted
+
+        Returns:
+            The statement's fingerprint
+        """
+        if dialect is None:
+            db = await db_manager.get_database(db_name)
+            dialect = "mysql" if db and db.get("db_type") == "mysql" else "postgres"
+
+        fingerprint, normalized = fingerprint_sql(sql, dialect)
+        await db_manager.record_query_stats(
+            db_name=db_name,
+            fingerprint=fingerprint,
+            normalized_sql=normalized,
+            sample_sql=sql,
+            row_count=row_count,
+            execution_time_ms=execution_time_ms,
+            time_bucket=time_bucket(execution_time_ms),
+        )
+        return fingerprint
+
+    async def top_queries(
+        self, db_name: str, sort: QueryStatsSort = "total_time", limit: int = 20
+    ) -> list[dict[str, Any]]:
+        """
+        Query shapes of a database, most expensive first.
+
+        Args:
+            db_name: Database connection name
+            sort: Ranking: total, mean or max execution time, executions or rows
+            limit: Maximum number of shapes to return
+
+        Returns:
+            Statistics per fingerprint, with means and p50/p95 execution times
+        """
+        items = await db_manager.list_query_stats(db_name=db_name, sort=sort, limit=limit)
+        for item in items:
+            buckets = item.pop("buckets")
+            count = item["exec_count"]
+            item["mean_time_ms"] = item["total_time_ms"] / count
+            item["mean_rows"] = item["total_rows"] / count
+            # Bucket midpoints can overshoot the slowest real execution
+            item["p50_time_ms"] = min(sketch_quantile(buckets, 0.5), item["max_time_ms"])
+            item["p95_time_ms"] = min(sketch_quantile(buckets, 0.95), item["max_time_ms"])
+        return items
+
+
+# Global singleton instance
+query_stats_service = QueryStatsService()
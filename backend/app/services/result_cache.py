@@ -0,0 +1,133 @@
+"""In-memory cache of query results.
+
+Results are keyed by database, dialect and the sqlglot-normalized SQL, so
+queries differing only in whitespace, keyword case or comments share an
+entry. Entries expire after a per-connection TTL, and the least recently
+used ones are evicted once the cache exceeds its memory budget.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import settings
+from app.connectors.base import Rows
+
+# (db_name, dialect, normalized_sql, row_format)
+CacheKey = tuple[str, str, str, str]
+
+# (executed_sql, columns, rows, execution_time_ms, truncated, cost_warning)
+CachedResult = tuple[str, list[str], Rows, int, bool, str | None]
+
+# Rows serialized to estimate the size of a result
+_SIZE_SAMPLE_ROWS = 100
+# Python object overhead on top of the serialized size
+_SIZE_OVERHEAD = 2
+
+
+def estimate_result_size(columns: list[str], rows: Rows) -> int:
+    """Approximate memory held by a result, from a JSON sample of its rows."""
+    size = len(json.dumps(columns, default=str))
+    if rows:
+        sample = rows[:_SIZE_SAMPLE_ROWS]
+        sample_size = len(json.dumps(sample, default=str))
+        size += sample_size * len(rows) // len(sample)
+    return size * _SIZE_OVERHEAD
+
+
+class _CacheEntry:
+    __slots__ = ("result", "size", "expires_at")
+
+    def __init__(self, result: CachedResult, size: int, expires_at: float) -> None:
+        self.result = result
+        self.size = size
+        self.expires_at = expires_at
+
+
+class QueryResultCache:
+    """LRU cache of query results with per-entry TTL and a global byte budget."""
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self.max_bytes = settings.query_cache_max_bytes if max_bytes is None else max_bytes
+        self._entries: OrderedDict[CacheKey, _CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: CacheKey) -> CachedResult | None:
+        """Return a live cached result and mark it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.result
+
+    def put(self, key: CacheKey, result: CachedResult, ttl_seconds: float) -> bool:
+        """
+        Cache a result, evicting least recently used entries to stay in budget.
+
+        Returns:
+            False if the result was not cached (TTL disabled or too large)
+        """
+        if ttl_seconds <= 0:
+            return False
+        size = estimate_result_size(result[1], result[2])
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(result, size, time.monotonic() + ttl_seconds)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def invalidate(self, db_name: str) -> int:
+        """Drop every cached result of a database. Returns the number dropped."""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == db_name]
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all cached results and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict[str, int]:
+        """Occupancy and counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+# Global instance
+query_cache = QueryResultCache()
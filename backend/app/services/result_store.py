@@ -0,0 +1,318 @@
+"""Query results materialized to disk.
+
+A stored result is written batch by batch to an Arrow IPC file under
+``result_store_dir`` and read back through a memory map, so serving a window
+of a million-row result only touches the pages holding those rows and
+server memory does not grow with result size. Results not read for
+``result_store_idle_seconds`` are deleted, as are the least recently read
+ones once the files exceed ``result_store_max_bytes``. The index lives in
+memory only: a restart forgets stored results and removes their files.
+
+Requires the optional pyarrow package.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncGenerator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+from app.config import settings
+from app.connectors.base import ResultBatch
+from app.connectors.converters import ColumnType, build_row_encoder
+from app.models.query import RowFormat
+from app.models.result import ResultViewRequest, StoredResultResponse, StoredRowsResponse
+from app.services.arrow_encoder import ArrowBatchConverter
+from app.services.result_view import apply_view
+
+logger = logging.getLogger(__name__)
+
+_RESULT_SUFFIX = ".arrow"
+
+
+def _serialize_value(value: Any) -> Any:
+    """Decode binary values the way the JSON query API does."""
+    if isinstance(value, bytes):
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return str(value)
+    return value
+
+
+def _read_type(arrow_type: Any) -> ColumnType:
+    """Column type for JSON encoding of values read back from Arrow."""
+    if pa.types.is_temporal(arrow_type):
+        return "timestamp"  # any type with isoformat()
+    if pa.types.is_binary(arrow_type):
+        return "binary"
+    return "text"  # passed through as-is
+
+
+def _encode(table: Any, row_format: RowFormat) -> list[Any]:
+    """Encode an Arrow table's rows the way the JSON query API does."""
+    encode = build_row_encoder(
+        table.column_names,
+        [_read_type(field.type) for field in table.schema],
+        _serialize_value,
+        arrays=row_format == "arrays",
+    )
+    values = [column.to_pylist() for column in table.columns]
+    return encode(list(zip(*values, strict=True)))
+
+
+class _StoredResult:
+    """Index entry of a result file."""
+
+    def __init__(
+        self,
+        result_id: str,
+        db_name: str,
+        sql: str,
+        truncated: bool,
+        path: Path,
+        columns: list[str],
+        column_types: list[ColumnType],
+        total_rows: int,
+    ) -> None:
+        self.result_id = result_id
+        self.db_name = db_name
+        self.sql = sql
+        self.truncated = truncated
+        self.path = path
+        self.columns = columns
+        # Written as Arrow strings; views compare them as numbers
+        self.decimal_columns = frozenset(
+            name
+            for name, column_type in zip(columns, column_types, strict=True)
+            if column_type == "decimal"
+        )
+        self.total_rows = total_rows
+        self.size_bytes = path.stat().st_size
+        self.created_at = datetime.now()
+        self.last_read = time.monotonic()
+
+    def to_response(self) -> StoredResultResponse:
+        return StoredResultResponse(
+            result_id=self.result_id,
+            db_name=self.db_name,
+            sql=self.sql,
+            columns=self.columns,
+            total_rows=self.total_rows,
+            truncated=self.truncated,
+            size_bytes=self.size_bytes,
+            created_at=self.created_at,
+        )
+
+
+class ResultStore:
+    """Disk-backed, memory-mapped store of query results with an LRU byte budget."""
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self.max_bytes = settings.result_store_max_bytes if max_bytes is None else max_bytes
+        self._results: OrderedDict[str, _StoredResult] = OrderedDict()
+        self._bytes = 0
+
+    async def write(
+        self,
+        db_name: str,
+        sql: str,
+        truncated: bool,
+        batches: AsyncGenerator[ResultBatch],
+    ) -> StoredResultResponse:
+        """
+        Write a streamed result to a new file, one record batch per fetched batch.
+
+        Args:
+            db_name: Database the result came from
+            sql: Executed SQL
+            truncated: True if LIMIT was auto-added
+            batches: Typed driver batches, the first one carrying the columns
+
+        Returns:
+            The stored result
+
+        Raises:
+            RuntimeError: If pyarrow is not installed
+        """
+        if pa is None:
+            raise RuntimeError("Stored results require the pyarrow package")
+
+        self._purge_idle()
+        settings.result_store_dir.mkdir(parents=True, exist_ok=True)
+        result_id = uuid.uuid4().hex
+        path = settings.result_store_dir / f"{result_id}{_RESULT_SUFFIX}"
+        converter: ArrowBatchConverter | None = None
+        writer: Any = None  # pyarrow RecordBatchFileWriter, created with the first batch
+        total_rows = 0
+        try:
+            async for batch in batches:
+                if converter is None:
+                    converter = ArrowBatchConverter(batch.columns, batch.column_types)
+                    writer = pa.ipc.new_file(str(path), converter.schema)
+                if batch.rows:
+                    writer.write_batch(converter.record_batch(batch.rows))
+                    total_rows += len(batch.rows)
+            if converter is None:
+                raise RuntimeError("Query returned no result description")
+            writer.close()
+        except BaseException:
+            if writer is not None:
+                writer.close()
+            path.unlink(missing_ok=True)
+            raise
+        finally:
+            await batches.aclose()
+
+        stored = _StoredResult(
+            result_id,
+            db_name,
+            sql,
+            truncated,
+            path,
+            [field.name for field in converter.schema],
+            converter.column_types,
+            total_rows,
+        )
+        self._results[result_id] = stored
+        self._bytes += stored.size_bytes
+        self._evict(keep=result_id)
+        return stored.to_response()
+
+    def get(self, result_id: str) -> StoredResultResponse | None:
+        """Description of a stored result, or None if unknown or expired."""
+        stored = self._touch(result_id)
+        return stored.to_response() if stored else None
+
+    def read(
+        self, result_id: str, offset: int, limit: int, row_format: RowFormat = "objects"
+    ) -> StoredRowsResponse | None:
+        """Rows [offset, offset + limit) of a stored result, or None if unknown."""
+        table = self.open_table(result_id)
+        if table is None:
+            return None
+
+        rows = _encode(table.slice(offset, limit), row_format)
+        return StoredRowsResponse(
+            result_id=result_id,
+            columns=table.column_names,
+            rows=rows,
+            offset=offset,
+            row_count=len(rows),
+            total_rows=table.num_rows,
+            row_format=row_format,
+        )
+
+    async def view(self, result_id: str, view: ResultViewRequest) -> StoredRowsResponse | None:
+        """
+        Filter, group and sort a stored result locally and return a window of it.
+
+        The Arrow compute kernels run in a worker thread.
+
+        Returns:
+            The view's rows [offset, offset + limit), or None if the result is unknown
+
+        Raises:
+            ValueError: If the view references unknown columns or doesn't fit their types
+        """
+        table = self.open_table(result_id)
+        if table is None:
+            return None
+        decimal_columns = self._results[result_id].decimal_columns
+
+        def _compute() -> tuple[list[str], list[Any], int]:
+            window, total_rows = apply_view(table, view, decimal_columns)
+            return window.column_names, _encode(window, view.row_format), total_rows
+
+        columns, rows, total_rows = await asyncio.to_thread(_compute)
+        return StoredRowsResponse(
+            result_id=result_id,
+            columns=columns,
+            rows=rows,
+            offset=view.offset,
+            row_count=len(rows),
+            total_rows=total_rows,
+            row_format=view.row_format,
+        )
+
+    def open_table(self, result_id: str) -> Any | None:
+        """
+        Memory-mapped Arrow table of a stored result, or None if unknown.
+
+        Opening reads only the file footer; column data is paged in as it is
+        accessed.
+        """
+        stored = self._touch(result_id)
+        if stored is None:
+            return None
+        with pa.memory_map(str(stored.path)) as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def delete(self, result_id: str) -> bool:
+        """Delete a stored result and its file."""
+        if result_id not in self._results:
+            return False
+        self._remove(result_id)
+        return True
+
+    def invalidate(self, db_name: str) -> int:
+        """Delete every stored result of a database (connection deleted)."""
+        result_ids = [rid for rid, stored in self._results.items() if stored.db_name == db_name]
+        for result_id in result_ids:
+            self._remove(result_id)
+        return len(result_ids)
+
+    def clear(self) -> None:
+        """Delete every stored result (application shutdown)."""
+        for result_id in list(self._results):
+            self._remove(result_id)
+
+    def remove_orphaned_files(self) -> None:
+        """Delete result files left behind by a previous process."""
+        if not settings.result_store_dir.is_dir():
+            return
+        for path in settings.result_store_dir.glob(f"*{_RESULT_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+    def _touch(self, result_id: str) -> _StoredResult | None:
+        self._purge_idle()
+        stored = self._results.get(result_id)
+        if stored is not None:
+            stored.last_read = time.monotonic()
+            self._results.move_to_end(result_id)
+        return stored
+
+    def _purge_idle(self) -> None:
+        idle_before = time.monotonic() - settings.result_store_idle_seconds
+        for result_id in [
+            rid for rid, stored in self._results.items() if stored.last_read <= idle_before
+        ]:
+            self._remove(result_id)
+
+    def _evict(self, keep: str) -> None:
+        # The newest result is kept even if it alone exceeds the budget
+        while self._bytes > self.max_bytes:
+            result_id = next(iter(self._results))
+            if result_id == keep:
+                break
+            logger.info(f"Evicting stored result {result_id} to stay within the disk budget")
+            self._remove(result_id)
+
+    def _remove(self, result_id: str) -> None:
+        stored = self._results.pop(result_id)
+        self._bytes -= stored.size_bytes
+        # Open memory maps of the file stay valid after unlinking
+        stored.path.unlink(missing_ok=True)
+
+
+# Global instance
+result_store = ResultStore()
@@ -0,0 +1,157 @@
+"""Filter, group, sort and page stored results with Arrow compute kernels.
+
+Views run locally over the memory-mapped Arrow table of a stored result,
+so re-slicing a large result never touches the source database. Decimal
+columns are stored as strings to keep their exact digits; views compare,
+sort and aggregate them as float64.
+
+Requires the optional pyarrow package.
+"""
+
+from typing import Any
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pc = None
+
+from app.models.result import ResultAggregate, ResultFilter, ResultViewRequest
+
+_COMPARISONS = {
+    "eq": "equal",
+    "ne": "not_equal",
+    "lt": "less",
+    "le": "less_equal",
+    "gt": "greater",
+    "ge": "greater_equal",
+}
+
+
+def apply_view(
+    table: Any, view: ResultViewRequest, decimal_columns: frozenset[str] = frozenset()
+) -> tuple[Any, int]:
+    """
+    Apply a view's filters, grouping and sort keys, then cut out its window.
+
+    Args:
+        table: Arrow table of the stored result
+        view: Filters, grouping, aggregates, sort keys and window
+        decimal_columns: Columns holding decimals encoded as strings
+
+    Returns:
+        Tuple of (window, total_rows), where total_rows counts the view's
+        rows before the window was applied
+
+    Raises:
+        ValueError: If a column is unknown or an operation doesn't fit its type
+    """
+    try:
+        if view.filters:
+            table = table.filter(_mask(table, view.filters, decimal_columns))
+        if view.group_by or view.aggregates:
+            table = _aggregate(table, view.group_by, view.aggregates, decimal_columns)
+            decimal_columns = decimal_columns & frozenset(view.group_by)
+        if view.sort:
+            keys = pa.table(
+                [_values(table, key.column, decimal_columns) for key in view.sort],
+                names=[f"k{index}" for index in range(len(view.sort))],
+            )
+            # sort_indices is stable, so pages of equal keys don't shuffle
+            table = table.take(
+                pc.sort_indices(
+                    keys,
+                    sort_keys=[
+                        (f"k{index}", "ascending" if key.direction == "asc" else "descending")
+                        for index, key in enumerate(view.sort)
+                    ],
+                )
+            )
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+        raise ValueError(f"Invalid result view: {e}") from e
+
+    return table.slice(view.offset, view.limit), table.num_rows
+
+
+def _column(table: Any, name: str) -> Any:
+    indices = table.schema.get_all_field_indices(name)
+    if not indices:
+        raise ValueError(f"Unknown column '{name}'")
+    if len(indices) > 1:
+        raise ValueError(f"Column name '{name}' is ambiguous")
+    return table.column(indices[0])
+
+
+def _values(table: Any, name: str, decimal_columns: frozenset[str]) -> Any:
+    """A column as used for comparison: decimals as float64."""
+    column = _column(table, name)
+    return pc.cast(column, pa.float64()) if name in decimal_columns else column
+
+
+def _mask(table: Any, filters: list[ResultFilter], decimal_columns: frozenset[str]) -> Any:
+    """Boolean mask of rows matching all filters."""
+    mask = None
+    for condition in filters:
+        values = _values(table, condition.column, decimal_columns)
+        if condition.op == "is_null":
+            matches = pc.is_null(values)
+        elif condition.op == "not_null":
+            matches = pc.is_valid(values)
+        elif condition.op == "contains":
+            text = _column(table, condition.column)
+            if not pa.types.is_string(text.type):
+                text = pc.cast(text, pa.string())
+            matches = pc.match_substring(text, str(condition.value), ignore_case=True)
+        elif condition.op == "in":
+            if not isinstance(condition.value, list):
+                raise ValueError(f"Filter 'in' on '{condition.column}' needs a list value")
+            matches = pc.is_in(values, value_set=pa.array(condition.value).cast(values.type))
+        else:
+            operand = pa.scalar(condition.value).cast(values.type)
+            matches = getattr(pc, _COMPARISONS[condition.op])(values, operand)
+        mask = matches if mask is None else pc.and_kleene(mask, matches)
+    return mask
+
+
+def _aggregate(
+    table: Any,
+    group_by: list[str],
+    aggregates: list[ResultAggregate],
+    decimal_columns: frozenset[str],
+) -> Any:
+    """One row per group: the grouping columns, then each aggregate under its alias."""
+    names = [*group_by, *(_alias(aggregate) for aggregate in aggregates)]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate view column names: {', '.join(sorted(duplicates))}")
+
+    # Aggregate inputs get positional names so they can't clash with group keys
+    arrays = [_column(table, name) for name in group_by]
+    fields = list(group_by)
+    specs: list[tuple[Any, ...]] = []
+    outputs: list[str] = []
+    for index, aggregate in enumerate(aggregates):
+        field = f"__agg{index}"
+        fields.append(field)
+        outputs.append(f"{field}_{aggregate.function}")
+        if aggregate.column is None:
+            if aggregate.function != "count":
+                raise ValueError(f"Aggregate '{aggregate.function}' needs a column")
+            # Counting every entry of an all-null column counts rows
+            arrays.append(pa.nulls(table.num_rows))
+            specs.append((field, "count", pc.CountOptions(mode="all")))
+        else:
+            arrays.append(_values(table, aggregate.column, decimal_columns))
+            specs.append((field, aggregate.function))
+
+    grouped = pa.table(arrays, names=fields).group_by(group_by).aggregate(specs)
+    return pa.table([grouped.column(name) for name in [*group_by, *outputs]], names=names)
+
+
+def _alias(aggregate: ResultAggregate) -> str:
+    if aggregate.alias:
+        return aggregate.alias
+    if aggregate.column is None:
+        return aggregate.function
+    return f"{aggregate.function}_{aggregate.column}"
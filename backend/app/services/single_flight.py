@@ -0,0 +1,89 @@
+"""Coalescing of identical concurrent calls ("single flight").
+
+The first caller for a key starts the call; callers arriving while it is in
+flight wait for the same result instead of starting their own. Each caller
+waits with its own timeout, and the shared call is cancelled only once
+every caller has stopped waiting.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class _Flight[T]:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[T]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight[T]:
+    """Runs at most one call per key at a time and shares its outcome."""
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight[T]] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[T]],
+        timeout: float | None = None,
+    ) -> tuple[T, bool]:
+        """
+        Run ``call`` for ``key``, or join the call already in flight.
+
+        Args:
+            key: Identity of the call
+            call: Starts the call; only invoked if none is in flight
+            timeout: Seconds this caller waits; None waits indefinitely
+
+        Returns:
+            Tuple of (result, shared) where shared is True if another caller
+            started the call
+
+        Raises:
+            asyncio.TimeoutError: If the result isn't ready within ``timeout``
+            Exception: Whatever the call raised, for every waiter
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, task))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # shield: one waiter timing out or disconnecting must not cancel
+            # the call for the others
+            result = await asyncio.wait_for(asyncio.shield(flight.task), timeout)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is waiting any more: stop the call (and the statement)
+                self._forget(key, flight)
+                flight.task.cancel()
+        return result, shared
+
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        return len(self._flights)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            self._forget(key, flight)
+        if not task.cancelled():
+            # Mark the error retrieved so one nobody waited for isn't logged
+            # as "never retrieved"; waiters still get it re-raised
+            task.exception()
+
+    def _forget(self, key: Hashable, flight: _Flight[T]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,102 @@
+"""Benchmark: bulk metadata save vs. one upsert per table.
+
+Caches the metadata of a synthetic warehouse (tables of 5-40 columns with
+comments) the way a full refresh does: previously by clearing the
+database's rows and calling ``save_metadata`` per table, each on its own
+connection with its own commit; now with one ``save_metadata_bulk`` call
+(one connection, one transaction, ``executemany``).
+
+Runs against a temporary SQLite file, so fsync costs are included.
+
+Usage (from backend/):
+    python -m benchmarks.bench_metadata_save [table_count ...]
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from app.db.sqlite import SQLiteManager
+
+DB_NAME = "warehouse"
+
+
+def synthetic_tables(count: int) -> list[dict[str, Any]]:
+    """Rows for save_metadata_bulk, as MetadataService builds them."""
+    rng = random.Random(0)
+    types = ["integer", "bigint", "text", "character varying", "timestamp", "numeric", "boolean"]
+    tables = []
+    for i in range(count):
+        columns = [
+            {
+                "name": f"col_{j}",
+                "dataType": rng.choice(types),
+                "isNullable": j > 0,
+                "isPrimaryKey": j == 0,
+                "defaultValue": None,
+                "comment": f"Column {j} of table {i}" if rng.random() < 0.3 else None,
+                "extra": None,
+            }
+            for j in range(rng.randint(5, 40))
+        ]
+        tables.append(
+            {
+                "schema_name": f"schema_{i % 20}",
+                "table_name": f"table_{i}",
+                "table_type": "table",
+                "columns": columns,
+                "table_comment": f"Table {i}",
+                "row_count": rng.randint(0, 10_000_000),
+                "size_bytes": rng.randint(8192, 10_000_000_000),
+                "fingerprint": f"{rng.getrandbits(128):032x}",
+            }
+        )
+    return tables
+
+
+async def per_table(manager: SQLiteManager, tables: list[dict[str, Any]]) -> None:
+    await manager.clear_metadata_for_database(DB_NAME)
+    for table in tables:
+        await manager.save_metadata(DB_NAME, **table)
+
+
+async def bulk(manager: SQLiteManager, tables: list[dict[str, Any]]) -> None:
+    await manager.save_metadata_bulk(DB_NAME, tables, replace=True)
+
+
+async def run(counts: list[int]) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SQLiteManager(Path(tmp) / "bench.db")
+        await manager.init_schema()
+        await manager.create_or_update_database(DB_NAME, "postgresql://localhost/warehouse")
+
+        for count in counts:
+            tables = synthetic_tables(count)
+
+            start = time.perf_counter()
+            await per_table(manager, tables)
+            baseline = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            await bulk(manager, tables)
+            with_bulk = (time.perf_counter() - start) * 1000
+
+            saved = len(await manager.get_metadata_for_database(DB_NAME))
+            assert saved == count, f"expected {count} tables, found {saved}"
+            print(
+                f"{count:6d} tables   per-table {baseline:9.1f} ms   bulk {with_bulk:8.1f} ms"
+                f"   speedup {baseline / with_bulk:.1f}x"
+            )
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000]
+    asyncio.run(run(counts))
+
+
+if __name__ == "__main__":
+    main()
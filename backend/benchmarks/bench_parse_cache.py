@@ -0,0 +1,116 @@
+"""Benchmark: SQL parse cache vs. parsing every statement.
+
+Replays the statements of ``query_history`` (in execution order, so repeats
+occur as they did for users and agents) through the per-query parsing done
+by ``/query``: parse for validation and LIMIT injection, then normalize for
+the result cache key. Without a cache that is a fresh parse plus an AST
+walk; with the cache it is a copy of a cached AST plus a cached string.
+
+Falls back to a synthetic corpus with repeats when the history is empty.
+
+Usage (from backend/):
+    python -m benchmarks.bench_parse_cache [database_path] [dialect]
+"""
+
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import sqlglot
+
+from app.config import settings
+from app.services.parse_cache import SqlParseCache
+
+
+def load_history(path: Path) -> list[str]:
+    """Statements of query_history, oldest first."""
+    if not path.exists():
+        return []
+    with sqlite3.connect(path) as conn:
+        try:
+            rows = conn.execute(
+                "SELECT sql_content FROM query_history ORDER BY executed_at, id"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return []
+    return [row[0] for row in rows]
+
+
+def synthetic_corpus(count: int = 5000) -> list[str]:
+    """Dashboard- and agent-like statements where a few are repeated often."""
+    rng = random.Random(0)
+    templates = [
+        "SELECT id, name, email FROM users WHERE id = {n}",
+        "SELECT status, COUNT(*) AS n FROM orders WHERE created_at >= '2024-01-{d:02}' "
+        "GROUP BY status ORDER BY n DESC",
+        "SELECT c.name, SUM(o.amount) AS total FROM customers c JOIN orders o "
+        "ON o.customer_id = c.id WHERE c.region IN ('east', 'west') "
+        "GROUP BY c.name HAVING SUM(o.amount) > {n} ORDER BY total DESC LIMIT 20",
+        "WITH recent AS (SELECT * FROM events WHERE ts > now() - interval '{d} days') "
+        "SELECT type, COUNT(DISTINCT user_id) FROM recent GROUP BY type",
+    ]
+    return [
+        rng.choice(templates).format(n=int(rng.paretovariate(1.2)) % 200, d=rng.randint(1, 28))
+        for _ in range(count)
+    ]
+
+
+def uncached(corpus: list[str], dialect: str) -> None:
+    for sql in corpus:
+        sqlglot.parse_one(sql, dialect=dialect)
+        sqlglot.parse_one(sql, dialect=dialect).sql(dialect=dialect, comments=False)
+
+
+def cached(corpus: list[str], dialect: str, cache: SqlParseCache) -> None:
+    for sql in corpus:
+        cache.parse(sql, dialect)
+        cache.normalize(sql, dialect)
+
+
+def parseable(corpus: list[str], dialect: str) -> list[str]:
+    result = []
+    for sql in corpus:
+        try:
+            sqlglot.parse_one(sql, dialect=dialect)
+        except Exception:
+            continue
+        result.append(sql)
+    return result
+
+
+def main() -> None:
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else settings.database_path
+    dialect = sys.argv[2] if len(sys.argv) > 2 else "postgres"
+
+    corpus = parseable(load_history(path), dialect)
+    source = f"query_history in {path}"
+    if not corpus:
+        corpus = synthetic_corpus()
+        source = "synthetic corpus (query_history is empty)"
+
+    print(f"{source}: {len(corpus)} statements, {len(set(corpus))} distinct")
+
+    start = time.perf_counter()
+    uncached(corpus, dialect)
+    baseline = (time.perf_counter() - start) * 1000
+
+    cache = SqlParseCache(max_entries=settings.parse_cache_max_entries)
+    start = time.perf_counter()
+    cached(corpus, dialect, cache)
+    with_cache = (time.perf_counter() - start) * 1000
+
+    stats = cache.stats()
+    print(
+        f"uncached {baseline:8.1f} ms   cached {with_cache:8.1f} ms"
+        f"   speedup {baseline / with_cache:.2f}x"
+    )
+    print(
+        f"hit rate {stats['hit_rate']:.1%} "
+        f"({stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Micro-benchmark: per-column converters vs. per-value serialization.
+
+Encodes a synthetic 100k-row PostgreSQL result (int, text, numeric,
+timestamp, date, json) both ways, in both row formats, and prints the
+timings.
+
+Usage (from backend/):
+    python -m benchmarks.bench_row_encoding [rows]
+"""
+
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import partial
+
+from app.connectors.converters import build_row_encoder
+from app.connectors.postgres import PostgreSQLConnector, column_types
+
+COLUMNS = ["id", "name", "amount", "created_at", "due", "payload"]
+TYPE_OIDS = [23, 1043, 1700, 1114, 1082, 3802]
+
+
+def make_rows(count: int) -> list[tuple]:
+    start = datetime(2024, 1, 1)
+    return [
+        (
+            i,
+            f"customer-{i}",
+            Decimal(i) / 100,
+            start + timedelta(seconds=i),
+            date(2024, 1, 1) + timedelta(days=i % 365),
+            {"n": i} if i % 10 == 0 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def per_value(connector: PostgreSQLConnector, rows: list[tuple], arrays: bool) -> list:
+    """The previous encoding: _serialize_value on every cell."""
+    serialize = connector._serialize_value
+    if arrays:
+        return [[serialize(val) for val in row] for row in rows]
+    return [{COLUMNS[i]: serialize(val) for i, val in enumerate(row)} for row in rows]
+
+
+def per_column(connector: PostgreSQLConnector, rows: list[tuple], arrays: bool) -> list:
+    """Converters chosen once from the column type OIDs."""
+    encode = build_row_encoder(
+        COLUMNS, column_types(TYPE_OIDS), connector._serialize_value, arrays=arrays
+    )
+    return encode(rows)
+
+
+def best_of(func, repeat: int) -> float:
+    """Best wall time of ``repeat`` runs, in milliseconds."""
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    connector = PostgreSQLConnector()
+    rows = make_rows(count)
+    repeat = 7
+
+    print(f"rows: {count}, best of {repeat}")
+    for arrays in (False, True):
+        assert per_value(connector, rows, arrays) == per_column(connector, rows, arrays)
+        baseline = best_of(partial(per_value, connector, rows, arrays), repeat)
+        per_col = best_of(partial(per_column, connector, rows, arrays), repeat)
+        label = "arrays" if arrays else "objects"
+        print(
+            f"{label:8} per-value {baseline:7.1f} ms   per-column {per_col:7.1f} ms"
+            f"   speedup {baseline / per_col:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -36,3 +36,13 @@ def test_client():
     from app.main import app
     
     return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clear_query_cache():
+    """Keep cached query results from leaking between tests."""
+    from app.services.result_cache import query_cache
+
+    query_cache.clear()
+    yield
+    query_cache.clear()
@@ -1,5 +1,6 @@
 """Integration tests for database management API."""
 
+import json
 from unittest.mock import AsyncMock, patch
 
 
@@ -244,6 +245,69 @@ class TestDatabasesAPIWithMocks:
             assert "Failed to refresh metadata" in response.json()["detail"]
 
 
+    def test_stream_refresh_metadata(self, test_client):
+        """Test schemas are streamed as NDJSON frames as they are fetched."""
+        from app.models.metadata import (
+            DatabaseMetadata,
+            MetadataRefreshSummary,
+            MetadataStreamHeader,
+            MetadataStreamSchema,
+            TableSummary,
+        )
+
+        async def refresh(name, on_progress):
+            await on_progress(MetadataStreamHeader(mode="full", schemas=["public"], pending=["public"]))
+            await on_progress(
+                MetadataStreamSchema(
+                    schema_name="public",
+                    tables=[TableSummary(schema_name="public", table_name="users", table_type="table")],
+                )
+            )
+            return DatabaseMetadata(
+                name=name,
+                refresh=MetadataRefreshSummary(mode="full", added=["public.users"], duration_ms=5),
+            )
+
+        with patch("app.api.v1.dbs.database_manager") as mock_db_mgr, \
+             patch("app.api.v1.dbs.metadata_service") as mock_meta_svc:
+            mock_db_mgr.get_database = AsyncMock(return_value={"name": "mydb"})
+            mock_meta_svc.refresh_metadata = AsyncMock(side_effect=refresh)
+
+            response = test_client.post("/api/v1/dbs/mydb/metadata/refresh/stream")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        assert [frame["type"] for frame in frames] == ["header", "schema", "end"]
+        assert frames[1]["schemaName"] == "public"
+        assert frames[1]["tables"][0]["tableName"] == "users"
+        assert frames[2]["refresh"]["added"] == ["public.users"]
+
+    def test_stream_refresh_metadata_errors(self, test_client):
+        """Test errors before the header get a status code, later ones an error frame."""
+        from app.models.metadata import MetadataStreamHeader
+
+        async def fail_after_header(name, on_progress):
+            await on_progress(MetadataStreamHeader(mode="full", schemas=["a"], pending=["a"]))
+            raise RuntimeError("connection lost")
+
+        with patch("app.api.v1.dbs.database_manager") as mock_db_mgr, \
+             patch("app.api.v1.dbs.metadata_service") as mock_meta_svc:
+            mock_db_mgr.get_database = AsyncMock(return_value={"name": "mydb"})
+
+            mock_meta_svc.refresh_metadata = AsyncMock(side_effect=Exception("Connection timeout"))
+            response = test_client.post("/api/v1/dbs/mydb/metadata/refresh/stream")
+            assert response.status_code == 503
+
+            mock_meta_svc.refresh_metadata = AsyncMock(side_effect=fail_after_header)
+            response = test_client.post("/api/v1/dbs/mydb/metadata/refresh/stream")
+
+        assert response.status_code == 200
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        assert [frame["type"] for frame in frames] == ["header", "error"]
+        assert "connection lost" in frames[1]["detail"]
+
+
 class TestTableListAPI:
     """Test table list API endpoints (lightweight metadata)."""
 
@@ -387,3 +451,24 @@ class TestTableDetailsAPI:
             assert response.status_code == 503
             assert "Failed to fetch table details" in response.json()["detail"]
 
+
+
+class TestPoolMetricsAPI:
+    """Test connection pool metrics endpoints."""
+
+    def test_list_pool_stats(self, test_client):
+        """Pool stats list is always available."""
+        response = test_client.get("/api/v1/metrics/pools")
+        assert response.status_code == 200
+        assert "pools" in response.json()
+
+    def test_get_pool_stats_not_found(self, test_client):
+        """Databases without a pool return 404."""
+        response = test_client.get("/api/v1/metrics/pools/no_such_pool_db")
+        assert response.status_code == 404
+
+    def test_parse_cache_stats(self, test_client):
+        """Parse cache counters are reported with a hit rate."""
+        response = test_client.get("/api/v1/metrics/parse-cache")
+        assert response.status_code == 200
+        assert {"entries", "maxEntries", "hits", "misses", "hitRate"} <= response.json().keys()
@@ -224,3 +224,49 @@ class TestHistoryAPI:
             assert len(data["items"]) == 0
             assert data["total"] == 0
 
+    # === GET /dbs/{name}/top-queries tests ===
+
+    def test_top_queries_returns_stats(self, test_client):
+        """Test GET /dbs/{name}/top-queries returns query shapes."""
+        mock_items = [
+            {
+                "fingerprint": "bee4f0268abb0615",
+                "normalized_sql": "SELECT a FROM t WHERE id = ?",
+                "sample_sql": "SELECT a FROM t WHERE id = 3",
+                "exec_count": 3,
+                "total_time_ms": 60,
+                "mean_time_ms": 20.0,
+                "max_time_ms": 30,
+                "p50_time_ms": 19.7,
+                "p95_time_ms": 29.9,
+                "total_rows": 3,
+                "mean_rows": 1.0,
+                "first_seen": datetime(2025, 12, 29, 10, 0, 0),
+                "last_seen": datetime(2025, 12, 29, 11, 0, 0),
+            },
+        ]
+
+        with patch("app.api.v1.history.db_manager") as mock_db, \
+             patch("app.api.v1.history.query_stats_service") as mock_service:
+
+            mock_db.get_database = AsyncMock(return_value={"name": "test_db"})
+            mock_service.top_queries = AsyncMock(return_value=mock_items)
+
+            response = test_client.get("/api/v1/dbs/test_db/top-queries?sort=max_time&limit=5")
+
+            assert response.status_code == 200
+            item = response.json()["items"][0]
+            assert item["normalizedSql"] == "SELECT a FROM t WHERE id = ?"
+            assert item["p95TimeMs"] == 29.9
+            mock_service.top_queries.assert_called_once_with(
+                db_name="test_db", sort="max_time", limit=5
+            )
+
+    def test_top_queries_rejects_unknown_sort(self, test_client):
+        """Test invalid sort keys return 422."""
+        with patch("app.api.v1.history.db_manager") as mock_db:
+            mock_db.get_database = AsyncMock(return_value={"name": "test_db"})
+
+            response = test_client.get("/api/v1/dbs/test_db/top-queries?sort=p99")
+
+            assert response.status_code == 422
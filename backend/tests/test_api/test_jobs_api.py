@@ -0,0 +1,101 @@
+"""Integration tests for the query job API."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from app.models.job import JobResponse, JobResultResponse
+from app.services.job_service import JobStateError
+
+
+def job_response(status: str = "queued") -> JobResponse:
+    return JobResponse(
+        id="abc123",
+        db_name="testdb",
+        sql="SELECT * FROM users LIMIT 10000000",
+        status=status,
+        truncated=True,
+        created_at=datetime(2024, 1, 1),
+    )
+
+
+class TestJobsAPI:
+    """Test query job endpoints."""
+
+    def test_submit_job(self, test_client):
+        with patch(
+            "app.api.v1.jobs.job_service.submit",
+            new_callable=AsyncMock,
+            return_value=job_response(),
+        ) as submit:
+            response = test_client.post(
+                "/api/v1/dbs/testdb/jobs",
+                json={"sql": "SELECT * FROM users", "timeoutSeconds": 600},
+            )
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["id"] == "abc123"
+        assert data["status"] == "queued"
+        assert data["rowsFetched"] == 0
+        submit.assert_awaited_once_with("testdb", "SELECT * FROM users", 600, None)
+
+    def test_submit_invalid_sql(self, test_client):
+        with patch(
+            "app.api.v1.jobs.job_service.submit",
+            new_callable=AsyncMock,
+            side_effect=ValueError("Only SELECT statements are allowed"),
+        ):
+            response = test_client.post(
+                "/api/v1/dbs/testdb/jobs", json={"sql": "DELETE FROM users"}
+            )
+
+        assert response.status_code == 400
+
+    def test_get_job_not_found(self, test_client):
+        response = test_client.get("/api/v1/jobs/missing")
+        assert response.status_code == 404
+
+    def test_get_job_result(self, test_client):
+        result = JobResultResponse(
+            id="abc123",
+            status="succeeded",
+            columns=["id"],
+            rows=[[5], [6]],
+            offset=4,
+            row_count=2,
+            total_rows=6,
+            row_format="arrays",
+        )
+        with patch(
+            "app.api.v1.jobs.job_service.get_result", AsyncMock(return_value=result)
+        ) as get_result:
+            response = test_client.get(
+                "/api/v1/jobs/abc123/result?offset=4&limit=2&rowFormat=arrays"
+            )
+
+        assert response.status_code == 200
+        assert response.json()["rows"] == [[5], [6]]
+        get_result.assert_called_once_with("abc123", 4, 2, "arrays")
+
+    def test_get_result_of_failed_job(self, test_client):
+        with patch(
+            "app.api.v1.jobs.job_service.get_result",
+            AsyncMock(side_effect=JobStateError("Job abc123 is failed")),
+        ):
+            response = test_client.get("/api/v1/jobs/abc123/result")
+
+        assert response.status_code == 409
+
+    def test_get_result_rejects_oversized_window(self, test_client):
+        response = test_client.get("/api/v1/jobs/abc123/result?limit=100000")
+        assert response.status_code == 422
+
+    def test_delete_job(self, test_client):
+        with patch(
+            "app.api.v1.jobs.job_service.delete", new_callable=AsyncMock, return_value=True
+        ):
+            response = test_client.delete("/api/v1/jobs/abc123")
+        assert response.status_code == 204
+
+        response = test_client.delete("/api/v1/jobs/missing")
+        assert response.status_code == 404
@@ -1,6 +1,13 @@
 """Integration tests for query execution API."""
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1 import query as query_api
 
 
 class TestQueryAPI:
@@ -75,6 +82,8 @@ class TestQueryAPIWithMocks:
             [{"id": 1, "name": "Alice", "email": "alice@example.com"}],  # rows
             15,  # execution_time_ms
             True,  # truncated
+            False,  # cached
+            None,  # cost_warning
         )
 
         with patch("app.api.v1.query.query_service") as mock_svc:
@@ -92,6 +101,7 @@ class TestQueryAPIWithMocks:
             assert data["result"]["rowCount"] == 1
             assert data["result"]["truncated"] is True
             assert data["executionTimeMs"] == 15
+            assert data["cached"] is False
 
     def test_query_value_error(self, test_client):
         """Test query with validation error."""
@@ -123,6 +133,127 @@ class TestQueryAPIWithMocks:
             assert response.status_code == 503
             assert "Query execution failed" in response.json()["detail"]
 
+    def test_query_arrays_row_format(self, test_client):
+        """rowFormat 'arrays' is passed to the service and echoed in the result."""
+        with patch("app.api.v1.query.query_service") as mock_svc:
+            mock_svc.execute_validated_query = AsyncMock(
+                return_value=("SELECT id, name FROM t", ["id", "name"], [[1, "a"]], 3, False, False, None)
+            )
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query",
+                json={"sql": "SELECT id, name FROM t", "rowFormat": "arrays"}
+            )
+
+            assert response.status_code == 200
+            result = response.json()["result"]
+            assert result["rows"] == [[1, "a"]]
+            assert result["rowFormat"] == "arrays"
+            assert mock_svc.execute_validated_query.call_args.args[3] == "arrays"
+
+    def test_query_cache_bypass_and_hit(self, test_client):
+        """cache=false is passed to the service; cached results are flagged."""
+        with patch("app.api.v1.query.query_service") as mock_svc:
+            mock_svc.execute_validated_query = AsyncMock(
+                return_value=("SELECT 1 LIMIT 1000", ["?column?"], [{"?column?": 1}], 4, True, True, None)
+            )
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query",
+                json={"sql": "SELECT 1", "cache": False}
+            )
+
+            assert response.status_code == 200
+            assert response.json()["cached"] is True
+            assert mock_svc.execute_validated_query.call_args.kwargs["use_cache"] is False
+
+    def test_query_queue_full(self, test_client):
+        """A full per-database wait queue maps to 429."""
+        from app.services.query_scheduler import QueryQueueFullError
+
+        with patch("app.api.v1.query.query_service") as mock_svc:
+            mock_svc.execute_validated_query = AsyncMock(
+                side_effect=QueryQueueFullError("Too many queries waiting for database 'mydb'")
+            )
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query",
+                json={"sql": "SELECT 1"}
+            )
+
+            assert response.status_code == 429
+            assert "Too many queries" in response.json()["detail"]
+
+    def test_query_cost_guard(self, test_client):
+        """Cost guard warnings are returned; rejections map to 400."""
+        from app.services.cost_guard import QueryCostExceededError
+
+        with patch("app.api.v1.query.query_service") as mock_svc, \
+             patch("app.api.v1.query.history_service") as mock_history:
+            mock_history.create_history = AsyncMock()
+            mock_svc.execute_validated_query = AsyncMock(
+                return_value=("SELECT * FROM t LIMIT 1000", ["id"], [], 4, True, False, "Query is likely expensive")
+            )
+
+            response = test_client.post("/api/v1/dbs/mydb/query", json={"sql": "SELECT * FROM t"})
+            assert response.status_code == 200
+            assert response.json()["costWarning"] == "Query is likely expensive"
+
+            mock_svc.execute_validated_query = AsyncMock(
+                side_effect=QueryCostExceededError("Query is likely expensive")
+            )
+            response = test_client.post("/api/v1/dbs/mydb/query", json={"sql": "SELECT * FROM t"})
+            assert response.status_code == 400
+            assert "expensive" in response.json()["detail"]
+
+    def test_query_server_timeout(self, test_client):
+        """A statement aborted by the server's timeout maps to 408."""
+        with patch("app.api.v1.query.query_service") as mock_svc:
+            mock_svc.execute_validated_query = AsyncMock(
+                side_effect=TimeoutError("Query execution exceeded timeout of 30 seconds")
+            )
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query",
+                json={"sql": "SELECT pg_sleep(60)"}
+            )
+
+            assert response.status_code == 408
+
+
+class TestRunUntilDisconnected:
+    """Test cancellation of queries abandoned by the client."""
+
+    async def test_returns_result_while_connected(self):
+        """The query result is returned when the client stays connected."""
+        http_request = MagicMock()
+        http_request.is_disconnected = AsyncMock(return_value=False)
+
+        async def query():
+            return "rows"
+
+        assert await query_api.run_until_disconnected(http_request, query()) == "rows"
+
+    async def test_disconnect_cancels_query(self):
+        """A client disconnect cancels the running query task."""
+        http_request = MagicMock()
+        http_request.is_disconnected = AsyncMock(return_value=True)
+        cancelled = asyncio.Event()
+
+        async def slow_query():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch.object(query_api, "DISCONNECT_POLL_INTERVAL", 0.01):
+            with pytest.raises(HTTPException) as exc_info:
+                await query_api.run_until_disconnected(http_request, slow_query())
+
+        assert exc_info.value.status_code == 499
+        assert cancelled.is_set()
+
 
 class TestFormatSQLAPI:
     """Test SQL formatting endpoint."""
@@ -285,3 +416,280 @@ class TestNaturalQueryAPI:
             assert response.status_code == 400
             assert "not a SELECT statement" in response.json()["detail"]
 
+
+
+class TestQueryStreamAPI:
+    """Test the NDJSON streaming query endpoint."""
+
+    @staticmethod
+    def _stream(*batches):
+        async def gen():
+            for batch in batches:
+                yield batch
+
+        return gen()
+
+    def test_stream_query_frames(self, test_client):
+        """Header, row batches and an end frame are emitted as NDJSON."""
+        batches = self._stream((["id"], [{"id": 1}, {"id": 2}]), (["id"], [{"id": 3}]))
+        with patch("app.api.v1.query.query_service") as mock_svc, \
+             patch("app.api.v1.query.history_service") as mock_history:
+            mock_svc.stream_validated_query = AsyncMock(
+                return_value=(
+                    "SELECT id FROM t LIMIT 100000", True, batches, "Query is likely expensive"
+                )
+            )
+            mock_history.create_history = AsyncMock()
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query/stream",
+                json={"sql": "SELECT id FROM t"}
+            )
+
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            frames = [json.loads(line) for line in response.text.splitlines()]
+            assert frames[0] == {
+                "type": "header",
+                "sql": "SELECT id FROM t LIMIT 100000",
+                "columns": ["id"],
+                "truncated": True,
+                "rowFormat": "objects",
+                "costWarning": "Query is likely expensive",
+            }
+            assert frames[1] == {"type": "rows", "rows": [{"id": 1}, {"id": 2}]}
+            assert frames[2] == {"type": "rows", "rows": [{"id": 3}]}
+            assert frames[3]["type"] == "end"
+            assert frames[3]["rowCount"] == 3
+            assert mock_history.create_history.call_args.kwargs["row_count"] == 3
+
+    def test_stream_query_error_mid_stream(self, test_client):
+        """A failure after the header is reported as an error frame."""
+        async def failing():
+            yield ["id"], [{"id": 1}]
+            raise ConnectionError("server closed the connection")
+
+        with patch("app.api.v1.query.query_service") as mock_svc:
+            mock_svc.stream_validated_query = AsyncMock(
+                return_value=("SELECT id FROM t", False, failing(), None)
+            )
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query/stream",
+                json={"sql": "SELECT id FROM t"}
+            )
+
+            frames = [json.loads(line) for line in response.text.splitlines()]
+            assert [f["type"] for f in frames] == ["header", "rows", "error"]
+            assert "server closed the connection" in frames[-1]["detail"]
+
+    def test_stream_query_validation_error(self, test_client):
+        """Errors before the first batch keep their HTTP status codes."""
+        with patch("app.api.v1.query.query_service") as mock_svc:
+            mock_svc.stream_validated_query = AsyncMock(
+                side_effect=ValueError("Only SELECT queries are allowed")
+            )
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query/stream",
+                json={"sql": "DELETE FROM t"}
+            )
+
+            assert response.status_code == 400
+
+
+class TestQueryArrowAPI:
+    """Test the Arrow IPC query endpoint."""
+
+    @staticmethod
+    def _stream(*batches):
+        async def gen():
+            for batch in batches:
+                yield batch
+
+        return gen()
+
+    def test_arrow_query_record_batches(self, test_client):
+        """Each connector batch becomes a typed Arrow record batch."""
+        pa = pytest.importorskip("pyarrow")
+        from app.connectors.base import ResultBatch
+
+        batches = self._stream(
+            ResultBatch(["id", "name"], ["int", "string"], [(1, "a"), (2, "b")]),
+            ResultBatch(["id", "name"], ["int", "string"], [(3, None)]),
+        )
+        with patch("app.api.v1.query.query_service") as mock_svc, \
+             patch("app.api.v1.query.history_service") as mock_history:
+            mock_svc.stream_validated_batches = AsyncMock(
+                return_value=("SELECT id, name FROM t LIMIT 100000", True, batches, None)
+            )
+            mock_history.create_history = AsyncMock()
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query/arrow",
+                json={"sql": "SELECT id, name FROM t"}
+            )
+
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+            reader = pa.ipc.open_stream(response.content)
+            assert reader.schema.field("id").type == pa.int64()
+            assert reader.schema.metadata[b"truncated"] == b"true"
+            table = reader.read_all()
+            assert table.column("id").to_pylist() == [1, 2, 3]
+            assert table.column("name").to_pylist() == ["a", "b", None]
+            assert mock_history.create_history.call_args.kwargs["row_count"] == 3
+
+    def test_arrow_query_validation_error(self, test_client):
+        """Errors before the first batch keep their HTTP status codes."""
+        pytest.importorskip("pyarrow")
+        with patch("app.api.v1.query.query_service") as mock_svc:
+            mock_svc.stream_validated_batches = AsyncMock(
+                side_effect=ValueError("Only SELECT queries are allowed")
+            )
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query/arrow",
+                json={"sql": "DELETE FROM t"}
+            )
+
+            assert response.status_code == 400
+
+    def test_arrow_query_without_pyarrow(self, test_client):
+        """Without pyarrow the endpoint reports the missing dependency."""
+        with patch("app.api.v1.query.arrow_encoder.is_available", return_value=False):
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query/arrow",
+                json={"sql": "SELECT 1"}
+            )
+
+        assert response.status_code == 503
+        assert "pyarrow" in response.json()["detail"]
+
+
+class TestQueryExportAPI:
+    """Test the streaming export endpoint."""
+
+    @staticmethod
+    def _stream(*batches):
+        async def gen():
+            for batch in batches:
+                yield batch
+
+        return gen()
+
+    def test_export_csv(self, test_client):
+        """Batches are written to a CSV download with the browser export's filename."""
+        from app.connectors.base import ResultBatch
+
+        batches = self._stream(
+            ResultBatch(["id", "name"], ["int", "text"], [(1, "a,b")]),
+            ResultBatch(["id", "name"], ["int", "text"], [(2, None)]),
+        )
+        with patch("app.api.v1.query.query_service") as mock_svc, \
+             patch("app.api.v1.query.history_service") as mock_history:
+            mock_svc.stream_validated_batches = AsyncMock(
+                return_value=("SELECT id, name FROM t LIMIT 10000000", True, batches, None)
+            )
+            mock_history.create_history = AsyncMock()
+
+            response = test_client.post(
+                "/api/v1/dbs/my db/query/export",
+                json={"sql": "SELECT id, name FROM t", "format": "csv"}
+            )
+
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/csv")
+            assert 'filename="my_db_' in response.headers["content-disposition"]
+            assert response.content.decode("utf-8-sig") == 'id,name\r\n1,"a,b"\r\n2,\r\n'
+            assert mock_svc.stream_validated_batches.call_args.kwargs["lane"] == "job"
+            assert mock_history.create_history.call_args.kwargs["row_count"] == 2
+
+    def test_export_xlsx_limit_capped_at_sheet_rows(self, test_client):
+        """XLSX exports never ask for more rows than a sheet holds."""
+        from app.connectors.base import ResultBatch
+        from app.services.export_encoder import XLSX_MAX_ROWS
+
+        batches = self._stream(ResultBatch(["id"], ["int"], [(1,)]))
+        with patch("app.api.v1.query.query_service") as mock_svc, \
+             patch("app.api.v1.query.history_service") as mock_history:
+            mock_svc.stream_validated_batches = AsyncMock(
+                return_value=("SELECT id FROM t", False, batches, None)
+            )
+            mock_history.create_history = AsyncMock()
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query/export",
+                json={"sql": "SELECT id FROM t", "format": "xlsx"}
+            )
+
+            assert response.status_code == 200
+            assert mock_svc.stream_validated_batches.call_args.kwargs["max_rows"] == XLSX_MAX_ROWS
+
+    def test_export_validation_error(self, test_client):
+        """Errors before the first batch keep their HTTP status codes."""
+        with patch("app.api.v1.query.query_service") as mock_svc:
+            mock_svc.stream_validated_batches = AsyncMock(
+                side_effect=ValueError("Only SELECT queries are allowed")
+            )
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query/export",
+                json={"sql": "DELETE FROM t", "format": "json"}
+            )
+
+            assert response.status_code == 400
+
+    def test_export_unknown_format(self, test_client):
+        response = test_client.post(
+            "/api/v1/dbs/mydb/query/export",
+            json={"sql": "SELECT 1", "format": "pdf"}
+        )
+        assert response.status_code == 422
+
+
+class TestExplainAPI:
+    """Test the query plan analysis endpoint."""
+
+    def test_explain(self, test_client):
+        """The normalized plan and findings are returned in camelCase."""
+        from app.models.query import ExplainResponse, PlanFinding, PlanNode
+
+        plan = PlanNode(id=0, node_type="Seq Scan", relation_name="orders", full_scan=True)
+        with patch("app.api.v1.query.explain_service") as mock_svc:
+            mock_svc.explain = AsyncMock(
+                return_value=ExplainResponse(
+                    sql="SELECT * FROM orders",
+                    dialect="postgres",
+                    plan=plan,
+                    findings=[
+                        PlanFinding(kind="seq_scan", node_id=0, table="orders", message="Full scan")
+                    ],
+                    raw_plan=[{"Plan": {"Node Type": "Seq Scan"}}],
+                )
+            )
+
+            response = test_client.post(
+                "/api/v1/dbs/mydb/explain",
+                json={"sql": "SELECT * FROM orders", "analyze": True},
+            )
+
+            assert response.status_code == 200
+            data = response.json()
+            assert data["plan"]["nodeType"] == "Seq Scan"
+            assert data["plan"]["fullScan"] is True
+            assert data["findings"][0]["nodeId"] == 0
+            mock_svc.explain.assert_awaited_once_with("mydb", "SELECT * FROM orders", True, 30)
+
+    def test_explain_errors(self, test_client):
+        """Validation errors map to 400 and timeouts to 408."""
+        with patch("app.api.v1.query.explain_service") as mock_svc:
+            mock_svc.explain = AsyncMock(
+                side_effect=ValueError("EXPLAIN ANALYZE is only supported for PostgreSQL")
+            )
+            response = test_client.post("/api/v1/dbs/mydb/explain", json={"sql": "SELECT 1"})
+            assert response.status_code == 400
+
+            mock_svc.explain = AsyncMock(side_effect=asyncio.TimeoutError("EXPLAIN exceeded timeout"))
+            response = test_client.post("/api/v1/dbs/mydb/explain", json={"sql": "SELECT 1"})
+            assert response.status_code == 408
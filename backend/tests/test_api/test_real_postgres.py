@@ -8,6 +8,13 @@ import os
 
 import pytest
 
+from app.connectors.postgres import build_table_metadata, metadata_queries
+from benchmarks.bench_pg_metadata import (
+    LEGACY_COLUMNS_SQL,
+    LEGACY_PRIMARY_KEYS_SQL,
+    LEGACY_TABLES_SQL,
+)
+
 # PostgreSQL 连接 URL (必须通过环境变量设置)
 POSTGRES_URL = os.getenv("POSTGRES_URL")
 TEST_DB_NAME = "test_postgres_db"
@@ -232,3 +239,118 @@ class TestRealPostgresIntegration:
         assert isinstance(data["executionTimeMs"], int)
         assert data["executionTimeMs"] >= 0
 
+
+# 元数据等价性测试使用的 schema 和角色
+EQUIVALENCE_SCHEMA = "metadata_equivalence"
+EQUIVALENCE_ROLE = "metadata_equivalence_reader"
+
+EQUIVALENCE_DDL = f"""
+    CREATE SCHEMA {EQUIVALENCE_SCHEMA};
+    CREATE DOMAIN {EQUIVALENCE_SCHEMA}.email AS text NOT NULL;
+    CREATE TABLE {EQUIVALENCE_SCHEMA}.users (
+        id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+        email {EQUIVALENCE_SCHEMA}.email,
+        tags text[],
+        created timestamptz NOT NULL DEFAULT now(),
+        name text DEFAULT 'n/a',
+        name_length integer GENERATED ALWAYS AS (length(name)) STORED
+    );
+    COMMENT ON TABLE {EQUIVALENCE_SCHEMA}.users IS 'User accounts';
+    COMMENT ON COLUMN {EQUIVALENCE_SCHEMA}.users.email IS 'Login';
+    CREATE TABLE {EQUIVALENCE_SCHEMA}.orders (
+        order_id integer GENERATED BY DEFAULT AS IDENTITY,
+        line integer,
+        user_id bigint REFERENCES {EQUIVALENCE_SCHEMA}.users,
+        amount numeric(12, 2),
+        PRIMARY KEY (order_id, line)
+    );
+    CREATE TABLE {EQUIVALENCE_SCHEMA}.events (id bigint, day date) PARTITION BY RANGE (day);
+    CREATE VIEW {EQUIVALENCE_SCHEMA}.big_orders AS
+        SELECT * FROM {EQUIVALENCE_SCHEMA}.orders WHERE amount > 100;
+    ANALYZE {EQUIVALENCE_SCHEMA}.users;
+"""
+
+
+@pytest.mark.integration
+class TestPostgresMetadataEquivalence:
+    """pg_catalog 元数据查询与原 information_schema 查询的结果一致."""
+
+    @pytest.fixture
+    def cursor(self):
+        """创建测试 schema, 结束后删除."""
+        if not POSTGRES_URL:
+            pytest.skip("POSTGRES_URL environment variable not set")
+        psycopg2 = pytest.importorskip("psycopg2")
+        try:
+            conn = psycopg2.connect(POSTGRES_URL)
+        except psycopg2.OperationalError as e:
+            pytest.skip(f"PostgreSQL 不可用: {e}")
+        conn.autocommit = True
+        cursor = conn.cursor()
+        if conn.server_version < 120000:
+            pytest.skip("generated columns require PostgreSQL 12+")
+        cursor.execute(f"DROP SCHEMA IF EXISTS {EQUIVALENCE_SCHEMA} CASCADE")
+        cursor.execute(EQUIVALENCE_DDL)
+        try:
+            yield cursor
+        finally:
+            cursor.execute("RESET ROLE")
+            cursor.execute(f"DROP SCHEMA IF EXISTS {EQUIVALENCE_SCHEMA} CASCADE")
+            cursor.execute(f"DROP ROLE IF EXISTS {EQUIVALENCE_ROLE}")
+            conn.close()
+
+    @staticmethod
+    def _metadata(cursor, queries):
+        results = []
+        for sql in queries:
+            cursor.execute(sql)
+            results.append(cursor.fetchall())
+        return build_table_metadata(*results)
+
+    def _assert_equivalent(self, cursor):
+        legacy = self._metadata(
+            cursor, [LEGACY_TABLES_SQL, LEGACY_PRIMARY_KEYS_SQL, LEGACY_COLUMNS_SQL]
+        )
+        catalog = self._metadata(
+            cursor,
+            [sql for sql, _ in metadata_queries(server_version=cursor.connection.server_version)],
+        )
+        assert catalog == legacy
+        return {(t.schema_name, t.table_name): t for t in catalog}
+
+    def test_same_metadata_as_information_schema(self, cursor):
+        """表, 主键, 列, 注释, 默认值和估计行数都一致."""
+        tables = self._assert_equivalent(cursor)
+
+        users = tables[(EQUIVALENCE_SCHEMA, "users")]
+        assert users.comment == "User accounts"
+        columns = {column.name: column for column in users.columns}
+        assert columns["id"].is_primary_key is True
+        assert columns["email"].data_type == "text"
+        assert columns["email"].is_nullable is False
+        assert columns["tags"].data_type == "ARRAY"
+        assert columns["name_length"].default_value is None
+        orders = tables[(EQUIVALENCE_SCHEMA, "orders")]
+        assert [c.name for c in orders.columns if c.is_primary_key] == ["order_id", "line"]
+        assert tables[(EQUIVALENCE_SCHEMA, "big_orders")].table_type == "view"
+
+    def test_same_metadata_with_partial_privileges(self, cursor):
+        """权限受限的角色看到的表和列也一致."""
+        try:
+            cursor.execute(f"DROP ROLE IF EXISTS {EQUIVALENCE_ROLE}")
+            cursor.execute(f"CREATE ROLE {EQUIVALENCE_ROLE}")
+        except Exception as e:
+            pytest.skip(f"cannot create roles: {e}")
+        cursor.execute(f"GRANT USAGE ON SCHEMA {EQUIVALENCE_SCHEMA} TO {EQUIVALENCE_ROLE}")
+        cursor.execute(f"GRANT SELECT ON {EQUIVALENCE_SCHEMA}.big_orders TO {EQUIVALENCE_ROLE}")
+        cursor.execute(
+            f"GRANT SELECT (id, name) ON {EQUIVALENCE_SCHEMA}.users TO {EQUIVALENCE_ROLE}"
+        )
+        cursor.execute(f"SET ROLE {EQUIVALENCE_ROLE}")
+
+        tables = self._assert_equivalent(cursor)
+
+        visible = {key for key in tables if key[0] == EQUIVALENCE_SCHEMA}
+        assert visible == {(EQUIVALENCE_SCHEMA, "users"), (EQUIVALENCE_SCHEMA, "big_orders")}
+        users = tables[(EQUIVALENCE_SCHEMA, "users")]
+        assert [column.name for column in users.columns] == ["id", "name"]
@@ -0,0 +1,118 @@
+"""Integration tests for stored query results."""
+
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.config import settings  # noqa: E402
+from app.connectors.base import ResultBatch  # noqa: E402
+from app.services.result_store import result_store  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "result_store_dir", tmp_path / "results")
+    monkeypatch.setattr(settings, "result_store_first_page_rows", 2)
+    yield
+    result_store.clear()
+
+
+async def batches(*items: ResultBatch):
+    for item in items:
+        yield item
+
+
+class TestResultsAPI:
+    """Test query?store=true and the /results endpoints."""
+
+    def test_store_query_then_read_windows(self, test_client):
+        stream = batches(
+            ResultBatch(["id"], ["int"], [(1,), (2,), (3,)]),
+            ResultBatch(["id"], ["int"], [(4,), (5,)]),
+        )
+        with patch(
+            "app.services.query_service.QueryService.stream_validated_batches",
+            AsyncMock(return_value=("SELECT id FROM t LIMIT 1000000", True, stream, None)),
+        ) as mock_stream, patch(
+            "app.api.v1.query.history_service.create_history", new_callable=AsyncMock
+        ) as create_history:
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query",
+                json={"sql": "SELECT id FROM t", "store": True, "rowFormat": "arrays"},
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["result"]["rows"] == [[1], [2]]
+        assert data["result"]["rowCount"] == 2
+        assert data["result"]["totalRows"] == 5
+        assert data["result"]["truncated"] is True
+        assert mock_stream.call_args.kwargs == {"max_rows": settings.result_store_max_rows}
+        assert create_history.call_args.kwargs["row_count"] == 5
+        result_id = data["resultId"]
+
+        response = test_client.get(f"/api/v1/results/{result_id}/rows?offset=2&limit=10")
+        assert response.status_code == 200
+        assert response.json()["rows"] == [{"id": 3}, {"id": 4}, {"id": 5}]
+
+        response = test_client.get(f"/api/v1/results/{result_id}")
+        assert response.json()["totalRows"] == 5
+
+        assert test_client.delete(f"/api/v1/results/{result_id}").status_code == 204
+        assert test_client.get(f"/api/v1/results/{result_id}/rows").status_code == 404
+
+    def test_view_stored_result(self, test_client):
+        stored = asyncio.run(
+            result_store.write(
+                "mydb",
+                "SELECT region, amount FROM sales",
+                False,
+                batches(
+                    ResultBatch(
+                        ["region", "amount"],
+                        ["text", "decimal"],
+                        [("east", Decimal("5.00")), ("west", Decimal("12.50")), ("east", Decimal("7.25"))],
+                    )
+                ),
+            )
+        )
+
+        response = test_client.post(
+            f"/api/v1/results/{stored.result_id}/view",
+            json={
+                "groupBy": ["region"],
+                "aggregates": [{"function": "sum", "column": "amount", "alias": "total"}],
+                "sort": [{"column": "total", "direction": "desc"}],
+                "rowFormat": "arrays",
+            },
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["columns"] == ["region", "total"]
+        assert data["rows"] == [["west", 12.5], ["east", 12.25]]
+        assert data["totalRows"] == 2
+
+        response = test_client.post(
+            f"/api/v1/results/{stored.result_id}/view",
+            json={"sort": [{"column": "nope"}]},
+        )
+        assert response.status_code == 400
+
+    def test_store_query_without_pyarrow(self, test_client):
+        with patch("app.api.v1.query.arrow_encoder.is_available", return_value=False):
+            response = test_client.post(
+                "/api/v1/dbs/mydb/query", json={"sql": "SELECT 1", "store": True}
+            )
+
+        assert response.status_code == 503
+        assert "pyarrow" in response.json()["detail"]
+
+    def test_unknown_result(self, test_client):
+        assert test_client.get("/api/v1/results/missing").status_code == 404
+        assert test_client.delete("/api/v1/results/missing").status_code == 404
+        response = test_client.post("/api/v1/results/missing/view", json={})
+        assert response.status_code == 404
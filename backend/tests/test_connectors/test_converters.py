@@ -0,0 +1,65 @@
+"""Unit tests for per-column result converters."""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.connectors.converters import build_row_encoder
+from app.connectors.postgres import PostgreSQLConnector, column_types
+
+
+class TestBuildRowEncoder:
+    """Row encoders are built from column types once per query."""
+
+    def test_matches_per_value_serialization(self):
+        """Output is identical to serializing every value individually."""
+        serialize = PostgreSQLConnector()._serialize_value
+        columns = ["id", "name", "price", "created", "doc", "missing", "raw"]
+        types = column_types([23, 25, 1700, 1114, 3802, 1082, 17])
+        rows = [
+            (1, "Alice", Decimal("9.90"), datetime(2024, 1, 15, 10, 30), {"a": 1}, None, b"x"),
+            (2, None, None, None, None, date(2024, 1, 16), None),
+        ]
+
+        encode = build_row_encoder(columns, types, serialize, arrays=False)
+
+        assert encode(rows) == [
+            {c: serialize(v) for c, v in zip(columns, row, strict=True)} for row in rows
+        ]
+
+    def test_identity_columns_are_copied(self):
+        """Numbers and text pass through unchanged; fallback is never called."""
+
+        def fallback(value):
+            raise AssertionError(f"unexpected conversion of {value!r}")
+
+        encode = build_row_encoder(["id", "name"], ["int", "text"], fallback, arrays=True)
+
+        assert encode([(1, "a"), (2, None)]) == [[1, "a"], [2, None]]
+
+    def test_untyped_columns_use_fallback(self):
+        """Without column types every non-null value goes through the fallback."""
+        encode = build_row_encoder(["a", "b"], None, str, arrays=True)
+
+        assert encode([(1, None)]) == [["1", None]]
+
+    def test_binary_accepts_memoryview(self):
+        """psycopg2 returns bytea as memoryview; it is decoded like bytes."""
+        serialize = PostgreSQLConnector()._serialize_value
+        encode = build_row_encoder(["raw"], ["binary"], serialize, arrays=True)
+
+        assert encode([(memoryview(b"abc"),), (b"\xff",)]) == [["abc"], [serialize(b"\xff")]]
+
+    def test_column_names_are_not_code(self):
+        """Arbitrary column names, including duplicates, are plain dict keys."""
+        columns = ["x}; import os #", "x}; import os #", "'"]
+        encode = build_row_encoder(columns, ["int", "int", "text"], str, arrays=False)
+
+        assert encode([(1, 2, "q")]) == [{"x}; import os #": 2, "'": "q"}]
+
+    def test_empty_batches_and_rows(self):
+        """Empty batches and rows without columns keep their row count."""
+        encode = build_row_encoder(["id"], ["int"], str, arrays=False)
+        assert encode([]) == []
+
+        assert build_row_encoder([], [], str, arrays=True)([(), ()]) == [[], []]
+        assert build_row_encoder([], [], str, arrays=False)([()]) == [{}]
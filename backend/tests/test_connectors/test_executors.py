@@ -0,0 +1,98 @@
+"""Unit tests for the per-database connector executors."""
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from app.connectors.executors import BoundedExecutor, ExecutorManager
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
+
+
+@pytest.mark.asyncio
+class TestBoundedExecutor:
+    """Test suite for BoundedExecutor."""
+
+    async def test_runs_call_in_named_thread_with_context(self):
+        executor = BoundedExecutor("mydb", "database", max_workers=1)
+        request_id.set("abc")
+
+        name, value = await executor.run(
+            lambda: (threading.current_thread().name, request_id.get())
+        )
+
+        assert name.startswith("tablechat-database-mydb")
+        assert value == "abc"
+        assert executor.stats()["completed"] == 1
+        executor.shutdown()
+
+    async def test_tracks_active_and_queued_calls(self):
+        executor = BoundedExecutor("mydb", "database", max_workers=1)
+        release = threading.Event()
+
+        first = asyncio.create_task(executor.run(release.wait))
+        second = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        stats = executor.stats()
+        assert stats["active"] == 1
+        assert stats["queued"] == 1
+
+        release.set()
+        await asyncio.gather(first, second)
+        stats = executor.stats()
+        assert (stats["active"], stats["queued"], stats["completed"]) == (0, 0, 2)
+        executor.shutdown()
+
+    async def test_cancelled_queued_call_never_runs(self):
+        executor = BoundedExecutor("mydb", "database", max_workers=1)
+        release = threading.Event()
+        ran = threading.Event()
+
+        blocker = asyncio.create_task(executor.run(release.wait))
+        queued = asyncio.create_task(executor.run(ran.set))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        await asyncio.sleep(0)
+
+        release.set()
+        await blocker
+        assert not ran.is_set()
+        assert executor.stats()["queued"] == 0
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+class TestExecutorManager:
+    """Test suite for ExecutorManager."""
+
+    async def test_stuck_database_does_not_block_others(self):
+        manager = ExecutorManager()
+        release = threading.Event()
+        stuck = manager.for_database("slow", "postgresql")
+
+        blocked = [asyncio.create_task(stuck.run(release.wait)) for _ in range(stuck.max_workers)]
+        await asyncio.sleep(0.05)
+
+        assert await asyncio.wait_for(manager.run("fast", "postgresql", lambda: 1), 1) == 1
+        assert await asyncio.wait_for(manager.control().run(lambda: 2), 1) == 2
+
+        release.set()
+        await asyncio.gather(*blocked)
+        manager.close_all()
+
+    async def test_executor_selection_and_invalidate(self):
+        manager = ExecutorManager()
+
+        assert manager.for_database("db", "mysql") is manager.for_database("db", "mysql")
+        assert manager.for_database(None, "mysql").kind == "shared"
+
+        old = manager.for_database("db", "mysql")
+        manager.invalidate("db")
+        assert old.closed
+        assert manager.for_database("db", "mysql") is not old
+
+        assert [stats["kind"] for stats in manager.stats()] == ["database", "shared"]
+        manager.close_all()
@@ -5,6 +5,7 @@ from unittest.mock import patch, MagicMock
 from datetime import datetime, date
 from decimal import Decimal
 
+from app.connectors.base import TableVersion
 from app.connectors.mysql import MySQLConnector
 from app.connectors.factory import ConnectorFactory
 
@@ -177,11 +178,8 @@ class TestMySQLConnector:
     async def test_execute_query_success(self, connector):
         """Test successful query execution."""
         mock_cursor = MagicMock()
-        mock_cursor.description = [("id",), ("name",)]
-        mock_cursor.fetchall.return_value = [
-            {"id": 1, "name": "Alice"},
-            {"id": 2, "name": "Bob"},
-        ]
+        mock_cursor.description = [("id", 3), ("name", 253)]
+        mock_cursor.fetchall.return_value = [(1, "Alice"), (2, "Bob")]
 
         mock_conn = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
@@ -228,7 +226,7 @@ class TestMySQLConnector:
     async def test_execute_query_empty_result(self, connector):
         """Test query with empty result."""
         mock_cursor = MagicMock()
-        mock_cursor.description = [("id",), ("name",)]
+        mock_cursor.description = [("id", 3), ("name", 253)]
         mock_cursor.fetchall.return_value = []
 
         mock_conn = MagicMock()
@@ -277,9 +275,9 @@ class TestMySQLConnector:
 
         # Mock tables query
         tables_result = [
-            ("testdb", "users", "BASE TABLE", "User accounts"),
-            ("testdb", "orders", "BASE TABLE", ""),
-            ("analytics", "metrics", "VIEW", "Metrics view"),
+            ("testdb", "users", "BASE TABLE", "User accounts", 1500, 65536),
+            ("testdb", "orders", "BASE TABLE", "", 0, 16384),
+            ("analytics", "metrics", "VIEW", "Metrics view", None, None),
         ]
 
         # Mock primary key query
@@ -372,8 +370,8 @@ class TestMySQLConnector:
 
         schemas_result = [("testdb",)]
         tables_result = [
-            ("testdb", "users", "BASE TABLE", ""),  # Empty comment
-            ("testdb", "orders", "BASE TABLE", None),  # None comment
+            ("testdb", "users", "BASE TABLE", "", 10, 16384),  # Empty comment
+            ("testdb", "orders", "BASE TABLE", None, 0, 16384),  # None comment
         ]
         pk_result = []
         columns_result = []
@@ -402,6 +400,105 @@ class TestMySQLConnector:
             assert users_table.comment is None
             assert orders_table.comment is None
 
+            assert users_table.row_count == 10
+            assert orders_table.row_count == 0
+            assert orders_table.size_bytes == 16384
+
+    @pytest.mark.asyncio
+    async def test_fetch_metadata_for_some_tables(self, connector):
+        """Metadata queries can be limited to some tables; none skips them."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [
+            [("shop",)],
+            [("shop", "orders", "BASE TABLE", "", 3, 16384)],
+            [],
+            [("shop", "orders", "id", "int", "NO", None, "", "", "")],
+            [("shop",)],
+        ]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.mysql.mysql.connector.connect", return_value=mock_conn):
+            _, tables = await connector.fetch_metadata(
+                "mysql://localhost/shop", tables=[("shop", "orders"), ("shop", "users")]
+            )
+            schemas, no_tables = await connector.fetch_metadata(
+                "mysql://localhost/shop", tables=[]
+            )
+
+        assert [t.table_name for t in tables] == ["orders"]
+        assert (schemas, no_tables) == (["shop"], [])
+        sql, params = mock_cursor.execute.call_args_list[1].args
+        assert "(TABLE_SCHEMA, TABLE_NAME) IN ((%s, %s), (%s, %s))" in sql
+        assert params == ["shop", "orders", "shop", "users"]
+        assert mock_cursor.execute.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_fetch_schema_metadata(self, connector):
+        """Fetching one database binds its name in every metadata query."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [
+            [("shop", "orders", "BASE TABLE", "", 120, 32768)],
+            [],
+            [("shop", "orders", "id", "int", "NO", None, "PRI", "", "auto_increment")],
+        ]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.mysql.mysql.connector.connect", return_value=mock_conn):
+            tables = await connector.fetch_schema_metadata("mysql://localhost/shop", "shop")
+
+        assert [(table.table_name, len(table.columns)) for table in tables] == [("orders", 1)]
+        for call in mock_cursor.execute.call_args_list:
+            sql, params = call.args
+            assert "TABLE_SCHEMA = %s" in sql and params == ["shop"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_table_versions(self, connector):
+        """Table fingerprints are keyed by (schema, table)."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [
+            ("shop", "orders", "9b1f", 120, 32768),
+            ("shop", "recent_orders", "77aa", None, None),
+        ]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.mysql.mysql.connector.connect", return_value=mock_conn):
+            versions = await connector.fetch_table_versions("mysql://localhost/shop")
+
+        assert versions == {
+            ("shop", "orders"): TableVersion("9b1f", 120, 32768),
+            ("shop", "recent_orders"): TableVersion("77aa", None, None),
+        }
+
+    @pytest.mark.asyncio
+    async def test_fetch_table_list(self, connector):
+        """Lazy listing reads schemas and tables only, flagged as without columns."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [
+            [("shop",)],
+            [
+                ("shop", "orders", "BASE TABLE", "Orders", 120, 32768),
+                ("shop", "recent_orders", "VIEW", "", None, None),
+            ],
+        ]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.mysql.mysql.connector.connect", return_value=mock_conn):
+            schemas, tables = await connector.fetch_table_list("mysql://localhost/shop")
+
+        assert schemas == ["shop"]
+        orders, recent = tables
+        assert (orders.table_name, orders.comment) == ("orders", "Orders")
+        assert (orders.row_count, orders.size_bytes) == (120, 32768)
+        assert (recent.table_type, recent.row_count, recent.size_bytes) == ("view", None, None)
+        for table in tables:
+            assert table.columns == [] and table.columns_loaded is False
+        assert mock_cursor.execute.call_count == 2
+        assert "INFORMATION_SCHEMA.COLUMNS" not in mock_cursor.execute.call_args.args[0]
+
 
 class TestConnectorFactory:
     """Test suite for ConnectorFactory."""
@@ -436,3 +533,181 @@ class TestConnectorFactory:
         """Get connector for invalid URL."""
         with pytest.raises(ValueError):
             ConnectorFactory.get_connector("sqlite:///test.db")
+
+
+class TestMySQLConnectorCancellation:
+    """Test server-side timeouts and cancellation."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_pushed_down_as_max_execution_time(self):
+        """timeout_seconds sets MAX_EXECUTION_TIME and resets it afterwards."""
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("id", 8)]
+        mock_cursor.fetchall.return_value = [(1,)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.mysql.mysql.connector.connect", return_value=mock_conn):
+            await MySQLConnector().execute_query(
+                "mysql://localhost/testdb", "SELECT 1 AS id", timeout_seconds=15
+            )
+
+        statements = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        assert statements == [
+            "SET SESSION MAX_EXECUTION_TIME = 15000",
+            "SELECT 1 AS id",
+            "SET SESSION MAX_EXECUTION_TIME = 0",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_server_timeout_raises_timeout_error(self):
+        """ER_QUERY_TIMEOUT surfaces as TimeoutError."""
+        import mysql.connector
+
+        def execute(sql, *args):
+            if not sql.startswith("SET"):
+                raise mysql.connector.Error(msg="Query execution was interrupted", errno=3024)
+
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = execute
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.mysql.mysql.connector.connect", return_value=mock_conn):
+            with pytest.raises(TimeoutError, match="exceeded timeout of 5 seconds"):
+                await MySQLConnector().execute_query(
+                    "mysql://localhost/testdb", "SELECT SLEEP(10)", timeout_seconds=5
+                )
+
+    @pytest.mark.asyncio
+    async def test_cancelling_task_kills_query(self):
+        """Abandoning the query issues KILL QUERY from a second connection."""
+        import asyncio
+        import threading
+
+        import mysql.connector
+
+        started = threading.Event()
+        killed = threading.Event()
+
+        def blocking_execute(sql, *args):
+            started.set()
+            if not killed.wait(timeout=5):
+                raise AssertionError("query was never killed")
+            raise mysql.connector.Error(msg="Query execution was interrupted", errno=1317)
+
+        query_cursor = MagicMock()
+        query_cursor.execute.side_effect = blocking_execute
+        query_conn = MagicMock()
+        query_conn.connection_id = 42
+        query_conn.cursor.return_value = query_cursor
+
+        kill_cursor = MagicMock()
+        kill_cursor.execute.side_effect = lambda sql: killed.set()
+        kill_conn = MagicMock()
+        kill_conn.cursor.return_value = kill_cursor
+
+        with patch(
+            "app.connectors.mysql.mysql.connector.connect", side_effect=[query_conn, kill_conn]
+        ):
+            task = asyncio.create_task(
+                MySQLConnector().execute_query("mysql://localhost/testdb", "SELECT SLEEP(60)")
+            )
+            await asyncio.to_thread(started.wait, 5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        kill_cursor.execute.assert_called_once_with("KILL QUERY 42")
+        kill_conn.close.assert_called_once()
+
+
+class TestMySQLConnectorStreaming:
+    """Test streaming results through an unbuffered cursor."""
+
+    @pytest.mark.asyncio
+    async def test_stream_query_batches(self):
+        """Rows arrive in fetchmany batches from an unbuffered cursor."""
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("id", 3)]
+        mock_cursor.fetchmany.side_effect = [[(1,), (2,)], []]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.mysql.mysql.connector.connect", return_value=mock_conn) as connect:
+            batches = [
+                batch
+                async for batch in MySQLConnector().stream_query(
+                    "mysql://localhost/testdb", "SELECT id FROM t", batch_size=2
+                )
+            ]
+
+        assert batches == [(["id"], [{"id": 1}, {"id": 2}])]
+        mock_conn.cursor.assert_called_with(buffered=False)
+        # Fully consumed: no KILL QUERY connection was needed
+        connect.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_batches_column_types(self):
+        """Raw batches carry column types mapped from the field type codes."""
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("id", 8), ("at", 12), ("duration", 11)]
+        mock_cursor.fetchmany.return_value = []
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.mysql.mysql.connector.connect", return_value=mock_conn):
+            batches = [
+                batch
+                async for batch in MySQLConnector().stream_batches(
+                    "mysql://localhost/testdb", "SELECT id, at, duration FROM t"
+                )
+            ]
+
+        assert batches[0].columns == ["id", "at", "duration"]
+        assert batches[0].column_types == ["int", "timestamp", "string"]
+
+    @pytest.mark.asyncio
+    async def test_stream_query_early_close_kills_query(self):
+        """Closing the stream before the end kills the rest of the query."""
+        query_cursor = MagicMock()
+        query_cursor.description = [("id", 3)]
+        query_cursor.fetchmany.return_value = [(1,), (2,)]
+        query_conn = MagicMock()
+        query_conn.connection_id = 7
+        query_conn.cursor.return_value = query_cursor
+
+        kill_conn = MagicMock()
+
+        with patch(
+            "app.connectors.mysql.mysql.connector.connect", side_effect=[query_conn, kill_conn]
+        ):
+            stream = MySQLConnector().stream_query(
+                "mysql://localhost/testdb", "SELECT id FROM big", batch_size=2
+            )
+            await anext(stream)
+            await stream.aclose()
+
+        kill_conn.cursor.return_value.execute.assert_called_once_with("KILL QUERY 7")
+        query_conn.close.assert_called_once()
+
+
+class TestMySQLConnectorRowFormat:
+    """Test compact array row encoding."""
+
+    @pytest.mark.asyncio
+    async def test_execute_query_arrays_uses_tuple_cursor(self):
+        """row_format='arrays' returns the tuple cursor's rows as lists."""
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("id", 3), ("payload", 252)]
+        mock_cursor.fetchall.return_value = [(1, b"abc")]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.mysql.mysql.connector.connect", return_value=mock_conn):
+            columns, rows, _ = await MySQLConnector().execute_query(
+                "mysql://localhost/testdb", "SELECT id, payload FROM t", row_format="arrays"
+            )
+
+        mock_conn.cursor.assert_called_with()
+        assert rows == [[1, "abc"]]
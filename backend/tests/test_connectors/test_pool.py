@@ -0,0 +1,247 @@
+"""Unit tests for connection pooling."""
+
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.connectors.pool import (
+    AsyncPoolHandle,
+    ConnectionPool,
+    ConnectionPoolManager,
+    PoolTimeoutError,
+    borrow_connection,
+)
+
+
+def make_pool(ping=None, **kwargs) -> tuple[ConnectionPool, list[MagicMock]]:
+    """Create a pool over MagicMock connections, returning the pool and created conns."""
+    created: list[MagicMock] = []
+
+    def connect() -> MagicMock:
+        conn = MagicMock()
+        created.append(conn)
+        return conn
+
+    options = {
+        "min_size": 0,
+        "max_size": 2,
+        "idle_timeout": 300,
+        "acquire_timeout": 0.1,
+        "health_check_interval": 300,
+    }
+    options.update(kwargs)
+    pool = ConnectionPool(
+        "testdb",
+        connect,
+        ping=ping or (lambda conn: None),
+        reset=lambda conn: conn.rollback(),
+        **options,
+    )
+    return pool, created
+
+
+class TestConnectionPool:
+    """Test suite for ConnectionPool."""
+
+    def test_reuses_released_connection(self):
+        """A released connection is handed out again instead of reconnecting."""
+        pool, created = make_pool()
+
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        assert first is second
+        assert len(created) == 1
+        first.rollback.assert_called()
+        stats = pool.stats()
+        assert stats["created"] == 1
+        assert stats["reused"] == 1
+        assert stats["idle"] == 1
+        assert stats["in_use"] == 0
+
+    def test_max_size_and_timeout(self):
+        """Borrowing beyond max_size times out."""
+        pool, created = make_pool(max_size=1)
+
+        entry = pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+
+        pool.release(entry)
+        assert pool.stats()["timeouts"] == 1
+        assert len(created) == 1
+
+    def test_waiter_gets_released_connection(self):
+        """A waiting borrower is woken up when a connection is released."""
+        pool, created = make_pool(max_size=1, acquire_timeout=2)
+        entry = pool.acquire()
+        result: list[object] = []
+
+        def borrow() -> None:
+            with pool.connection() as conn:
+                result.append(conn)
+
+        thread = threading.Thread(target=borrow)
+        thread.start()
+        pool.release(entry)
+        thread.join(timeout=2)
+
+        assert result == [created[0]]
+
+    def test_health_check_discards_dead_connection(self):
+        """A connection failing the borrow-time ping is replaced."""
+
+        def ping(conn: MagicMock) -> None:
+            if conn.dead:
+                raise ConnectionError("server closed the connection")
+
+        pool, created = make_pool(ping=ping, health_check_interval=0)
+
+        with pool.connection() as conn:
+            conn.dead = True
+        with pool.connection() as replacement:
+            replacement.dead = False
+
+        assert replacement is not conn
+        conn.close.assert_called_once()
+        assert pool.stats()["health_check_failures"] == 1
+
+    def test_reset_failure_discards_connection(self):
+        """A connection that cannot be rolled back is not returned to the pool."""
+        pool, created = make_pool()
+
+        with pool.connection() as conn:
+            conn.rollback.side_effect = Exception("connection lost")
+
+        conn.close.assert_called_once()
+        assert pool.stats()["idle"] == 0
+
+    def test_connect_failure_frees_slot(self):
+        """A failed connect attempt does not leak a pool slot."""
+        pool = ConnectionPool(
+            "testdb",
+            MagicMock(side_effect=ConnectionError("refused")),
+            ping=lambda conn: None,
+            reset=lambda conn: None,
+            max_size=1,
+            acquire_timeout=0.1,
+        )
+
+        with pytest.raises(ConnectionError, match="refused"):
+            pool.acquire()
+
+        assert pool.stats()["in_use"] == 0
+
+    def test_idle_timeout_evicts_above_min_size(self):
+        """Idle connections past idle_timeout are closed, keeping min_size."""
+        pool, created = make_pool(min_size=1, idle_timeout=10)
+        first = pool.acquire()
+        second = pool.acquire()
+        pool.release(first)
+        pool.release(second)
+
+        with patch("app.connectors.pool.time.monotonic", return_value=first.last_used + 60):
+            entry = pool.acquire()
+            pool.release(entry)
+
+        closed = [conn for conn in created if conn.close.called]
+        assert len(closed) == 1
+        assert pool.stats()["size"] == 1
+
+    def test_close_closes_idle_and_released_connections(self):
+        """Closing the pool closes idle connections now and borrowed ones on release."""
+        pool, created = make_pool()
+        idle = pool.acquire()
+        borrowed = pool.acquire()
+        pool.release(idle)
+
+        pool.close()
+        idle.conn.close.assert_called_once()
+        borrowed.conn.close.assert_not_called()
+
+        pool.release(borrowed)
+        borrowed.conn.close.assert_called_once()
+        with pytest.raises(ConnectionError, match="closed"):
+            pool.acquire()
+
+
+class TestConnectionPoolManager:
+    """Test suite for ConnectionPoolManager."""
+
+    def test_get_pool_reuses_same_signature(self):
+        """The same database and signature share one pool."""
+        manager = ConnectionPoolManager()
+        factory = MagicMock(side_effect=lambda: make_pool()[0])
+
+        first = manager.get_pool("db", "postgresql://a", ConnectionPool, factory)
+        second = manager.get_pool("db", "postgresql://a", ConnectionPool, factory)
+
+        assert first is second
+        factory.assert_called_once()
+
+    def test_get_pool_rebuilds_on_signature_change(self):
+        """A changed URL closes the old pool and creates a new one."""
+        manager = ConnectionPoolManager()
+
+        first = manager.get_pool("db", "postgresql://a", ConnectionPool, lambda: make_pool()[0])
+        second = manager.get_pool("db", "postgresql://b", ConnectionPool, lambda: make_pool()[0])
+
+        assert first is not second
+        assert first.closed
+        assert not second.closed
+
+    def test_get_pool_replaces_pool_of_another_type(self):
+        """A registered pool is only reused when it is of the requested type."""
+        manager = ConnectionPoolManager()
+        handle = AsyncPoolHandle("testdb", AsyncMock(), terminate=MagicMock(), describe=MagicMock())
+
+        first = manager.get_pool("db", "postgresql://a", AsyncPoolHandle, lambda: handle)
+        second = manager.get_pool("db", "postgresql://a", ConnectionPool, lambda: make_pool()[0])
+
+        assert isinstance(second, ConnectionPool)
+        assert first.closed
+        assert not second.closed
+
+    def test_invalidate_and_stats(self):
+        """Invalidating a database closes its pool and removes its stats."""
+        manager = ConnectionPoolManager()
+        pool = manager.get_pool("db", "postgresql://a", ConnectionPool, lambda: make_pool()[0])
+
+        assert [s["name"] for s in manager.stats()] == ["testdb"]
+        assert manager.get_stats("db") is not None
+
+        manager.invalidate("db")
+
+        assert pool.closed
+        assert manager.get_stats("db") is None
+        assert manager.stats() == []
+
+
+class TestBorrowConnection:
+    """Test suite for borrow_connection helper."""
+
+    def test_without_db_name_opens_one_off_connection(self):
+        """Unregistered URLs get a connection that is closed afterwards."""
+        conn = MagicMock()
+
+        with borrow_connection(None, "sig", lambda: conn, ping=MagicMock(), reset=MagicMock()) as c:
+            assert c is conn
+
+        conn.close.assert_called_once()
+
+    def test_with_db_name_uses_pool(self):
+        """Registered databases reuse pooled connections."""
+        manager = ConnectionPoolManager()
+        connect = MagicMock(side_effect=lambda: MagicMock())
+
+        with patch("app.connectors.pool.pool_manager", manager):
+            with borrow_connection("db", "sig", connect, ping=MagicMock(), reset=MagicMock()):
+                pass
+            with borrow_connection("db", "sig", connect, ping=MagicMock(), reset=MagicMock()):
+                pass
+
+        connect.assert_called_once()
+        manager.close_all()
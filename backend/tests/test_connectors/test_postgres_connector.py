@@ -5,7 +5,8 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from datetime import datetime, date
 from decimal import Decimal
 
-from app.connectors.postgres import PostgreSQLConnector
+from app.connectors.base import TableVersion
+from app.connectors.postgres import PostgreSQLConnector, metadata_queries
 from app.connectors.factory import ConnectorFactory
 
 
@@ -110,7 +111,7 @@ class TestPostgreSQLConnector:
     async def test_execute_query_success(self, connector):
         """Test successful query execution."""
         mock_cursor = MagicMock()
-        mock_cursor.description = [("id",), ("name",)]
+        mock_cursor.description = [("id", 23), ("name", 25)]
         mock_cursor.fetchall.return_value = [(1, "Alice"), (2, "Bob")]
 
         mock_conn = MagicMock()
@@ -139,7 +140,7 @@ class TestPostgreSQLConnector:
     async def test_execute_query_empty_result(self, connector):
         """Test query with empty result."""
         mock_cursor = MagicMock()
-        mock_cursor.description = [("id",), ("name",)]
+        mock_cursor.description = [("id", 23), ("name", 25)]
         mock_cursor.fetchall.return_value = []
 
         mock_conn = MagicMock()
@@ -187,9 +188,9 @@ class TestPostgreSQLConnector:
 
         # Mock tables query
         tables_result = [
-            ("public", "users", "BASE TABLE", "User accounts"),
-            ("public", "orders", "BASE TABLE", None),
-            ("analytics", "metrics", "VIEW", "Metrics view"),
+            ("public", "users", "BASE TABLE", "User accounts", 1500, 65536),
+            ("public", "orders", "BASE TABLE", None, None, 8192),
+            ("analytics", "metrics", "VIEW", "Metrics view", None, None),
         ]
 
         # Mock primary key query
@@ -216,6 +217,7 @@ class TestPostgreSQLConnector:
         ]
 
         mock_conn = MagicMock()
+        mock_conn.server_version = 160002
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("app.connectors.postgres.psycopg2.connect") as mock_connect:
@@ -255,6 +257,100 @@ class TestPostgreSQLConnector:
 
             mock_conn.close.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_fetch_metadata_for_some_tables(self, connector):
+        """Metadata queries can be limited to some tables with array parameters."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [
+            [("public",)],
+            [("public", "users", "BASE TABLE", None, 10, 8192)],
+            [("public", "users", "id")],
+            [("public", "users", "id", "integer", "NO", None, None, None, "NO")],
+        ]
+        mock_conn = MagicMock()
+        mock_conn.server_version = 160002
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            _, tables = await connector.fetch_metadata(
+                "postgresql://localhost/testdb", tables=[("public", "users"), ("sales", "orders")]
+            )
+
+        assert [t.table_name for t in tables] == ["users"]
+        for call in mock_cursor.execute.call_args_list[1:]:
+            sql, params = call.args
+            assert "unnest(%s::text[], %s::text[])" in sql
+            assert params == [["public", "sales"], ["users", "orders"]]
+
+    def test_metadata_queries_read_pg_catalog(self):
+        """Metadata queries join pg_catalog instead of information_schema views."""
+        for sql, params in metadata_queries():
+            assert params is None
+            assert "information_schema." not in sql
+            assert "::regclass," not in sql
+        tables_sql, pk_sql, columns_sql = (sql for sql, _ in metadata_queries())
+        assert "pg_description" in tables_sql
+        assert "pg_constraint" in pk_sql
+        assert "pg_attribute" in columns_sql and "pg_attrdef" in columns_sql
+
+    def test_metadata_queries_by_server_version(self):
+        """attgenerated is only read on PostgreSQL 12+; older than 10 is rejected."""
+        assert "a.attgenerated" in metadata_queries(server_version=120000)[2][0]
+        assert metadata_queries(server_version=160002) == metadata_queries()
+        for sql, _ in metadata_queries(schema="sales", server_version=110005):
+            assert "attgenerated" not in sql
+        with pytest.raises(ValueError, match=r"PostgreSQL 10 or later \(server is 9.6\)"):
+            metadata_queries(server_version=90624)
+
+    def test_metadata_queries_for_one_schema(self):
+        """A schema filter binds the schema name; a table list takes precedence."""
+        for sql, params in metadata_queries(schema="sales"):
+            assert params == ["sales"]
+            assert "n.nspname = %s" in sql
+        for sql, params in metadata_queries([("sales", "orders")], schema="sales"):
+            assert params == [["sales"], ["orders"]]
+
+    @pytest.mark.asyncio
+    async def test_fetch_table_list(self, connector):
+        """Lazy listing reads schemas and tables only, flagged as without columns."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [
+            [("public",)],
+            [("public", "users", "BASE TABLE", "Users", 1500, 65536)],
+        ]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            schemas, tables = await connector.fetch_table_list("postgresql://localhost/testdb")
+
+        assert schemas == ["public"]
+        (table,) = tables
+        assert (table.table_name, table.comment, table.row_count) == ("users", "Users", 1500)
+        assert table.columns == [] and table.columns_loaded is False
+        assert mock_cursor.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fetch_table_versions(self, connector):
+        """Table fingerprints are keyed by (schema, table)."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [
+            ("public", "users", "5d41402a", 1500, 65536),
+            ("public", "user_view", "7d793037", None, None),
+        ]
+        mock_conn = MagicMock()
+        mock_conn.server_version = 160002
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            versions = await connector.fetch_table_versions("postgresql://localhost/testdb")
+
+        assert versions == {
+            ("public", "users"): TableVersion("5d41402a", 1500, 65536),
+            ("public", "user_view"): TableVersion("7d793037", None, None),
+        }
+        assert "pg_attribute" in mock_cursor.execute.call_args.args[0]
+
 
 class TestConnectorFactoryPostgres:
     """Test ConnectorFactory with PostgreSQL URLs."""
@@ -281,3 +377,237 @@ class TestConnectorFactoryPostgres:
         connector = ConnectorFactory.get_connector(url)
         assert isinstance(connector, PostgreSQLConnector)
 
+
+
+class TestPostgreSQLConnectorPooling:
+    """Test pooled connections for registered databases."""
+
+    @pytest.mark.asyncio
+    async def test_execute_query_reuses_pooled_connection(self):
+        """Queries for a registered database share one connection."""
+        from app.connectors.pool import ConnectionPoolManager
+
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("id", 23)]
+        mock_cursor.fetchall.return_value = [(1,)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_conn.closed = 0
+
+        manager = ConnectionPoolManager()
+        connector = PostgreSQLConnector()
+
+        with patch("app.connectors.pool.pool_manager", manager), \
+             patch("app.connectors.postgres.psycopg2.connect") as mock_connect:
+            mock_connect.return_value = mock_conn
+
+            for _ in range(3):
+                columns, rows, _ = await connector.execute_query(
+                    "postgresql://localhost/testdb", "SELECT 1 AS id", db_name="testdb"
+                )
+                assert rows == [{"id": 1}]
+
+            mock_connect.assert_called_once()
+            mock_conn.close.assert_not_called()
+            # Each borrow ends its transaction before returning to the pool
+            assert mock_conn.rollback.call_count >= 3
+            assert manager.get_stats("testdb")["reused"] == 2
+
+        manager.close_all()
+        mock_conn.close.assert_called_once()
+
+
+class TestPostgreSQLConnectorCancellation:
+    """Test server-side timeouts and cancellation."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_pushed_down_as_statement_timeout(self):
+        """timeout_seconds sets a transaction-scoped statement_timeout."""
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("id", 23)]
+        mock_cursor.fetchall.return_value = [(1,)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            await PostgreSQLConnector().execute_query(
+                "postgresql://localhost/testdb", "SELECT 1 AS id", timeout_seconds=15
+            )
+
+        first_call = mock_cursor.execute.call_args_list[0]
+        assert "statement_timeout" in first_call.args[0]
+        assert first_call.args[1] == ("15000",)
+
+    @pytest.mark.asyncio
+    async def test_server_timeout_raises_timeout_error(self):
+        """A statement aborted by statement_timeout surfaces as TimeoutError."""
+        import psycopg2.errors
+
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = [None, psycopg2.errors.QueryCanceled("canceling")]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            with pytest.raises(TimeoutError, match="exceeded timeout of 5 seconds"):
+                await PostgreSQLConnector().execute_query(
+                    "postgresql://localhost/testdb", "SELECT pg_sleep(10)", timeout_seconds=5
+                )
+
+    @pytest.mark.asyncio
+    async def test_cancelling_task_cancels_statement(self):
+        """Abandoning the query (e.g. wait_for timeout) sends a cancel request."""
+        import asyncio
+        import threading
+
+        import psycopg2.errors
+
+        started = threading.Event()
+        cancel_requested = threading.Event()
+
+        def blocking_execute(sql, *args):
+            started.set()
+            if not cancel_requested.wait(timeout=5):
+                raise AssertionError("statement was never cancelled")
+            raise psycopg2.errors.QueryCanceled("canceling statement due to user request")
+
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = blocking_execute
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_conn.cancel.side_effect = cancel_requested.set
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            task = asyncio.create_task(
+                PostgreSQLConnector().execute_query(
+                    "postgresql://localhost/testdb", "SELECT pg_sleep(60)"
+                )
+            )
+            await asyncio.to_thread(started.wait, 5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        mock_conn.cancel.assert_called_once()
+
+
+class TestPostgreSQLConnectorStreaming:
+    """Test streaming results through a named cursor."""
+
+    @pytest.mark.asyncio
+    async def test_stream_query_batches(self):
+        """Rows arrive in fetchmany batches from a server-side cursor."""
+        named_cursor = MagicMock()
+        named_cursor.description = [("id", 23)]
+        named_cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)]]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = named_cursor
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            batches = [
+                batch
+                async for batch in PostgreSQLConnector().stream_query(
+                    "postgresql://localhost/testdb", "SELECT id FROM t", batch_size=2
+                )
+            ]
+
+        assert batches == [(["id"], [{"id": 1}, {"id": 2}]), (["id"], [{"id": 3}])]
+        assert "name" in mock_conn.cursor.call_args.kwargs
+        named_cursor.fetchmany.assert_called_with(2)
+        mock_conn.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_batches_column_types(self):
+        """Raw batches carry column types mapped from the type OIDs."""
+        named_cursor = MagicMock()
+        named_cursor.description = [("id", 23), ("price", 1700), ("tags", 1009)]
+        named_cursor.fetchmany.return_value = [(1, Decimal("9.90"), ["a"])]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = named_cursor
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            batches = [
+                batch
+                async for batch in PostgreSQLConnector().stream_batches(
+                    "postgresql://localhost/testdb", "SELECT id, price, tags FROM t"
+                )
+            ]
+
+        assert batches[0].column_types == ["int", "decimal", "string"]
+        assert batches[0].rows == [(1, Decimal("9.90"), ["a"])]
+
+    @pytest.mark.asyncio
+    async def test_stream_query_empty_result_yields_columns(self):
+        """An empty result still yields one batch carrying the columns."""
+        named_cursor = MagicMock()
+        named_cursor.description = [("id", 23), ("name", 25)]
+        named_cursor.fetchmany.return_value = []
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = named_cursor
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            batches = [
+                batch
+                async for batch in PostgreSQLConnector().stream_query(
+                    "postgresql://localhost/testdb", "SELECT id, name FROM t WHERE false"
+                )
+            ]
+
+        assert batches == [(["id", "name"], [])]
+
+    @pytest.mark.asyncio
+    async def test_stream_query_early_close_releases_connection(self):
+        """Closing the stream early returns the connection."""
+        named_cursor = MagicMock()
+        named_cursor.description = [("id", 23)]
+        named_cursor.fetchmany.return_value = [(1,), (2,)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = named_cursor
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            stream = PostgreSQLConnector().stream_query(
+                "postgresql://localhost/testdb", "SELECT id FROM big", batch_size=2
+            )
+            await anext(stream)
+            await stream.aclose()
+
+        mock_conn.close.assert_called_once()
+
+
+class TestPostgreSQLConnectorRowFormat:
+    """Test compact array row encoding."""
+
+    @pytest.mark.asyncio
+    async def test_execute_query_arrays(self):
+        """row_format='arrays' returns positional lists built from cursor tuples."""
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("id", 23), ("created", 1082)]
+        mock_cursor.fetchall.return_value = [(1, date(2024, 1, 15)), (2, None)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            columns, rows, _ = await PostgreSQLConnector().execute_query(
+                "postgresql://localhost/testdb", "SELECT id, created FROM t", row_format="arrays"
+            )
+
+        assert columns == ["id", "created"]
+        assert rows == [[1, "2024-01-15"], [2, None]]
+
+    @pytest.mark.asyncio
+    async def test_execute_query_read_only(self):
+        """read_only=True opens the transaction READ ONLY before the statement."""
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("n", 23)]
+        mock_cursor.fetchall.return_value = [(1,)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+
+        with patch("app.connectors.postgres.psycopg2.connect", return_value=mock_conn):
+            await PostgreSQLConnector().execute_query(
+                "postgresql://localhost/testdb", "SELECT 1 AS n", read_only=True
+            )
+
+        statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+        assert statements[0] == "SET TRANSACTION READ ONLY"
+        assert statements[-1] == "SELECT 1 AS n"
@@ -1,6 +1,7 @@
 """Unit tests for sqlite module."""
 
 import json
+import sqlite3
 import tempfile
 from pathlib import Path
 
@@ -105,6 +106,17 @@ class TestSQLiteManager:
         assert updated["url"] == "postgresql://localhost/newdb"
         assert updated["updated_at"] >= original["updated_at"]
 
+    @pytest.mark.asyncio
+    async def test_cache_ttl_round_trip(self, manager):
+        """The result cache TTL override is stored and defaults to NULL."""
+        db = await manager.create_or_update_database("testdb", "postgresql://localhost/db")
+        assert db["cache_ttl_seconds"] is None
+
+        db = await manager.create_or_update_database(
+            "testdb", "postgresql://localhost/db", cache_ttl_seconds=0
+        )
+        assert db["cache_ttl_seconds"] == 0
+
     @pytest.mark.asyncio
     async def test_delete_database_exists(self, manager):
         """Test deleting an existing database."""
@@ -150,6 +162,111 @@ class TestSQLiteManager:
         assert result[0]["table_type"] == "table"
         assert result[0]["columns"] == columns
 
+    @pytest.mark.asyncio
+    async def test_save_metadata_table_size(self, manager):
+        """Row estimates and sizes are stored; views have neither."""
+        await manager.create_or_update_database("testdb", "postgresql://localhost/testdb")
+
+        await manager.save_metadata(
+            "testdb", "public", "events", "table", [], row_count=2_500_000, size_bytes=734_003_200
+        )
+        await manager.save_metadata("testdb", "public", "recent_events", "view", [])
+
+        result = {row["table_name"]: row for row in await manager.get_metadata_for_database("testdb")}
+
+        assert result["events"]["row_count"] == 2_500_000
+        assert result["events"]["size_bytes"] == 734_003_200
+        assert result["recent_events"]["row_count"] is None
+        assert result["recent_events"]["size_bytes"] is None
+
+    @pytest.mark.asyncio
+    async def test_incremental_metadata_updates(self, manager):
+        """Fingerprints are stored per table; dropped tables and stats are updated in bulk."""
+        await manager.create_or_update_database("testdb", "postgresql://localhost/testdb")
+        await manager.save_metadata("testdb", "public", "users", "table", [], fingerprint="a1")
+        await manager.save_metadata("testdb", "public", "orders", "table", [], row_count=10)
+        await manager.save_metadata("testdb", "sales", "orders", "table", [], fingerprint="c3")
+
+        assert await manager.get_table_fingerprints("testdb") == {
+            ("public", "users"): "a1",
+            ("public", "orders"): None,
+            ("sales", "orders"): "c3",
+        }
+
+        await manager.save_metadata_bulk(
+            "testdb",
+            [],
+            deleted=[("sales", "orders")],
+            stats=[("public", "orders", 5000, 65536)],
+        )
+
+        result = {row["table_name"]: row for row in await manager.get_metadata_for_database("testdb")}
+        assert set(result) == {"users", "orders"}
+        assert (result["orders"]["row_count"], result["orders"]["size_bytes"]) == (5000, 65536)
+        assert await manager.get_table_fingerprints("other") == {}
+
+    @pytest.mark.asyncio
+    async def test_save_metadata_bulk(self, manager):
+        """Bulk saves upsert many tables; replace swaps the database's metadata."""
+        await manager.create_or_update_database("testdb", "postgresql://localhost/testdb")
+        await manager.create_or_update_database("other", "postgresql://localhost/other")
+        await manager.save_metadata("other", "public", "kept", "table", [])
+        await manager.save_metadata("testdb", "public", "stale", "table", [])
+
+        saved = await manager.save_metadata_bulk(
+            "testdb",
+            [
+                {"schema_name": "public", "table_name": "users", "table_type": "table",
+                 "columns": [{"name": "id"}], "row_count": 3, "fingerprint": "f1"},
+                {"schema_name": "public", "table_name": "active_users", "table_type": "view",
+                 "columns": [], "table_comment": "Active only"},
+            ],
+            replace=True,
+        )
+
+        assert saved == 2
+        result = {row["table_name"]: row for row in await manager.get_metadata_for_database("testdb")}
+        assert set(result) == {"users", "active_users"}
+        assert result["users"]["columns"] == [{"name": "id"}]
+        assert result["users"]["row_count"] == 3
+        assert result["users"]["columns_loaded"] is True
+        assert result["active_users"]["table_comment"] == "Active only"
+        assert len(await manager.get_metadata_for_database("other")) == 1
+
+    @pytest.mark.asyncio
+    async def test_save_metadata_columns_loaded(self, manager):
+        """Lazily listed tables are flagged until their columns are saved."""
+        await manager.create_or_update_database("testdb", "postgresql://localhost/testdb")
+        await manager.save_metadata_bulk(
+            "testdb",
+            [{"schema_name": "public", "table_name": "users", "table_type": "table",
+              "columns": [], "columns_loaded": False}],
+        )
+        (row,) = await manager.get_metadata_for_database("testdb")
+        assert row["columns_loaded"] is False
+
+        await manager.save_metadata("testdb", "public", "users", "table", [{"name": "id"}])
+        (row,) = await manager.get_metadata_for_database("testdb")
+        assert row["columns_loaded"] is True
+        assert row["columns"] == [{"name": "id"}]
+
+    @pytest.mark.asyncio
+    async def test_save_metadata_bulk_is_atomic(self, manager):
+        """A failing bulk save leaves the previous metadata in place."""
+        await manager.create_or_update_database("testdb", "postgresql://localhost/testdb")
+        await manager.save_metadata("testdb", "public", "users", "table", [])
+
+        with pytest.raises(sqlite3.IntegrityError):
+            await manager.save_metadata_bulk(
+                "testdb",
+                [{"schema_name": "public", "table_name": "bad", "table_type": "index",
+                  "columns": []}],
+                replace=True,
+            )
+
+        result = await manager.get_metadata_for_database("testdb")
+        assert [row["table_name"] for row in result] == ["users"]
+
     @pytest.mark.asyncio
     async def test_get_metadata_for_database_empty(self, manager):
         """Test getting metadata when none exists."""
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.models.metadata import ColumnInfo, DatabaseMetadata, TableMetadata
 from app.services.agent_tools import (
     ANTHROPIC_TOOLS,
     MAX_OUTPUT_SIZE,
@@ -13,6 +14,7 @@ from app.services.agent_tools import (
     query_database,
     truncate_output,
 )
+from app.services.metadata_service import metadata_service
 
 
 class TestTruncateOutput:
@@ -65,6 +67,7 @@ class TestQueryDatabase:
                 "db_type": "postgresql"
             })
             mock_qs.validate_readonly = lambda sql, dialect: None
+            mock_qs.check_query_cost = AsyncMock(return_value=None)
             mock_qs.execute_query = AsyncMock(return_value=(
                 ["id", "name"],
                 [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}],
@@ -87,6 +90,7 @@ class TestQueryDatabase:
                 "db_type": "mysql"
             })
             mock_qs.validate_readonly = lambda sql, dialect: None
+            mock_qs.check_query_cost = AsyncMock(return_value=None)
             mock_qs.execute_query = AsyncMock(return_value=(
                 ["Field", "Type"],
                 [{"Field": "id", "Type": "int"}],
@@ -107,6 +111,7 @@ class TestQueryDatabase:
                 "db_type": "mysql"
             })
             mock_qs.validate_readonly = lambda sql, dialect: None
+            mock_qs.check_query_cost = AsyncMock(return_value=None)
             mock_qs.execute_query = AsyncMock(return_value=(
                 ["Tables"],
                 [{"Tables": "users"}, {"Tables": "orders"}],
@@ -117,6 +122,37 @@ class TestQueryDatabase:
             
             assert result["is_error"] is False
 
+    @pytest.mark.asyncio
+    async def test_query_database_cost_guard(self):
+        """Cost guard warnings are shown to the agent; rejections are errors."""
+        from app.services.cost_guard import QueryCostExceededError
+
+        with patch("app.services.agent_tools.database_manager") as mock_mgr, \
+             patch("app.services.agent_tools.query_service") as mock_qs:
+            mock_mgr.get_database = AsyncMock(return_value={
+                "url": "postgresql://localhost/test",
+                "db_type": "postgresql"
+            })
+            mock_qs.validate_readonly = lambda sql, dialect: None
+            mock_qs.check_query_cost = AsyncMock(return_value="Query is likely expensive")
+            mock_qs.execute_query = AsyncMock(return_value=(["n"], [{"n": 1}], 5))
+
+            result = await query_database("testdb", "SELECT count(*) AS n FROM events")
+
+            assert result["is_error"] is False
+            assert result["content"][0]["text"].startswith("Warning: Query is likely expensive")
+            mock_qs.check_query_cost.assert_awaited_once_with(
+                "testdb", "SELECT count(*) AS n FROM events", lane="agent"
+            )
+
+            mock_qs.check_query_cost = AsyncMock(
+                side_effect=QueryCostExceededError("Query is likely expensive")
+            )
+            result = await query_database("testdb", "SELECT count(*) AS n FROM events")
+
+            assert result["is_error"] is True
+            assert mock_qs.execute_query.await_count == 1
+
     @pytest.mark.asyncio
     async def test_query_database_insert_blocked(self):
         """Test INSERT query is blocked."""
@@ -203,6 +239,7 @@ class TestQueryDatabase:
                 "db_type": "postgresql"
             })
             mock_qs.validate_readonly = lambda sql, dialect: None
+            mock_qs.check_query_cost = AsyncMock(return_value=None)
             # Return more rows than MAX_TOOL_RESULT_ROWS
             large_result = [{"id": i} for i in range(MAX_TOOL_RESULT_ROWS + 50)]
             mock_qs.execute_query = AsyncMock(return_value=(["id"], large_result, 100))
@@ -262,6 +299,28 @@ class TestGetTableSchema:
             assert "email" in text
             assert "[PK]" in text
 
+    @pytest.mark.asyncio
+    async def test_list_tables_shows_table_size(self):
+        """Estimated row counts and sizes are listed so agents notice large tables."""
+        with patch("app.db.sqlite.db_manager") as mock_mgr:
+            mock_mgr.get_metadata_for_database = AsyncMock(return_value=[
+                {
+                    "schema_name": "public",
+                    "table_name": "events",
+                    "table_type": "table",
+                    "table_comment": "Click stream",
+                    "row_count": 3_400_000_000,
+                    "size_bytes": 900 * 1024**3,
+                },
+                {"schema_name": "public", "table_name": "recent", "table_type": "view"},
+            ])
+
+            result = await list_tables("testdb")
+
+            text = result["content"][0]["text"]
+            assert "public.events (table, ~3.4B rows, 900 GB) - Click stream" in text
+            assert "public.recent (view)" in text
+
     @pytest.mark.asyncio
     async def test_get_table_schema_specific_table(self):
         """Test getting schema for a specific table."""
@@ -308,6 +367,61 @@ class TestGetTableSchema:
             assert result["is_error"] is True
             assert "not found" in result["content"][0]["text"]
 
+    @pytest.mark.asyncio
+    async def test_get_table_schema_loads_lazy_columns(self):
+        """Columns of a lazily listed table are fetched and cached on first access."""
+        listed = [
+            {
+                "schema_name": "public",
+                "table_name": "users",
+                "table_type": "table",
+                "row_count": 1500,
+                "columns": [],
+                "columns_loaded": False,
+            },
+            {
+                "schema_name": "sales",
+                "table_name": "users",
+                "table_type": "table",
+                "columns": [],
+                "columns_loaded": False,
+            },
+        ]
+        fetched = DatabaseMetadata(
+            name="testdb",
+            tables=[
+                TableMetadata(
+                    schema_name="public",
+                    table_name="users",
+                    table_type="table",
+                    row_count=1500,
+                    columns=[
+                        ColumnInfo(name="id", data_type="integer", is_nullable=False, is_primary_key=True),
+                        ColumnInfo(name="email", data_type="text", extra="unique"),
+                    ],
+                )
+            ],
+        )
+        with patch("app.db.sqlite.db_manager") as mock_mgr, \
+             patch("app.services.metadata_service.db_manager") as mock_db, \
+             patch.object(metadata_service, "fetch_metadata", new_callable=AsyncMock) as mock_fetch:
+            mock_mgr.get_metadata_for_database = AsyncMock(return_value=listed)
+            mock_db.save_metadata_bulk = AsyncMock()
+            mock_fetch.return_value = fetched
+
+            result = await get_table_schema("testdb", "users")
+
+        mock_fetch.assert_called_once_with(
+            "testdb", tables=[("public", "users"), ("sales", "users")]
+        )
+        # sales.users was dropped since it was listed
+        assert mock_db.save_metadata_bulk.call_args.kwargs == {"deleted": [("sales", "users")]}
+        text = result["content"][0]["text"]
+        assert "Table: public.users (table)" in text
+        assert "  - id: integer NOT NULL [PK]" in text
+        assert "  - email: text (Extra: unique)" in text
+        assert "sales.users" not in text
+
 
 class TestAgentToolsDefinition:
     """Test suite for ANTHROPIC_TOOLS definition."""
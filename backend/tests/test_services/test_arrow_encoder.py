@@ -0,0 +1,84 @@
+"""Unit tests for Arrow IPC result encoding."""
+
+from datetime import UTC, date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from app.services.arrow_encoder import ArrowStreamEncoder  # noqa: E402
+
+
+def encode(encoder: ArrowStreamEncoder, *batches) -> bytes:
+    data = encoder.begin()
+    for rows in batches:
+        data += encoder.write(rows)
+    return data + encoder.finish()
+
+
+class TestArrowStreamEncoder:
+    """Test conversion of driver rows to Arrow record batches."""
+
+    def test_column_types_map_to_arrow_types(self):
+        """Column types from the connector become the Arrow schema."""
+        encoder = ArrowStreamEncoder(
+            ["id", "price", "day", "at", "flag", "raw"],
+            ["int", "decimal", "date", "timestamptz", "bool", "binary"],
+        )
+
+        assert encoder.schema.types == [
+            pa.int64(),
+            pa.string(),
+            pa.date32(),
+            pa.timestamp("us", tz="UTC"),
+            pa.bool_(),
+            pa.binary(),
+        ]
+
+    def test_round_trip(self):
+        """Values survive an IPC round trip with one record batch per write."""
+        plus_two = timezone(timedelta(hours=2))
+        encoder = ArrowStreamEncoder(
+            ["id", "price", "day", "at", "raw", "doc"],
+            ["int", "decimal", "date", "timestamptz", "binary", "string"],
+            metadata={"sql": "SELECT 1"},
+        )
+        data = encode(
+            encoder,
+            [(1, Decimal("9.90"), date(2024, 1, 15), datetime(2024, 1, 15, 12, tzinfo=plus_two),
+              memoryview(b"\x00\x01"), {"a": 1})],
+            [(2, None, None, None, None, None)],
+        )
+
+        reader = pa.ipc.open_stream(data)
+        assert reader.schema.metadata == {b"sql": b"SELECT 1"}
+        batches = list(reader)
+        assert [batch.num_rows for batch in batches] == [1, 1]
+        rows = pa.Table.from_batches(batches).to_pylist()
+        assert rows[0] == {
+            "id": 1,
+            "price": "9.90",
+            "day": date(2024, 1, 15),
+            "at": datetime(2024, 1, 15, 10, tzinfo=UTC),
+            "raw": b"\x00\x01",
+            "doc": '{"a": 1}',
+        }
+        assert rows[1]["price"] is None
+
+    def test_untyped_columns_are_strings(self):
+        """Without connector column types every column is a string."""
+        encoder = ArrowStreamEncoder(["id", "created"], None)
+        table = pa.ipc.open_stream(
+            encode(encoder, [(1, date(2024, 1, 15))])
+        ).read_all()
+
+        assert table.to_pylist() == [{"id": "1", "created": "2024-01-15"}]
+
+    def test_empty_result_has_schema_only(self):
+        """An empty result is a valid stream with a schema and no batches."""
+        encoder = ArrowStreamEncoder(["id"], ["int"])
+        reader = pa.ipc.open_stream(encode(encoder, []))
+
+        assert reader.schema.names == ["id"]
+        assert reader.read_all().num_rows == 0
@@ -0,0 +1,148 @@
+"""Unit tests for the EXPLAIN-based cost guard."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.config import settings
+from app.services.cost_guard import (
+    CostEstimate,
+    CostGuard,
+    QueryCostExceededError,
+    cost_limits,
+    explain_sql,
+    parse_plan_estimate,
+)
+
+PG_PLAN = [
+    {
+        "Plan": {
+            "Node Type": "Aggregate",
+            "Total Cost": 18334.5,
+            "Plan Rows": 1,
+            "Plans": [
+                {
+                    "Node Type": "Hash Join",
+                    "Total Cost": 15834.5,
+                    "Plan Rows": 1000,
+                    "Plans": [
+                        {"Node Type": "Seq Scan", "Relation Name": "orders", "Plan Rows": 1000000},
+                        {"Node Type": "Index Scan", "Relation Name": "users", "Plan Rows": 20},
+                    ],
+                }
+            ],
+        }
+    }
+]
+
+MYSQL_PLAN = {
+    "query_block": {
+        "cost_info": {"query_cost": "1234.50"},
+        "nested_loop": [
+            {"table": {"table_name": "orders", "access_type": "ALL", "rows_examined_per_scan": 98000}},
+            {"table": {"table_name": "users", "access_type": "eq_ref", "rows_examined_per_scan": 1}},
+        ],
+    }
+}
+
+
+class TestPlanParsing:
+    """Test estimate extraction from EXPLAIN JSON."""
+
+    def test_postgres_plan(self):
+        assert explain_sql("SELECT 1", "postgres") == "EXPLAIN (FORMAT JSON) SELECT 1"
+        assert parse_plan_estimate(PG_PLAN, "postgres") == CostEstimate(18334.5, 1000000)
+        # asyncpg returns the plan as text
+        assert parse_plan_estimate(json.dumps(PG_PLAN), "postgres").cost == 18334.5
+
+    def test_mysql_plan(self):
+        assert explain_sql("SELECT 1", "mysql") == "EXPLAIN FORMAT=JSON SELECT 1"
+        assert parse_plan_estimate(json.dumps(MYSQL_PLAN), "mysql") == CostEstimate(1234.5, 98000)
+
+    def test_unexpected_plan(self):
+        with pytest.raises(ValueError):
+            parse_plan_estimate({"nope": 1}, "postgres")
+
+
+class TestCostLimits:
+    """Test threshold resolution."""
+
+    def test_server_defaults_and_agent_factor(self, monkeypatch):
+        monkeypatch.setattr(settings, "cost_guard_mode", "warn")
+        monkeypatch.setattr(settings, "cost_guard_max_cost", 1000.0)
+        monkeypatch.setattr(settings, "cost_guard_max_rows", 50_000)
+        monkeypatch.setattr(settings, "cost_guard_agent_factor", 0.1)
+
+        assert cost_limits(None, agent=False) == ("warn", 1000.0, 50_000)
+        assert cost_limits(None, agent=True) == ("warn", 100.0, 5_000)
+
+    def test_connection_overrides(self, monkeypatch):
+        monkeypatch.setattr(settings, "cost_guard_max_rows", 50_000)
+        config = json.dumps({"mode": "reject", "maxCost": 500, "agentMaxRows": 10})
+
+        assert cost_limits(config, agent=False) == ("reject", 500, 50_000)
+        assert cost_limits(config, agent=True) == ("reject", 500 * settings.cost_guard_agent_factor, 10)
+
+
+class TestCostGuard:
+    """Test checks and estimate caching."""
+
+    @pytest.fixture
+    def connector(self):
+        connector = MagicMock()
+        connector.get_dialect.return_value = "postgres"
+        connector.execute_query = AsyncMock(return_value=(["QUERY PLAN"], [[PG_PLAN]], 3))
+        return connector
+
+    @staticmethod
+    def db(**config):
+        return {"name": "db", "url": "postgresql://localhost/db", "cost_guard": json.dumps(config)}
+
+    @pytest.mark.asyncio
+    async def test_off_mode_skips_explain(self, connector):
+        guard = CostGuard()
+        assert await guard.check(self.db(mode="off", maxCost=1), connector, "SELECT 1") is None
+        connector.execute_query.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_reject_and_warn(self, connector):
+        guard = CostGuard()
+        with pytest.raises(QueryCostExceededError, match="estimated cost 18,334 exceeds 1,000"):
+            await guard.check(self.db(mode="reject", maxCost=1000), connector, "SELECT 1")
+
+        warning = await guard.check(self.db(mode="warn", maxRows=1000), connector, "SELECT 1")
+        assert "scan of 1,000,000 rows" in warning
+
+        assert await guard.check(self.db(mode="reject", maxCost=20000), connector, "SELECT 1") is None
+        sql = connector.execute_query.await_args.args[1]
+        assert sql == "EXPLAIN (FORMAT JSON) SELECT 1"
+
+    @pytest.mark.asyncio
+    async def test_agent_limits_are_stricter(self, connector):
+        guard = CostGuard()
+        db = self.db(mode="reject", maxCost=100_000, agentMaxCost=10_000)
+
+        assert await guard.check(db, connector, "SELECT 1") is None
+        with pytest.raises(QueryCostExceededError):
+            await guard.check(db, connector, "SELECT 1", lane="agent")
+
+    @pytest.mark.asyncio
+    async def test_estimates_are_cached_by_fingerprint(self, connector):
+        guard = CostGuard()
+        db = self.db(mode="warn", maxCost=1)
+
+        await guard.check(db, connector, "SELECT * FROM orders WHERE id = 1")
+        await guard.check(db, connector, "select * from orders where id = 2")
+        assert connector.execute_query.await_count == 1
+
+        guard.invalidate("db")
+        await guard.check(db, connector, "SELECT * FROM orders WHERE id = 3")
+        assert connector.execute_query.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_explain_lets_query_run(self, connector):
+        connector.execute_query.side_effect = PermissionError("EXPLAIN denied")
+        guard = CostGuard()
+
+        assert await guard.check(self.db(mode="reject", maxCost=1), connector, "SELECT 1") is None
@@ -0,0 +1,273 @@
+"""Unit tests for query plan analysis."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.metadata import ColumnInfo, DatabaseMetadata, TableMetadata
+from app.services.explain_service import (
+    ExplainService,
+    condition_columns,
+    find_plan_issues,
+    parse_plan,
+    walk_plan,
+)
+
+PG_ANALYZE_PLAN = [
+    {
+        "Plan": {
+            "Node Type": "Hash Join",
+            "Total Cost": 20000.0,
+            "Plan Rows": 50,
+            "Actual Total Time": 400.0,
+            "Actual Rows": 4800,
+            "Actual Loops": 1,
+            "Hash Cond": "(o.user_id = u.id)",
+            "Plans": [
+                {
+                    "Node Type": "Seq Scan",
+                    "Relation Name": "orders",
+                    "Alias": "o",
+                    "Total Cost": 18000.0,
+                    "Plan Rows": 5000,
+                    "Actual Total Time": 350.0,
+                    "Actual Rows": 5000,
+                    "Actual Loops": 1,
+                    "Filter": "(((status)::text = 'paid'::text) AND (created_at > '2024-01-01'::date))",
+                },
+                {
+                    "Node Type": "Hash",
+                    "Total Cost": 1500.0,
+                    "Plan Rows": 1000,
+                    "Actual Total Time": 30.0,
+                    "Actual Rows": 1000,
+                    "Actual Loops": 1,
+                    "Plans": [
+                        {
+                            "Node Type": "Index Scan",
+                            "Relation Name": "users",
+                            "Alias": "u",
+                            "Index Name": "users_pkey",
+                            "Total Cost": 1400.0,
+                            "Plan Rows": 1000,
+                            "Actual Total Time": 25.0,
+                            "Actual Rows": 1000,
+                            "Actual Loops": 1,
+                            "Index Cond": "(id < 1000)",
+                        }
+                    ],
+                },
+            ],
+        },
+        "Planning Time": 0.5,
+        "Execution Time": 401.2,
+    }
+]
+
+MYSQL_PLAN = {
+    "query_block": {
+        "select_id": 1,
+        "cost_info": {"query_cost": "10250.00"},
+        "ordering_operation": {
+            "using_filesort": True,
+            "cost_info": {"sort_cost": "50.00"},
+            "nested_loop": [
+                {
+                    "table": {
+                        "table_name": "orders",
+                        "access_type": "ALL",
+                        "rows_examined_per_scan": 200000,
+                        "cost_info": {"read_cost": "9000.00", "eval_cost": "1000.00"},
+                        "attached_condition": "(`shop`.`orders`.`region` in ('east','west'))",
+                    }
+                },
+                {
+                    "table": {
+                        "table_name": "users",
+                        "access_type": "eq_ref",
+                        "key": "PRIMARY",
+                        "rows_examined_per_scan": 1,
+                        "cost_info": {"read_cost": "150.00", "eval_cost": "50.00"},
+                    }
+                },
+            ],
+        },
+    }
+}
+
+ORDERS = TableMetadata(
+    schema_name="public",
+    table_name="orders",
+    table_type="table",
+    row_count=2_000_000,
+    columns=[
+        ColumnInfo(name="id", data_type="integer", is_primary_key=True),
+        ColumnInfo(name="status", data_type="text"),
+        ColumnInfo(name="created_at", data_type="date"),
+        ColumnInfo(name="region", data_type="text"),
+    ],
+)
+
+
+class TestPlanParsing:
+    """Test normalization of EXPLAIN JSON plans."""
+
+    def test_postgres_plan(self):
+        root, planning, execution = parse_plan(json.dumps(PG_ANALYZE_PLAN), "postgres")
+
+        assert (planning, execution) == (0.5, 401.2)
+        nodes = list(walk_plan(root))
+        assert [node.id for node in nodes] == [0, 1, 2, 3]
+        assert [node.node_type for node in nodes] == ["Hash Join", "Seq Scan", "Hash", "Index Scan"]
+
+        scan = nodes[1]
+        assert scan.full_scan is True
+        assert scan.relation_name == "orders"
+        assert scan.alias == "o"
+        assert nodes[3].index_name == "users_pkey"
+        # Self cost and time exclude the children
+        assert root.self_cost == 500.0
+        assert root.self_time_ms == 20.0
+        assert nodes[2].self_time_ms == 5.0
+
+    def test_mysql_plan(self):
+        root, planning, execution = parse_plan(json.dumps(MYSQL_PLAN), "mysql")
+
+        assert planning is None and execution is None
+        assert root.node_type == "Query Block"
+        assert root.total_cost == 10250.0
+        nodes = list(walk_plan(root))
+        assert [node.node_type for node in nodes] == [
+            "Query Block",
+            "Sort",
+            "Nested Loop",
+            "Table Scan",
+            "Unique Index Lookup",
+        ]
+        scan = nodes[3]
+        assert scan.full_scan is True
+        assert scan.self_cost == 10000.0
+        assert scan.plan_rows == 200000
+        assert nodes[1].total_cost == 10250.0
+
+    def test_unexpected_plan(self):
+        with pytest.raises(ValueError, match="Unexpected EXPLAIN output"):
+            parse_plan([{"nope": 1}], "postgres")
+
+
+class TestConditionColumns:
+    """Test extraction of index candidate columns from plan filters."""
+
+    def test_postgres_filter(self):
+        condition = PG_ANALYZE_PLAN[0]["Plan"]["Plans"][0]["Filter"]
+        assert condition_columns(condition, "postgres") == ["status", "created_at"]
+
+    def test_equality_before_range(self):
+        assert condition_columns("(a > 5) AND (b = 1) AND (c IN (1, 2))", "postgres") == [
+            "b",
+            "c",
+            "a",
+        ]
+
+    def test_mysql_filter(self):
+        condition = "(`shop`.`orders`.`region` in ('east','west'))"
+        assert condition_columns(condition, "mysql") == ["region"]
+
+    def test_join_conditions_ignored(self):
+        assert condition_columns("(o.user_id = u.id)", "postgres") == []
+        assert condition_columns("not sql ((", "postgres") == []
+
+
+class TestFindings:
+    """Test plan annotation."""
+
+    def test_analyzed_postgres_plan(self):
+        root, _, _ = parse_plan(PG_ANALYZE_PLAN, "postgres")
+        findings = find_plan_issues(root, "postgres", {"orders": ORDERS})
+
+        kinds = [(finding.kind, finding.node_id) for finding in findings]
+        # The scan takes 350 of 400 ms; the join misestimated 50 vs 4800 rows
+        assert kinds == [
+            ("hot_node", 1),
+            ("misestimate", 0),
+            ("seq_scan", 1),
+            ("missing_index", 1),
+        ]
+        assert "88%" in findings[0].message
+        assert findings[3].columns == ["status", "created_at"]
+        assert "CREATE INDEX ON orders (status, created_at)" in findings[3].message
+
+    def test_small_tables_and_primary_keys(self):
+        root, _, _ = parse_plan(PG_ANALYZE_PLAN, "postgres")
+        small = ORDERS.model_copy(update={"row_count": 100})
+        findings = find_plan_issues(root, "postgres", {"orders": small})
+        assert "seq_scan" not in {finding.kind for finding in findings}
+
+        # No metadata and a filtered scan: the table size is unknown
+        findings = find_plan_issues(root, "postgres", {})
+        assert "seq_scan" not in {finding.kind for finding in findings}
+
+    def test_mysql_plan_without_metadata(self):
+        root, _, _ = parse_plan(MYSQL_PLAN, "mysql")
+        findings = find_plan_issues(root, "mysql")
+
+        kinds = [(finding.kind, finding.node_id) for finding in findings]
+        # Ranked by estimated cost; MySQL scans estimate the table size
+        assert kinds == [("hot_node", 3), ("seq_scan", 3), ("missing_index", 3)]
+        assert findings[2].columns == ["region"]
+
+
+class TestExplainService:
+    """Test running EXPLAIN through the connector."""
+
+    @pytest.mark.asyncio
+    async def test_explain_analyze(self):
+        connector = MagicMock()
+        connector.get_dialect.return_value = "postgres"
+        connector.execute_query = AsyncMock(return_value=(["QUERY PLAN"], [[PG_ANALYZE_PLAN]], 3))
+        metadata = DatabaseMetadata(name="db", schemas=["public"], tables=[ORDERS])
+
+        with patch("app.services.explain_service.database_manager") as mock_mgr, \
+             patch("app.services.explain_service.ConnectorFactory") as mock_factory, \
+             patch("app.services.explain_service.metadata_service") as mock_meta:
+            mock_mgr.get_database = AsyncMock(return_value={"name": "db", "url": "postgresql://x/db"})
+            mock_mgr.get_tunnel_endpoint = AsyncMock(return_value=None)
+            mock_factory.get_connector.return_value = connector
+            mock_meta.get_cached_metadata = AsyncMock(return_value=metadata)
+
+            response = await ExplainService().explain(
+                "db", "SELECT * FROM orders WHERE status = 'paid';", analyze=True
+            )
+
+        statement = connector.execute_query.call_args.args[1]
+        assert statement == (
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT * FROM orders WHERE status = 'paid'"
+        )
+        assert connector.execute_query.call_args.kwargs["read_only"] is True
+        assert response.analyzed is True
+        assert response.total_cost == 20000.0
+        assert response.execution_time_ms == 401.2
+        assert response.raw_plan == PG_ANALYZE_PLAN
+        assert "missing_index" in {finding.kind for finding in response.findings}
+
+    @pytest.mark.asyncio
+    async def test_rejects_writes_and_mysql_analyze(self):
+        connector = MagicMock()
+        connector.execute_query = AsyncMock()
+
+        with patch("app.services.explain_service.database_manager") as mock_mgr, \
+             patch("app.services.explain_service.ConnectorFactory") as mock_factory:
+            mock_mgr.get_database = AsyncMock(return_value={"name": "db", "url": "mysql://x/db"})
+            mock_mgr.get_tunnel_endpoint = AsyncMock(return_value=None)
+            mock_factory.get_connector.return_value = connector
+
+            connector.get_dialect.return_value = "postgres"
+            with pytest.raises(ValueError, match="Only SELECT"):
+                await ExplainService().explain("db", "DELETE FROM orders", analyze=True)
+
+            connector.get_dialect.return_value = "mysql"
+            with pytest.raises(ValueError, match="only supported for PostgreSQL"):
+                await ExplainService().explain("db", "SELECT 1", analyze=True)
+
+        connector.execute_query.assert_not_called()
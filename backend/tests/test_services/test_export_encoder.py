@@ -0,0 +1,120 @@
+"""Unit tests for streamed export file encoders."""
+
+import csv
+import io
+import json
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.etree import ElementTree
+
+import pytest
+
+from app.services.export_encoder import (
+    CsvEncoder,
+    ExportEncoder,
+    JsonEncoder,
+    NdjsonEncoder,
+    XlsxEncoder,
+)
+
+COLUMNS = ["id", "price", "day", "note", "tags"]
+TYPES = ["int", "decimal", "date", "text", "string"]
+ROWS = [
+    (1, Decimal("9.50"), date(2024, 1, 2), 'say "hi", bye\n', {"a": 1}),
+    (2, None, None, "  <tag> & ", [1, 2]),
+]
+
+
+def encode(encoder: ExportEncoder, *batches) -> bytes:
+    data = encoder.begin()
+    for rows in batches:
+        data += encoder.write(rows)
+    return data + encoder.finish()
+
+
+class TestTextEncoders:
+    """Test CSV, JSON and NDJSON output."""
+
+    def test_csv(self):
+        data = encode(CsvEncoder(COLUMNS, TYPES), ROWS[:1], ROWS[1:])
+
+        assert data.startswith("\ufeff".encode())
+        text = data.decode("utf-8-sig")
+        assert "\r\n" in text
+        assert list(csv.reader(io.StringIO(text))) == [
+            COLUMNS,
+            ["1", "9.50", "2024-01-02", 'say "hi", bye\n', '{"a": 1}'],
+            ["2", "", "", "  <tag> & ", "[1, 2]"],
+        ]
+
+    def test_json_matches_indented_array(self):
+        data = encode(JsonEncoder(COLUMNS, TYPES), ROWS[:1], [], ROWS[1:])
+
+        expected = [
+            {"id": 1, "price": "9.50", "day": "2024-01-02", "note": 'say "hi", bye\n', "tags": {"a": 1}},
+            {"id": 2, "price": None, "day": None, "note": "  <tag> & ", "tags": [1, 2]},
+        ]
+        assert json.loads(data) == expected
+        assert data.decode() == json.dumps(expected, indent=2)
+
+    def test_json_empty_result(self):
+        assert encode(JsonEncoder(COLUMNS, TYPES)) == b"[]"
+
+    def test_ndjson(self):
+        lines = encode(NdjsonEncoder(COLUMNS, TYPES), ROWS).decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [1, 2]
+
+
+class TestXlsxEncoder:
+    """Test the streamed workbook."""
+
+    def test_workbook_cells(self):
+        encoder = XlsxEncoder(["id", "flag", "when", "note"], None)
+        chunks = [
+            encoder.begin(),
+            encoder.write([(1, True, datetime(2024, 1, 2, 3, 4), "a\x01 & <b>")]),
+            encoder.write([(2.5, None, None, None)]),
+            encoder.finish(),
+        ]
+
+        workbook = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        assert "xl/workbook.xml" in workbook.namelist()
+        ns = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+        sheet = ElementTree.fromstring(workbook.read("xl/worksheets/sheet1.xml"))
+        rows = sheet.findall("s:sheetData/s:row", ns)
+
+        def cells(row):
+            return [
+                (cell.get("t"), "".join(cell.itertext()) or None)
+                for cell in row.findall("s:c", ns)
+            ]
+
+        assert cells(rows[0])[0] == ("inlineStr", "id")
+        assert cells(rows[1]) == [
+            (None, "1"),
+            ("b", "1"),
+            ("inlineStr", "2024-01-02T03:04:00"),
+            ("inlineStr", "a & <b>"),
+        ]
+        assert cells(rows[2]) == [(None, "2.5"), (None, None), (None, None), (None, None)]
+
+
+class TestParquetEncoder:
+    """Test Parquet row groups."""
+
+    def test_row_groups(self, monkeypatch):
+        pq = pytest.importorskip("pyarrow.parquet")
+        import pyarrow as pa
+
+        from app.services import export_encoder
+
+        monkeypatch.setattr(export_encoder, "PARQUET_ROW_GROUP_ROWS", 3)
+        encoder = export_encoder.ParquetEncoder(["id", "price"], ["int", "decimal"])
+        data = encode(encoder, [(1, Decimal("1.10")), (2, None)], [(3, Decimal("3"))], [(4, None)])
+
+        parquet = pq.ParquetFile(pa.BufferReader(data))
+        assert parquet.metadata.num_row_groups == 2
+        table = parquet.read()
+        assert table.column("id").to_pylist() == [1, 2, 3, 4]
+        assert table.column("price").to_pylist() == ["1.10", None, "3", None]
@@ -67,6 +67,31 @@ class TestHistoryService:
             assert call_args.kwargs["natural_query"] is None
             assert call_args.kwargs["natural_tokens"] == ""
 
+    @pytest.mark.asyncio
+    async def test_create_history_records_query_stats(self, service):
+        """Test create_history adds the execution to its fingerprint's stats."""
+        with patch("app.services.history_service.db_manager") as mock_db, \
+             patch("app.services.history_service.query_stats_service") as mock_stats:
+
+            mock_db.create_query_history = AsyncMock(return_value=1)
+            mock_stats.record = AsyncMock(side_effect=RuntimeError("locked"))
+
+            result = await service.create_history(
+                db_name="test_db",
+                sql_content="SELECT * FROM users WHERE id = 1",
+                row_count=1,
+                execution_time_ms=7,
+            )
+
+            # Stats failures are logged, the history record is still created
+            assert result == 1
+            mock_stats.record.assert_awaited_once_with(
+                db_name="test_db",
+                sql="SELECT * FROM users WHERE id = 1",
+                row_count=1,
+                execution_time_ms=7,
+            )
+
     # === list_history tests ===
 
     @pytest.mark.asyncio
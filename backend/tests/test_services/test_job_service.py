@@ -0,0 +1,200 @@
+"""Unit tests for asynchronous query jobs."""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.config import settings
+from app.services.job_service import JobService, JobStateError, _RowSpill
+
+
+@pytest.fixture(autouse=True)
+def job_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "job_results_dir", tmp_path / "jobs")
+    monkeypatch.setattr(settings, "job_max_running", 1)
+    with patch(
+        "app.services.job_service.history_service.create_history", new_callable=AsyncMock
+    ) as create_history:
+        yield create_history
+
+
+def stream(batches, gate: asyncio.Event | None = None, fail: Exception | None = None):
+    """Mock stream_validated_query returning the given (columns, rows) batches."""
+
+    async def _batches():
+        for i, batch in enumerate(batches):
+            if gate is not None and i == 1:
+                await gate.wait()
+            yield batch
+        if fail is not None:
+            raise fail
+
+    return AsyncMock(return_value=("SELECT a, b FROM t LIMIT 10000000", True, _batches(), None))
+
+
+async def wait_for_status(service: JobService, job_id: str, status: str) -> None:
+    for _ in range(200):
+        if service.get(job_id).status == status:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job never reached {status}: {service.get(job_id)}")
+
+
+class TestRowSpill:
+    """Test suite for _RowSpill."""
+
+    def test_reads_windows_across_index_blocks(self, tmp_path):
+        spill = _RowSpill(tmp_path / "rows.jsonl")
+        spill.append([[i, f"row {i}"] for i in range(2500)])
+
+        assert spill.row_count == 2500
+        assert spill.read(0, 2) == [[0, "row 0"], [1, "row 1"]]
+        assert spill.read(1999, 3) == [[1999, "row 1999"], [2000, "row 2000"], [2001, "row 2001"]]
+        assert spill.read(2498, 10) == [[2498, "row 2498"], [2499, "row 2499"]]
+        assert spill.read(2500, 10) == []
+
+        spill.delete()
+        assert not (tmp_path / "rows.jsonl").exists()
+
+
+@pytest.mark.asyncio
+class TestJobService:
+    """Test suite for JobService."""
+
+    async def test_job_runs_to_completion(self, job_settings):
+        service = JobService()
+        batches = [(["a", "b"], [[1, "x"], [2, "y"]]), (["a", "b"], [[3, "z"]])]
+        with patch(
+            "app.services.job_service.query_service.stream_validated_query", stream(batches)
+        ) as mock_stream:
+            job = await service.submit("mydb", "SELECT a, b FROM t", 600, "all rows")
+            await wait_for_status(service, job.id, "succeeded")
+
+        assert mock_stream.call_args.kwargs == {"max_rows": settings.job_max_rows, "lane": "job"}
+        done = service.get(job.id)
+        assert done.rows_fetched == 3
+        assert done.truncated is True
+        assert done.expires_at is not None
+
+        result = await service.get_result(job.id, 1, 10)
+        assert result.rows == [{"a": 2, "b": "y"}, {"a": 3, "b": "z"}]
+        assert result.total_rows == 3
+        assert (await service.get_result(job.id, 0, 1, "arrays")).rows == [[1, "x"]]
+
+        assert job_settings.call_args.kwargs["row_count"] == 3
+        assert job_settings.call_args.kwargs["natural_query"] == "all rows"
+
+    async def test_partial_result_while_running_then_cancel(self, job_settings):
+        service = JobService()
+        gate = asyncio.Event()
+        batches = [(["a"], [[1], [2]]), (["a"], [[3]])]
+        with patch(
+            "app.services.job_service.query_service.stream_validated_query",
+            stream(batches, gate),
+        ):
+            job = await service.submit("mydb", "SELECT a FROM t")
+            await wait_for_status(service, job.id, "running")
+            await asyncio.sleep(0.01)
+
+            partial = await service.get_result(job.id, 0, 10)
+            assert partial.status == "running"
+            assert partial.rows == [{"a": 1}, {"a": 2}]
+
+            assert await service.delete(job.id) is True
+
+        assert service.get(job.id) is None
+        assert list(settings.job_results_dir.iterdir()) == []
+        job_settings.assert_not_called()
+
+    async def test_failed_job_has_no_result(self):
+        service = JobService()
+        with patch(
+            "app.services.job_service.query_service.stream_validated_query",
+            stream([(["a"], [[1]])], fail=RuntimeError("connection lost")),
+        ):
+            job = await service.submit("mydb", "SELECT a FROM t")
+            await wait_for_status(service, job.id, "failed")
+
+        assert "connection lost" in service.get(job.id).error
+        with pytest.raises(JobStateError):
+            await service.get_result(job.id, 0, 10)
+
+    async def test_jobs_beyond_limit_stay_queued(self):
+        service = JobService()
+        gate = asyncio.Event()
+        with patch(
+            "app.services.job_service.query_service.stream_validated_query",
+            side_effect=[
+                stream([(["a"], [[1]]), (["a"], [[2]])], gate).return_value,
+                stream([(["a"], [[3]])]).return_value,
+            ],
+        ):
+            first = await service.submit("mydb", "SELECT a FROM t")
+            second = await service.submit("mydb", "SELECT a FROM u")
+            await wait_for_status(service, first.id, "running")
+
+            assert service.get(second.id).status == "queued"
+            with pytest.raises(JobStateError):
+                await service.get_result(second.id, 0, 10)
+
+            gate.set()
+            await wait_for_status(service, second.id, "succeeded")
+
+        assert service.get(first.id).rows_fetched == 2
+
+    async def test_invalid_sql_is_rejected_at_submit(self):
+        service = JobService()
+        with (
+            patch(
+                "app.services.job_service.query_service.stream_validated_query",
+                AsyncMock(side_effect=ValueError("Only SELECT statements are allowed")),
+            ),
+            pytest.raises(ValueError),
+        ):
+            await service.submit("mydb", "DELETE FROM t")
+
+    async def test_expired_jobs_are_purged(self):
+        service = JobService()
+        with patch(
+            "app.services.job_service.query_service.stream_validated_query",
+            stream([(["a"], [[1]])]),
+        ):
+            job = await service.submit("mydb", "SELECT a FROM t")
+            await wait_for_status(service, job.id, "succeeded")
+
+        path = settings.job_results_dir / f"{job.id}.jsonl"
+        assert path.exists()
+        service._jobs[job.id].finished_at = datetime.now() - timedelta(
+            seconds=settings.job_retention_seconds + 1
+        )
+
+        assert service.get(job.id) is None
+        assert not path.exists()
+
+    async def test_sweeper_deletes_expired_jobs(self, monkeypatch):
+        monkeypatch.setattr(settings, "job_sweep_interval_seconds", 0.01)
+        service = JobService()
+        with patch(
+            "app.services.job_service.query_service.stream_validated_query",
+            stream([(["a"], [[1]])]),
+        ):
+            job = await service.submit("mydb", "SELECT a FROM t")
+            await wait_for_status(service, job.id, "succeeded")
+
+        path = settings.job_results_dir / f"{job.id}.jsonl"
+        service._jobs[job.id].finished_at = datetime.now() - timedelta(
+            seconds=settings.job_retention_seconds + 1
+        )
+        service.start_sweeper()
+        # No API call: the sweeper alone removes the job and its file
+        for _ in range(100):
+            if job.id not in service._jobs:
+                break
+            await asyncio.sleep(0.01)
+
+        assert job.id not in service._jobs
+        assert not path.exists()
+        await service.close_all()
+        assert service._sweeper is None
@@ -4,6 +4,7 @@ import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.models.metadata import ColumnInfo, DatabaseMetadata, TableMetadata
 from app.services.llm_service import (
     LLMService,
     TABLE_SELECTION_THRESHOLD,
@@ -11,6 +12,7 @@ from app.services.llm_service import (
     PHASE1_MAX_TOKENS,
     strip_think_tags,
 )
+from app.services.metadata_service import metadata_service
 
 
 class TestStripThinkTags:
@@ -208,6 +210,73 @@ class TestLLMService:
             assert "PRIMARY KEY" in result
             assert "name: varchar" in result
 
+    @pytest.mark.asyncio
+    async def test_build_schema_context_loads_lazy_columns(self, service):
+        """Only the selected lazily listed tables get their columns fetched."""
+        listed = [
+            {
+                "schema_name": "public",
+                "table_name": table_name,
+                "table_type": "table",
+                "columns": [],
+                "columns_loaded": False,
+            }
+            for table_name in ("orders", "users")
+        ]
+        fetched = DatabaseMetadata(
+            name="testdb",
+            tables=[
+                TableMetadata(
+                    schema_name="public",
+                    table_name="users",
+                    table_type="table",
+                    columns=[ColumnInfo(name="id", data_type="integer", is_primary_key=True)],
+                )
+            ],
+        )
+
+        with patch("app.services.llm_service.database_manager") as mock_mgr, \
+             patch("app.db.sqlite.db_manager") as mock_db, \
+             patch("app.services.metadata_service.db_manager") as mock_cache, \
+             patch.object(metadata_service, "fetch_metadata", new_callable=AsyncMock) as mock_fetch:
+            mock_mgr.get_database = AsyncMock(return_value={"name": "testdb"})
+            mock_db.get_metadata_for_database = AsyncMock(return_value=listed)
+            mock_cache.save_metadata_bulk = AsyncMock()
+            mock_fetch.return_value = fetched
+
+            result = await service.build_schema_context("testdb", ["public.users"])
+
+        mock_fetch.assert_called_once_with("testdb", tables=[("public", "users")])
+        ((_, rows), _) = mock_cache.save_metadata_bulk.call_args
+        assert rows[0]["columns_loaded"] is True
+        assert "public.users" in result
+        assert "id: integer PRIMARY KEY" in result
+        assert "public.orders" not in result
+
+    @pytest.mark.asyncio
+    async def test_build_table_summary_context_lazy(self, service):
+        """The table summary needs no columns, so lazily listed tables are not loaded."""
+        listed = [
+            {
+                "schema_name": "public",
+                "table_name": "users",
+                "table_type": "table",
+                "row_count": 1500,
+                "columns": [],
+                "columns_loaded": False,
+            }
+        ]
+
+        with patch("app.db.sqlite.db_manager") as mock_db, \
+             patch.object(metadata_service, "fetch_metadata", new_callable=AsyncMock) as mock_fetch:
+            mock_db.get_metadata_for_database = AsyncMock(return_value=listed)
+
+            context, count, names = await service.build_table_summary_context("testdb")
+
+        mock_fetch.assert_not_called()
+        assert (count, names) == (1, ["public.users"])
+        assert "Table: public.users (table, ~1.5K rows)" in context
+
     @pytest.mark.asyncio
     async def test_generate_sql_success(self, service):
         """Test generate_sql returns SQL and explanation."""
@@ -371,6 +440,8 @@ class TestPromptChain:
                 "table_name": "orders",
                 "table_type": "table",
                 "table_comment": "订单主表",
+                "row_count": 48_000_000,
+                "size_bytes": 12 * 1024**3,
             },
             {
                 "schema_name": "public",
@@ -390,6 +461,8 @@ class TestPromptChain:
             assert "public.customers" in summary
             assert "订单主表" in summary
             assert "客户信息" in summary
+            assert "Table: public.orders (table, ~48M rows, 12 GB) - 订单主表" in summary
+            assert "Table: public.customers (table) - 客户信息" in summary
             assert "public.orders" in all_tables
             assert "public.customers" in all_tables
 
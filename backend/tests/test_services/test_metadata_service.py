@@ -1,10 +1,13 @@
 """Unit tests for metadata_service module."""
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.connectors.base import TableVersion
 from app.models.metadata import ColumnInfo, TableMetadata, DatabaseMetadata
-from app.services.metadata_service import MetadataService
+from app.services.metadata_service import MetadataService, format_table_size
 
 
 class TestMetadataService:
@@ -57,14 +60,16 @@ class TestMetadataService:
     async def test_cache_metadata(self, service, sample_metadata):
         """Test caching metadata to SQLite."""
         with patch("app.services.metadata_service.db_manager") as mock_db:
-            mock_db.clear_metadata_for_database = AsyncMock()
-            mock_db.save_metadata = AsyncMock()
+            mock_db.save_metadata_bulk = AsyncMock()
 
             await service.cache_metadata("testdb", sample_metadata)
 
-            mock_db.clear_metadata_for_database.assert_called_once_with("testdb")
-            # Should save each table
-            assert mock_db.save_metadata.call_count == 2
+            # Should replace the database's metadata with all tables at once
+            mock_db.save_metadata_bulk.assert_called_once()
+            args = mock_db.save_metadata_bulk.call_args
+            assert args.args[0] == "testdb"
+            assert args.kwargs == {"replace": True}
+            assert [row["table_name"] for row in args.args[1]] == ["users", "user_view"]
 
     @pytest.mark.asyncio
     async def test_get_cached_metadata_found(self, service):
@@ -75,7 +80,13 @@ class TestMetadataService:
                 "table_name": "users",
                 "table_type": "table",
                 "columns": [
-                    {"name": "id", "dataType": "integer", "isNullable": False, "isPrimaryKey": True}
+                    {
+                        "name": "id",
+                        "dataType": "integer",
+                        "isNullable": False,
+                        "isPrimaryKey": True,
+                        "extra": "auto_increment",
+                    }
                 ],
                 "created_at": "2024-01-01T00:00:00",
             }
@@ -91,6 +102,7 @@ class TestMetadataService:
             assert len(result.tables) == 1
             assert result.tables[0].table_name == "users"
             assert len(result.tables[0].columns) == 1
+            assert result.tables[0].columns[0].extra == "auto_increment"
 
     @pytest.mark.asyncio
     async def test_get_cached_metadata_not_found(self, service):
@@ -128,16 +140,182 @@ class TestMetadataService:
 
     @pytest.mark.asyncio
     async def test_refresh_metadata(self, service, sample_metadata):
-        """Test refresh_metadata fetches and caches."""
+        """Test refresh_metadata fetches and caches everything without fingerprints."""
         with patch.object(service, "fetch_metadata", new_callable=AsyncMock) as mock_fetch, \
-             patch.object(service, "cache_metadata", new_callable=AsyncMock) as mock_cache:
+             patch.object(service, "fetch_table_versions", new_callable=AsyncMock) as mock_versions, \
+             patch.object(service, "cache_metadata", new_callable=AsyncMock) as mock_cache, \
+             patch("app.services.metadata_service.db_manager") as mock_db, \
+             patch("app.services.metadata_service.settings.metadata_fetch_concurrency", 1):
             mock_fetch.return_value = sample_metadata
+            mock_versions.return_value = None
+            mock_db.get_table_fingerprints = AsyncMock(
+                return_value={("public", "users"): None, ("public", "old"): None}
+            )
 
             result = await service.refresh_metadata("testdb")
 
-            mock_fetch.assert_called_once_with("testdb")
-            mock_cache.assert_called_once_with("testdb", sample_metadata)
-            assert result == sample_metadata
+            mock_fetch.assert_called_once_with("testdb", tables=None)
+            mock_cache.assert_called_once_with("testdb", result, {})
+            assert [table.table_name for table in result.tables] == ["user_view", "users"]
+            assert result.schemas == ["public"]
+            assert result.refresh.mode == "full"
+            assert result.refresh.added == ["public.user_view"]
+            assert result.refresh.dropped == ["public.old"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_metadata_incremental(self, service, sample_metadata):
+        """Test refresh_metadata only fetches tables whose fingerprint changed."""
+        versions = {
+            ("public", "users"): TableVersion("fp-users-2", 120, 8192),
+            ("public", "user_view"): TableVersion("fp-view", None, None),
+            ("public", "orders"): TableVersion("fp-orders", 5000, 65536),
+        }
+        fetched = DatabaseMetadata(
+            name="testdb",
+            schemas=["empty", "public"],
+            tables=[sample_metadata.tables[0]],
+            last_refreshed="2024-02-01T00:00:00",
+        )
+        with patch.object(service, "fetch_metadata", new_callable=AsyncMock) as mock_fetch, \
+             patch.object(service, "fetch_table_versions", new_callable=AsyncMock) as mock_versions, \
+             patch.object(service, "get_cached_metadata", new_callable=AsyncMock) as mock_cached, \
+             patch("app.services.metadata_service.db_manager") as mock_db, \
+             patch("app.services.metadata_service.settings.metadata_fetch_concurrency", 1):
+            mock_versions.return_value = versions
+            mock_fetch.return_value = fetched
+            mock_cached.return_value = sample_metadata.model_copy()
+            mock_db.get_table_fingerprints = AsyncMock(
+                return_value={
+                    ("public", "users"): "fp-users-1",
+                    ("public", "user_view"): "fp-view",
+                    ("public", "dropped"): "fp-dropped",
+                }
+            )
+            mock_db.save_metadata_bulk = AsyncMock()
+
+            result = await service.refresh_metadata("testdb")
+
+        mock_fetch.assert_called_once_with(
+            "testdb", tables=[("public", "orders"), ("public", "users")]
+        )
+        save = mock_db.save_metadata_bulk.call_args
+        (row,) = save.args[1]
+        assert (row["table_name"], row["fingerprint"]) == ("users", "fp-users-2")
+        # Only the fetched tables are replaced
+        # Unchanged tables only get fresh statistics, in the same transaction
+        assert save.kwargs == {
+            "deleted": [("public", "dropped")],
+            "stats": [("public", "user_view", None, None)],
+        }
+
+        assert result.schemas == ["empty", "public"]
+        # The unchanged view is kept from the cache, with fresh statistics
+        assert [table.table_name for table in result.tables] == ["user_view", "users"]
+        summary = result.refresh
+        assert summary.mode == "incremental"
+        assert summary.added == ["public.orders"]
+        assert summary.changed == ["public.users"]
+        assert summary.dropped == ["public.dropped"]
+        assert summary.unchanged == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_metadata_parallel(self, service):
+        """Test refresh_metadata fans out per schema, bounded, reporting each as it arrives."""
+        running = 0
+        peak = 0
+
+        async def fetch_schema(url, schema, tunnel_endpoint=None, *, db_name=None, tables=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01 if schema == "a" else 0)
+            running -= 1
+            return [TableMetadata(schema_name=schema, table_name=f"{schema}_t", table_type="table")]
+
+        connector = MagicMock()
+        connector.fetch_schemas = AsyncMock(return_value=["a", "b", "c"])
+        connector.fetch_schema_metadata = AsyncMock(side_effect=fetch_schema)
+        frames = []
+
+        async def on_progress(frame):
+            frames.append(frame)
+
+        with patch.object(service, "_connector", new_callable=AsyncMock) as mock_connector, \
+             patch.object(service, "fetch_table_versions", new_callable=AsyncMock) as mock_versions, \
+             patch.object(service, "cache_metadata", new_callable=AsyncMock) as mock_cache, \
+             patch("app.services.metadata_service.db_manager") as mock_db, \
+             patch("app.services.metadata_service.settings.metadata_fetch_concurrency", 2):
+            mock_connector.return_value = ("postgresql://x/db", connector, None)
+            mock_versions.return_value = None
+            mock_db.get_table_fingerprints = AsyncMock(return_value={})
+
+            result = await service.refresh_metadata("testdb", on_progress=on_progress)
+
+        assert peak == 2
+        assert [table.table_name for table in result.tables] == ["a_t", "b_t", "c_t"]
+        mock_cache.assert_called_once_with("testdb", result, {})
+
+        header, *schemas = frames
+        assert (header.mode, header.schemas, header.pending) == ("full", ["a", "b", "c"], ["a", "b", "c"])
+        # The slow schema arrives last
+        assert [frame.schema_name for frame in schemas] == ["b", "c", "a"]
+        assert schemas[2].tables[0].table_name == "a_t"
+
+    @pytest.mark.asyncio
+    async def test_refresh_metadata_parallel_incremental(self, service, sample_metadata):
+        """Test only schemas with changed tables are fetched, the others come from the cache."""
+        versions = {
+            ("public", "users"): TableVersion("fp-users", 10, 8192),
+            ("public", "user_view"): TableVersion("fp-view-2", None, None),
+            ("sales", "orders"): TableVersion("fp-orders", 5, 8192),
+        }
+        connector = MagicMock()
+        connector.fetch_schemas = AsyncMock(return_value=["empty", "public", "sales"])
+        connector.fetch_schema_metadata = AsyncMock(return_value=[sample_metadata.tables[1]])
+        frames = []
+
+        async def on_progress(frame):
+            frames.append(frame)
+
+        with patch.object(service, "_connector", new_callable=AsyncMock) as mock_connector, \
+             patch.object(service, "fetch_table_versions", new_callable=AsyncMock) as mock_versions, \
+             patch.object(service, "get_cached_metadata", new_callable=AsyncMock) as mock_cached, \
+             patch("app.services.metadata_service.db_manager") as mock_db:
+            mock_connector.return_value = ("postgresql://x/db", connector, None)
+            mock_versions.return_value = versions
+            mock_cached.return_value = sample_metadata.model_copy(
+                update={
+                    "tables": sample_metadata.tables
+                    + [TableMetadata(schema_name="sales", table_name="orders", table_type="table")]
+                }
+            )
+            mock_db.get_table_fingerprints = AsyncMock(
+                return_value={
+                    ("public", "users"): "fp-users",
+                    ("public", "user_view"): "fp-view-1",
+                    ("sales", "orders"): "fp-orders",
+                }
+            )
+            mock_db.save_metadata_bulk = AsyncMock()
+
+            result = await service.refresh_metadata("testdb", on_progress=on_progress)
+
+        connector.fetch_schema_metadata.assert_called_once_with(
+            "postgresql://x/db", "public", None, db_name="testdb", tables=[("public", "user_view")]
+        )
+        assert result.refresh.changed == ["public.user_view"]
+        assert result.schemas == ["empty", "public", "sales"]
+        assert mock_db.save_metadata_bulk.call_args.kwargs["stats"] == [
+            ("public", "users", 10, 8192),
+            ("sales", "orders", 5, 8192),
+        ]
+
+        header, *schemas = frames
+        assert (header.mode, header.pending) == ("incremental", ["public"])
+        assert [frame.schema_name for frame in schemas] == ["empty", "sales", "public"]
+        assert schemas[0].tables == []
+        assert [table.table_name for table in schemas[2].tables] == ["user_view", "users"]
+        assert schemas[2].tables[1].row_count == 10
 
     @pytest.mark.asyncio
     async def test_get_or_refresh_uses_cache(self, service, sample_metadata):
@@ -279,15 +457,65 @@ class TestMetadataService:
         )
 
         with patch("app.services.metadata_service.db_manager") as mock_db:
-            mock_db.clear_metadata_for_database = AsyncMock()
-            mock_db.save_metadata = AsyncMock()
+            mock_db.save_metadata_bulk = AsyncMock()
 
             await service.cache_metadata("testdb", metadata)
 
             # Verify table_comment is passed
-            mock_db.save_metadata.assert_called_once()
-            call_kwargs = mock_db.save_metadata.call_args
-            assert call_kwargs.kwargs.get("table_comment") == "User information table"
+            (row,) = mock_db.save_metadata_bulk.call_args.args[1]
+            assert row["table_comment"] == "User information table"
+            assert row["columns"][0]["comment"] == "Primary key column"
+
+    @pytest.mark.asyncio
+    async def test_table_size_round_trip(self, service):
+        """Row estimates and sizes are cached and restored."""
+        metadata = DatabaseMetadata(
+            name="testdb",
+            schemas=["public"],
+            tables=[
+                TableMetadata(
+                    schema_name="public",
+                    table_name="events",
+                    table_type="table",
+                    row_count=2_500_000,
+                    size_bytes=734_003_200,
+                )
+            ],
+        )
+
+        with patch("app.services.metadata_service.db_manager") as mock_db:
+            mock_db.save_metadata_bulk = AsyncMock()
+
+            await service.cache_metadata("testdb", metadata)
+
+            (row,) = mock_db.save_metadata_bulk.call_args.args[1]
+            assert row["row_count"] == 2_500_000
+            assert row["size_bytes"] == 734_003_200
+
+            mock_db.get_metadata_for_database = AsyncMock(
+                return_value=[
+                    {
+                        "schema_name": "public",
+                        "table_name": "events",
+                        "table_type": "table",
+                        "row_count": 2_500_000,
+                        "size_bytes": 734_003_200,
+                        "columns": [],
+                        "created_at": "2024-01-01T00:00:00",
+                    }
+                ]
+            )
+            result = await service.get_cached_metadata("testdb")
+
+            assert result.tables[0].row_count == 2_500_000
+            assert result.tables[0].size_bytes == 734_003_200
+
+    def test_format_table_size(self):
+        """Sizes are abbreviated for LLM context."""
+        assert format_table_size(1_234_567, 356_515_840) == "~1.2M rows, 340 MB"
+        assert format_table_size(12, 8192) == "~12 rows, 8 KB"
+        assert format_table_size(None, 16384) == "16 KB"
+        assert format_table_size(None, None) == ""
 
     @pytest.mark.asyncio
     async def test_get_cached_metadata_restores_table_comment(self, service):
@@ -382,6 +610,8 @@ class TestTableListService:
                 table_name="users",
                 table_type="table",
                 columns=columns,
+                row_count=1_200_000,
+                size_bytes=268_435_456,
                 comment="用户表",
             ),
             TableMetadata(
@@ -414,6 +644,8 @@ class TestTableListService:
             assert not hasattr(result.tables[0], "columns") or result.tables[0].columns is None
             assert result.tables[0].table_name == "users"
             assert result.tables[0].comment == "用户表"
+            assert result.tables[0].row_count == 1_200_000
+            assert result.tables[0].size_bytes == 268_435_456
 
     @pytest.mark.asyncio
     async def test_get_table_list_with_force_refresh(self, service, sample_metadata):
@@ -425,6 +657,33 @@ class TestTableListService:
 
             mock_meta.assert_called_once_with("testdb", force_refresh=True)
 
+    @pytest.mark.asyncio
+    async def test_get_table_list_lazy_loading(self, service, sample_metadata):
+        """Test lazy mode lists tables without fetching columns."""
+        listed = DatabaseMetadata(
+            name="testdb",
+            schemas=["public"],
+            tables=[
+                TableMetadata(
+                    schema_name="public", table_name="users", table_type="table",
+                    columns_loaded=False,
+                )
+            ],
+        )
+        with patch.object(service, "get_cached_metadata", new_callable=AsyncMock) as mock_cache, \
+             patch.object(service, "fetch_table_list", new_callable=AsyncMock) as mock_list, \
+             patch.object(service, "cache_metadata", new_callable=AsyncMock) as mock_save, \
+             patch.object(service, "refresh_metadata", new_callable=AsyncMock) as mock_refresh, \
+             patch("app.services.metadata_service.settings.metadata_lazy_loading", True):
+            mock_cache.return_value = None
+            mock_list.return_value = listed
+
+            result = await service.get_table_list("testdb")
+
+            mock_refresh.assert_not_called()
+            mock_save.assert_called_once_with("testdb", listed)
+            assert [table.table_name for table in result.tables] == ["users"]
+
     @pytest.mark.asyncio
     async def test_get_table_list_empty_when_no_tables(self, service):
         """Test get_table_list returns empty list when metadata has no tables."""
@@ -558,6 +817,40 @@ class TestTableDetailsService:
             assert result is not None
             assert result.table_name == "users"
 
+    @pytest.mark.asyncio
+    async def test_get_table_details_loads_lazy_columns(self, service, sample_metadata):
+        """Test columns of a lazily listed table are fetched and cached on first access."""
+        listed = sample_metadata.model_copy(
+            update={
+                "tables": [
+                    table.model_copy(update={"columns": [], "columns_loaded": False})
+                    for table in sample_metadata.tables
+                ]
+            }
+        )
+        fetched = DatabaseMetadata(name="testdb", tables=[sample_metadata.tables[0]])
+        with patch.object(service, "get_cached_metadata", new_callable=AsyncMock) as mock_cache, \
+             patch.object(service, "fetch_metadata", new_callable=AsyncMock) as mock_fetch, \
+             patch("app.services.metadata_service.db_manager") as mock_db:
+            mock_cache.return_value = listed
+            mock_fetch.return_value = fetched
+            mock_db.save_metadata_bulk = AsyncMock()
+
+            result = await service.get_table_details("testdb", "public", "users")
+
+            mock_fetch.assert_called_once_with("testdb", tables=[("public", "users")])
+            assert len(result.columns) == 2
+            ((_, rows), _) = mock_db.save_metadata_bulk.call_args
+            assert rows[0]["table_name"] == "users"
+            assert rows[0]["columns_loaded"] is True
+
+            # Dropped since it was listed
+            mock_fetch.return_value = DatabaseMetadata(name="testdb")
+            assert await service.get_table_details("testdb", "sales", "orders") is None
+            mock_db.save_metadata_bulk.assert_called_with(
+                "testdb", [], deleted=[("sales", "orders")]
+            )
+
     @pytest.mark.asyncio
     async def test_get_table_details_returns_none_when_refresh_fails(self, service):
         """Test get_table_details returns None when refresh fails."""
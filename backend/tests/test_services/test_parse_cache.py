@@ -0,0 +1,72 @@
+"""Unit tests for the SQL parse cache."""
+
+import pytest
+from sqlglot import exp
+from sqlglot.errors import ParseError
+
+from app.services.parse_cache import SqlParseCache
+
+
+class TestSqlParseCache:
+    """Test suite for SqlParseCache."""
+
+    def test_repeated_sql_is_parsed_once(self):
+        cache = SqlParseCache(max_entries=10)
+        sql = "SELECT id FROM users WHERE active"
+
+        first = cache.parse(sql, "postgres")
+        second = cache.parse(sql, "postgres")
+
+        assert first.sql() == second.sql()
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_callers_get_private_copies(self):
+        cache = SqlParseCache(max_entries=10)
+        sql = "SELECT id FROM users"
+
+        tree = cache.parse(sql, "postgres")
+        tree.set("limit", exp.Limit(expression=exp.Literal.number(5)))
+
+        assert cache.parse(sql, "postgres").args.get("limit") is None
+        assert cache.normalize(sql, "postgres") == "SELECT id FROM users"
+
+    def test_dialect_is_part_of_the_key(self):
+        cache = SqlParseCache(max_entries=10)
+        cache.parse("SELECT 1", "postgres")
+        cache.parse("SELECT 1", "mysql")
+
+        assert cache.stats()["misses"] == 2
+
+    def test_least_recently_used_is_evicted(self):
+        cache = SqlParseCache(max_entries=2)
+        cache.parse("SELECT 1", "postgres")
+        cache.parse("SELECT 2", "postgres")
+        cache.parse("SELECT 1", "postgres")
+        cache.parse("SELECT 3", "postgres")
+
+        cache.parse("SELECT 1", "postgres")
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["hits"] == 2
+
+    def test_normalize_ignores_comments_and_case(self):
+        cache = SqlParseCache(max_entries=10)
+        assert cache.normalize("select  id /* c */ from t", "postgres") == "SELECT id FROM t"
+
+    def test_errors_are_raised_and_not_cached(self):
+        cache = SqlParseCache(max_entries=10)
+        for _ in range(2):
+            with pytest.raises(ParseError):
+                cache.parse("SELECT FROM WHERE (", "postgres")
+
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["misses"] == 2
+
+    def test_disabled_cache_always_parses(self):
+        cache = SqlParseCache(max_entries=0)
+        cache.parse("SELECT 1", "postgres")
+        cache.parse("SELECT 1", "postgres")
+
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["hits"] == 0
@@ -0,0 +1,117 @@
+"""Unit tests for the per-database query scheduler."""
+
+import asyncio
+
+import pytest
+
+from app.services.query_scheduler import QueryQueueFullError, QueryScheduler
+
+
+async def hold(scheduler: QueryScheduler, lane, order: list, release: asyncio.Event, tag: str):
+    async with scheduler.slot("db", lane):
+        order.append(tag)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+class TestQueryScheduler:
+    """Test suite for QueryScheduler."""
+
+    async def test_limits_concurrency_per_database(self):
+        scheduler = QueryScheduler(max_concurrency=2, max_queue=10, starvation_seconds=60)
+        release = asyncio.Event()
+        order: list[str] = []
+
+        tasks = [
+            asyncio.create_task(hold(scheduler, "interactive", order, release, str(i)))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        assert order == ["0", "1"]
+
+        # Other databases have their own slots
+        async with scheduler.slot("other"):
+            pass
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == ["0", "1", "2"]
+        stats = scheduler.stats()[0]
+        assert stats["running"] == 0
+        assert stats["admitted"] == 3
+        assert stats["waited"] == 1
+
+    async def test_interactive_lane_admitted_first(self):
+        scheduler = QueryScheduler(max_concurrency=1, max_queue=10, starvation_seconds=60)
+        release = asyncio.Event()
+        order: list[str] = []
+
+        first = asyncio.create_task(hold(scheduler, "interactive", order, release, "first"))
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.create_task(hold(scheduler, lane, order, release, lane))
+            for lane in ("metadata", "agent", "interactive")
+        ]
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()[0]["queued_by_lane"] == {
+            "interactive": 1,
+            "agent": 1,
+            "job": 0,
+            "metadata": 1,
+        }
+
+        release.set()
+        await asyncio.gather(first, *queued)
+        assert order == ["first", "interactive", "agent", "metadata"]
+
+    async def test_starving_waiter_admitted_regardless_of_lane(self):
+        scheduler = QueryScheduler(max_concurrency=1, max_queue=10, starvation_seconds=0)
+        release = asyncio.Event()
+        order: list[str] = []
+
+        first = asyncio.create_task(hold(scheduler, "interactive", order, release, "first"))
+        await asyncio.sleep(0)
+        metadata = asyncio.create_task(hold(scheduler, "metadata", order, release, "metadata"))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(
+            hold(scheduler, "interactive", order, release, "interactive")
+        )
+        await asyncio.sleep(0.01)
+
+        release.set()
+        await asyncio.gather(first, metadata, interactive)
+        assert order == ["first", "metadata", "interactive"]
+
+    async def test_full_queue_rejects(self):
+        scheduler = QueryScheduler(max_concurrency=1, max_queue=1, starvation_seconds=60)
+        release = asyncio.Event()
+        order: list[str] = []
+
+        running = asyncio.create_task(hold(scheduler, "interactive", order, release, "a"))
+        waiting = asyncio.create_task(hold(scheduler, "interactive", order, release, "b"))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(QueryQueueFullError, match="Too many queries"):
+            async with scheduler.slot("db"):
+                pass
+        assert scheduler.stats()[0]["rejected"] == 1
+
+        release.set()
+        await asyncio.gather(running, waiting)
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = QueryScheduler(max_concurrency=1, max_queue=10, starvation_seconds=60)
+        release = asyncio.Event()
+        order: list[str] = []
+
+        running = asyncio.create_task(hold(scheduler, "interactive", order, release, "a"))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(hold(scheduler, "interactive", order, release, "b"), 0.01)
+        assert scheduler.stats()[0]["queued"] == 0
+
+        release.set()
+        await running
+        # The slot was not leaked by the cancelled waiter
+        async with scheduler.slot("db"):
+            assert scheduler.stats()[0]["running"] == 1
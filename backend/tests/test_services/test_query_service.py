@@ -332,7 +332,7 @@ class TestQueryServiceWithMocks:
             mock_mgr.get_database = AsyncMock(return_value=mock_db)
             mock_factory.get_connector.return_value = mock_connector
 
-            final_sql, columns, rows, exec_time, truncated = await query_service.execute_validated_query(
+            final_sql, columns, rows, exec_time, truncated, cached = await query_service.execute_validated_query(
                 "testdb", "SELECT * FROM users"
             )
 
@@ -358,7 +358,7 @@ class TestQueryServiceWithMocks:
             mock_mgr.get_database = AsyncMock(return_value=mock_db)
             mock_factory.get_connector.return_value = mock_connector
 
-            final_sql, columns, rows, exec_time, truncated = await query_service.execute_validated_query(
+            final_sql, columns, rows, exec_time, truncated, cached = await query_service.execute_validated_query(
                 "testdb", "SELECT * FROM users LIMIT 10"
             )
 
@@ -379,3 +379,87 @@ class TestQueryServiceWithMocks:
             with pytest.raises(ValueError, match="Database.*not found"):
                 await query_service.execute_validated_query("nonexistent", "SELECT 1")
 
+
+
+class TestStreamValidatedQuery:
+    """Tests for streamed query execution."""
+
+    async def test_stream_uses_stream_limit(self):
+        """Streamed queries get the larger stream LIMIT and the configured batch size."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from app.config import settings
+
+        async def batches(*args, **kwargs):
+            yield ["id"], [{"id": 1}]
+
+        mock_connector = MagicMock()
+        mock_connector.get_dialect.return_value = "postgres"
+        mock_connector.stream_query = MagicMock(side_effect=batches)
+
+        with patch("app.services.query_service.database_manager") as mock_mgr, \
+             patch("app.services.query_service.ConnectorFactory") as mock_factory:
+            mock_mgr.get_database = AsyncMock(return_value={"url": "postgresql://localhost/db"})
+            mock_mgr.get_tunnel_endpoint = AsyncMock(return_value=None)
+            mock_factory.get_connector.return_value = mock_connector
+
+            final_sql, truncated, stream, cost_warning = await query_service.stream_validated_query(
+                "db", "SELECT id FROM t"
+            )
+            result = [batch async for batch in stream]
+
+        assert final_sql == f"SELECT id FROM t LIMIT {settings.query_stream_max_rows}"
+        assert truncated is True
+        assert result == [(["id"], [{"id": 1}])]
+        kwargs = mock_connector.stream_query.call_args.kwargs
+        assert kwargs["batch_size"] == settings.query_stream_batch_size
+        assert kwargs["timeout_seconds"] == 30
+        assert cost_warning is None
+
+    async def test_stream_runs_cost_guard(self):
+        """Streams are cost-checked in their lane before the query starts."""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from app.services.cost_guard import QueryCostExceededError
+
+        mock_connector = MagicMock()
+        mock_connector.get_dialect.return_value = "postgres"
+
+        with patch("app.services.query_service.database_manager") as mock_mgr, \
+             patch("app.services.query_service.ConnectorFactory") as mock_factory, \
+             patch("app.services.query_service.cost_guard") as mock_guard:
+            mock_mgr.get_database = AsyncMock(return_value={"url": "postgresql://localhost/db"})
+            mock_mgr.get_tunnel_endpoint = AsyncMock(return_value=None)
+            mock_factory.get_connector.return_value = mock_connector
+            mock_guard.check = AsyncMock(return_value="Query is likely expensive")
+
+            *_, cost_warning = await query_service.stream_validated_batches(
+                "db", "SELECT id FROM t", lane="job"
+            )
+            assert cost_warning == "Query is likely expensive"
+            assert mock_guard.check.call_args.kwargs["lane"] == "job"
+
+            mock_guard.check = AsyncMock(side_effect=QueryCostExceededError("too expensive"))
+            with pytest.raises(QueryCostExceededError):
+                await query_service.stream_validated_query("db", "SELECT id FROM t")
+            mock_connector.stream_query.assert_not_called()
+
+    async def test_deadline_cancels_slow_fetch(self):
+        """A fetch exceeding the remaining timeout raises TimeoutError and closes the stream."""
+        import asyncio
+
+        closed = asyncio.Event()
+
+        async def slow_batches():
+            try:
+                yield ["id"], []
+                await asyncio.sleep(60)
+                yield ["id"], [{"id": 1}]
+            finally:
+                closed.set()
+
+        stream = query_service._with_deadline(slow_batches(), timeout_seconds=0.05)
+        assert await anext(stream) == (["id"], [])
+        with pytest.raises(asyncio.TimeoutError, match="exceeded timeout"):
+            await anext(stream)
+        assert closed.is_set()
@@ -0,0 +1,104 @@
+"""Unit tests for query fingerprint statistics."""
+
+import math
+import random
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.db.sqlite import SQLiteManager
+from app.services.query_stats import (
+    SKETCH_RELATIVE_ACCURACY,
+    QueryStatsService,
+    fingerprint_sql,
+    sketch_quantile,
+    time_bucket,
+)
+
+
+class TestFingerprint:
+    """Test literal-stripping fingerprints."""
+
+    def test_literals_formatting_and_comments_are_ignored(self):
+        first = fingerprint_sql("select a from t where id = 5 and b in (1, 2, -3) limit 1000", "postgres")
+        second = fingerprint_sql("SELECT a\nFROM t -- recent\nWHERE id=7 AND b IN (4) LIMIT 10", "postgres")
+
+        assert first == second
+        assert first[1] == "SELECT a FROM t WHERE id = ? AND b IN (?) LIMIT ?"
+
+    def test_different_shapes_differ(self):
+        first, _ = fingerprint_sql("SELECT a FROM t WHERE id = 1", "postgres")
+        second, _ = fingerprint_sql("SELECT a FROM t WHERE name = 'x'", "postgres")
+        assert first != second
+
+    def test_type_parameters_and_intervals(self):
+        _, normalized = fingerprint_sql(
+            "SELECT x::numeric(10, 2) FROM t WHERE d > now() - interval '2 days'", "postgres"
+        )
+        assert normalized == "SELECT CAST(x AS DECIMAL(10, 2)) FROM t WHERE d > CURRENT_TIMESTAMP - ?"
+
+    def test_unparseable_sql_falls_back_to_text(self):
+        assert fingerprint_sql("SHOW  TABLES LIKE 'a%' ((", "mysql")[1] == "SHOW TABLES LIKE ? (("
+
+
+class TestSketch:
+    """Test the log-bucketed execution time sketch."""
+
+    def test_quantiles_are_within_relative_accuracy(self):
+        rng = random.Random(1)
+        times = sorted(int(rng.lognormvariate(4, 1.5)) + 1 for _ in range(5000))
+        buckets: dict[int, int] = {}
+        for value in times:
+            buckets[time_bucket(value)] = buckets.get(time_bucket(value), 0) + 1
+
+        for q in (0.5, 0.95):
+            exact = times[math.ceil(q * len(times)) - 1]
+            assert abs(sketch_quantile(buckets, q) - exact) <= SKETCH_RELATIVE_ACCURACY * exact
+
+    def test_zero_and_empty(self):
+        assert sketch_quantile({time_bucket(0): 3}, 0.5) == 0.0
+        assert sketch_quantile({}, 0.95) == 0.0
+
+
+class TestQueryStatsService:
+    """Test recording and ranking against a temporary SQLite database."""
+
+    @pytest.fixture
+    async def manager(self):
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = Path(f.name)
+        manager = SQLiteManager(db_path=db_path)
+        await manager.init_schema()
+        await manager.create_or_update_database(name="db", url="postgresql://localhost/db")
+        with patch("app.services.query_stats.db_manager", manager):
+            yield manager
+        db_path.unlink()
+
+    @pytest.mark.asyncio
+    async def test_record_and_rank(self, manager):
+        service = QueryStatsService()
+        for user_id, ms in [(1, 10), (2, 30), (3, 20)]:
+            await service.record("db", f"SELECT * FROM users WHERE id = {user_id}", 1, ms)
+        await service.record("db", "SELECT COUNT(*) FROM orders", 1, 45)
+
+        top = await service.top_queries("db")
+        assert [item["exec_count"] for item in top] == [3, 1]
+        users = top[0]
+        assert users["normalized_sql"] == "SELECT * FROM users WHERE id = ?"
+        assert users["sample_sql"] == "SELECT * FROM users WHERE id = 3"
+        assert (users["total_time_ms"], users["max_time_ms"], users["total_rows"]) == (60, 30, 3)
+        assert users["mean_time_ms"] == 20
+        assert users["p50_time_ms"] == pytest.approx(20, rel=SKETCH_RELATIVE_ACCURACY)
+        assert users["p95_time_ms"] == pytest.approx(30, rel=SKETCH_RELATIVE_ACCURACY)
+
+        by_mean = await service.top_queries("db", sort="mean_time", limit=1)
+        assert by_mean[0]["normalized_sql"] == "SELECT COUNT(*) FROM orders"
+
+    @pytest.mark.asyncio
+    async def test_stats_are_deleted_with_the_database(self, manager):
+        await QueryStatsService().record("db", "SELECT 1", 1, 5)
+        await manager.delete_database("db")
+
+        assert await QueryStatsService().top_queries("db") == []
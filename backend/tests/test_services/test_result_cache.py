@@ -0,0 +1,178 @@
+"""Unit tests for the query result cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.query_service import query_service
+from app.services.result_cache import QueryResultCache, estimate_result_size, query_cache
+
+
+def make_result(rows: list) -> tuple:
+    return ("SELECT 1 LIMIT 1000", ["a"], rows, 5, True, None)
+
+
+class TestQueryResultCache:
+    """Test suite for QueryResultCache."""
+
+    def test_get_returns_cached_result(self):
+        cache = QueryResultCache(max_bytes=10_000)
+        key = ("db", "postgres", "SELECT 1", "objects")
+        result = make_result([{"a": 1}])
+
+        assert cache.get(key) is None
+        assert cache.put(key, result, ttl_seconds=60) is True
+        assert cache.get(key) == result
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_expired_entry_is_dropped(self):
+        cache = QueryResultCache(max_bytes=10_000)
+        key = ("db", "postgres", "SELECT 1", "objects")
+
+        with patch("app.services.result_cache.time.monotonic", return_value=100.0):
+            cache.put(key, make_result([{"a": 1}]), ttl_seconds=10)
+        with patch("app.services.result_cache.time.monotonic", return_value=110.0):
+            assert cache.get(key) is None
+
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["bytes"] == 0
+
+    def test_zero_ttl_is_not_cached(self):
+        cache = QueryResultCache(max_bytes=10_000)
+        key = ("db", "postgres", "SELECT 1", "objects")
+
+        assert cache.put(key, make_result([{"a": 1}]), ttl_seconds=0) is False
+        assert cache.get(key) is None
+
+    def test_lru_eviction_keeps_budget(self):
+        rows = [{"a": "x" * 100}]
+        size = estimate_result_size(["a"], rows)
+        cache = QueryResultCache(max_bytes=size * 2)
+        first, second, third = (("db", "postgres", f"SELECT {i}", "objects") for i in range(3))
+
+        cache.put(first, make_result(rows), 60)
+        cache.put(second, make_result(rows), 60)
+        cache.get(first)  # second is now least recently used
+        cache.put(third, make_result(rows), 60)
+
+        assert cache.get(second) is None
+        assert cache.get(first) is not None
+        assert cache.get(third) is not None
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] <= cache.max_bytes
+
+    def test_oversized_result_is_not_cached(self):
+        cache = QueryResultCache(max_bytes=100)
+        key = ("db", "postgres", "SELECT 1", "objects")
+
+        assert cache.put(key, make_result([{"a": "x" * 1000}]), 60) is False
+        assert cache.stats()["entries"] == 0
+
+    def test_invalidate_drops_only_that_database(self):
+        cache = QueryResultCache(max_bytes=10_000)
+        cache.put(("db1", "postgres", "SELECT 1", "objects"), make_result([]), 60)
+        cache.put(("db1", "postgres", "SELECT 2", "arrays"), make_result([]), 60)
+        cache.put(("db2", "postgres", "SELECT 1", "objects"), make_result([]), 60)
+
+        assert cache.invalidate("db1") == 2
+        assert cache.stats()["entries"] == 1
+        assert cache.get(("db2", "postgres", "SELECT 1", "objects")) is not None
+
+    def test_estimate_scales_sample_to_all_rows(self):
+        rows = [{"a": 1}] * 1000
+        assert estimate_result_size(["a"], rows) > estimate_result_size(["a"], rows[:100]) * 5
+
+
+@pytest.mark.asyncio
+class TestQueryServiceCaching:
+    """Result caching in execute_validated_query."""
+
+    @pytest.fixture
+    def connector(self):
+        connector = MagicMock()
+        connector.get_dialect.return_value = "postgres"
+        connector.execute_query = AsyncMock(return_value=(["id"], [{"id": 1}], 7))
+        with patch("app.services.query_service.database_manager") as mock_mgr, \
+             patch("app.services.query_service.ConnectorFactory") as mock_factory:
+            mock_mgr.get_database = AsyncMock(
+                return_value={"url": "postgresql://localhost/testdb", "cache_ttl_seconds": None}
+            )
+            mock_mgr.get_tunnel_endpoint = AsyncMock(return_value=None)
+            mock_factory.get_connector.return_value = connector
+            connector.manager = mock_mgr
+            yield connector
+
+    async def test_repeated_query_is_served_from_cache(self, connector):
+        first = await query_service.execute_validated_query("testdb", "SELECT id FROM users")
+        # Whitespace, keyword case and comments don't change the key
+        second = await query_service.execute_validated_query(
+            "testdb", "select  id\nFROM users -- again"
+        )
+
+        assert first[5] is False
+        assert second[5] is True
+        assert second[:5] == first[:5]
+        assert connector.execute_query.await_count == 1
+
+    async def test_cached_result_keeps_cost_warning(self, connector):
+        with patch(
+            "app.services.query_service.cost_guard.check",
+            AsyncMock(return_value="Query is likely expensive"),
+        ) as check:
+            first = await query_service.execute_validated_query("testdb", "SELECT id FROM users")
+            second = await query_service.execute_validated_query("testdb", "SELECT id FROM users")
+
+        assert second[5] is True
+        assert first[6] == second[6] == "Query is likely expensive"
+        check.assert_awaited_once()
+
+    async def test_cache_bypass(self, connector):
+        await query_service.execute_validated_query("testdb", "SELECT id FROM users")
+        result = await query_service.execute_validated_query(
+            "testdb", "SELECT id FROM users", use_cache=False
+        )
+
+        assert result[5] is False
+        assert connector.execute_query.await_count == 2
+
+    async def test_row_format_is_part_of_key(self, connector):
+        await query_service.execute_validated_query("testdb", "SELECT id FROM users")
+        result = await query_service.execute_validated_query(
+            "testdb", "SELECT id FROM users", row_format="arrays"
+        )
+
+        assert result[5] is False
+        assert connector.execute_query.await_count == 2
+
+    async def test_connection_ttl_zero_disables_cache(self, connector):
+        connector.manager.get_database.return_value = {
+            "url": "postgresql://localhost/testdb",
+            "cache_ttl_seconds": 0,
+        }
+        await query_service.execute_validated_query("testdb", "SELECT id FROM users")
+        await query_service.execute_validated_query("testdb", "SELECT id FROM users")
+
+        assert connector.execute_query.await_count == 2
+        assert query_cache.stats()["entries"] == 0
+
+    async def test_metadata_refresh_invalidates(self, connector):
+        from app.models.metadata import DatabaseMetadata
+        from app.services.metadata_service import metadata_service
+
+        await query_service.execute_validated_query("testdb", "SELECT id FROM users")
+        with patch.object(
+            metadata_service,
+            "fetch_metadata",
+            AsyncMock(return_value=DatabaseMetadata(name="testdb", schemas=[], tables=[])),
+        ), patch.object(
+            metadata_service, "fetch_table_versions", AsyncMock(return_value=None)
+        ), patch.object(metadata_service, "cache_metadata", AsyncMock()), patch(
+            "app.services.metadata_service.db_manager.get_table_fingerprints",
+            AsyncMock(return_value={}),
+        ), patch("app.services.metadata_service.settings.metadata_fetch_concurrency", 1):
+            await metadata_service.refresh_metadata("testdb")
+        result = await query_service.execute_validated_query("testdb", "SELECT id FROM users")
+
+        assert result[5] is False
+        assert connector.execute_query.await_count == 2
@@ -0,0 +1,114 @@
+"""Unit tests for the disk-backed result store."""
+
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.config import settings  # noqa: E402
+from app.connectors.base import ResultBatch  # noqa: E402
+from app.services.result_store import ResultStore  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "result_store_dir", tmp_path / "results")
+    return tmp_path / "results"
+
+
+async def batches(*items: ResultBatch):
+    for item in items:
+        yield item
+
+
+def numbered(start: int, stop: int) -> ResultBatch:
+    return ResultBatch(["id", "name"], ["int", "text"], [(i, f"row {i}") for i in range(start, stop)])
+
+
+@pytest.mark.asyncio
+class TestResultStore:
+    """Test suite for ResultStore."""
+
+    async def test_reads_windows_across_batches(self, store_dir):
+        store = ResultStore()
+        stored = await store.write(
+            "mydb", "SELECT id, name FROM t", False, batches(numbered(0, 500), numbered(500, 1200))
+        )
+
+        assert stored.total_rows == 1200
+        assert stored.columns == ["id", "name"]
+        assert (store_dir / f"{stored.result_id}.arrow").stat().st_size == stored.size_bytes
+
+        window = store.read(stored.result_id, 498, 4, "arrays")
+        assert window.rows == [[498, "row 498"], [499, "row 499"], [500, "row 500"], [501, "row 501"]]
+        assert window.total_rows == 1200
+        assert store.read(stored.result_id, 1199, 10).rows == [{"id": 1199, "name": "row 1199"}]
+        assert store.read(stored.result_id, 5000, 10).rows == []
+
+    async def test_values_read_back_like_json_api(self):
+        store = ResultStore()
+        stored = await store.write(
+            "mydb",
+            "SELECT ...",
+            True,
+            batches(
+                ResultBatch(
+                    ["price", "day", "at", "raw", "extra"],
+                    ["decimal", "date", "timestamp", "binary", "string"],
+                    [(Decimal("1.50"), date(2024, 1, 2), datetime(2024, 1, 2, 3, 4), b"hi", 7)],
+                )
+            ),
+        )
+
+        assert store.read(stored.result_id, 0, 1).rows == [
+            {"price": "1.50", "day": "2024-01-02", "at": "2024-01-02T03:04:00", "raw": "hi", "extra": "7"}
+        ]
+        assert store.get(stored.result_id).truncated is True
+
+    async def test_failed_write_leaves_no_file(self, store_dir):
+        store = ResultStore()
+
+        async def failing():
+            yield numbered(0, 10)
+            raise RuntimeError("connection lost")
+
+        with pytest.raises(RuntimeError):
+            await store.write("mydb", "SELECT 1", False, failing())
+
+        assert list(store_dir.iterdir()) == []
+
+    async def test_least_recently_read_results_are_evicted(self):
+        store = ResultStore()
+        first = await store.write("mydb", "SELECT 1", False, batches(numbered(0, 100)))
+        second = await store.write("mydb", "SELECT 2", False, batches(numbered(0, 100)))
+        store.read(first.result_id, 0, 1)
+
+        store.max_bytes = first.size_bytes * 2
+        third = await store.write("mydb", "SELECT 3", False, batches(numbered(0, 100)))
+
+        assert store.get(second.result_id) is None
+        assert store.get(first.result_id) is not None
+        assert store.get(third.result_id) is not None
+
+    async def test_idle_results_expire(self, store_dir, monkeypatch):
+        store = ResultStore()
+        stored = await store.write("mydb", "SELECT 1", False, batches(numbered(0, 10)))
+
+        monkeypatch.setattr(settings, "result_store_idle_seconds", 0)
+        time.sleep(0.01)
+
+        assert store.get(stored.result_id) is None
+        assert list(store_dir.iterdir()) == []
+
+    async def test_invalidate_and_delete(self):
+        store = ResultStore()
+        kept = await store.write("other", "SELECT 1", False, batches(numbered(0, 10)))
+        dropped = await store.write("mydb", "SELECT 1", False, batches(numbered(0, 10)))
+
+        assert store.invalidate("mydb") == 1
+        assert store.get(dropped.result_id) is None
+        assert store.delete(kept.result_id) is True
+        assert store.delete(kept.result_id) is False
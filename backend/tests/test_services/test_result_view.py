@@ -0,0 +1,98 @@
+"""Unit tests for views over stored results."""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from app.models.result import ResultViewRequest  # noqa: E402
+from app.services.result_view import apply_view  # noqa: E402
+
+
+@pytest.fixture
+def table():
+    return pa.table(
+        {
+            "region": ["east", "west", "east", None, "west"],
+            "units": [3, 1, 4, 1, 5],
+            "price": ["10.50", "2.00", "9.75", None, "100.00"],
+        }
+    )
+
+
+def view(table, decimals=frozenset({"price"}), **kwargs):
+    window, total_rows = apply_view(table, ResultViewRequest(**kwargs), decimals)
+    return window.to_pylist(), total_rows
+
+
+class TestApplyView:
+    """Test filters, grouping, sorting and windows."""
+
+    def test_filters_combine_with_and(self, table):
+        rows, total = view(
+            table,
+            filters=[
+                {"column": "region", "op": "in", "value": ["east", "west"]},
+                {"column": "units", "op": "ge", "value": 3},
+            ],
+        )
+
+        assert [row["units"] for row in rows] == [3, 4, 5]
+        assert total == 3
+
+    def test_decimal_columns_compare_as_numbers(self, table):
+        rows, _ = view(table, filters=[{"column": "price", "op": "gt", "value": "9.9"}])
+        assert [row["price"] for row in rows] == ["10.50", "100.00"]
+
+        rows, _ = view(table, sort=[{"column": "price", "direction": "desc"}])
+        assert [row["price"] for row in rows] == ["100.00", "10.50", "9.75", "2.00", None]
+
+    def test_contains_and_null_filters(self, table):
+        rows, _ = view(table, filters=[{"column": "region", "op": "contains", "value": "EA"}])
+        assert len(rows) == 2
+
+        rows, _ = view(table, filters=[{"column": "region", "op": "is_null"}])
+        assert rows == [{"region": None, "units": 1, "price": None}]
+
+    def test_group_by_with_aggregates_and_top_n(self, table):
+        rows, total = view(
+            table,
+            group_by=["region"],
+            aggregates=[
+                {"function": "count"},
+                {"function": "sum", "column": "units", "alias": "total_units"},
+                {"function": "max", "column": "price"},
+            ],
+            sort=[{"column": "total_units", "direction": "desc"}],
+            limit=2,
+        )
+
+        assert rows == [
+            {"region": "east", "count": 2, "total_units": 7, "max_price": 10.5},
+            {"region": "west", "count": 2, "total_units": 6, "max_price": 100.0},
+        ]
+        assert total == 3
+
+    def test_aggregates_without_grouping_give_one_row(self, table):
+        rows, total = view(table, aggregates=[{"function": "count"}, {"function": "mean", "column": "units"}])
+        assert rows == [{"count": 5, "mean_units": 2.8}]
+        assert total == 1
+
+    def test_stable_sort_and_window(self, table):
+        rows, total = view(table, sort=[{"column": "units"}], offset=1, limit=2)
+        assert [(row["units"], row["region"]) for row in rows] == [(1, None), (3, "east")]
+        assert total == 5
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"sort": [{"column": "missing"}]},
+            {"filters": [{"column": "units", "op": "eq", "value": "many"}]},
+            {"filters": [{"column": "units", "op": "in", "value": 3}]},
+            {"aggregates": [{"function": "sum", "column": "region"}]},
+            {"aggregates": [{"function": "sum"}]},
+            {"group_by": ["region"], "aggregates": [{"function": "count", "alias": "region"}]},
+        ],
+    )
+    def test_invalid_views_raise_value_error(self, table, kwargs):
+        with pytest.raises(ValueError):
+            view(table, **kwargs)
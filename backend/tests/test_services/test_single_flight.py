@@ -0,0 +1,116 @@
+"""Unit tests for single-flight query coalescing."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.query_service import QueryService
+from app.services.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """Test suite for SingleFlight."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        flights: SingleFlight[int] = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def call() -> int:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 42
+
+        waiters = [asyncio.create_task(flights.do("k", call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert [value for value, _ in results] == [42, 42, 42]
+        assert [shared for _, shared in results] == [False, True, True]
+        assert flights.in_flight() == 0
+
+    async def test_waiter_timeout_does_not_cancel_others(self):
+        flights: SingleFlight[str] = SingleFlight()
+        release = asyncio.Event()
+
+        async def call() -> str:
+            await release.wait()
+            return "done"
+
+        impatient = asyncio.create_task(flights.do("k", call, timeout=0.01))
+        patient = asyncio.create_task(flights.do("k", call, timeout=5))
+        with pytest.raises(asyncio.TimeoutError):
+            await impatient
+        release.set()
+
+        assert await patient == ("done", True)
+
+    async def test_call_cancelled_when_all_waiters_leave(self):
+        flights: SingleFlight[None] = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def call() -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.create_task(flights.do("k", call, timeout=0.01)) for _ in range(2)]
+        for waiter in waiters:
+            with pytest.raises(asyncio.TimeoutError):
+                await waiter
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert flights.in_flight() == 0
+
+    async def test_error_is_shared_and_not_remembered(self):
+        flights: SingleFlight[int] = SingleFlight()
+        call = AsyncMock(side_effect=[RuntimeError("boom"), 7])
+
+        results = await asyncio.gather(
+            flights.do("k", call), flights.do("k", call), return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        assert await flights.do("k", call) == (7, False)
+        assert call.await_count == 2
+
+
+@pytest.mark.asyncio
+class TestQueryServiceCoalescing:
+    """Identical concurrent queries hit the database once."""
+
+    async def test_execute_query_coalesces_identical_sql(self):
+        service = QueryService()
+        release = asyncio.Event()
+
+        async def execute_query(*_args, **_kwargs):
+            await release.wait()
+            return ["id"], [{"id": 1}], 3
+
+        connector = MagicMock()
+        connector.get_dialect.return_value = "postgres"
+        connector.execute_query = AsyncMock(side_effect=execute_query)
+
+        with patch("app.services.query_service.database_manager") as mock_mgr, \
+             patch("app.services.query_service.ConnectorFactory") as mock_factory:
+            mock_mgr.get_database = AsyncMock(return_value={"url": "postgresql://localhost/db"})
+            mock_mgr.get_tunnel_endpoint = AsyncMock(return_value=None)
+            mock_factory.get_connector.return_value = connector
+
+            waiters = [
+                asyncio.create_task(service.execute_query("db", "SELECT id FROM t")),
+                asyncio.create_task(service.execute_query("db", "select id  from t")),
+            ]
+            await asyncio.sleep(0.01)
+            release.set()
+            results = await asyncio.gather(*waiters)
+
+        assert results[0] == results[1] == (["id"], [{"id": 1}], 3)
+        assert connector.execute_query.await_count == 1
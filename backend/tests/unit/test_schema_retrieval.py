@@ -16,7 +16,7 @@ class TestSchemaRetrievalExtra:
         mock_cursor = MagicMock()
 
         schemas_result = [("public",)]
-        tables_result = [("public", "users", "BASE TABLE", "User table")]
+        tables_result = [("public", "users", "BASE TABLE", "User table", 10, 16384)]
         pk_result = [("public", "users", "id")]
 
         columns_result = [
@@ -57,7 +57,7 @@ class TestSchemaRetrievalExtra:
         mock_cursor = MagicMock()
 
         schemas_result = [("db1",)]
-        tables_result = [("db1", "users", "BASE TABLE", "User table")]
+        tables_result = [("db1", "users", "BASE TABLE", "User table", 10, 16384)]
         pk_result = [("db1", "users", "id")]
 
         columns_result = [
@@ -56,6 +56,25 @@ interface DatabaseSidebarProps {
 
 const { Text } = Typography;
 
+const compactNumber = new Intl.NumberFormat('en', { notation: 'compact', maximumFractionDigits: 1 });
+
+// Estimated table size, e.g. "~1.2M rows, 340 MB"
+const formatTableSize = (rowCount?: number | null, sizeBytes?: number | null): string | null => {
+  const parts: string[] = [];
+  if (rowCount != null) parts.push(`~${compactNumber.format(rowCount)} rows`);
+  if (sizeBytes != null) {
+    const units = ['B', 'KB', 'MB', 'GB', 'TB'];
+    let size = sizeBytes;
+    let unit = 0;
+    while (size >= 1024 && unit < units.length - 1) {
+      size /= 1024;
+      unit += 1;
+    }
+    parts.push(`${size >= 100 ? size.toFixed(0) : Number(size.toPrecision(2))} ${units[unit]}`);
+  }
+  return parts.length ? parts.join(', ') : null;
+};
+
 // Comment display component - inline with word wrap when needed
 const CommentText: React.FC<{ comment: string | undefined | null }> = ({ comment }) => {
   if (!comment) return null;
@@ -191,8 +210,12 @@ export const DatabaseSidebar: React.FC<DatabaseSidebarProps> = ({
           title: (
             <div style={{ color: '#a9b7c6', fontSize: 12, whiteSpace: 'normal', wordBreak: 'break-word', padding: '2px 0' }}>
               {table.tableName}
-              <span style={{ color: '#666', marginLeft: 4, fontSize: 10 }}>
-                ({table.columns?.length || 0} cols)
+              <span
+                style={{ color: '#666', marginLeft: 4, fontSize: 10 }}
+                title={formatTableSize(table.rowCount, table.sizeBytes) ?? undefined}
+              >
+                ({table.columns?.length || 0} cols
+                {table.rowCount != null && `, ~${compactNumber.format(table.rowCount)} rows`})
               </span>
               <CommentText comment={table.comment} />
             </div>
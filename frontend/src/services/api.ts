@@ -5,16 +5,32 @@ import type {
   DatabaseListResponse,
   DatabaseResponse,
   ErrorResponse,
+  ExplainRequest,
+  ExplainResponse,
   NaturalQueryRequest,
   NaturalQueryResponse,
+  QueryExportRequest,
   QueryRequest,
   QueryResponse,
+  QueryStreamFrame,
+  QueryStreamHandlers,
+  ResultViewRequest,
+  RowFormat,
+  StoredRowsResponse,
 } from '../types';
 import type {
   QueryHistoryListResponse,
   QueryHistorySearchResponse,
+  QueryStatsSort,
+  TopQueriesResponse,
 } from '../types/history';
-import type { DatabaseMetadata, TableListResponse, TableMetadata } from '../types/metadata';
+import type {
+  DatabaseMetadata,
+  MetadataStreamFrame,
+  MetadataStreamHandlers,
+  TableListResponse,
+  TableMetadata,
+} from '../types/metadata';
 import type {
   AgentEventHandlers,
   AgentQueryRequest,
@@ -179,6 +195,139 @@ class ApiClient {
     }
   }
 
+  /**
+   * Execute a query and receive rows in batches as they are fetched (NDJSON).
+   * Returns an AbortController; aborting also cancels the query on the server.
+   */
+  streamQuery(
+    dbName: string,
+    data: QueryRequest,
+    handlers: QueryStreamHandlers
+  ): AbortController {
+    const controller = new AbortController();
+
+    const processStream = async () => {
+      try {
+        const response = await fetch(`${API_BASE_URL}/api/v1/dbs/${dbName}/query/stream`, {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json',
+          },
+          body: JSON.stringify({ ...data, sql: cleanSQL(data.sql) }),
+          signal: controller.signal,
+        });
+
+        if (!response.ok) {
+          const errorData = await response.json().catch(() => ({}));
+          handlers.onError?.({
+            error: errorData.detail || `HTTP ${response.status}`,
+            detail: errorData.detail,
+          });
+          return;
+        }
+
+        const reader = response.body?.getReader();
+        if (!reader) {
+          handlers.onError?.({ error: 'No response body' });
+          return;
+        }
+
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+
+          buffer += decoder.decode(value, { stream: true });
+          const lines = buffer.split('\n');
+          buffer = lines.pop() || ''; // Keep incomplete line in buffer
+
+          for (const line of lines) {
+            if (!line.trim()) continue;
+            const frame = JSON.parse(line) as QueryStreamFrame;
+            switch (frame.type) {
+              case 'header':
+                handlers.onHeader?.(frame);
+                break;
+              case 'rows':
+                handlers.onRows?.(frame.rows);
+                break;
+              case 'end':
+                handlers.onEnd?.(frame);
+                break;
+              case 'error':
+                handlers.onError?.({ error: frame.detail, detail: frame.detail });
+                break;
+            }
+          }
+        }
+      } catch (error) {
+        if ((error as Error).name === 'AbortError') {
+          // Request was cancelled
+          return;
+        }
+        handlers.onError?.({
+          error: (error as Error).message || 'Unknown error',
+        });
+      }
+    };
+
+    processStream();
+    return controller;
+  }
+
+  /**
+   * Execute a query and receive the result as an Arrow IPC stream.
+   * Decode with apache-arrow's tableFromIPC().
+   */
+  async executeQueryArrow(dbName: string, data: QueryRequest): Promise<ArrayBuffer> {
+    try {
+      const response: AxiosResponse<ArrayBuffer> = await this.client.post(
+        `/dbs/${dbName}/query/arrow`,
+        { ...data, sql: cleanSQL(data.sql) },
+        { responseType: 'arraybuffer' }
+      );
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error as AxiosError<ErrorResponse>);
+    }
+  }
+
+  /**
+   * Export the full result of a query as a file built on the server.
+   * The file is streamed while rows are fetched, so it can exceed the
+   * rows the grid holds.
+   */
+  async exportQuery(dbName: string, data: QueryExportRequest): Promise<Blob> {
+    try {
+      const response: AxiosResponse<Blob> = await this.client.post(
+        `/dbs/${dbName}/query/export`,
+        { ...data, sql: cleanSQL(data.sql) },
+        { responseType: 'blob' }
+      );
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error as AxiosError<ErrorResponse>);
+    }
+  }
+
+  /**
+   * Analyze the plan of a SELECT query: normalized plan tree plus findings
+   * (hot nodes, misestimates, large full scans, missing-index candidates).
+   */
+  async explainQuery(dbName: string, data: ExplainRequest): Promise<ExplainResponse> {
+    try {
+      const response: AxiosResponse<ExplainResponse> = await this.client.post(
+        `/dbs/${dbName}/explain`,
+        { ...data, sql: cleanSQL(data.sql) }
+      );
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error as AxiosError<ErrorResponse>);
+    }
+  }
+
   async formatSql(sql: string, dialect?: string): Promise<string> {
     try {
       const response: AxiosResponse<{ formatted: string }> = await this.client.post(
@@ -231,6 +380,78 @@ class ApiClient {
     }
   }
 
+  /**
+   * Refresh metadata and receive each schema's tables as they are fetched (NDJSON).
+   * Returns an AbortController; aborting stops fetching the remaining schemas.
+   */
+  streamRefreshDatabaseMetadata(
+    dbName: string,
+    handlers: MetadataStreamHandlers
+  ): AbortController {
+    const controller = new AbortController();
+
+    const processStream = async () => {
+      try {
+        const response = await fetch(
+          `${API_BASE_URL}/api/v1/dbs/${dbName}/metadata/refresh/stream`,
+          { method: 'POST', signal: controller.signal }
+        );
+
+        if (!response.ok) {
+          const errorData = await response.json().catch(() => ({}));
+          handlers.onError?.(errorData.detail || `HTTP ${response.status}`);
+          return;
+        }
+
+        const reader = response.body?.getReader();
+        if (!reader) {
+          handlers.onError?.('No response body');
+          return;
+        }
+
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+
+          buffer += decoder.decode(value, { stream: true });
+          const lines = buffer.split('\n');
+          buffer = lines.pop() || ''; // Keep incomplete line in buffer
+
+          for (const line of lines) {
+            if (!line.trim()) continue;
+            const frame = JSON.parse(line) as MetadataStreamFrame;
+            switch (frame.type) {
+              case 'header':
+                handlers.onHeader?.(frame);
+                break;
+              case 'schema':
+                handlers.onSchema?.(frame.schemaName, frame.tables);
+                break;
+              case 'end':
+                handlers.onEnd?.(frame.refresh);
+                break;
+              case 'error':
+                handlers.onError?.(frame.detail);
+                break;
+            }
+          }
+        }
+      } catch (error) {
+        if ((error as Error).name === 'AbortError') {
+          // Request was cancelled
+          return;
+        }
+        handlers.onError?.((error as Error).message || 'Unknown error');
+      }
+    };
+
+    processStream();
+    return controller;
+  }
+
   async getTableList(dbName: string, refresh = false): Promise<TableListResponse> {
     try {
       const response: AxiosResponse<TableListResponse> = await this.client.get(
@@ -258,6 +479,49 @@ class ApiClient {
     }
   }
 
+  /**
+   * Fetch rows [offset, offset + limit) of a result stored with store: true.
+   */
+  async getResultRows(
+    resultId: string,
+    offset: number,
+    limit: number = 1000,
+    rowFormat: RowFormat = 'objects'
+  ): Promise<StoredRowsResponse> {
+    try {
+      const response: AxiosResponse<StoredRowsResponse> = await this.client.get(
+        `/results/${resultId}/rows`,
+        { params: { offset, limit, rowFormat } }
+      );
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error as AxiosError<ErrorResponse>);
+    }
+  }
+
+  /**
+   * Filter, group and sort a stored result on the server without re-running its SQL.
+   */
+  async getResultView(resultId: string, view: ResultViewRequest): Promise<StoredRowsResponse> {
+    try {
+      const response: AxiosResponse<StoredRowsResponse> = await this.client.post(
+        `/results/${resultId}/view`,
+        view
+      );
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error as AxiosError<ErrorResponse>);
+    }
+  }
+
+  async deleteResult(resultId: string): Promise<void> {
+    try {
+      await this.client.delete(`/results/${resultId}`);
+    } catch (error) {
+      throw this.handleError(error as AxiosError<ErrorResponse>);
+    }
+  }
+
   // === Query History Operations ===
 
   async getQueryHistory(
@@ -292,6 +556,22 @@ class ApiClient {
     }
   }
 
+  async getTopQueries(
+    dbName: string,
+    sort: QueryStatsSort = 'total_time',
+    limit: number = 20
+  ): Promise<TopQueriesResponse> {
+    try {
+      const response: AxiosResponse<TopQueriesResponse> = await this.client.get(
+        `/dbs/${dbName}/top-queries`,
+        { params: { sort, limit } }
+      );
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error as AxiosError<ErrorResponse>);
+    }
+  }
+
   // === Agent Operations ===
 
   async getAgentStatus(): Promise<AgentStatusResponse> {
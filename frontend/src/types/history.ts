@@ -56,3 +56,41 @@ export interface QueryHistorySearchResponse {
   total: number;
 }
 
+/**
+ * Ranking of query shapes for top queries.
+ */
+export type QueryStatsSort = 'total_time' | 'mean_time' | 'max_time' | 'count' | 'rows';
+
+/**
+ * Aggregated executions of one query shape (literals replaced by ?).
+ */
+export interface QueryStatsItem {
+  /** Hash of the normalized SQL */
+  fingerprint: string;
+  /** SQL with literals replaced by ? */
+  normalizedSql: string;
+  /** Most recently executed SQL of this shape */
+  sampleSql: string;
+  /** Recorded executions */
+  execCount: number;
+  totalTimeMs: number;
+  meanTimeMs: number;
+  maxTimeMs: number;
+  /** Median execution time (within 2%) */
+  p50TimeMs: number;
+  /** 95th percentile execution time (within 2%) */
+  p95TimeMs: number;
+  totalRows: number;
+  meanRows: number;
+  /** First execution (ISO8601) */
+  firstSeen: string;
+  /** Latest execution (ISO8601) */
+  lastSeen: string;
+}
+
+/**
+ * Response for the most expensive query shapes.
+ */
+export interface TopQueriesResponse {
+  items: QueryStatsItem[];
+}
@@ -11,16 +11,49 @@ export interface SSHConfig {
   keyPassphrase?: string;
 }
 
+/** EXPLAIN-based cost guard of a connection (omitted fields: server defaults) */
+export interface CostGuardConfig {
+  mode?: 'off' | 'warn' | 'reject' | null;
+  maxCost?: number | null; // Planner cost units
+  maxRows?: number | null; // Largest estimated table scan
+  agentMaxCost?: number | null;
+  agentMaxRows?: number | null;
+}
+
 export interface DatabaseCreateRequest {
   url: string;
   sslDisabled?: boolean;
   sshConfig?: SSHConfig;
+  cacheTtlSeconds?: number | null; // Result cache TTL (null: server default, 0: disabled)
+  costGuard?: CostGuardConfig | null;
 }
 
+/** Row encoding: 'objects' (dict per row, default) or 'arrays' (list per row, compact) */
+export type RowFormat = 'objects' | 'arrays';
+
 export interface QueryRequest {
   sql: string;
   naturalQuery?: string;
   timeoutSeconds?: number; // Query timeout in seconds (10-300, default: 30)
+  rowFormat?: RowFormat;
+  cache?: boolean; // false bypasses the result cache (default: true)
+  store?: boolean; // Write the full result to disk; read more rows via getResultRows
+}
+
+// Formats of POST /dbs/{name}/query/export
+export type QueryExportFormat = 'csv' | 'json' | 'ndjson' | 'xlsx' | 'parquet';
+
+export interface QueryExportRequest {
+  sql: string;
+  naturalQuery?: string;
+  format?: QueryExportFormat;
+  timeoutSeconds?: number; // 10-3600, default: 600
+}
+
+export interface ExplainRequest {
+  sql: string;
+  analyze?: boolean; // EXPLAIN ANALYZE: runs the statement (PostgreSQL only)
+  timeoutSeconds?: number; // 10-300, default: 30
 }
 
 export interface NaturalQueryRequest {
@@ -47,6 +80,8 @@ export interface DatabaseResponse {
   dbType: 'postgresql' | 'mysql';
   sslDisabled: boolean;
   sshConfig: SSHConfigResponse | null;
+  cacheTtlSeconds?: number | null;
+  costGuard?: CostGuardConfig | null;
   createdAt: string;
   updatedAt: string;
 }
@@ -60,12 +95,123 @@ export interface QueryResult {
   rows: Record<string, unknown>[];
   rowCount: number;
   truncated: boolean;
+  rowFormat?: RowFormat;
+  totalRows?: number | null; // Rows in the stored result (store: true)
+}
+
+/** Query result requested with rowFormat: 'arrays' */
+export interface ArrayQueryResult extends Omit<QueryResult, 'rows'> {
+  rows: unknown[][];
+  rowFormat: 'arrays';
 }
 
 export interface QueryResponse {
   sql: string;
   result: QueryResult;
   executionTimeMs: number;
+  cached?: boolean; // Served from the result cache (time is of the original run)
+  resultId?: string | null; // Stored result ID (store: true)
+  costWarning?: string | null; // Cost guard warning (estimate above the connection's limits)
+}
+
+/** Query plan node, normalized across PostgreSQL and MySQL (POST /dbs/{name}/explain) */
+export interface PlanNode {
+  id: number;
+  nodeType: string;
+  relationName: string | null;
+  schemaName: string | null;
+  alias: string | null;
+  indexName: string | null;
+  fullScan: boolean;
+  condition: string | null;
+  indexCondition: string | null;
+  totalCost: number | null;
+  selfCost: number | null;
+  planRows: number | null;
+  actualRows: number | null; // ANALYZE only, per execution
+  actualLoops: number | null;
+  actualTimeMs: number | null; // Including children, all executions
+  selfTimeMs: number | null;
+  children: PlanNode[];
+}
+
+export type PlanFindingKind = 'hot_node' | 'misestimate' | 'seq_scan' | 'missing_index';
+
+export interface PlanFinding {
+  kind: PlanFindingKind;
+  nodeId: number;
+  table: string | null;
+  columns: string[]; // Candidate index columns (missing_index)
+  message: string;
+}
+
+export interface ExplainResponse {
+  sql: string;
+  dialect: string;
+  analyzed: boolean;
+  plan: PlanNode;
+  totalCost: number | null;
+  planningTimeMs: number | null;
+  executionTimeMs: number | null;
+  findings: PlanFinding[];
+  rawPlan: unknown;
+}
+
+/** A window of a stored result's rows (GET /results/{id}/rows) */
+export interface StoredRowsResponse {
+  resultId: string;
+  columns: string[];
+  rows: Record<string, unknown>[] | unknown[][];
+  offset: number;
+  rowCount: number;
+  totalRows: number;
+  rowFormat: RowFormat;
+}
+
+/** View of a stored result (POST /results/{id}/view): filter, then group, then sort */
+export interface ResultViewRequest {
+  filters?: {
+    column: string;
+    op: 'eq' | 'ne' | 'lt' | 'le' | 'gt' | 'ge' | 'contains' | 'in' | 'is_null' | 'not_null';
+    value?: unknown;
+  }[];
+  groupBy?: string[];
+  aggregates?: {
+    function: 'count' | 'count_distinct' | 'sum' | 'mean' | 'min' | 'max';
+    column?: string; // Omit with 'count' to count rows
+    alias?: string;
+  }[];
+  sort?: { column: string; direction?: 'asc' | 'desc' }[];
+  offset?: number;
+  limit?: number; // 1-10000, default: 1000
+  rowFormat?: RowFormat;
+}
+
+/** NDJSON frames emitted by POST /dbs/{name}/query/stream */
+export type QueryStreamFrame =
+  | {
+      type: 'header';
+      sql: string;
+      columns: string[];
+      truncated: boolean;
+      rowFormat: RowFormat;
+      costWarning?: string | null;
+    }
+  | { type: 'rows'; rows: Record<string, unknown>[] | unknown[][] }
+  | { type: 'end'; rowCount: number; executionTimeMs: number }
+  | { type: 'error'; detail: string };
+
+export interface QueryStreamHandlers {
+  onHeader?: (header: {
+    sql: string;
+    columns: string[];
+    truncated: boolean;
+    rowFormat: RowFormat;
+    costWarning?: string | null;
+  }) => void;
+  onRows?: (rows: Record<string, unknown>[] | unknown[][]) => void;
+  onEnd?: (summary: { rowCount: number; executionTimeMs: number }) => void;
+  onError?: (error: { error: string; detail?: string }) => void;
 }
 
 export interface NaturalQueryResponse {
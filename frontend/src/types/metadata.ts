@@ -15,6 +15,8 @@ export interface TableSummary {
   tableName: string;
   tableType: 'table' | 'view';
   comment?: string;
+  rowCount?: number | null; // Planner estimate (tables only)
+  sizeBytes?: number | null; // On disk, including indexes (tables only)
 }
 
 export interface TableMetadata {
@@ -22,8 +24,20 @@ export interface TableMetadata {
   tableName: string;
   tableType: 'table' | 'view';
   columns: ColumnInfo[];
-  rowCount?: number;
+  rowCount?: number | null;
+  sizeBytes?: number | null;
   comment?: string;
+  columnsLoaded?: boolean; // False for lazily listed tables until their details are fetched
+}
+
+// What a metadata refresh changed; table names are "schema.table"
+export interface MetadataRefreshSummary {
+  mode: 'full' | 'incremental';
+  added: string[];
+  changed: string[];
+  dropped: string[];
+  unchanged: number;
+  durationMs: number;
 }
 
 export interface DatabaseMetadata {
@@ -31,6 +45,21 @@ export interface DatabaseMetadata {
   schemas: string[];
   tables: TableMetadata[];
   lastRefreshed?: string;
+  refresh?: MetadataRefreshSummary | null; // Only set on refreshed metadata
+}
+
+/** NDJSON frames emitted by POST /dbs/{name}/metadata/refresh/stream */
+export type MetadataStreamFrame =
+  | { type: 'header'; mode: 'full' | 'incremental'; schemas: string[]; pending: string[] }
+  | { type: 'schema'; schemaName: string; tables: TableSummary[] }
+  | { type: 'end'; refresh: MetadataRefreshSummary }
+  | { type: 'error'; detail: string };
+
+export interface MetadataStreamHandlers {
+  onHeader?: (header: { mode: 'full' | 'incremental'; schemas: string[]; pending: string[] }) => void;
+  onSchema?: (schemaName: string, tables: TableSummary[]) => void;
+  onEnd?: (refresh: MetadataRefreshSummary) => void;
+  onError?: (error: string) => void;
 }
 
 export interface TableListResponse {